@@ -0,0 +1,141 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Requests/sec of ``JSONConnection.api_request`` over a local stub server.
+
+Compares a single :class:`httplib2.Http` shared behind a lock (the only
+safe way to share the old default transport across threads) with
+:class:`google.cloud._http_pool.PooledHttp`, at 1, 8 and 64 threads.
+The stub server sleeps for ``--latency`` seconds per request to stand in
+for a network round trip::
+
+    $ python benchmarks/http_transport.py --requests 2000 --latency 0.005
+"""
+
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+
+import httplib2
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from google.cloud._http import JSONConnection
+from google.cloud._http_pool import PooledHttp
+
+
+THREAD_COUNTS = (1, 8, 64)
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = b'{"kind": "stub"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+
+class _LockedHttp(object):
+
+    def __init__(self):
+        self._http = httplib2.Http()
+        self._lock = threading.Lock()
+
+    def request(self, *args, **kwargs):
+        with self._lock:
+            return self._http.request(*args, **kwargs)
+
+
+class _Client(object):
+
+    def __init__(self, http):
+        self._http = http
+
+
+def _make_connection(base_url, http):
+    class _Connection(JSONConnection):
+        API_BASE_URL = base_url
+        API_VERSION = 'v1'
+        API_URL_TEMPLATE = '{api_base_url}/{api_version}{path}'
+
+    return _Connection(_Client(http))
+
+
+def _run(connection, num_threads, num_requests):
+    per_thread = max(1, num_requests // num_threads)
+
+    def worker():
+        for _ in range(per_thread):
+            connection.api_request('GET', '/stub')
+
+    threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    return per_thread * num_threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--pool-size', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='Simulated server latency, in seconds.')
+    args = parser.parse_args()
+    _Handler.latency = args.latency
+
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    base_url = 'http://127.0.0.1:%d' % (server.server_address[1],)
+
+    transports = (
+        ('locked httplib2.Http', _LockedHttp),
+        ('PooledHttp', lambda: PooledHttp(maxsize=args.pool_size)),
+    )
+    try:
+        for num_threads in THREAD_COUNTS:
+            for name, factory in transports:
+                connection = _make_connection(base_url, factory())
+                rate = _run(connection, num_threads, args.requests)
+                print('%3d threads  %-22s %10.1f req/s' % (
+                    num_threads, name, rate))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
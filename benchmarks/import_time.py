@@ -0,0 +1,116 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cold import time of the ``google.cloud`` packages.
+
+Imports each package in a fresh interpreter under ``python -X importtime``
+(Python 3.7+), and reports the median cumulative import time and the
+slowest modules it pulled in.  The run fails if importing a package loads
+any module which should only be loaded on first use (gRPC, generated
+protobuf modules, optional transports)::
+
+    $ python benchmarks/import_time.py storage logging bigquery --runs 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+
+
+DEFERRED_MODULES = (
+    'grpc',
+    'google.gax',
+    'google.protobuf',
+    'google.auth.transport.grpc',
+    'google.auth.transport.requests',
+    'google.oauth2.service_account',
+    'google.resumable_media.requests',
+    'google.cloud.streaming.transfer',
+    'numpy',
+    'requests',
+)
+"""Modules (and their submodules) which must not be loaded by import."""
+
+
+def import_times(module):
+    """Import a module in a fresh interpreter.
+
+    :rtype: dict
+    :returns: Cumulative import time (in microseconds) of each module
+              loaded.
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode('utf-8', 'replace'))
+
+    times = {}
+    for line in stderr.decode('utf-8').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def deferred_loaded(times):
+    """Find the :data:`DEFERRED_MODULES` which were loaded."""
+    return [
+        deferred for deferred in DEFERRED_MODULES
+        if any(name == deferred or name.startswith(deferred + '.')
+               for name in times)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('packages', nargs='*',
+                        default=['storage', 'logging', 'bigquery'])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for package in args.packages:
+        module = 'google.cloud.' + package
+        try:
+            runs = [import_times(module) for _ in range(args.runs)]
+        except RuntimeError as exc:
+            print('%s: import failed (%s)' % (
+                module, exc.args[0].strip().splitlines()[-1]))
+            continue
+
+        totals = sorted(times[module] for times in runs)
+        print('%s: %.1f ms (median of %d)' % (
+            module, totals[len(totals) // 2] / 1000.0, len(totals)))
+
+        slowest = sorted(
+            (cumulative, name) for name, cumulative in runs[-1].items()
+            if not name.startswith(module))
+        for cumulative, name in slowest[::-1][:args.top]:
+            print('    %8.1f ms  %s' % (cumulative / 1000.0, name))
+
+        loaded = deferred_loaded(runs[-1])
+        if loaded:
+            failed = True
+            print('    loaded eagerly: %s' % (', '.join(loaded),))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
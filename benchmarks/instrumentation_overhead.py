@@ -0,0 +1,130 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-call cost of :mod:`google.cloud.instrumentation`.
+
+Calls ``JSONConnection.api_request`` over an in-memory transport (so only
+client-side CPU is measured), and a gRPC stub method wrapped by
+:func:`~google.cloud.instrumentation.instrument_stub`, with no listener,
+a no-op listener and a
+:class:`~google.cloud.instrumentation.HistogramAggregator`.
+The ``baseline`` rows bypass instrumentation entirely::
+
+    $ python benchmarks/instrumentation_overhead.py --calls 200000
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import grpc
+import httplib2
+
+from google.cloud import instrumentation
+from google.cloud._http import JSONConnection
+
+
+class _Connection(JSONConnection):
+
+    API_BASE_URL = 'http://localhost'
+    API_VERSION = 'v1'
+    API_URL_TEMPLATE = '{api_base_url}/bench/{api_version}{path}'
+
+    def __init__(self, http):
+        super(_Connection, self).__init__(_Client(http))
+
+    def baseline_request(self, method, path):
+        """``api_request`` with the instrumentation stripped out."""
+        url = self.build_api_url(path=path)
+        response, content = self._make_request(method=method, url=url)
+        return self._process_response(method, url, response, content, True)
+
+
+class _Client(object):
+
+    def __init__(self, http):
+        self._http = http
+
+
+class _Http(object):
+
+    def __init__(self):
+        self._response = httplib2.Response(
+            {'status': '200', 'content-type': 'application/json'})
+
+    def request(self, **kwargs):
+        return self._response, b'{}'
+
+
+class _Method(grpc.UnaryUnaryMultiCallable):
+
+    def __call__(self, request, timeout=None, metadata=None,
+                 credentials=None):
+        return request
+
+    future = with_call = __call__
+
+
+class BenchStub(object):
+
+    def __init__(self):
+        self.Method = _Method()
+
+
+def _per_call(function, calls):
+    seconds = min(timeit.repeat(function, number=calls, repeat=3))
+    return seconds / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    connection = _Connection(_Http())
+    raw_method = _Method()
+    stub = instrumentation.instrument_stub(BenchStub())
+
+    cases = [
+        ('http', 'baseline',
+         lambda: connection.baseline_request('GET', '/b/bucket')),
+        ('http', 'api_request',
+         lambda: connection.api_request('GET', '/b/bucket')),
+        ('grpc', 'baseline', lambda: raw_method(None)),
+        ('grpc', 'instrumented', lambda: stub.Method(None)),
+    ]
+    listeners = [
+        ('no listener', None),
+        ('no-op listener', lambda record: None),
+        ('histogram', instrumentation.HistogramAggregator()),
+    ]
+
+    print('%-6s %-14s %-16s %12s' % ('', 'call', 'listeners', 'ns/call'))
+    for label, listener in listeners:
+        if listener is not None:
+            instrumentation.add_listener(listener)
+        try:
+            for transport, name, function in cases:
+                if name == 'baseline' and listener is not None:
+                    continue
+                print('%-6s %-14s %-16s %12.0f' % (
+                    transport, name, label, _per_call(function, args.calls)))
+        finally:
+            if listener is not None:
+                instrumentation.remove_listener(listener)
+
+
+if __name__ == '__main__':
+    main()
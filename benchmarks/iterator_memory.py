@@ -0,0 +1,122 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory held by iterators while listing many synthetic items.
+
+Lists ``--items`` synthetic items (blob-like JSON dictionaries, served in
+pages of ``--page-size`` by an in-process connection) through an
+:class:`~google.cloud.iterator.HTTPIterator`, with and without
+``release_items``, keeping ``--open`` iterators part-way through a page at
+the same time.  Reports the peak memory traced by :mod:`tracemalloc`
+(Python 3.4+) while listing, and the memory retained by each open
+iterator and its current page::
+
+    $ python benchmarks/iterator_memory.py --items 10000000 --page-size 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+import tracemalloc
+
+from google.cloud.iterator import HTTPIterator
+
+
+class _Connection(object):
+    """Serves pages of synthetic items, decoded afresh for each request."""
+
+    def __init__(self, items, page_size):
+        self._items = items
+        self._page_size = page_size
+
+    def api_request(self, method, path, query_params=None, **kwargs):
+        start = int(query_params.get('pageToken', 0))
+        stop = min(start + self._page_size, self._items)
+        response = {'items': [{
+            'kind': 'storage#object',
+            'name': 'logs/2017/06/01/object-%09d' % (index,),
+            'bucket': 'bucket',
+            'generation': '1496275200000000',
+            'size': '1024',
+            'md5Hash': 'XrY7u+Ae7tCTyyK7j1rNww==',
+        } for index in range(start, stop)]}
+        if stop < self._items:
+            response['nextPageToken'] = str(stop)
+        return response
+
+
+class _Client(object):
+
+    def __init__(self, connection):
+        self._connection = connection
+
+
+def _item_to_value(iterator, item):
+    return item['name']
+
+
+def _make_iterator(items, page_size, release_items):
+    client = _Client(_Connection(items, page_size))
+    return HTTPIterator(client, '/b/bucket/o', _item_to_value,
+                        release_items=release_items)
+
+
+def _list_all(items, page_size, release_items):
+    iterator = _make_iterator(items, page_size, release_items)
+    tracemalloc.start()
+    start = time.time()
+    count = sum(1 for _ in iterator)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == items
+    return peak, elapsed
+
+
+def _open_iterators(count, page_size, release_items):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    pages = []
+    for _ in range(count):
+        page = next(_make_iterator(
+            page_size, page_size, release_items).pages)
+        # Stop at the last item of the page.
+        for _ in range(page_size - 1):
+            next(page)
+        pages.append(page)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / float(count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--items', type=int, default=10000000)
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--open', type=int, default=1000,
+                        help='Iterators kept open at the same time.')
+    args = parser.parse_args()
+
+    print('%16s %16s %10s %24s' % (
+        'release_items', 'peak MiB', 'seconds', 'KiB per open iterator'))
+    for release_items in (False, True):
+        peak, elapsed = _list_all(args.items, args.page_size, release_items)
+        retained = _open_iterators(args.open, args.page_size, release_items)
+        print('%16s %16.2f %10.1f %24.2f' % (
+            release_items, peak / 2.0 ** 20, elapsed, retained / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
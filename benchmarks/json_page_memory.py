@@ -0,0 +1,106 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Peak memory of consuming one list page, eagerly vs. incrementally decoded.
+
+Builds a ``tabledata.list``-style page of ``--rows`` rows (each with
+``--columns`` string cells) and iterates it through an
+:class:`~google.cloud.iterator.HTTPIterator`, once with the default
+``json.loads`` decoding and once with ``stream_items=True``.  Peak memory
+is measured with :mod:`tracemalloc` (Python 3.4+), excluding the response
+text itself::
+
+    $ python benchmarks/json_page_memory.py --rows 10000 100000
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import httplib2
+
+from google.cloud._http import JSONConnection
+from google.cloud.iterator import HTTPIterator
+
+
+def _make_page(rows, columns):
+    row = {'f': [{'v': 'value-%d' % (column,)} for column in range(columns)]}
+    page = {'kind': 'bigquery#tableDataList', 'rows': [row] * rows}
+    return json.dumps(page)
+
+
+class _Connection(object):
+
+    def __init__(self, content):
+        self._content = content
+
+    def api_request(self, method, path, query_params=None, data=None,
+                    lazy_items_key=None):
+        response = httplib2.Response(
+            {'status': '200', 'content-type': 'application/json'})
+        return JSONConnection._process_response(
+            method, path, response, self._content, True,
+            lazy_items_key=lazy_items_key)
+
+
+class _Client(object):
+
+    def __init__(self, connection):
+        self._connection = connection
+
+
+def _count_cells(iterator, row):
+    return len(row['f'])
+
+
+def _measure(content, stream_items):
+    client = _Client(_Connection(content))
+    iterator = HTTPIterator(
+        client, '/rows', _count_cells, items_key='rows',
+        stream_items=stream_items)
+
+    tracemalloc.start()
+    start = time.time()
+    cells = sum(iterator)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cells, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--columns', type=int, default=10)
+    args = parser.parse_args()
+
+    print('%10s %10s %16s %16s %10s' % (
+        'rows', 'text MiB', 'mode', 'peak MiB', 'seconds'))
+    for rows in args.rows:
+        content = _make_page(rows, args.columns)
+        text_mib = len(content) / 2.0 ** 20
+        for mode, stream_items in (('json.loads', False),
+                                   ('stream_items', True)):
+            cells, peak, elapsed = _measure(content, stream_items)
+            assert cells == rows * args.columns
+            print('%10d %10.1f %16s %16.2f %10.3f' % (
+                rows, text_mib, mode, peak / 2.0 ** 20, elapsed))
+
+
+if __name__ == '__main__':
+    main()
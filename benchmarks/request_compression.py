@@ -0,0 +1,147 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wall time and bytes on the wire of gzip-compressed request bodies.
+
+POSTs BigQuery ``insertAll``-style bodies of ``--rows`` rows through
+``JSONConnection.api_request`` to a local stub server, with the client's
+``compression_threshold`` unset and set.  The server decodes each body,
+and sleeps as long as sending it over a ``--bandwidth`` megabytes per
+second uplink would take (``0`` for loopback speed)::
+
+    $ python benchmarks/request_compression.py --rows 5000 --bandwidth 10
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import threading
+import time
+import zlib
+
+import httplib2
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from google.cloud._http import JSONConnection
+
+
+_MB = 1 << 20
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Accepts JSON bodies, gzip-compressed or not."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    bandwidth = 0.0
+    received = 0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        _Handler.received += length
+        if self.bandwidth:
+            time.sleep(length / (self.bandwidth * _MB))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        json.loads(body.decode('utf-8'))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+
+class _Client(object):
+
+    def __init__(self, compression_threshold):
+        self._http = httplib2.Http()
+        self.compression_threshold = compression_threshold
+
+
+class _Connection(JSONConnection):
+
+    API_VERSION = 'v2'
+    API_URL_TEMPLATE = '{api_base_url}/bigquery/{api_version}{path}'
+
+
+def _rows(count):
+    """Rows typical of streamed telemetry: repetitive keys and values."""
+    return {
+        'kind': 'bigquery#tableDataInsertAllRequest',
+        'rows': [{
+            'insertId': 'a5c3e2f0-%08d' % (index,),
+            'json': {
+                'timestamp': '2017-06-01T12:%02d:%02d.%06dZ' % (
+                    index // 60 % 60, index % 60, index),
+                'host': 'frontend-%d.us-central1-b' % (index % 16,),
+                'status': 200 if index % 10 else 503,
+                'latency_ms': index % 977,
+                'path': '/api/v1/items/%d' % (index % 1000,),
+            },
+        } for index in range(count)],
+    }
+
+
+def _run(base_url, rows, requests, threshold):
+    connection = _Connection(_Client(threshold))
+    _Handler.received = 0
+    start = time.time()
+    for _ in range(requests):
+        connection.api_request(
+            'POST', '/projects/p/datasets/d/tables/t/insertAll',
+            data=rows, api_base_url=base_url)
+    elapsed = time.time() - start
+    return elapsed / requests, _Handler.received / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000,
+                        help='Rows per request.')
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--bandwidth', type=float, default=10.0,
+                        help='Simulated uplink, in megabytes per second.')
+    args = parser.parse_args()
+    _Handler.bandwidth = args.bandwidth
+
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    base_url = 'http://127.0.0.1:%d' % (server.server_address[1],)
+
+    rows = _rows(args.rows)
+    try:
+        for name, threshold in (('uncompressed', None),
+                                ('gzip', 1024)):
+            seconds, sent = _run(base_url, rows, args.requests, threshold)
+            print('%-14s %8.1f ms/request %10.1f KB/request' % (
+                name, seconds * 1000.0, sent / 1024.0))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of parsing RFC 3339 timestamps.
+
+Compares the original ``strptime``-based parsers with the fast-path
+parsers in :mod:`google.cloud._helpers`, for distinct values (every call
+misses the LRU cache) and for repeated values (as in a listing where many
+objects share a timestamp), plus the bulk API.  Before timing, the outputs
+of both implementations are checked to be identical::
+
+    $ python benchmarks/rfc3339_parsing.py --values 100000
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import random
+import timeit
+
+from google.cloud import _helpers
+
+
+def reference_micros(dt_str):
+    """The original ``_rfc3339_to_datetime``."""
+    return datetime.datetime.strptime(
+        dt_str, _helpers._RFC3339_MICROS).replace(tzinfo=_helpers.UTC)
+
+
+def reference_nanos(dt_str):
+    """The original ``_rfc3339_nanos_to_datetime``."""
+    with_nanos = _helpers._RFC3339_NANOS.match(dt_str)
+    bare_seconds = datetime.datetime.strptime(
+        with_nanos.group('no_fraction'), _helpers._RFC3339_NO_FRACTION)
+    fraction = with_nanos.group('nanos')
+    if fraction is None:
+        micros = 0
+    else:
+        scale = 9 - len(fraction)
+        micros = int(fraction) * (10 ** scale) // 1000
+    return bare_seconds.replace(microsecond=micros, tzinfo=_helpers.UTC)
+
+
+def make_values(count, digits, seed=0):
+    """Generate distinct, valid timestamps."""
+    rng = random.Random(seed)
+    start = datetime.datetime(2017, 1, 1)
+    values = []
+    for index in range(count):
+        stamp = start + datetime.timedelta(seconds=index * 7.3)
+        values.append('%s.%0*dZ' % (
+            stamp.strftime('%Y-%m-%dT%H:%M:%S'), digits,
+            rng.randint(0, 10 ** digits - 1)))
+    return values
+
+
+def check(values, fast, reference):
+    """Verify both implementations agree."""
+    for value in values:
+        if fast(value) != reference(value):
+            raise AssertionError('Mismatch for %r' % (value,))
+
+
+def time_per_value(function, values, repeat):
+    """Best time per value, in microseconds."""
+    def run():
+        for value in values:
+            function(value)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(values) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--values', type=int, default=100000)
+    parser.add_argument('--distinct-repeated', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    micros = make_values(args.values, 6)
+    nanos = make_values(args.values, 9, seed=1)
+    check(micros, _helpers._rfc3339_to_datetime, reference_micros)
+    check(nanos, _helpers._rfc3339_nanos_to_datetime, reference_nanos)
+
+    repeated = make_values(args.distinct_repeated, 6, seed=2)
+    repeated = (repeated * (args.values // len(repeated) + 1))[:args.values]
+
+    # Distinct values never hit the cache; time the uncached functions
+    # so earlier runs don't warm it.
+    uncached_micros = getattr(
+        _helpers._rfc3339_to_datetime, '__wrapped__',
+        _helpers._rfc3339_to_datetime)
+    uncached_nanos = getattr(
+        _helpers._rfc3339_nanos_to_datetime, '__wrapped__',
+        _helpers._rfc3339_nanos_to_datetime)
+
+    rows = [
+        ('micros, reference', reference_micros, micros),
+        ('micros, fast', uncached_micros, micros),
+        ('micros, fast + cache (distinct)',
+         _helpers._rfc3339_to_datetime, micros),
+        ('nanos, reference', reference_nanos, nanos),
+        ('nanos, fast', uncached_nanos, nanos),
+        ('micros, reference (repeated)', reference_micros, repeated),
+        ('micros, fast + cache (repeated)',
+         _helpers._rfc3339_to_datetime, repeated),
+    ]
+    print('%-34s %10s' % ('case', 'us/value'))
+    for name, function, values in rows:
+        print('%-34s %10.3f' % (
+            name, time_per_value(function, values, args.repeat)))
+
+    bulk_cases = [('bulk list', False)]
+    if _helpers.numpy is not None:
+        bulk_cases.append(('bulk datetime64', True))
+    for name, as_numpy in bulk_cases:
+        best = min(timeit.repeat(
+            lambda: _helpers._rfc3339_bulk_to_datetime(
+                nanos, nanos=True, as_numpy=as_numpy),
+            number=1, repeat=args.repeat))
+        print('%-34s %10.3f' % (name, best / len(nanos) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of large blob downloads to files, in slices or not.
+
+Downloads a blob of ``--size`` bytes (4 GiB by default) from the fake
+storage server of :mod:`test_utils.fake_servers`, running in a child
+process, into a temporary file: with ``download_to_filename`` (in chunks
+of ``--chunk-size``), then with ``sliced_download_to_filename`` for each
+of the ``--workers`` counts, slices being sized automatically.  Sliced
+downloads include the check of the MD5 hash of the file::
+
+    $ pip install -e test_utils
+    $ python benchmarks/storage_sliced_download.py --size 4294967296 \\
+        --workers 1 4 8 16
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from google.cloud.storage import _http
+from google.cloud.storage import Client
+
+from test_utils import fake_servers
+from test_utils.system import EmulatorCreds
+
+
+def _get_blob(port, workers):
+    _http.Connection.API_BASE_URL = 'http://127.0.0.1:%d' % (port,)
+    client = Client(project='benchmark', credentials=EmulatorCreds())
+    client.media_pool_size = workers
+    return client.bucket('bucket').get_blob('object')
+
+
+def _measure(download, filename, size):
+    start = time.time()
+    download(filename)
+    elapsed = time.time() - start
+    assert os.path.getsize(filename) == size
+    os.remove(filename)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--size', type=int, default=4 << 30)
+    parser.add_argument('--chunk-size', type=int, default=8 << 20,
+                        help='Chunk size of the unsliced download.')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'object')
+    print('%10s %10s %10s %10s' % ('mode', 'workers', 'seconds', 'MiB/s'))
+    try:
+        with fake_servers.spawn('http', object_size=args.size) as endpoint:
+            blob = _get_blob(endpoint.port, 1)
+            blob.chunk_size = args.chunk_size
+            elapsed = _measure(blob.download_to_filename, filename, args.size)
+            print('%10s %10d %10.1f %10.1f' % (
+                'chunked', 1, elapsed, args.size / elapsed / 2.0 ** 20))
+
+            for workers in args.workers:
+                blob = _get_blob(endpoint.port, workers)
+
+                def download(filename, blob=blob, workers=workers):
+                    blob.sliced_download_to_filename(
+                        filename, max_workers=workers)
+
+                elapsed = _measure(download, filename, args.size)
+                print('%10s %10d %10.1f %10.1f' % (
+                    'sliced', workers, elapsed,
+                    args.size / elapsed / 2.0 ** 20))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of small blob uploads and downloads, from many threads.
+
+Each of ``--threads`` threads uploads (with ``upload_from_string``) and
+then downloads (with ``download_as_string``) ``--objects`` blobs in total,
+of each of the ``--sizes``, against the fake storage server of
+:mod:`test_utils.fake_servers` running in a child process.  Blobs share
+the pooled media transport of their client, or (``per-call``) create a
+new transport for each operation, as they used to::
+
+    $ pip install -e test_utils
+    $ python benchmarks/storage_small_objects.py --threads 32 \\
+        --sizes 1024 10240 102400
+"""
+
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+
+from google.cloud.storage import _http
+from google.cloud.storage import blob as blob_module
+from google.cloud.storage import Client
+
+from test_utils import fake_servers
+from test_utils.system import EmulatorCreds
+
+
+class _PerCallClient(Client):
+    """Client without a shared media transport."""
+
+    _media_transport = None
+
+
+def _use_fake_server(port):
+    base_url = 'http://127.0.0.1:%d' % (port,)
+    _http.Connection.API_BASE_URL = base_url
+    blob_module._MULTIPART_URL_TEMPLATE = (
+        base_url + '/upload/storage/v1{bucket_path}/o?uploadType=multipart')
+
+
+def _transfer(bucket, names, data):
+    for name in names:
+        blob = bucket.blob(name)
+        blob.upload_from_string(data)
+        assert len(blob.download_as_string()) == len(data)
+
+
+def _measure(client_class, threads, objects, size):
+    client = client_class(project='benchmark', credentials=EmulatorCreds())
+    client.media_pool_size = threads
+    bucket = client.bucket('bucket')
+    data = b'x' * size
+    names = ['object-%06d' % (index,) for index in range(objects)]
+
+    workers = [
+        threading.Thread(
+            target=_transfer, args=(bucket, names[index::threads], data))
+        for index in range(threads)]
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--objects', type=int, default=2000,
+                        help='Blobs uploaded and downloaded, per size.')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1024, 10240, 102400])
+    args = parser.parse_args()
+
+    print('%10s %10s %12s %12s' % ('size', 'transport', 'objects/s', 'MiB/s'))
+    for size in args.sizes:
+        with fake_servers.spawn('http', object_size=size) as endpoint:
+            _use_fake_server(endpoint.port)
+            for mode, client_class in (('per-call', _PerCallClient),
+                                       ('pooled', Client)):
+                elapsed = _measure(
+                    client_class, args.threads, args.objects, size)
+                # Each object is both uploaded and downloaded.
+                print('%10d %10s %12.1f %12.2f' % (
+                    size, mode, args.objects / elapsed,
+                    2 * args.objects * size / elapsed / 2.0 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of chunked resumable uploads over a local stub server.
+
+Streams a file through :class:`google.cloud.streaming.transfer.Upload` in
+chunks, with and without ``read_ahead``.  The stub server sleeps for
+``--latency`` seconds per chunk to stand in for a network round trip, and
+the source stream sleeps for ``--read-latency`` seconds per megabyte read,
+standing in for a slow disk or a generated file.  Reading ahead overlaps
+the two::
+
+    $ python benchmarks/streaming_upload.py --size 64 --chunksize 4
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import threading
+import time
+
+import httplib2
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
+from google.cloud.streaming.transfer import Upload
+
+
+_MB = 1 << 20
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Resumable upload session: accepts chunks in order."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.0
+    received = 0
+
+    def do_PUT(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+        content_range = self.headers['Content-Range']
+        first, _, total = content_range[len('bytes '):].partition('/')
+        if first != '*':
+            start = int(first.partition('-')[0])
+            if start != _Handler.received:
+                self._respond(400)
+                return
+            _Handler.received = start + length
+        if total != '*' and _Handler.received == int(total):
+            self._respond(200, body=b'{}')
+        else:
+            self._respond(308, headers={
+                'Range': 'bytes=0-%d' % (_Handler.received - 1,)})
+
+    def _respond(self, status, headers=None, body=b''):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+
+class _SlowStream(io.BytesIO):
+    """In-memory file, taking ``latency`` seconds per megabyte read."""
+
+    latency = 0.0
+
+    def read(self, size=-1):
+        data = super(_SlowStream, self).read(size)
+        time.sleep(self.latency * len(data) / _MB)
+        return data
+
+
+def _upload(url, content, chunksize, read_ahead, known_size):
+    _Handler.received = 0
+    stream = _SlowStream(content)
+    total_size = len(content) if known_size else None
+    upload = Upload(stream, 'application/octet-stream', total_size,
+                    chunksize=chunksize, read_ahead=read_ahead)
+    upload.strategy = RESUMABLE_UPLOAD
+    http = httplib2.Http()
+    if hasattr(http, 'redirect_codes'):
+        # Newer ``httplib2`` releases treat 308 as a redirect.
+        http.redirect_codes = http.redirect_codes - set([308])
+    upload._initialize(http, url)
+
+    start = time.time()
+    response = upload.stream_file(use_chunks=True)
+    elapsed = time.time() - start
+    assert response.status_code == 200, response.status_code
+    assert _Handler.received == len(content)
+    return len(content) / elapsed / _MB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=64,
+                        help='Upload size, in megabytes.')
+    parser.add_argument('--chunksize', type=int, default=4,
+                        help='Chunk size, in megabytes.')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Simulated round trip per chunk, in seconds.')
+    parser.add_argument('--read-latency', type=float, default=0.0125,
+                        help='Simulated read time per megabyte, in seconds.')
+    parser.add_argument('--read-ahead', type=int, nargs='*',
+                        default=[0, 1, 2, 4])
+    args = parser.parse_args()
+    _Handler.latency = args.latency
+    _SlowStream.latency = args.read_latency
+
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d/upload' % (server.server_address[1],)
+
+    content = b'x' * (args.size * _MB)
+    try:
+        for known_size in (True, False):
+            for read_ahead in args.read_ahead:
+                rate = _upload(url, content, args.chunksize * _MB,
+                               read_ahead, known_size)
+                print('%-14s read_ahead=%d %10.1f MB/s' % (
+                    'known size' if known_size else 'unknown size',
+                    read_ahead, rate))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client hot paths, measured against local fake API servers.
+
+Starts the fake JSON and gRPC servers of :mod:`test_utils.fake_servers`
+in child processes, then runs each case (a client operation, from request
+to decoded result) repeatedly, and reports its throughput, latency
+percentiles, CPU time per operation and peak memory (Python 3.4+).  Cases
+whose package, or generated stubs, are not installed are skipped.
+
+Results are saved as JSON, to compare two commits::
+
+    $ pip install -e test_utils
+    $ python benchmarks/suite.py --output before.json
+    $ git checkout my-branch
+    $ python benchmarks/suite.py --compare before.json storage bigquery
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2.7
+    tracemalloc = None
+
+from test_utils import fake_servers
+from test_utils.system import EmulatorCreds
+
+
+try:
+    _process_time = time.process_time
+except AttributeError:  # Python 2.7
+    _process_time = time.clock
+
+_Case = collections.namedtuple('_Case', ['name', 'transport', 'setup'])
+_CASES = []
+
+_HIGHER_IS_BETTER = ('ops_per_second',)
+_METRICS = ('ops_per_second', 'p50_ms', 'p90_ms', 'p99_ms',
+            'cpu_ms_per_op', 'peak_kib')
+
+
+def _case(name, transport):
+    """Register a benchmark case.
+
+    The decorated function is called with the port of the fake server, and
+    returns the operation to measure.
+    """
+    def decorator(setup):
+        _CASES.append(_Case(name, transport, setup))
+        return setup
+    return decorator
+
+
+def _patch_base_url(connection_class, port):
+    connection_class.API_BASE_URL = 'http://127.0.0.1:%d' % (port,)
+
+
+@_case('storage.get_bucket', 'http')
+def _storage_get_bucket(port):
+    from google.cloud.storage import _http
+    from google.cloud.storage import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds())
+    return lambda: client.get_bucket('bucket')
+
+
+@_case('storage.list_blobs', 'http')
+def _storage_list_blobs(port):
+    from google.cloud.storage import _http
+    from google.cloud.storage import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds())
+    bucket = client.bucket('bucket')
+    return lambda: sum(1 for _ in bucket.list_blobs(max_results=1000))
+
+
+@_case('storage.download', 'http')
+def _storage_download(port):
+    from google.cloud.storage import _http
+    from google.cloud.storage import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds())
+    bucket = client.bucket('bucket')
+    return lambda: bucket.get_blob('object').download_as_string()
+
+
+@_case('bigquery.fetch_data', 'http')
+def _bigquery_fetch_data(port):
+    from google.cloud.bigquery import _http
+    from google.cloud.bigquery import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds())
+    table = client.dataset('dataset').table('table')
+    table.reload()
+    return lambda: sum(1 for _ in table.fetch_data(max_results=1000))
+
+
+@_case('bigquery.insert_data', 'http')
+def _bigquery_insert_data(port):
+    from google.cloud.bigquery import _http
+    from google.cloud.bigquery import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds())
+    table = client.dataset('dataset').table('table')
+    table.reload()
+    now = datetime.datetime(2017, 6, 1)
+    rows = [('name-%d' % (index,), index, index / 3.0, bool(index % 2), now)
+            for index in range(500)]
+    return lambda: table.insert_data(rows)
+
+
+@_case('logging.write_entries', 'http')
+def _logging_write_entries(port):
+    from google.cloud.logging import _http
+    from google.cloud.logging import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds(),
+                    _use_grpc=False)
+    logger = client.logger('benchmark')
+
+    def write_entries():
+        batch = logger.batch()
+        for index in range(100):
+            batch.log_struct({'message': 'Entry', 'index': index})
+        batch.commit()
+
+    return write_entries
+
+
+@_case('logging.list_entries', 'http')
+def _logging_list_entries(port):
+    from google.cloud.logging import _http
+    from google.cloud.logging import Client
+
+    _patch_base_url(_http.Connection, port)
+    client = Client(project='benchmark', credentials=EmulatorCreds(),
+                    _use_grpc=False)
+    return lambda: sum(1 for _ in client.list_entries(page_size=1000))
+
+
+@_case('bigtable.mutate_row', 'grpc')
+def _bigtable_mutate_row(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.bigtable._generated import bigtable_pb2
+    from google.cloud.bigtable._generated import data_pb2
+
+    stub = make_insecure_stub(bigtable_pb2.BigtableStub, '127.0.0.1', port)
+    request = bigtable_pb2.MutateRowRequest(
+        table_name='projects/p/instances/i/tables/t', row_key=b'row',
+        mutations=[data_pb2.Mutation(set_cell=data_pb2.Mutation.SetCell(
+            family_name='cf', column_qualifier=b'column', value=b'v' * 100))])
+    return lambda: stub.MutateRow(request)
+
+
+@_case('bigtable.read_rows', 'grpc')
+def _bigtable_read_rows(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.bigtable._generated import bigtable_pb2
+    from google.cloud.bigtable.row_data import PartialRowsData
+
+    stub = make_insecure_stub(bigtable_pb2.BigtableStub, '127.0.0.1', port)
+    request = bigtable_pb2.ReadRowsRequest(
+        table_name='projects/p/instances/i/tables/t')
+
+    def read_rows():
+        rows = PartialRowsData(stub.ReadRows(request))
+        rows.consume_all()
+        return len(rows.rows)
+
+    return read_rows
+
+
+@_case('pubsub.publish', 'grpc')
+def _pubsub_publish(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.proto.pubsub.v1 import pubsub_pb2
+
+    stub = make_insecure_stub(pubsub_pb2.PublisherStub, '127.0.0.1', port)
+    request = pubsub_pb2.PublishRequest(
+        topic='projects/p/topics/t',
+        messages=[pubsub_pb2.PubsubMessage(data=b'm' * 1024)
+                  for _ in range(100)])
+    return lambda: stub.Publish(request)
+
+
+@_case('pubsub.pull', 'grpc')
+def _pubsub_pull(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.proto.pubsub.v1 import pubsub_pb2
+
+    stub = make_insecure_stub(pubsub_pb2.SubscriberStub, '127.0.0.1', port)
+    request = pubsub_pb2.PullRequest(
+        subscription='projects/p/subscriptions/s', max_messages=1000)
+    return lambda: len(stub.Pull(request).received_messages)
+
+
+@_case('datastore.lookup', 'grpc')
+def _datastore_lookup(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.datastore import helpers
+    from google.cloud.datastore.key import Key
+    from google.cloud.proto.datastore.v1 import datastore_pb2
+
+    stub = make_insecure_stub(datastore_pb2.DatastoreStub, '127.0.0.1', port)
+    request = datastore_pb2.LookupRequest(project_id='benchmark', keys=[
+        Key('Item', index + 1, project='benchmark').to_protobuf()
+        for index in range(100)])
+
+    def lookup():
+        return [helpers.entity_from_protobuf(result.entity)
+                for result in stub.Lookup(request).found]
+
+    return lookup
+
+
+@_case('datastore.run_query', 'grpc')
+def _datastore_run_query(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.datastore import helpers
+    from google.cloud.proto.datastore.v1 import datastore_pb2
+
+    stub = make_insecure_stub(datastore_pb2.DatastoreStub, '127.0.0.1', port)
+    request = datastore_pb2.RunQueryRequest(project_id='benchmark')
+    request.query.kind.add().name = 'Item'
+
+    def run_query():
+        batch = stub.RunQuery(request).batch
+        return [helpers.entity_from_protobuf(result.entity)
+                for result in batch.entity_results]
+
+    return run_query
+
+
+@_case('spanner.execute_streaming_sql', 'grpc')
+def _spanner_execute_streaming_sql(port):
+    from google.cloud._helpers import make_insecure_stub
+    from google.cloud.proto.spanner.v1 import spanner_pb2
+    from google.cloud.spanner.streamed import StreamedResultSet
+
+    stub = make_insecure_stub(spanner_pb2.SpannerStub, '127.0.0.1', port)
+    request = spanner_pb2.ExecuteSqlRequest(
+        session='projects/p/instances/i/databases/d/sessions/s',
+        sql='SELECT id, name, score FROM items')
+
+    def execute_streaming_sql():
+        result_set = StreamedResultSet(stub.ExecuteStreamingSql(request))
+        result_set.consume_all()
+        return len(result_set.rows)
+
+    return execute_streaming_sql
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of sorted values."""
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _peak_memory(operation):
+    """Peak memory allocated by one operation, in KiB."""
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+def _measure(operation, warmup, iterations, duration):
+    """Run an operation repeatedly, and summarize its costs.
+
+    Runs ``iterations`` times, or for ``duration`` seconds if given.  Peak
+    memory is measured in a separate run, as tracing slows down the others.
+    """
+    for _ in range(warmup):
+        operation()
+
+    latencies = []
+    cpu_start = _process_time()
+    start = time.time()
+    deadline = start + duration if duration else None
+    while True:
+        before = time.time()
+        operation()
+        after = time.time()
+        latencies.append(after - before)
+        if deadline is None:
+            if len(latencies) >= iterations:
+                break
+        elif after >= deadline:
+            break
+    elapsed = time.time() - start
+    cpu = _process_time() - cpu_start
+
+    latencies.sort()
+    return {
+        'operations': len(latencies),
+        'ops_per_second': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.5) * 1000.0,
+        'p90_ms': _percentile(latencies, 0.9) * 1000.0,
+        'p99_ms': _percentile(latencies, 0.99) * 1000.0,
+        'cpu_ms_per_op': cpu * 1000.0 / len(latencies),
+        'peak_kib': _peak_memory(operation),
+    }
+
+
+def _run_cases(cases, endpoint, args):
+    results = {}
+    for case in cases:
+        try:
+            operation = case.setup(endpoint.port)
+        except ImportError as exc:
+            results[case.name] = {'skipped': str(exc)}
+            continue
+        results[case.name] = _measure(
+            operation, args.warmup, args.iterations, args.duration)
+    return results
+
+
+def _selected(names):
+    if not names:
+        return list(_CASES)
+    return [case for case in _CASES
+            if any(case.name == name or case.name.startswith(name + '.')
+                   for name in names)]
+
+
+def _commit():
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def _print_results(results, baseline):
+    print('%-32s %10s %9s %9s %9s %9s %10s' % (
+        'case', 'ops/s', 'p50 ms', 'p90 ms', 'p99 ms', 'cpu ms', 'peak KiB'))
+    for name in sorted(results):
+        result = results[name]
+        if 'skipped' in result:
+            print('%-32s skipped: %s' % (name, result['skipped']))
+            continue
+        cells = []
+        for metric in _METRICS:
+            value = result[metric]
+            cells.append('-' if value is None else '%.2f' % (value,))
+        print('%-32s %10s %9s %9s %9s %9s %10s' % ((name,) + tuple(cells)))
+
+        previous = baseline.get(name, {})
+        if not previous or 'skipped' in previous:
+            continue
+        changes = []
+        for metric in _METRICS:
+            if result[metric] and previous.get(metric):
+                ratio = result[metric] / previous[metric]
+                if metric not in _HIGHER_IS_BETTER:
+                    ratio = 1.0 / ratio
+                changes.append('x%.2f' % (ratio,))
+            else:
+                changes.append('-')
+        print('%-32s %10s %9s %9s %9s %9s %10s' % (
+            ('  vs. baseline',) + tuple(changes)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('cases', nargs='*',
+                        help='Case names, or API prefixes (e.g. storage). '
+                             'Defaults to all cases.')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--duration', type=float,
+                        help='Seconds per case, instead of --iterations.')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--page-size', type=int, default=1000,
+                        help='Items (or rows) per list (or read) response.')
+    parser.add_argument('--object-size', type=int, default=1 << 20,
+                        help='Size of downloaded objects, in bytes.')
+    parser.add_argument('--output', help='Save results as JSON to a file.')
+    parser.add_argument('--compare', help='JSON results to compare with; '
+                                          'ratios above 1 are improvements.')
+    args = parser.parse_args()
+
+    cases = _selected(args.cases)
+    results = {}
+    for transport in ('http', 'grpc'):
+        transport_cases = [case for case in cases
+                           if case.transport == transport]
+        if not transport_cases:
+            continue
+        with fake_servers.spawn(transport, page_size=args.page_size,
+                                object_size=args.object_size) as endpoint:
+            results.update(_run_cases(transport_cases, endpoint, args))
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file_obj:
+            baseline = json.load(file_obj)['results']
+    _print_results(results, baseline)
+
+    if args.output:
+        report = {
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+            'settings': {
+                'iterations': args.iterations,
+                'duration': args.duration,
+                'warmup': args.warmup,
+                'page_size': args.page_size,
+                'object_size': args.object_size,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as file_obj:
+            json.dump(report, file_obj, indent=2, sort_keys=True)
+        print('Saved results to %s' % (args.output,), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
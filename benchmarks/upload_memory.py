@@ -0,0 +1,191 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory traffic of chunked resumable uploads.
+
+Uploads a (sparse) file of ``--size`` megabytes through
+:class:`google.cloud.streaming.transfer.Upload` to an in-process stand-in
+for the resumable upload endpoint, which consumes each chunk body the way
+``httplib2`` does (sending bytes-like bodies as-is, reading file-like ones
+in small blocks), checksumming the bytes in place of sending them.  Each
+mode runs in a fresh interpreter (Linux only), and reports:
+
+* bytes copied out of the file into process memory (zero for views of a
+  memory-mapped file);
+* bytes of newly allocated chunk bodies or blocks (buffers reused by the
+  read-ahead pool are only counted once);
+* peak anonymous RSS, sampled at each request (file-backed pages of a
+  mapping are page cache, and are reclaimable);
+* peak RSS (``VmHWM``), including file-backed pages.
+
+::
+
+    $ python benchmarks/upload_memory.py --size 2048 --chunksize 8
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
+from google.cloud.streaming.transfer import Upload
+
+
+_MB = 1 << 20
+_BLOCKSIZE = 8192
+
+MODES = (
+    ('from_file', dict(use_mmap=False, read_ahead=0)),
+    ('from_file, read_ahead=2', dict(use_mmap=False, read_ahead=2)),
+    ('from_file, mmap', dict(use_mmap=True, read_ahead=0)),
+    ('from_file, mmap, read_ahead=2', dict(use_mmap=True, read_ahead=2)),
+    ('from_stream', dict(stream=True, read_ahead=0)),
+    ('from_stream, read_ahead=2', dict(stream=True, read_ahead=2)),
+)
+
+
+def _status_kb(field):
+    """Read a memory counter (in kB) of this process."""
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return 0
+
+
+class _Endpoint(object):
+    """Stand-in for ``httplib2.Http`` serving a resumable session."""
+
+    def __init__(self):
+        self.received = 0
+        self.copied = 0
+        self.allocated = 0
+        self.peak_anon_kb = 0
+        self.crc32 = 0
+        self._buffers = set()
+
+    def _consume(self, body):
+        if hasattr(body, 'read'):
+            # File-like bodies are read (and copied) in small blocks.
+            count = 0
+            while True:
+                block = body.read(_BLOCKSIZE)
+                if not block:
+                    return count
+                count += len(block)
+                self.copied += len(block)
+                self.allocated += len(block)
+                self.crc32 = zlib.crc32(block, self.crc32)
+        view = memoryview(body)
+        self.crc32 = zlib.crc32(view, self.crc32)
+        owner = getattr(view, 'obj', body)
+        if isinstance(owner, bytes):
+            self.copied += len(view)
+            self.allocated += len(view)
+        elif isinstance(owner, bytearray):
+            self.copied += len(view)
+            if id(owner) not in self._buffers:
+                self._buffers.add(id(owner))
+                self.allocated += len(owner)
+        # Otherwise a view of a memory-mapped file: nothing copied.
+        return len(view)
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        self.peak_anon_kb = max(self.peak_anon_kb, _status_kb('RssAnon'))
+        count = self._consume(body) if body is not None else 0
+        first, _, total = headers['Content-Range'][6:].partition('/')
+        if first != '*':
+            self.received = int(first.partition('-')[0]) + count
+        if total != '*' and self.received == int(total):
+            return {'status': '200'}, b'{}'
+        return {'status': '308',
+                'range': 'bytes=0-%d' % (self.received - 1,)}, b''
+
+
+def run_mode(path, size, chunksize, options):
+    """Upload ``path`` in one mode, returning the measurements."""
+    options = dict(options)
+    read_ahead = options.pop('read_ahead')
+    if options.pop('stream', False):
+        upload = Upload.from_stream(
+            open(path, 'rb'), 'application/octet-stream',
+            auto_transfer=False, chunksize=chunksize, read_ahead=read_ahead)
+    else:
+        upload = Upload.from_file(
+            path, 'application/octet-stream', auto_transfer=False,
+            chunksize=chunksize, read_ahead=read_ahead, **options)
+    upload.strategy = RESUMABLE_UPLOAD
+    endpoint = _Endpoint()
+    upload._initialize(endpoint, 'http://upload.example.com/session')
+
+    start = time.time()
+    upload.stream_file(use_chunks=True)
+    elapsed = time.time() - start
+    assert endpoint.received == size, endpoint.received
+    upload.stream.close()
+    return {
+        'seconds': elapsed,
+        'copied_mb': endpoint.copied / float(_MB),
+        'allocated_mb': endpoint.allocated / float(_MB),
+        'peak_anon_rss_mb': endpoint.peak_anon_kb / 1024.0,
+        'peak_rss_mb': _status_kb('VmHWM') / 1024.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=2048,
+                        help='Upload size, in megabytes.')
+    parser.add_argument('--chunksize', type=int, default=8,
+                        help='Chunk size, in megabytes.')
+    parser.add_argument('--mode', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        result = run_mode(args.path, args.size * _MB,
+                          args.chunksize * _MB, MODES[args.mode][1])
+        print(json.dumps(result))
+        return
+
+    handle, path = tempfile.mkstemp()
+    try:
+        os.ftruncate(handle, args.size * _MB)
+        os.close(handle)
+        print('%-30s %8s %10s %10s %10s %10s' % (
+            'mode', 'seconds', 'copied MB', 'alloc MB', 'anon MB',
+            'RSS MB'))
+        for index, (name, _) in enumerate(MODES):
+            output = subprocess.check_output([
+                sys.executable, __file__, '--mode', str(index),
+                '--path', path, '--size', str(args.size),
+                '--chunksize', str(args.chunksize)])
+            result = json.loads(output.decode('utf-8'))
+            print('%-30s %8.2f %10.0f %10.0f %10.0f %10.0f' % (
+                name, result['seconds'], result['copied_mb'],
+                result['allocated_mb'], result['peak_anon_rss_mb'],
+                result['peak_rss_mb']))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
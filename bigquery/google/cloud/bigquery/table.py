@@ -26,11 +26,6 @@ from google.cloud._helpers import _millis_from_datetime
 from google.cloud.exceptions import NotFound
 from google.cloud.exceptions import make_exception
 from google.cloud.iterator import HTTPIterator
-from google.cloud.streaming.exceptions import HttpError
-from google.cloud.streaming.http_wrapper import Request
-from google.cloud.streaming.http_wrapper import make_api_request
-from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
-from google.cloud.streaming.transfer import Upload
 from google.cloud.bigquery.schema import SchemaField
 from google.cloud.bigquery._helpers import _item_to_row
 from google.cloud.bigquery._helpers import _rows_page_start
@@ -534,7 +529,7 @@ class Table(object):
         client = self._require_client(client)
 
         api_response = client._connection.api_request(
-            method='GET', path=self.path)
+            method='GET', path=self.path, _cacheable=True)
         self._set_properties(api_response)
 
     def patch(self,
@@ -682,7 +677,8 @@ class Table(object):
         iterator = HTTPIterator(client=client, path=path,
                                 item_to_value=_item_to_row, items_key='rows',
                                 page_token=page_token, max_results=max_results,
-                                page_start=_rows_page_start)
+                                page_start=_rows_page_start,
+                                release_items=True)
         iterator.schema = self._schema
         # Over-ride the key used to retrieve the next page token.
         iterator._NEXT_TOKEN = 'pageToken'
@@ -804,7 +800,8 @@ class Table(object):
                          quote_character=None,
                          skip_leading_rows=None,
                          write_disposition=None,
-                         client=None):
+                         client=None,
+                         read_ahead=0):
         """Upload the contents of this table from a file-like object.
 
         The content type of the upload will either be
@@ -830,7 +827,8 @@ class Table(object):
                      filesystem this won't be possible.)
 
         :type num_retries: int
-        :param num_retries: Number of upload retries. Defaults to 6.
+        :param num_retries: Number of upload retries. Defaults to 6. Ignored
+                            if the client has a ``retry`` policy.
 
         :type allow_jagged_rows: bool
         :param allow_jagged_rows: job configuration option;  see
@@ -877,6 +875,12 @@ class Table(object):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the current dataset.
 
+        :type read_ahead: int
+        :param read_ahead: Optional. For resumable uploads, how many chunks
+                           to read from ``file_obj`` ahead of the one being
+                           sent.  Reading then overlaps with sending, at the
+                           cost of buffering that many chunks in memory.
+
         :rtype: :class:`google.cloud.bigquery.jobs.LoadTableFromStorageJob`
         :returns: the job instance used to load the data (e.g., for
                   querying status). Note that the job is already started:
@@ -885,6 +889,13 @@ class Table(object):
                  be determined, or if the ``file_obj`` can be detected to be
                  a file opened in text mode.
         """
+        # The upload machinery is only needed here: load it on first use.
+        from google.cloud.streaming.exceptions import HttpError
+        from google.cloud.streaming.http_wrapper import Request
+        from google.cloud.streaming.http_wrapper import make_api_request
+        from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
+        from google.cloud.streaming.transfer import Upload
+
         client = self._require_client(client)
         connection = client._connection
         content_type = 'application/octet-stream'
@@ -942,7 +953,8 @@ class Table(object):
                                 write_disposition)
 
         upload = Upload(file_obj, content_type, total_bytes,
-                        auto_transfer=False)
+                        auto_transfer=False, retry=client.retry,
+                        read_ahead=read_ahead)
 
         url_builder = _UrlBuilder()
         upload_config = _UploadConfig()
@@ -973,7 +985,8 @@ class Table(object):
             http_response = upload.stream_file(use_chunks=True)
         else:
             http_response = make_api_request(connection.http, request,
-                                             retries=num_retries)
+                                             retries=num_retries,
+                                             retry=client.retry)
 
         self._check_response_error(request, http_response)
 
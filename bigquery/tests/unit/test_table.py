@@ -791,6 +791,7 @@ class TestTable(unittest.TestCase, _SchemaBase):
         req = conn._requested[0]
         self.assertEqual(req['method'], 'GET')
         self.assertEqual(req['path'], '/%s' % PATH)
+        self.assertTrue(req['_cacheable'])
         self._verifyResourceProperties(table, RESOURCE)
 
     def test_reload_w_alternate_client(self):
@@ -1124,6 +1125,8 @@ class TestTable(unittest.TestCase, _SchemaBase):
         self.assertEqual(rows[3], ('Bhettye Rhubble', None, None))
         self.assertEqual(total_rows, ROWS)
         self.assertEqual(page_token, TOKEN)
+        # Raw rows are released as soon as they are converted.
+        self.assertEqual(DATA['rows'], [None] * 4)
 
         self.assertEqual(len(conn._requested), 1)
         req = conn._requested[0]
@@ -1822,6 +1825,41 @@ class TestTable(unittest.TestCase, _SchemaBase):
         self.assertEqual(req['body'], BODY)
     # pylint: enable=too-many-statements
 
+    def test_upload_from_file_resumable_w_read_ahead(self):
+        import mock
+        from six.moves.http_client import OK
+
+        UPLOAD_PATH = 'https://example.com/upload/test'
+        initial_response = {'status': OK, 'location': UPLOAD_PATH}
+        upload_response = {'status': OK}
+        conn = _Connection(
+            (initial_response, b'{}'),
+            (upload_response, b'{}'),
+        )
+        client = _Client(project=self.PROJECT, connection=conn)
+
+        class _UploadConfig(object):
+            accept = ['*/*']
+            max_size = None
+            resumable_multipart = True
+            resumable_path = u'/upload/bigquery/v2/projects/{project}/jobs'
+            simple_multipart = True
+            simple_path = u''  # force resumable
+
+        with mock.patch('google.cloud.bigquery.table._UploadConfig',
+                        new=_UploadConfig):
+            _, _, BODY = self._upload_from_file_helper(
+                client=client, read_ahead=2)
+
+        requested = conn.http._requested
+        self.assertEqual(len(requested), 2)
+        req = requested[1]
+        length = len(BODY)
+        self.assertEqual(req['method'], 'PUT')
+        self.assertEqual(req['headers']['Content-Range'],
+                         'bytes 0-%d/%d' % (length - 1, length))
+        self.assertEqual(req['body'], BODY)
+
 
 class Test_parse_schema_resource(unittest.TestCase, _SchemaBase):
 
@@ -1939,6 +1977,7 @@ class Test_build_schema_resource(unittest.TestCase, _SchemaBase):
 class _Client(object):
 
     _query_results = ()
+    retry = None
 
     def __init__(self, project='project', connection=None):
         self.project = project
@@ -236,14 +236,29 @@ class Client(_ClientFactoryMixin, _ClientProjectMixin):
         self._credentials = credentials
         self.user_agent = user_agent
         self.emulator_host = os.getenv(BIGTABLE_EMULATOR)
+        self._make_stubs()
 
-        # Create gRPC stubs for making requests.
+    def _make_stubs(self):
+        """Create gRPC stubs for making requests."""
         self._data_stub = _make_data_stub(self)
         if self._admin:
             self._instance_stub_internal = _make_instance_stub(self)
             self._operations_stub_internal = _make_operations_stub(self)
             self._table_stub_internal = _make_table_stub(self)
 
+    def __getstate__(self):
+        # gRPC stubs (and their channels) cannot be pickled: the unpickled
+        # client creates its own.
+        state = self.__dict__.copy()
+        for name in ('_data_stub', '_instance_stub_internal',
+                     '_operations_stub_internal', '_table_stub_internal'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._make_stubs()
+
     def copy(self):
         """Make a copy of this client.
 
@@ -15,6 +15,7 @@
 
 import unittest
 
+import google.auth.credentials
 import mock
 
 
@@ -431,6 +432,34 @@ class TestClient(unittest.TestCase):
     def test_copy_read_only(self):
         self._copy_test_helper(read_only=True)
 
+    def test_pickle(self):
+        import pickle
+        from google.cloud._testing import _Monkey
+        from google.cloud.bigtable import client as MUT
+
+        credentials = _Credentials()
+        client = self._make_oneWithMocks(
+            project=self.PROJECT, credentials=credentials, admin=True)
+
+        mock_make_data_stub = _MakeStubMock()
+        mock_make_instance_stub = _MakeStubMock()
+        mock_make_operations_stub = _MakeStubMock()
+        mock_make_table_stub = _MakeStubMock()
+        with _Monkey(MUT, _make_data_stub=mock_make_data_stub,
+                     _make_instance_stub=mock_make_instance_stub,
+                     _make_operations_stub=mock_make_operations_stub,
+                     _make_table_stub=mock_make_table_stub):
+            new_client = pickle.loads(pickle.dumps(client))
+
+        self.assertEqual(new_client.project, self.PROJECT)
+        self.assertTrue(new_client._admin)
+        self.assertEqual(new_client.user_agent, client.user_agent)
+        self.assertIsInstance(new_client.credentials, _Credentials)
+        self.assertEqual(mock_make_data_stub.calls, [new_client])
+        self.assertEqual(mock_make_instance_stub.calls, [new_client])
+        self.assertEqual(mock_make_operations_stub.calls, [new_client])
+        self.assertEqual(mock_make_table_stub.calls, [new_client])
+
     def test_credentials_getter(self):
         credentials = _make_credentials()
         project = 'PROJECT'
@@ -621,3 +650,9 @@ class _MakeStubMock(object):
     def __call__(self, client):
         self.calls.append(client)
         return self.result
+
+
+class _Credentials(google.auth.credentials.Credentials):
+
+    def refresh(self, request):
+        raise NotImplementedError
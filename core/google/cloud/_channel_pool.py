@@ -0,0 +1,312 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide cache of shared gRPC channels.
+
+Each gRPC channel owns its own TLS connection(s), so building a channel
+per client makes short-lived clients expensive.  :func:`get_channel`
+instead returns a :class:`SharedChannel` cached by key, for as long as
+anything (a client, a stub, or a multi-callable created from it) still
+references it.  Once the last reference is dropped, the underlying
+channels are closed.
+
+A :class:`SharedChannel` may also wrap a pool of several channels to the
+same target: each call is then sent on the next channel, round-robin,
+spreading concurrent streams over several connections.
+
+gRPC channels cannot be used across ``fork()``: in a child process, the
+cache starts empty.  Channels (and stubs) created by the parent before
+forking must not be used by the child.
+
+This module is not part of the public API surface.
+"""
+
+# Avoid the grpc and google.cloud.grpc collision.
+from __future__ import absolute_import
+
+import itertools
+import os
+import threading
+import weakref
+
+import grpc
+import six
+
+
+POOL_INDEX_OPTION = 'google.cloud.channel_pool_index'
+"""Channel argument distinguishing the channels of a pool.
+
+gRPC shares connections between channels created with identical
+arguments; an otherwise unused argument with a distinct value gives each
+channel of a pool its own connection.
+"""
+
+_CHANNELS = weakref.WeakValueDictionary()
+_CHANNELS_LOCK = threading.Lock()
+_CHANNELS_PID = os.getpid()
+
+
+def _check_fork():
+    """Forget the channels cached by a parent process.
+
+    The lock is replaced too: another thread of the parent may have held
+    it when the process forked.
+    """
+    global _CHANNELS, _CHANNELS_LOCK, _CHANNELS_PID
+    pid = os.getpid()
+    if pid != _CHANNELS_PID:
+        _CHANNELS = weakref.WeakValueDictionary()
+        _CHANNELS_LOCK = threading.Lock()
+        _CHANNELS_PID = pid
+
+
+class _SharedMultiCallable(object):
+    """Round-robin multi-callable over the channels of a pool.
+
+    :type owner: :class:`SharedChannel`
+    :param owner: The channel which created this object. Referencing it
+                  keeps the underlying channels open while this object is
+                  in use.
+
+    :type callables: list
+    :param callables: One multi-callable per channel of the pool.
+    """
+
+    def __init__(self, owner, callables):
+        self._owner = owner
+        self._callables = itertools.cycle(callables)
+
+    def _next(self):
+        """Pick the multi-callable to use for the next call.
+
+        :rtype: object
+        :returns: A multi-callable bound to one channel of the pool.
+        """
+        return six.next(self._callables)
+
+    def __call__(self, *args, **kwargs):
+        return self._next()(*args, **kwargs)
+
+    def with_call(self, *args, **kwargs):
+        """Make a call, returning both the response and the call object.
+
+        :rtype: tuple
+        :returns: The value returned by the underlying ``with_call``.
+        """
+        return self._next().with_call(*args, **kwargs)
+
+    def future(self, *args, **kwargs):
+        """Make an asynchronous call.
+
+        :rtype: :class:`grpc.Future`
+        :returns: The value returned by the underlying ``future``.
+        """
+        return self._next().future(*args, **kwargs)
+
+
+class _SharedUnaryUnary(_SharedMultiCallable, grpc.UnaryUnaryMultiCallable):
+    """Shared unary-unary multi-callable."""
+
+
+class _SharedUnaryStream(_SharedMultiCallable, grpc.UnaryStreamMultiCallable):
+    """Shared unary-stream multi-callable."""
+
+
+class _SharedStreamUnary(_SharedMultiCallable, grpc.StreamUnaryMultiCallable):
+    """Shared stream-unary multi-callable."""
+
+
+class _SharedStreamStream(_SharedMultiCallable,
+                          grpc.StreamStreamMultiCallable):
+    """Shared stream-stream multi-callable."""
+
+
+class SharedChannel(grpc.Channel):
+    """gRPC channel shared between clients, closed once unreferenced.
+
+    :type channels: list
+    :param channels: The :class:`grpc.Channel` objects (at least one) to
+                     send calls on, round-robin.
+    """
+
+    def __init__(self, channels):
+        self._channels = tuple(channels)
+        self._closed = False
+
+    @property
+    def channels(self):
+        """The underlying channels.
+
+        :rtype: tuple
+        :returns: The :class:`grpc.Channel` objects of the pool.
+        """
+        return self._channels
+
+    def _multi_callable(self, shared_class, factory_name, method,
+                        request_serializer, response_deserializer, kwargs):
+        """Create a multi-callable on each channel of the pool.
+
+        :type shared_class: type
+        :param shared_class: The :class:`_SharedMultiCallable` subclass to
+                             return.
+
+        :type factory_name: str
+        :param factory_name: The name of the :class:`grpc.Channel` method
+                             creating the multi-callables.
+
+        :type method: str
+        :param method: The name of the RPC method.
+
+        :type request_serializer: callable
+        :param request_serializer: Serializer for request messages.
+
+        :type response_deserializer: callable
+        :param response_deserializer: Deserializer for response messages.
+
+        :type kwargs: dict
+        :param kwargs: Extra keyword arguments for the factory.
+
+        :rtype: :class:`_SharedMultiCallable`
+        :returns: A round-robin multi-callable.
+        """
+        callables = [
+            getattr(channel, factory_name)(
+                method, request_serializer=request_serializer,
+                response_deserializer=response_deserializer, **kwargs)
+            for channel in self._channels
+        ]
+        return shared_class(self, callables)
+
+    def unary_unary(self, method, request_serializer=None,
+                    response_deserializer=None, **kwargs):
+        """Create a unary-unary multi-callable.
+
+        :rtype: :class:`grpc.UnaryUnaryMultiCallable`
+        :returns: A multi-callable sending calls round-robin.
+        """
+        return self._multi_callable(
+            _SharedUnaryUnary, 'unary_unary', method,
+            request_serializer, response_deserializer, kwargs)
+
+    def unary_stream(self, method, request_serializer=None,
+                     response_deserializer=None, **kwargs):
+        """Create a unary-stream multi-callable.
+
+        :rtype: :class:`grpc.UnaryStreamMultiCallable`
+        :returns: A multi-callable sending calls round-robin.
+        """
+        return self._multi_callable(
+            _SharedUnaryStream, 'unary_stream', method,
+            request_serializer, response_deserializer, kwargs)
+
+    def stream_unary(self, method, request_serializer=None,
+                     response_deserializer=None, **kwargs):
+        """Create a stream-unary multi-callable.
+
+        :rtype: :class:`grpc.StreamUnaryMultiCallable`
+        :returns: A multi-callable sending calls round-robin.
+        """
+        return self._multi_callable(
+            _SharedStreamUnary, 'stream_unary', method,
+            request_serializer, response_deserializer, kwargs)
+
+    def stream_stream(self, method, request_serializer=None,
+                      response_deserializer=None, **kwargs):
+        """Create a stream-stream multi-callable.
+
+        :rtype: :class:`grpc.StreamStreamMultiCallable`
+        :returns: A multi-callable sending calls round-robin.
+        """
+        return self._multi_callable(
+            _SharedStreamStream, 'stream_stream', method,
+            request_serializer, response_deserializer, kwargs)
+
+    def subscribe(self, callback, try_to_connect=False):
+        """Subscribe to the connectivity of the first channel of the pool.
+
+        :type callback: callable
+        :param callback: Called with a :class:`grpc.ChannelConnectivity`.
+
+        :type try_to_connect: bool
+        :param try_to_connect: Flag indicating if the channel should try to
+                               connect immediately.
+        """
+        self._channels[0].subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback):
+        """Unsubscribe a callback added by :meth:`subscribe`.
+
+        :type callback: callable
+        :param callback: The subscribed callback.
+        """
+        self._channels[0].unsubscribe(callback)
+
+    def close(self):
+        """Close the underlying channels.
+
+        Outstanding calls are cancelled. Closing twice has no effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for channel in self._channels:
+            close = getattr(channel, 'close', None)
+            if close is not None:  # Not provided by older ``grpcio``.
+                close()
+
+    def __del__(self):
+        self.close()
+
+
+def get_channel(key, create_channel, pool_size=1):
+    """Get the shared channel cached for ``key``, creating it if needed.
+
+    :type key: tuple
+    :param key: Hashable key identifying the channel's target, credentials
+                and options.
+
+    :type create_channel: callable
+    :param create_channel: Called with the index of each channel of the
+                           pool (from ``0`` to ``pool_size - 1``) to create
+                           it, on a cache miss.
+
+    :type pool_size: int
+    :param pool_size: (Optional) The number of channels in the pool.
+
+    :rtype: :class:`SharedChannel`
+    :returns: The cached (or newly created) channel.
+    :raises: :class:`ValueError` if ``pool_size`` is not positive.
+    """
+    if pool_size < 1:
+        raise ValueError('pool_size must be a positive integer', pool_size)
+    key = key + (pool_size,)
+    _check_fork()
+    with _CHANNELS_LOCK:
+        channel = _CHANNELS.get(key)
+        if channel is None:
+            channel = SharedChannel(
+                [create_channel(index) for index in range(pool_size)])
+            _CHANNELS[key] = channel
+    return channel
+
+
+def clear():
+    """Forget all cached channels.
+
+    Channels already handed out remain open, and are closed once
+    unreferenced.
+    """
+    _check_fork()
+    with _CHANNELS_LOCK:
+        _CHANNELS.clear()
@@ -22,25 +22,19 @@ from __future__ import absolute_import
 
 import calendar
 import datetime
+import functools
 import os
 import re
 from threading import local as Local
 
 import google.auth
-from google.protobuf import duration_pb2
-from google.protobuf import timestamp_pb2
 import google_auth_httplib2
-
-try:
-    import grpc
-    import google.auth.transport.grpc
-except ImportError:  # pragma: NO COVER
-    grpc = None
-
-import httplib2
 import six
 from six.moves import http_client
 
+from google.cloud._http_pool import PooledHttp
+from google.cloud.instrumentation import instrument_stub
+
 
 _NOW = datetime.datetime.utcnow  # To be replaced by tests.
 _RFC3339_MICROS = '%Y-%m-%dT%H:%M:%S.%fZ'
@@ -56,6 +50,17 @@ _RFC3339_NANOS = re.compile(r"""
     )?
     Z                                        # Zulu
 """, re.VERBOSE)
+# Fast paths for the fixed layouts emitted by Google APIs.  Only ASCII
+# digits are accepted:  anything else falls back to the slower, more
+# lenient parsers above, so results are identical either way.
+_RFC3339_MICROS_FAST = re.compile(
+    r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})'
+    r'\.([0-9]{1,6})Z\Z')
+_RFC3339_NANOS_FAST = re.compile(
+    r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})'
+    r'(?:\.([0-9]{1,9}))?Z')
+_TIMESTAMP_CACHE_SIZE = 1024
+_NUMPY_NAT = -2 ** 63  # The int64 value of NumPy's "not a time".
 # NOTE: Catching this ImportError is a workaround for GAE not supporting the
 #       "pwd" module which is imported lazily when "expanduser" is called.
 try:
@@ -165,6 +170,28 @@ def _ensure_tuple_or_list(arg_name, tuple_or_list):
     return list(tuple_or_list)
 
 
+def _module_available(name):
+    """Check if a module can be imported, without importing it.
+
+    Lets packages choose a transport at import time while deferring the
+    (slow) import of gRPC and generated modules until they are used.
+
+    :type name: str
+    :param name: The absolute name of the module.
+
+    :rtype: bool
+    :returns: Flag indicating if the module was found.
+    """
+    try:
+        from importlib.util import find_spec
+    except ImportError:  # pragma: NO COVER  Python 2
+        from pkgutil import find_loader as find_spec
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        return False
+
+
 def _determine_default_project(project=None):
     """Determine default project ID explicitly or implicitly as fall-back.
 
@@ -263,6 +290,47 @@ def _time_from_iso8601_time_naive(value):
     return datetime.datetime.strptime(value, '%H:%M:%S').time()
 
 
+def _cache_timestamps(function):
+    """Cache the results of a timestamp parser, for repeated values.
+
+    Uses a small LRU cache, where :func:`functools.lru_cache` is available
+    (Python 3). The parsed :class:`datetime.datetime` objects are immutable,
+    so sharing them between callers is safe.
+
+    :type function: callable
+    :param function: A function taking a single string argument.
+
+    :rtype: callable
+    :returns: The (possibly) caching function.
+    """
+    lru_cache = getattr(functools, 'lru_cache', None)
+    if lru_cache is None:  # pragma: NO COVER
+        return function
+    return lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)(function)
+
+
+def _datetime_from_match(match):
+    """Build a datetime from a match of a fast-path timestamp pattern.
+
+    :type match: :class:`re.MatchObject`
+    :param match: A match of :data:`_RFC3339_MICROS_FAST` or
+                  :data:`_RFC3339_NANOS_FAST`.
+
+    :rtype: :class:`datetime.datetime`
+    :returns: The timestamp, truncated to microseconds, in UTC.
+    :raises ValueError: If a field is out of range.
+    """
+    year, month, day, hour, minute, second, fraction = match.groups()
+    if fraction:
+        micros = int(fraction[:6].ljust(6, '0'))
+    else:
+        micros = 0
+    return datetime.datetime(
+        int(year), int(month), int(day), int(hour), int(minute),
+        int(second), micros, UTC)
+
+
+@_cache_timestamps
 def _rfc3339_to_datetime(dt_str):
     """Convert a microsecond-precision timestamp to a native datetime.
 
@@ -272,10 +340,14 @@ def _rfc3339_to_datetime(dt_str):
     :rtype: :class:`datetime.datetime`
     :returns: The datetime object created from the string.
     """
+    match = _RFC3339_MICROS_FAST.match(dt_str)
+    if match is not None:
+        return _datetime_from_match(match)
     return datetime.datetime.strptime(
         dt_str, _RFC3339_MICROS).replace(tzinfo=UTC)
 
 
+@_cache_timestamps
 def _rfc3339_nanos_to_datetime(dt_str):
     """Convert a nanosecond-precision timestamp to a native datetime.
 
@@ -292,6 +364,9 @@ def _rfc3339_nanos_to_datetime(dt_str):
     :raises ValueError: If the timestamp does not match the RFC 3339
                         regular expression.
     """
+    match = _RFC3339_NANOS_FAST.match(dt_str)
+    if match is not None:
+        return _datetime_from_match(match)
     with_nanos = _RFC3339_NANOS.match(dt_str)
     if with_nanos is None:
         raise ValueError(
@@ -309,6 +384,52 @@ def _rfc3339_nanos_to_datetime(dt_str):
     return bare_seconds.replace(microsecond=micros, tzinfo=UTC)
 
 
+def _rfc3339_bulk_to_datetime(values, nanos=False, as_numpy=False):
+    """Convert many timestamps at once.
+
+    :type values: iterable
+    :param values: The strings to convert. :data:`None` values are
+                   passed through (as ``NaT`` if ``as_numpy`` is set).
+
+    :type nanos: bool
+    :param nanos: (Optional) If set, parse the values as
+                  :func:`_rfc3339_nanos_to_datetime` does; otherwise as
+                  :func:`_rfc3339_to_datetime` does.
+
+    :type as_numpy: bool
+    :param as_numpy: (Optional) If set, return a NumPy array of naive
+                     (UTC) ``datetime64[us]`` values. Requires ``numpy``.
+
+    :rtype: list or :class:`numpy.ndarray`
+    :returns: The datetime objects created from the strings.
+    :raises ValueError: If a value cannot be parsed.
+    :raises ImportError: If ``as_numpy`` is set but ``numpy`` is not
+                         installed.
+    """
+    if nanos:
+        parse = _rfc3339_nanos_to_datetime
+    else:
+        parse = _rfc3339_to_datetime
+    # Values in bulk are mostly distinct: bypass the LRU cache.
+    parse = getattr(parse, '__wrapped__', parse)
+    result = [None if value is None else parse(value) for value in values]
+    if not as_numpy:
+        return result
+
+    import numpy
+
+    micros = []
+    for value in result:
+        if value is None:
+            micros.append(_NUMPY_NAT)
+        else:
+            delta = value - _EPOCH
+            micros.append(
+                (delta.days * 86400 + delta.seconds) * 1000000 +
+                delta.microseconds)
+    return numpy.array(micros, dtype='int64').view('datetime64[us]')
+
+
 def _datetime_to_rfc3339(value, ignore_zone=True):
     """Convert a timestamp to a string.
 
@@ -422,6 +543,8 @@ def _datetime_to_pb_timestamp(when):
     ms_value = _microseconds_from_datetime(when)
     seconds, micros = divmod(ms_value, 10**6)
     nanos = micros * 10**3
+    from google.protobuf import timestamp_pb2
+
     return timestamp_pb2.Timestamp(seconds=seconds, nanos=nanos)
 
 
@@ -439,6 +562,8 @@ def _timedelta_to_duration_pb(timedelta_val):
     :rtype: :class:`google.protobuf.duration_pb2.Duration`
     :returns: A duration object equivalent to the time delta.
     """
+    from google.protobuf import duration_pb2
+
     duration_pb = duration_pb2.Duration()
     duration_pb.FromTimedelta(timedelta_val)
     return duration_pb
@@ -505,11 +630,36 @@ def _name_from_project_path(path, project, template):
     return match.group('name')
 
 
-def make_secure_channel(credentials, user_agent, host, extra_options=()):
+_REFRESH_REQUEST = None
+
+
+def _get_refresh_request():
+    """Get the request used by gRPC channels to refresh access tokens.
+
+    A single (thread-safe, pooled) transport is shared by all channels,
+    rather than each channel opening its own connection to the token
+    endpoint.
+
+    :rtype: :class:`google_auth_httplib2.Request`
+    :returns: The shared token refresh request.
+    """
+    global _REFRESH_REQUEST
+    if _REFRESH_REQUEST is None:
+        _REFRESH_REQUEST = google_auth_httplib2.Request(http=PooledHttp())
+    return _REFRESH_REQUEST
+
+
+def make_secure_channel(credentials, user_agent, host, extra_options=(),
+                        pool_size=1):
     """Makes a secure channel for an RPC service.
 
     Uses / depends on gRPC.
 
+    Channels are cached process-wide: calls with the same ``credentials``
+    (the same object), ``user_agent``, ``host``, ``extra_options`` and
+    ``pool_size`` share a single channel, for as long as it is referenced.
+    The underlying connections are closed once it no longer is.
+
     :type credentials: :class:`google.auth.credentials.Credentials`
     :param credentials: The OAuth2 Credentials to use for creating
                         access tokens.
@@ -524,23 +674,48 @@ def make_secure_channel(credentials, user_agent, host, extra_options=()):
     :param extra_options: (Optional) Extra gRPC options used when creating the
                           channel.
 
-    :rtype: :class:`grpc._channel.Channel`
+    :type pool_size: int
+    :param pool_size: (Optional) The number of channels (each with its own
+                      connection) to send calls on, round-robin. Use more
+                      than one to exceed the limit on concurrent streams
+                      per connection.
+
+    :rtype: :class:`~google.cloud._channel_pool.SharedChannel`
     :returns: gRPC secure channel with credentials attached.
     """
+    import google.auth.transport.grpc
+    from google.cloud import _channel_pool
+
     target = '%s:%d' % (host, http_client.HTTPS_PORT)
-    http_request = google_auth_httplib2.Request(http=httplib2.Http())
 
     user_agent_option = ('grpc.primary_user_agent', user_agent)
-    options = (user_agent_option,) + extra_options
-    return google.auth.transport.grpc.secure_authorized_channel(
-        credentials,
-        http_request,
-        target,
-        options=options)
+    options = (user_agent_option,) + tuple(extra_options)
+
+    def create_channel(index):
+        """Create one channel of the pool.
+
+        :type index: int
+        :param index: The position of the channel in the pool.
+
+        :rtype: :class:`grpc.Channel`
+        :returns: A new secure channel.
+        """
+        channel_options = options
+        if pool_size > 1:
+            channel_options += ((_channel_pool.POOL_INDEX_OPTION, index),)
+        return google.auth.transport.grpc.secure_authorized_channel(
+            credentials,
+            _get_refresh_request(),
+            target,
+            options=channel_options)
+
+    return _channel_pool.get_channel(
+        (credentials, target, options), create_channel, pool_size=pool_size)
 
 
 def make_secure_stub(credentials, user_agent, stub_class, host,
-                     extra_options=()):
+                     extra_options=(), retry=None, pool_size=1,
+                     rate_limiter=None):
     """Makes a secure stub for an RPC service.
 
     Uses / depends on gRPC.
@@ -562,15 +737,30 @@ def make_secure_stub(credentials, user_agent, stub_class, host,
     :param extra_options: (Optional) Extra gRPC options passed when creating
                           the channel.
 
+    :type retry: :class:`~google.cloud.retry.Retry`
+    :param retry: (Optional) Policy for retrying failed unary calls.
+
+    :type pool_size: int
+    :param pool_size: (Optional) The number of channels to send calls on,
+                      round-robin. See :func:`make_secure_channel`.
+
+    :type rate_limiter: :class:`~google.cloud.rate_limit.RateLimiter`
+    :param rate_limiter: (Optional) Limiter of the rate and concurrency of
+                         unary calls.
+
     :rtype: object, instance of ``stub_class``
-    :returns: The stub object used to make gRPC requests to a given API.
+    :returns: The stub object used to make gRPC requests to a given API,
+              with its calls reported to instrumentation listeners.
     """
     channel = make_secure_channel(credentials, user_agent, host,
-                                  extra_options=extra_options)
-    return stub_class(channel)
+                                  extra_options=extra_options,
+                                  pool_size=pool_size)
+    return instrument_stub(stub_class(channel), retry=retry,
+                           rate_limiter=rate_limiter)
 
 
-def make_insecure_stub(stub_class, host, port=None):
+def make_insecure_stub(stub_class, host, port=None, retry=None,
+                       rate_limiter=None):
     """Makes an insecure stub for an RPC service.
 
     Uses / depends on gRPC.
@@ -585,16 +775,27 @@ def make_insecure_stub(stub_class, host, port=None):
     :type port: int
     :param port: (Optional) The port for the service.
 
+    :type retry: :class:`~google.cloud.retry.Retry`
+    :param retry: (Optional) Policy for retrying failed unary calls.
+
+    :type rate_limiter: :class:`~google.cloud.rate_limit.RateLimiter`
+    :param rate_limiter: (Optional) Limiter of the rate and concurrency of
+                         unary calls.
+
     :rtype: object, instance of ``stub_class``
-    :returns: The stub object used to make gRPC requests to a given API.
+    :returns: The stub object used to make gRPC requests to a given API,
+              with its calls reported to instrumentation listeners.
     """
     if port is None:
         target = host
     else:
         # NOTE: This assumes port != http_client.HTTPS_PORT:
         target = '%s:%d' % (host, port)
+    import grpc
+
     channel = grpc.insecure_channel(target)
-    return stub_class(channel)
+    return instrument_stub(stub_class(channel), retry=retry,
+                           rate_limiter=rate_limiter)
 
 
 try:
@@ -14,14 +14,19 @@
 
 """Shared implementation of connections to API servers."""
 
-import json
 import platform
+import zlib
 from pkg_resources import get_distribution
 
 import six
+from six.moves import http_client
 from six.moves.urllib.parse import urlencode
 
+from google.cloud import instrumentation
+from google.cloud._lazy_json import LazyJSONObject
+from google.cloud._single_flight import SingleFlight
 from google.cloud.exceptions import make_exception
+from google.cloud.json_codec import STDLIB_CODEC
 
 
 API_BASE_URL = 'https://www.googleapis.com'
@@ -35,6 +40,45 @@ CLIENT_INFO_HEADER = 'X-Goog-API-Client'
 CLIENT_INFO_TEMPLATE = (
     'gl-python/' + platform.python_version() + ' gccl/{}')
 
+_IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE'])
+"""Methods of the requests which the ``retry`` policy of the client retries.
+
+Other requests (e.g. ``POST`` inserts, or ``PATCH`` updates) might have
+been applied by the server when they fail: they are only retried if a
+``retry`` is passed explicitly.
+"""
+
+_GZIP_COMPRESSOR = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+"""Pristine gzip compressor, copied (settings and all) for each body.
+
+The fastest level: repetitive JSON compresses about as well as with the
+default level, in half the time.
+"""
+
+
+def _gzip_body(data, threshold):
+    """Gzip a request body, if large enough to be worth it.
+
+    :type data: bytes or str
+    :param data: The body of the request.
+
+    :type threshold: int
+    :param threshold: The minimum size of the body (in bytes) to compress.
+
+    :rtype: bytes
+    :returns: The compressed body, or :data:`None` if the body is smaller
+              than ``threshold``, or does not shrink when compressed.
+    """
+    if isinstance(data, six.text_type):
+        data = data.encode('utf-8')
+    if len(data) < threshold:
+        return None
+    compressor = _GZIP_COMPRESSOR.copy()
+    compressed = compressor.compress(data) + compressor.flush()
+    if len(compressed) >= len(data):
+        return None
+    return compressed
+
 
 class Connection(object):
     """A generic connection to Google Cloud Platform.
@@ -52,6 +96,46 @@ class Connection(object):
 
     def __init__(self, client):
         self._client = client
+        self._in_flight = SingleFlight()
+
+    def __getstate__(self):
+        """Get the state of the connection to pickle.
+
+        :rtype: dict
+        :returns: The state, without the requests in flight.
+        """
+        state = self.__dict__.copy()
+        del state['_in_flight']
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of an unpickled connection.
+
+        :type state: dict
+        :param state: The state returned by :meth:`__getstate__`.
+        """
+        self.__dict__.update(state)
+        self._in_flight = SingleFlight()
+
+    @property
+    def _compression_threshold(self):
+        """Minimum size of the request bodies to be gzip-compressed.
+
+        :rtype: int
+        :returns: The ``compression_threshold`` attribute of the client,
+                  or :data:`None` if bodies are not to be compressed.
+        """
+        return getattr(self._client, 'compression_threshold', None)
+
+    @property
+    def _json_codec(self):
+        """Codec for JSON request bodies and responses.
+
+        :rtype: :class:`~google.cloud.json_codec.JSONCodec`
+        :returns: The ``json_codec`` attribute of the client, if set, or
+                  :data:`~google.cloud.json_codec.STDLIB_CODEC`.
+        """
+        return getattr(self._client, 'json_codec', None) or STDLIB_CODEC
 
     @property
     def credentials(self):
@@ -177,10 +261,14 @@ class JSONConnection(Connection):
         headers.update(self._EXTRA_HEADERS)
         headers['Accept-Encoding'] = 'gzip'
 
-        if data:
-            content_length = len(str(data))
-        else:
+        if not data:
             content_length = 0
+        elif isinstance(data, six.binary_type):
+            content_length = len(data)
+        elif isinstance(data, six.text_type):
+            content_length = len(data.encode('utf-8'))
+        else:
+            content_length = len(str(data))
 
         # NOTE: str is intended, bytes are sufficient for headers.
         headers['Content-Length'] = str(content_length)
@@ -225,7 +313,9 @@ class JSONConnection(Connection):
     def api_request(self, method, path, query_params=None,
                     data=None, content_type=None, headers=None,
                     api_base_url=None, api_version=None,
-                    expect_json=True, _target_object=None):
+                    expect_json=True, _target_object=None,
+                    lazy_items_key=None, retry=None, _cacheable=False,
+                    rate_limiter=None):
         """Make a request over the HTTP transport to the API.
 
         You shouldn't need to use this method, but if you plan to
@@ -279,6 +369,41 @@ class JSONConnection(Connection):
             can allow custom behavior, for example, to defer an HTTP request
             and complete initialization of the object at a later time.
 
+        :type lazy_items_key: str
+        :param lazy_items_key: (Optional) If passed, a JSON response is
+                               decoded incrementally: it is returned as a
+                               :class:`~google.cloud._lazy_json.LazyJSONObject`
+                               and the array under this key is decoded one
+                               item at a time as it is iterated.
+
+        :type retry: :class:`~google.cloud.retry.Retry`
+        :param retry: (Optional) Policy for retrying the request if it
+                      fails. Defaults to the ``retry`` attribute of the
+                      client, if any, for idempotent (``GET``, ``HEAD``,
+                      ``PUT`` and ``DELETE``) requests only.
+
+        :type _cacheable: bool
+        :param _cacheable:
+            (Optional) Protected argument to be used by library callers: if
+            True, a ``GET`` of a single resource is revalidated against the
+            client's ``metadata_cache`` attribute, if any.
+
+        :type rate_limiter: :class:`~google.cloud.rate_limit.RateLimiter`
+        :param rate_limiter: (Optional) Limiter of the rate and concurrency
+                             of requests, which each attempt to send the
+                             request waits for. Defaults to the
+                             ``rate_limiter`` attribute of the client, if
+                             any.
+
+        If the client's ``compression_threshold`` attribute is set, a body
+        of at least that many bytes is sent gzip-compressed, if that makes
+        it smaller.
+
+        If the client's ``coalesce_gets`` attribute is true, a ``GET``
+        request identical (same URL and headers) to one already in flight
+        on this connection is not sent: it receives the response to that
+        request instead.
+
         :raises: Exception if the response code is not 200 OK.
         :rtype: dict or str
         :returns: The API response payload, either as a raw string or
@@ -290,14 +415,128 @@ class JSONConnection(Connection):
 
         # Making the executive decision that any dictionary
         # data will be sent properly as JSON.
+        codec = self._json_codec
         if data and isinstance(data, dict):
-            data = json.dumps(data)
+            data = codec.dumps(data)
             content_type = 'application/json'
 
-        response, content = self._make_request(
-            method=method, url=url, data=data, content_type=content_type,
-            headers=headers, target_object=_target_object)
+        threshold = self._compression_threshold
+        if (threshold is not None and data and
+                'Content-Encoding' not in (headers or {})):
+            compressed = _gzip_body(data, threshold)
+            if compressed is not None:
+                data = compressed
+                headers = dict(headers or {})
+                headers['Content-Encoding'] = 'gzip'
+
+        if retry is None and method in _IDEMPOTENT_METHODS:
+            retry = getattr(self._client, 'retry', None)
+
+        if rate_limiter is None:
+            rate_limiter = getattr(self._client, 'rate_limiter', None)
+        if rate_limiter is not None:
+            rate_limiter = rate_limiter.select(
+                method + ' ' + instrumentation._path_template(path))
+
+        cache = getattr(self._client, 'metadata_cache', None)
+        if cache is not None and method != 'GET':
+            cache.invalidate(path)
+        if method != 'GET' or not _cacheable:
+            cache = None
+        entry = None
+        if cache is not None:
+            entry = cache.get(path, url)
+            if entry is not None:
+                headers = dict(headers or {})
+                headers['If-None-Match'] = entry.etag
+
+        def make_request():
+            """Send the request once."""
+            if rate_limiter is None:
+                return self._make_request(
+                    method=method, url=url, data=data,
+                    content_type=content_type, headers=headers,
+                    target_object=_target_object)
+            permit = rate_limiter.acquire()
+            call.throttled(permit.delay)
+            try:
+                response, content = self._make_request(
+                    method=method, url=url, data=data,
+                    content_type=content_type, headers=headers,
+                    target_object=_target_object)
+            except Exception:
+                rate_limiter.release(permit, None)
+                raise
+            rate_limiter.release(permit, response.status)
+            return response, content
+
+        key = None
+        if (method == 'GET' and not data and
+                getattr(self._client, 'coalesce_gets', False)):
+            key = (url, content_type,
+                   tuple(sorted(six.iteritems(headers or {}))))
+
+        def send():
+            """Send the request once (or share one) and check its response."""
+            if key is not None:
+                (response, content), shared = self._in_flight.call(
+                    key, make_request)
+            else:
+                (response, content), shared = make_request(), False
+            call.set_http_response(response.status, content, coalesced=shared)
+            if (entry is not None and
+                    response.status == http_client.NOT_MODIFIED):
+                return cache.revalidated(path, entry)
+            result = self._process_response(
+                method, url, response, content, expect_json,
+                lazy_items_key=lazy_items_key, codec=codec)
+            if cache is not None and isinstance(result, dict):
+                etag = response.get('etag', result.get('etag'))
+                if etag:
+                    cache.put(path, url, etag, result)
+            return result
+
+        with instrumentation.http_call(self, method, path, data) as call:
+            if retry is None:
+                return send()
+            return retry.call(send, on_retry=call.retried)
+
+    @staticmethod
+    def _process_response(method, url, response, content, expect_json,
+                          lazy_items_key=None, codec=STDLIB_CODEC):
+        """Check the status of a response and decode its payload.
+
+        Shared by :meth:`api_request` and its asynchronous counterpart.
+
+        :type method: str
+        :param method: The HTTP method used for the request.
+
+        :type url: str
+        :param url: The URL the request was sent to.
 
+        :type response: :class:`httplib2.Response`
+        :param response: The HTTP response (a dictionary of sorts).
+
+        :type content: str
+        :param content: The content of the response.
+
+        :type expect_json: bool
+        :param expect_json: If True, parse the content as JSON.
+
+        :type lazy_items_key: str
+        :param lazy_items_key: (Optional) Key of an array in the JSON
+                               content to be decoded lazily.
+
+        :type codec: :class:`~google.cloud.json_codec.JSONCodec`
+        :param codec: (Optional) Codec decoding the JSON content (unless
+                      decoded lazily).
+
+        :raises: Exception if the response code is not 2xx, or
+                 :class:`TypeError` if JSON was expected but not returned.
+        :rtype: dict or str
+        :returns: The API response payload, either as a raw string or
+                  a dictionary if the response is valid JSON.
+        """
         if not 200 <= response.status < 300:
             raise make_exception(response, content,
                                  error_info=method + ' ' + url)
@@ -307,8 +546,10 @@ class JSONConnection(Connection):
             content_type = response.get('content-type', '')
             if not content_type.startswith('application/json'):
                 raise TypeError('Expected JSON, got %s' % content_type)
-            if isinstance(content, six.binary_type):
-                content = content.decode('utf-8')
-            return json.loads(content)
+            if lazy_items_key is not None:
+                if isinstance(content, six.binary_type):
+                    content = content.decode('utf-8')
+                return LazyJSONObject(content, lazy_items_key)
+            return codec.loads(content)
 
         return content
@@ -0,0 +1,344 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asynchronous (:mod:`asyncio`) connections to JSON API servers.
+
+.. note::
+
+   This module requires Python 3.5 or later. The default transport,
+   :class:`AuthorizedAsyncHttp`, also requires the optional ``aiohttp``
+   package, installed with the ``async`` extra::
+
+       $ pip install google-cloud-core[async]
+
+Example::
+
+    >>> from google.cloud import storage
+    >>> from google.cloud._http_async import AsyncJSONConnection
+    >>> client = storage.Client()
+    >>> connection = AsyncJSONConnection.from_connection(client._connection)
+    >>> bucket = await connection.api_request('GET', '/b/my-bucket')
+"""
+
+import asyncio
+
+import google_auth_httplib2
+import httplib2
+
+try:
+    import aiohttp
+except ImportError:  # pragma: NO COVER
+    aiohttp = None
+
+from google.cloud import instrumentation
+from google.cloud._http import _IDEMPOTENT_METHODS
+from google.cloud._http import JSONConnection
+
+
+_REFRESH_STATUS_CODES = (401,)
+_MAX_REFRESH_ATTEMPTS = 2
+
+
+def _running_loop():
+    """Get the event loop running the current coroutine.
+
+    :rtype: :class:`asyncio.AbstractEventLoop`
+    :returns: The running loop.
+    """
+    get_running_loop = getattr(asyncio, 'get_running_loop', None)
+    if get_running_loop is None:  # pragma: NO COVER Python < 3.7
+        return asyncio.get_event_loop()
+    return get_running_loop()
+
+
+class AuthorizedAsyncHttp(object):
+    """Asynchronous HTTP transport which adds credentials to requests.
+
+    Mirrors :class:`google_auth_httplib2.AuthorizedHttp`, but with a
+    coroutine ``request()``. Token refreshes (which are blocking) are run in
+    the event loop's default executor.
+
+    :type credentials: :class:`google.auth.credentials.Credentials`
+    :param credentials: The credentials to add to each request.
+
+    :type session: :class:`aiohttp.ClientSession`
+    :param session: (Optional) The session used to send requests. If not
+                    passed, one is created on first use, and closed by
+                    :meth:`close`.
+    """
+
+    _session_owned = False
+
+    def __init__(self, credentials, session=None):
+        self.credentials = credentials
+        self._session = session
+        self._refresh_lock = None
+        self._refresh_request = google_auth_httplib2.Request(httplib2.Http())
+
+    @property
+    def session(self):
+        """The session used to send requests.
+
+        :rtype: :class:`aiohttp.ClientSession`
+        :returns: The (possibly newly-created) session.
+        :raises: :class:`RuntimeError` if ``aiohttp`` is not installed.
+        """
+        if self._session is None:
+            if aiohttp is None:
+                raise RuntimeError(
+                    'The aiohttp package is required for asynchronous '
+                    'requests.')
+            self._session = aiohttp.ClientSession()
+            self._session_owned = True
+        return self._session
+
+    async def close(self):
+        """Close the session, if the transport created it.
+
+        Sessions passed to the constructor are left open.  A new session
+        is created if the transport is used again.
+        """
+        if self._session_owned:
+            session, self._session = self._session, None
+            self._session_owned = False
+            await session.close()
+
+    async def _refresh(self, stale_token):
+        """Refresh the credentials, unless another request already has.
+
+        :type stale_token: str
+        :param stale_token: The token seen by the caller before refreshing.
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if (self.credentials.valid and
+                    self.credentials.token != stale_token):
+                return
+            loop = _running_loop()
+            await loop.run_in_executor(
+                None, self.credentials.refresh, self._refresh_request)
+
+    async def request(self, uri, method='GET', body=None, headers=None):
+        """Send a request with the credentials applied.
+
+        :type uri: str
+        :param uri: The URL to send the request to.
+
+        :type method: str
+        :param method: The HTTP method to use in the request.
+
+        :type body: bytes
+        :param body: (Optional) The body of the request.
+
+        :type headers: dict
+        :param headers: (Optional) HTTP headers to send with the request.
+
+        :rtype: tuple of ``response`` (a :class:`httplib2.Response`)
+                and ``content`` (bytes).
+        :returns: The HTTP response and the content of the response.
+        """
+        for attempt in range(_MAX_REFRESH_ATTEMPTS + 1):
+            if not self.credentials.valid:
+                await self._refresh(self.credentials.token)
+            token = self.credentials.token
+            request_headers = dict(headers or {})
+            self.credentials.apply(request_headers)
+
+            async with self.session.request(
+                    method, uri, data=body, headers=request_headers) as resp:
+                content = await resp.read()
+                info = dict(resp.headers)
+                info['status'] = str(resp.status)
+
+            response = httplib2.Response(info)
+            if (response.status not in _REFRESH_STATUS_CODES or
+                    attempt == _MAX_REFRESH_ATTEMPTS):
+                return response, content
+            await self._refresh(token)
+
+
+class AsyncJSONConnection(JSONConnection):
+    """A connection to a Google JSON-based API with awaitable requests.
+
+    Builds URLs, headers and errors exactly as :class:`JSONConnection`
+    does, but sends requests over an asynchronous transport so many calls
+    can be in flight on a single event loop.
+
+    Subclasses must set the same class constants as for
+    :class:`JSONConnection`; see :meth:`from_connection` to re-use those of
+    an existing (synchronous) connection.
+
+    .. note::
+
+       Only the retry policy and instrumentation of the client apply to
+       these requests: unlike :meth:`JSONConnection.api_request`,
+       :meth:`api_request` does not compress request bodies (the client's
+       ``compression_threshold``), revalidate resources against the
+       client's ``metadata_cache``, coalesce identical ``GET`` requests
+       (``coalesce_gets``) or wait for the client's ``rate_limiter``.
+
+    :type client: :class:`~google.cloud.client.Client`
+    :param client: The client that owns the current connection.
+
+    :type http: object
+    :param http: (Optional) Asynchronous transport, which must define a
+                 coroutine ``request()`` with the same signature as
+                 :meth:`AuthorizedAsyncHttp.request`. If not passed, an
+                 :class:`AuthorizedAsyncHttp` bound to the client's
+                 credentials is created on first use, and closed by
+                 :meth:`close`.
+
+    Connections are asynchronous context managers, closed on exit::
+
+        >>> async with AsyncJSONConnection.from_connection(
+        ...         client._connection) as connection:
+        ...     bucket = await connection.api_request('GET', '/b/my-bucket')
+    """
+
+    _http_owned = False
+
+    def __init__(self, client, http=None):
+        super(AsyncJSONConnection, self).__init__(client)
+        self._http = http
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the transport, if the connection created it.
+
+        Transports passed to the constructor are left open.
+        """
+        if self._http_owned:
+            http, self._http = self._http, None
+            self._http_owned = False
+            await http.close()
+
+    @classmethod
+    def from_connection(cls, connection, http=None):
+        """Factory: create an asynchronous twin of a JSON connection.
+
+        :type connection: :class:`JSONConnection`
+        :param connection: The connection whose API endpoint, extra headers
+                           and user agent should be used.
+
+        :type http: object
+        :param http: (Optional) Asynchronous transport, as for the
+                     constructor.
+
+        :rtype: :class:`AsyncJSONConnection`
+        :returns: A connection for the same API, owned by the same client.
+        """
+        klass = type(connection)
+        if not issubclass(klass, cls):
+            klass = type('Async' + klass.__name__, (cls, klass),
+                         {'__module__': klass.__module__})
+        return klass(connection._client, http=http)
+
+    @property
+    def http(self):
+        """A getter for the asynchronous transport.
+
+        :rtype: :class:`AuthorizedAsyncHttp`
+        :returns: An object with a coroutine ``request()`` method.
+        """
+        if self._http is None:
+            self._http = AuthorizedAsyncHttp(self.credentials)
+            self._http_owned = True
+        return self._http
+
+    def _do_request(self, method, url, headers, data,
+                    target_object):  # pylint: disable=unused-argument
+        """Low-level helper:  start the actual API request over HTTP.
+
+        :type method: str
+        :param method: The HTTP method to use in the request.
+
+        :type url: str
+        :param url: The URL to send the request to.
+
+        :type headers: dict
+        :param headers: A dictionary of HTTP headers to send with the request.
+
+        :type data: str
+        :param data: The data to send as the body of the request.
+
+        :type target_object: object
+        :param target_object: (Optional) Unused ``target_object`` here.
+
+        :rtype: coroutine
+        :returns: A coroutine resolving to a tuple of ``response`` (a
+                  dictionary of sorts) and ``content`` (a string).
+        """
+        return self.http.request(
+            uri=url, method=method, headers=headers, body=data)
+
+    async def api_request(self, method, path, query_params=None,
+                          data=None, content_type=None, headers=None,
+                          api_base_url=None, api_version=None,
+                          expect_json=True, _target_object=None,
+                          retry=None):
+        """Make a request over the asynchronous transport to the API.
+
+        Arguments have the same meaning as for
+        :meth:`JSONConnection.api_request`. Retries wait with
+        :func:`asyncio.sleep`, so don't block the event loop. Compression,
+        the metadata cache, coalescing and rate limiting of the client are
+        not applied.
+
+        :raises: Exception if the response code is not 200 OK.
+        :rtype: dict or str
+        :returns: The API response payload, either as a raw string or
+                  a dictionary if the response is valid JSON.
+        """
+        url = self.build_api_url(path=path, query_params=query_params,
+                                 api_base_url=api_base_url,
+                                 api_version=api_version)
+
+        # Making the executive decision that any dictionary
+        # data will be sent properly as JSON.
+        codec = self._json_codec
+        if data and isinstance(data, dict):
+            data = codec.dumps(data)
+            content_type = 'application/json'
+
+        if retry is None and method in _IDEMPOTENT_METHODS:
+            retry = getattr(self._client, 'retry', None)
+
+        async def send():
+            """Send the request once and check its response."""
+            response, content = await self._make_request(
+                method=method, url=url, data=data, content_type=content_type,
+                headers=headers, target_object=_target_object)
+            call.set_http_response(response.status, content)
+            return self._process_response(
+                method, url, response, content, expect_json, codec=codec)
+
+        with instrumentation.http_call(self, method, path, data) as call:
+            if retry is None:
+                return await send()
+            deadline = retry._start()
+            for delay in retry.delays():
+                try:
+                    return await send()
+                except Exception as exc:
+                    delay = retry._retry_delay(exc, delay, deadline)
+                    if delay is None:
+                        raise
+                    call.retried(exc, delay)
+                await asyncio.sleep(delay)
@@ -0,0 +1,217 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Thread-safe, pooled HTTP transport.
+
+A single :class:`httplib2.Http` instance is not safe to share between
+threads: it caches one live connection per host and mutates that cache
+while a request is in flight.  :class:`PooledHttp` hands each request its
+own :class:`httplib2.Http` checked out from a bounded, per-host pool of
+keep-alive instances, so that a client (and its connection) can be shared
+freely across worker threads.
+
+The pools are discarded in a forked child process, which must not use the
+connections of its parent, and are not pickled.
+
+This module is not part of the public API surface.
+"""
+
+import os
+import threading
+
+import httplib2
+from six.moves.urllib.parse import urlsplit
+
+
+DEFAULT_POOL_SIZE = 10
+"""Default maximum number of concurrent connections per host."""
+
+
+class _HostPool(object):
+    """Bounded LIFO pool of HTTP objects connected to a single host.
+
+    :type http_factory: callable
+    :param http_factory: Callable (taking no arguments) which returns a new
+                         HTTP object.
+
+    :type maxsize: int
+    :param maxsize: The maximum number of HTTP objects which may be checked
+                    out at the same time.
+    """
+
+    def __init__(self, http_factory, maxsize):
+        self._http_factory = http_factory
+        self._slots = threading.BoundedSemaphore(maxsize)
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def get(self):
+        """Check out an HTTP object, blocking while the pool is exhausted.
+
+        Idle objects are re-used most-recently-returned first, so that the
+        connections kept alive are the ones most likely to still be warm.
+
+        :rtype: :class:`httplib2.Http`
+        :returns: An HTTP object, either re-used or freshly created.
+        """
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._http_factory()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def put(self, http):
+        """Return a checked-out HTTP object to the pool.
+
+        :type http: :class:`httplib2.Http`
+        :param http: An object previously returned by :meth:`get`.
+        """
+        with self._lock:
+            self._idle.append(http)
+        self._slots.release()
+
+    def clear(self):
+        """Close and discard all idle HTTP objects.
+
+        Objects which are currently checked out are unaffected.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for http in idle:
+            _close_http(http)
+
+
+def _close_http(http):
+    """Close the live connections cached on an HTTP object.
+
+    :type http: :class:`httplib2.Http`
+    :param http: The HTTP object to close.
+    """
+    connections = getattr(http, 'connections', None) or {}
+    for key, connection in list(connections.items()):
+        # httplib2 stores both connection classes (keyed by scheme) and
+        # connection instances (keyed by scheme + authority) in this dict.
+        if ':' in key:
+            connection.close()
+            del connections[key]
+
+
+class PooledHttp(object):
+    """HTTP transport which is safe to share across threads.
+
+    Exposes the same ``request()`` interface as :class:`httplib2.Http`, so
+    it can be passed anywhere an ``_http`` object is accepted (including as
+    the ``http`` wrapped by :class:`google_auth_httplib2.AuthorizedHttp`).
+
+    :type maxsize: int
+    :param maxsize: (Optional) The maximum number of concurrent connections
+                    kept open to each host. Requests beyond this limit block
+                    until a connection is returned to the pool. Defaults to
+                    :data:`DEFAULT_POOL_SIZE`.
+
+    :type http_factory: callable
+    :param http_factory: (Optional) Callable (taking no arguments) used to
+                         create the pooled HTTP objects. Defaults to
+                         :class:`httplib2.Http`.
+    """
+
+    def __init__(self, maxsize=DEFAULT_POOL_SIZE,
+                 http_factory=httplib2.Http):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive integer', maxsize)
+        self._maxsize = maxsize
+        self._http_factory = http_factory
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._pid = os.getpid()
+
+    def __reduce__(self):
+        return PooledHttp, (self._maxsize, self._http_factory)
+
+    def _check_fork(self):
+        """Discard the pools, if inherited from a parent process.
+
+        The lock is replaced too: another thread of the parent may have
+        held it when the process forked.
+        """
+        pid = os.getpid()
+        if pid != self._pid:
+            self._lock = threading.Lock()
+            self._pools = {}
+            self._pid = pid
+
+    @property
+    def maxsize(self):
+        """Maximum number of concurrent connections per host.
+
+        :rtype: int
+        :returns: The per-host pool size.
+        """
+        return self._maxsize
+
+    def _get_pool(self, uri):
+        """Get (or create) the pool for the host targeted by ``uri``.
+
+        :type uri: str
+        :param uri: The URI of a request.
+
+        :rtype: :class:`_HostPool`
+        :returns: The pool for the URI's scheme and authority.
+        """
+        scheme, netloc = urlsplit(uri)[:2]
+        key = (scheme, netloc)
+        self._check_fork()
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(
+                    self._http_factory, self._maxsize)
+        return pool
+
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        """Perform a request using a pooled HTTP object.
+
+        Arguments have the same meaning as for
+        :meth:`httplib2.Http.request`.
+
+        :rtype: tuple of ``response`` (a dictionary of sorts)
+                and ``content`` (a string).
+        :returns: The HTTP response object and the content of the response.
+        """
+        pool = self._get_pool(uri)
+        http = pool.get()
+        try:
+            return http.request(
+                uri, method=method, body=body, headers=headers,
+                redirections=redirections, connection_type=connection_type)
+        finally:
+            pool.put(http)
+
+    def clear(self):
+        """Close all idle pooled connections.
+
+        Connections in use by in-flight requests are returned to the pool
+        as usual once those requests complete.
+        """
+        self._check_fork()
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.clear()
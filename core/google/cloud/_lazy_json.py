@@ -0,0 +1,261 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental decoding of large JSON list responses.
+
+``json.loads`` builds the whole object tree for a response at once.  For a
+list page holding many thousands of items, that tree is many times larger
+than the response text.  :class:`LazyJSONObject` instead decodes the
+top-level object one member at a time, and leaves one (large) array member
+as a :class:`LazyJSONArray`, whose elements are decoded only as they are
+iterated.  Peak memory is then bounded by the response text plus a single
+item, rather than by the full tree.
+
+This module is not part of the public API surface.
+"""
+
+import json
+import re
+
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _skip_whitespace(text, position):
+    """Get the position of the next non-whitespace character.
+
+    :type text: str
+    :param text: The JSON text.
+
+    :type position: int
+    :param position: The position to start from.
+
+    :rtype: int
+    :returns: The position of the first non-whitespace character at or
+              after ``position``.
+    """
+    return _WHITESPACE.match(text, position).end()
+
+
+def _expect(text, position, expected):
+    """Check the character at a position.
+
+    :type text: str
+    :param text: The JSON text.
+
+    :type position: int
+    :param position: The position to check.
+
+    :type expected: str
+    :param expected: The character expected at ``position``.
+
+    :raises: :class:`ValueError` if the character does not match.
+    """
+    if text[position:position + 1] != expected:
+        raise ValueError(
+            'Expected %r at position %d of JSON document' % (
+                expected, position))
+
+
+class LazyJSONArray(object):
+    """A JSON array whose elements are decoded as they are iterated.
+
+    :type text: str
+    :param text: The JSON text containing the array.
+
+    :type start: int
+    :param start: The position of the array's opening ``[``.
+    """
+
+    def __init__(self, text, start):
+        _expect(text, start, '[')
+        self._text = text
+        self._start = start
+        self._end = None
+        self._length = None
+
+    def __iter__(self):
+        """Decode the elements of the array, one at a time.
+
+        :rtype: :class:`~types.GeneratorType`
+        :returns: A generator of decoded elements.
+        """
+        text = self._text
+        count = 0
+        position = _skip_whitespace(text, self._start + 1)
+        if text[position:position + 1] == ']':
+            position += 1
+        else:
+            while True:
+                value, position = _DECODER.raw_decode(text, position)
+                count += 1
+                yield value
+                position = _skip_whitespace(text, position)
+                if text[position:position + 1] == ']':
+                    position += 1
+                    break
+                _expect(text, position, ',')
+                position = _skip_whitespace(text, position + 1)
+        self._end = position
+        self._length = count
+
+    def _scan(self):
+        """Decode (and discard) every element, to find the array's extent.
+
+        This costs CPU, but not memory: only one element is alive at a time.
+        """
+        for _ in self:
+            pass
+
+    def __len__(self):
+        if self._length is None:
+            self._scan()
+        return self._length
+
+    @property
+    def end(self):
+        """Position just after the array's closing ``]``.
+
+        :rtype: int
+        :returns: The end position of the array in the JSON text.
+        """
+        if self._end is None:
+            self._scan()
+        return self._end
+
+
+class LazyJSONObject(object):
+    """A read-only mapping decoded from a JSON object on demand.
+
+    Members are decoded in document order, only as far as needed to find a
+    requested key. An array stored under ``lazy_key`` is returned as a
+    :class:`LazyJSONArray`.
+
+    :type text: str
+    :param text: The JSON text of an object.
+
+    :type lazy_key: str
+    :param lazy_key: The key of the array member to be decoded lazily.
+
+    :raises: :class:`ValueError` if ``text`` is not a JSON object.
+    """
+
+    def __init__(self, text, lazy_key):
+        self._text = text
+        self._lazy_key = lazy_key
+        self._values = {}
+        self._position = _skip_whitespace(text, 0)
+        _expect(text, self._position, '{')
+        self._position = _skip_whitespace(text, self._position + 1)
+        self._first = True
+        self._finished = False
+        self._pending_array = None
+
+    def _decode_next_member(self):
+        """Decode the next member of the object.
+
+        :rtype: bool
+        :returns: Flag indicating if a member was decoded (:data:`False`
+                  once the end of the object has been reached).
+        """
+        if self._finished:
+            return False
+        text = self._text
+        position = self._position
+        if self._pending_array is not None:
+            position = _skip_whitespace(text, self._pending_array.end)
+            self._pending_array = None
+
+        if text[position:position + 1] == '}':
+            self._finished = True
+            self._text = None
+            return False
+        if not self._first:
+            _expect(text, position, ',')
+            position = _skip_whitespace(text, position + 1)
+        self._first = False
+
+        key, position = _DECODER.raw_decode(text, position)
+        position = _skip_whitespace(text, position)
+        _expect(text, position, ':')
+        position = _skip_whitespace(text, position + 1)
+
+        if key == self._lazy_key and text[position:position + 1] == '[':
+            value = self._pending_array = LazyJSONArray(text, position)
+        else:
+            value, position = _DECODER.raw_decode(text, position)
+            position = _skip_whitespace(text, position)
+        self._values[key] = value
+        self._position = position
+        return True
+
+    def _decode_all(self):
+        """Decode all remaining members of the object."""
+        while self._decode_next_member():
+            pass
+
+    def get(self, key, default=None):
+        """Get a member of the object.
+
+        :type key: str
+        :param key: The member name.
+
+        :type default: object
+        :param default: Value to return if the object has no such member.
+
+        :rtype: object
+        :returns: The decoded member, or ``default``.
+        """
+        while key not in self._values:
+            if not self._decode_next_member():
+                return default
+        return self._values[key]
+
+    def __getitem__(self, key):
+        result = self.get(key, _MISSING)
+        if result is _MISSING:
+            raise KeyError(key)
+        return result
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        self._decode_all()
+        return iter(self._values)
+
+    def __len__(self):
+        self._decode_all()
+        return len(self._values)
+
+    def keys(self):
+        """Names of the members of the object.
+
+        :rtype: list
+        :returns: The member names.
+        """
+        return list(self)
+
+    def items(self):
+        """Members of the object.
+
+        :rtype: list
+        :returns: ``(key, value)`` pairs for each member.
+        """
+        self._decode_all()
+        return list(self._values.items())
+
+
+_MISSING = object()
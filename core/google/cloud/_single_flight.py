@@ -0,0 +1,103 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Coalescing of identical concurrent calls.
+
+While a call for a given key is in flight, other threads making a call
+with the same key wait for it and share its result, instead of making
+their own.  Once the call returns, the next call for that key starts a
+new flight: results are never cached.
+
+This module is not part of the public API surface.
+"""
+
+import sys
+import threading
+
+import six
+
+
+class _Flight(object):
+    """A call in progress, and its outcome once done."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.exc_info = None
+
+
+class SingleFlight(object):
+    """Run at most one call per key at a time, sharing its outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def call(self, key, function):
+        """Call ``function``, unless a call for ``key`` is in flight.
+
+        :type key: tuple
+        :param key: Hashable key identifying calls which are
+                    interchangeable.
+
+        :type function: callable
+        :param function: Called without arguments, if no call for ``key``
+                         is in flight.
+
+        :rtype: tuple
+        :returns: The value returned by ``function`` (here, or on the thread
+                  which made the call in flight), and a flag indicating if
+                  that value was shared from another thread's call.
+        :raises: the exception raised by ``function``, on every thread
+                 which waited for it.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.exc_info is not None:
+                six.reraise(*flight.exc_info)
+            return flight.result, True
+
+        try:
+            flight.result = function()
+        except BaseException:
+            flight.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def waiters(self, key):
+        """Count the threads waiting for the call in flight for ``key``.
+
+        :type key: tuple
+        :param key: The key of the call.
+
+        :rtype: int
+        :returns: The number of threads waiting to share the outcome of the
+                  call in flight, or 0 if there is none.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            return 0 if flight is None else flight.waiters
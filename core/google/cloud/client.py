@@ -16,14 +16,14 @@
 
 import io
 import json
-from pickle import PicklingError
 
 import google.auth.credentials
-from google.oauth2 import service_account
 import google_auth_httplib2
 import six
 
 from google.cloud._helpers import _determine_default_project
+from google.cloud._http_pool import DEFAULT_POOL_SIZE
+from google.cloud._http_pool import PooledHttp
 from google.cloud.credentials import get_credentials
 
 
@@ -71,6 +71,10 @@ class _ClientFactoryMixin(object):
             raise TypeError('credentials must not be in keyword arguments')
         with io.open(json_credentials_path, 'r', encoding='utf-8') as json_fi:
             credentials_info = json.load(json_fi)
+        # Loaded on first use: it pulls in the (slow to import) crypto
+        # libraries needed to sign JWTs.
+        from google.oauth2 import service_account
+
         credentials = service_account.Credentials.from_service_account_info(
             credentials_info)
         if cls._SET_PROJECT:
@@ -78,7 +82,10 @@ class _ClientFactoryMixin(object):
                 kwargs['project'] = credentials_info.get('project_id')
 
         kwargs['credentials'] = credentials
-        return cls(*args, **kwargs)
+        client = cls(*args, **kwargs)
+        # Service account credentials do not pickle: ship their info.
+        client._credentials_info = credentials_info
+        return client
 
 
 class Client(_ClientFactoryMixin):
@@ -87,13 +94,21 @@ class Client(_ClientFactoryMixin):
     Stores ``credentials`` and an HTTP object so that subclasses
     can pass them along to a connection class.
 
-    If no value is passed in for ``_http``, a :class:`httplib2.Http` object
-    will be created and authorized with the ``credentials``. If not, the
-    ``credentials`` and ``_http`` need not be related.
+    If no value is passed in for ``_http``, a thread-safe
+    :class:`~google.cloud._http_pool.PooledHttp` object will be created and
+    authorized with the ``credentials``. If not, the ``credentials`` and
+    ``_http`` need not be related.
 
     Callers and subclasses may seek to use the private key from
     ``credentials`` to sign data.
 
+    Clients can be pickled, e.g. to be passed to :mod:`multiprocessing`
+    workers: their transports are not pickled, but rebuilt on first use
+    in the unpickled copy.  Credentials inferred from the environment are
+    inferred again, and those loaded by :meth:`from_service_account_json`
+    are loaded again from the service account info; other credentials are
+    pickled as they are.
+
     A custom (non-``httplib2``) HTTP object must have a ``request`` method
     which accepts the following arguments:
 
@@ -129,6 +144,79 @@ class Client(_ClientFactoryMixin):
     Needs to be set by subclasses.
     """
 
+    _HTTP_POOL_SIZE = DEFAULT_POOL_SIZE
+    """Maximum number of concurrent connections per host.
+
+    Used for the pooled HTTP transport created when no ``_http`` is passed.
+    """
+
+    retry = None
+    """Default :class:`~google.cloud.retry.Retry` policy for API requests.
+
+    Used by :meth:`~google.cloud._http.JSONConnection.api_request` when no
+    ``retry`` is passed to it, for idempotent (``GET``, ``HEAD``, ``PUT``
+    and ``DELETE``) requests only: other requests might have been applied
+    when they fail, and retrying them could repeat their side effects.
+    :data:`None` (the default) disables retries.
+    """
+
+    coalesce_gets = False
+    """Share the response of identical concurrent ``GET`` requests.
+
+    When true, :meth:`~google.cloud._http.JSONConnection.api_request` sends
+    only one of several identical ``GET`` requests made concurrently (e.g.
+    by many threads reloading the same resource) on the client's
+    connection: the others wait for its response, and decode it in turn.
+    Responses are never cached beyond the request in flight.
+    """
+
+    compression_threshold = None
+    """Minimum size, in bytes, of request bodies to be gzip-compressed.
+
+    Used by :meth:`~google.cloud._http.JSONConnection.api_request`: large,
+    repetitive JSON bodies (e.g. BigQuery ``insertAll`` rows or Stackdriver
+    log entries) typically shrink 5 to 10 times.  :data:`None` (the
+    default) disables compression.
+    """
+
+    json_codec = None
+    """Codec for the JSON payloads of API requests and responses.
+
+    A :class:`~google.cloud.json_codec.JSONCodec`, e.g. the one returned
+    by :func:`~google.cloud.json_codec.fast_codec`.  :data:`None` (the
+    default) uses the standard library.
+    """
+
+    metadata_cache = None
+    """Cache of resource properties, revalidated by ``reload`` methods.
+
+    A :class:`~google.cloud.metadata_cache.MetadataCache`: when set, a
+    resource ``reload`` sends the ETag of the properties last fetched, and
+    reuses them if the API reports them as not modified.  :data:`None` (the
+    default) disables the cache.
+    """
+
+    rate_limiter = None
+    """Limiter of the rate and concurrency of API requests.
+
+    A :class:`~google.cloud.rate_limit.RateLimiter` (or
+    :class:`~google.cloud.rate_limit.MethodRateLimiter`), which every
+    request sent by :meth:`~google.cloud._http.JSONConnection.api_request`
+    waits for, and which backs off when the API reports overload.
+    :data:`None` (the default) sends requests as soon as they are made.
+    """
+
+    _TRANSIENT_ATTRIBUTES = ()
+    """Attributes holding live transports, or API objects using them.
+
+    They are not pickled: they are reset to :data:`None` when unpickled,
+    and rebuilt on first use.  Extended by subclasses.
+    """
+
+    _http_owned = False
+    _credentials_inferred = False
+    _credentials_info = None
+
     def __init__(self, credentials=None, _http=None):
         if (credentials is not None and
                 not isinstance(
@@ -136,27 +224,71 @@ class Client(_ClientFactoryMixin):
             raise ValueError(_GOOGLE_AUTH_CREDENTIALS_HELP)
         if credentials is None and _http is None:
             credentials = get_credentials()
+            self._credentials_inferred = True
         self._credentials = google.auth.credentials.with_scopes_if_required(
             credentials, self.SCOPE)
         self._http_internal = _http
 
     def __getstate__(self):
-        """Explicitly state that clients are not pickleable."""
-        raise PicklingError('\n'.join([
-            'Pickling client objects is explicitly not supported.',
-            'Clients have non-trivial state that is local and unpickleable.',
-        ]))
+        """Get the state of the client to pickle.
+
+        Leaves out the transports created by the client, and credentials
+        which can be rebuilt from the environment or service account info.
+
+        :rtype: dict
+        :returns: The picklable state.
+        """
+        state = self.__dict__.copy()
+        for name in self._TRANSIENT_ATTRIBUTES:
+            state.pop(name, None)
+        if self._http_owned:
+            del state['_http_internal']
+            del state['_http_owned']
+        if self._credentials_inferred or self._credentials_info is not None:
+            state['_credentials'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of an unpickled client.
+
+        :type state: dict
+        :param state: The state returned by :meth:`__getstate__`.
+        """
+        self.__dict__.update(state)
+        for name in self._TRANSIENT_ATTRIBUTES:
+            setattr(self, name, None)
+        self.__dict__.setdefault('_http_internal', None)
+        if self._credentials is not None or not (
+                self._credentials_inferred or
+                self._credentials_info is not None):
+            return
+        if self._credentials_info is not None:
+            from google.oauth2 import service_account
+
+            credentials = (
+                service_account.Credentials.from_service_account_info(
+                    self._credentials_info))
+        else:
+            credentials = get_credentials()
+        self._credentials = google.auth.credentials.with_scopes_if_required(
+            credentials, self.SCOPE)
 
     @property
     def _http(self):
         """Getter for object used for HTTP transport.
 
+        If no HTTP object was passed to the constructor, creates one which
+        keeps a bounded pool of keep-alive connections per host (of size
+        :attr:`_HTTP_POOL_SIZE`) and can be shared across threads.
+
         :rtype: :class:`~httplib2.Http`
         :returns: An HTTP object.
         """
         if self._http_internal is None:
             self._http_internal = google_auth_httplib2.AuthorizedHttp(
-                self._credentials)
+                self._credentials,
+                http=PooledHttp(maxsize=self._HTTP_POOL_SIZE))
+            self._http_owned = True
         return self._http_internal
 
 
@@ -22,22 +22,50 @@ from __future__ import absolute_import
 
 import copy
 import json
+import sys
+
 import six
 
 from google.cloud._helpers import _to_bytes
 
 _HTTP_CODE_TO_EXCEPTION = {}  # populated at end of module
 
-try:
-    from grpc._channel import _Rendezvous
-except ImportError:  # pragma: NO COVER
-    _Rendezvous = None
 
+def _load_grpc_rendezvous():
+    """Load the exception class raised by gRPC stable.
+
+    :rtype: type
+    :returns: The gRPC ``_Rendezvous`` class, or :data:`None` if gRPC is
+              not installed.
+    """
+    try:
+        from grpc._channel import _Rendezvous
+    except ImportError:  # pragma: NO COVER
+        return None
+    return _Rendezvous
+
+
+if sys.version_info >= (3, 7):
+    # Importing gRPC is slow: only do so once ``GrpcRendezvous`` is used.
+    def __getattr__(name):
+        """Resolve ``GrpcRendezvous`` lazily (see PEP 562).
 
-# pylint: disable=invalid-name
-GrpcRendezvous = _Rendezvous
-"""Exception class raised by gRPC stable."""
-# pylint: enable=invalid-name
+        :type name: str
+        :param name: The name of the missing module attribute.
+
+        :rtype: type
+        :returns: The exception class raised by gRPC stable.
+        :raises: :class:`AttributeError` for any other name.
+        """
+        if name == 'GrpcRendezvous':
+            return _load_grpc_rendezvous()
+        raise AttributeError(
+            'module %r has no attribute %r' % (__name__, name))
+else:  # pragma: NO COVER
+    # pylint: disable=invalid-name
+    GrpcRendezvous = _load_grpc_rendezvous()
+    """Exception class raised by gRPC stable."""
+    # pylint: enable=invalid-name
 
 
 class GoogleCloudError(Exception):
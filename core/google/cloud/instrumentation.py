@@ -0,0 +1,866 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-request instrumentation of HTTP and gRPC API calls.
+
+Listeners are callables registered with :func:`add_listener`.  Each is
+called, on the calling thread, with a :class:`CallRecord` once for every
+request sent through
+:meth:`~google.cloud._http.JSONConnection.api_request` and every call
+made on a gRPC stub created by
+:func:`~google.cloud._helpers.make_secure_stub` or
+:func:`~google.cloud._helpers.make_insecure_stub`::
+
+    >>> from google.cloud import instrumentation
+    >>> def log_call(record):
+    ...     print(record.service, record.method, record.path_template,
+    ...           record.status, record.latency)
+    >>> instrumentation.add_listener(log_call)
+
+:class:`HistogramAggregator` is a ready-made listener, which collects
+latency histograms and byte counts in memory and can be dumped on demand::
+
+    >>> aggregator = instrumentation.HistogramAggregator()
+    >>> instrumentation.add_listener(aggregator)
+    >>> bucket = client.get_bucket('my-bucket')
+    >>> aggregator.dump()
+    storage GET /b/{} 200: count=1 mean=0.087 p50=0.128 ...
+
+While no listener is registered, requests are neither timed nor measured,
+so the cost of instrumentation is a single check per call.
+
+Listeners should be fast: a slow listener slows down every call. An
+exception raised by a listener is logged, rather than propagated to the
+caller of the API.
+
+The current limits of the :class:`~google.cloud.rate_limit.RateLimiter`
+instances in use are reported by :func:`rate_limiter_stats`::
+
+    >>> for stats in instrumentation.rate_limiter_stats():
+    ...     print(stats.name, stats.rate, stats.concurrency_limit,
+    ...           stats.backoffs)
+"""
+
+# Avoid the grpc and google.cloud.grpc collision.
+from __future__ import absolute_import
+
+import bisect
+import collections
+import functools
+import logging
+import sys
+import threading
+from timeit import default_timer
+import weakref
+
+import six
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_listeners = ()
+_listeners_lock = threading.Lock()
+
+_rate_limiters = weakref.WeakSet()
+_rate_limiters_lock = threading.Lock()
+
+
+class CallRecord(collections.namedtuple('CallRecord', [
+        'transport', 'service', 'method', 'path_template', 'status',
+        'bytes_sent', 'bytes_received', 'latency', 'retry_count',
+        'coalesced', 'throttle_delay', 'retry_delay'])):
+    """A single API call, as reported to instrumentation listeners.
+
+    :type transport: str
+    :param transport: Either ``'http'`` or ``'grpc'``.
+
+    :type service: str
+    :param service: The API called, e.g. ``'storage'`` or ``'Bigtable'``.
+
+    :type method: str
+    :param method: The HTTP method (e.g. ``'GET'``), or the name of the
+                   gRPC method (e.g. ``'ReadRows'``).
+
+    :type path_template: str
+    :param path_template: The request path with resource names replaced by
+                          ``{}`` (e.g. ``'/b/{}/o/{}'``), or the full name of
+                          the gRPC method.
+
+    :type status: int or str
+    :param status: The HTTP status code, or the name of the gRPC status code
+                   (e.g. ``'OK'``).  :data:`None` if no response was
+                   received.
+
+    :type bytes_sent: int
+    :param bytes_sent: The size of the request body (or message).
+
+    :type bytes_received: int
+    :param bytes_received: The size of the response body (or messages).
+
+    :type latency: float
+    :param latency: Seconds from the start of the call until the whole
+                    response was received, including the time waited for a
+                    rate limiter (``throttle_delay``) and between retries
+                    (``retry_delay``): the time spent in requests is
+                    ``latency - throttle_delay - retry_delay``.
+
+    :type retry_count: int
+    :param retry_count: The number of times the request was retried.
+
+    :type coalesced: bool
+    :param coalesced: (Optional) True if the request was not sent, but
+                      received the response to an identical request in
+                      flight (see ``coalesce_gets`` on
+                      :class:`~google.cloud.client.Client`); its
+                      ``bytes_sent`` and ``bytes_received`` are then 0.
+                      Defaults to False.
+
+    :type throttle_delay: float
+    :param throttle_delay: (Optional) Seconds the call (all its attempts)
+                           waited for a
+                           :class:`~google.cloud.rate_limit.RateLimiter`.
+                           Defaults to 0.
+
+    :type retry_delay: float
+    :param retry_delay: (Optional) Seconds the call waited between its
+                        attempts, backing off before retries.  Defaults to
+                        0.
+    """
+
+
+CallRecord.__new__.__defaults__ = (False, 0.0, 0.0)
+
+
+def add_listener(listener):
+    """Register a listener, to be called for every API call.
+
+    :type listener: callable
+    :param listener: Called with a single :class:`CallRecord` argument.
+    """
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener):
+    """Unregister a listener added with :func:`add_listener`.
+
+    :type listener: callable
+    :param listener: The listener to remove.
+
+    :raises: :class:`ValueError` if ``listener`` is not registered.
+    """
+    global _listeners
+    with _listeners_lock:
+        listeners = list(_listeners)
+        listeners.remove(listener)
+        _listeners = tuple(listeners)
+
+
+def is_enabled():
+    """Check if any listener is registered.
+
+    :rtype: bool
+    :returns: Flag indicating if API calls are being instrumented.
+    """
+    return bool(_listeners)
+
+
+def notify(record):
+    """Pass a record to every registered listener.
+
+    :type record: :class:`CallRecord`
+    :param record: The call to report.
+    """
+    for listener in _listeners:
+        try:
+            listener(record)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(
+                'Instrumentation listener %r failed', listener)
+
+
+def track_rate_limiter(limiter):
+    """Report the state of a rate limiter in :func:`rate_limiter_stats`.
+
+    The limiter is tracked for as long as it is in use (i.e. referenced).
+
+    :type limiter: :class:`~google.cloud.rate_limit.RateLimiter`
+    :param limiter: The limiter to track.
+    """
+    with _rate_limiters_lock:
+        _rate_limiters.add(limiter)
+
+
+def rate_limiter_stats():
+    """Get the current state of the rate limiters in use.
+
+    :rtype: list
+    :returns: A :class:`~google.cloud.rate_limit.RateLimiterStats` for
+              each :class:`~google.cloud.rate_limit.RateLimiter` in use.
+    """
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters)
+    return [limiter.stats() for limiter in limiters]
+
+
+def _path_template(path):
+    """Replace the resource names in a JSON API path with ``{}``.
+
+    JSON API paths alternate between collection names and resource names
+    (``/projects/{}/datasets/{}``), so every second segment is replaced.
+    A custom verb (``/projects/{}:lookup``) is kept.
+
+    :type path: str
+    :param path: The request path, relative to the API version.
+
+    :rtype: str
+    :returns: The path, with resource names replaced.
+    """
+    segments = path.split('/')
+    position = 0
+    for index, segment in enumerate(segments):
+        if not segment:
+            continue
+        if position % 2:
+            _, colon, verb = segment.partition(':')
+            segments[index] = '{}' + colon + verb
+        position += 1
+    return '/'.join(segments)
+
+
+def _service_name(obj):
+    """Guess the name of the API served by a connection object.
+
+    :type obj: object
+    :param obj: An instance of a class defined in a
+                ``google.cloud.<service>`` package.
+
+    :rtype: str
+    :returns: The name of the package, e.g. ``'storage'``.
+    """
+    module = type(obj).__module__
+    prefix = 'google.cloud.'
+    if module.startswith(prefix):
+        module = module[len(prefix):]
+    return module.split('.')[0]
+
+
+class _Call(object):
+    """Measures one API call, reporting it to listeners when done.
+
+    Use as a context manager around sending the request; an exception
+    raised inside the ``with`` block is reported with :data:`None` status.
+
+    :type transport: str
+    :param transport: Either ``'http'`` or ``'grpc'``.
+
+    :type service: str
+    :param service: The API called.
+
+    :type method: str
+    :param method: The HTTP or gRPC method.
+
+    :type path_template: str
+    :param path_template: The request path template, or gRPC method name.
+
+    :type bytes_sent: int
+    :param bytes_sent: The size of the request.
+    """
+
+    def __init__(self, transport, service, method, path_template,
+                 bytes_sent):
+        self.transport = transport
+        self.service = service
+        self.method = method
+        self.path_template = path_template
+        self.bytes_sent = bytes_sent
+        self.bytes_received = 0
+        self.status = None
+        self.retry_count = 0
+        self.coalesced = False
+        self.throttle_delay = 0.0
+        self.retry_delay = 0.0
+        self._started = default_timer()
+        self._finished = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self.status is None:
+            self.status = _grpc_status(exc_value)
+        self.finish()
+
+    def set_response(self, status, bytes_received, coalesced=False):
+        """Record the response to the call.
+
+        :type status: int or str
+        :param status: The HTTP status code, or gRPC status code name.
+
+        :type bytes_received: int
+        :param bytes_received: The size of the response.
+
+        :type coalesced: bool
+        :param coalesced: (Optional) True if the response was shared from
+                          an identical request in flight.
+        """
+        self.status = status
+        self.bytes_received += bytes_received
+        self.coalesced = coalesced
+
+    def set_http_response(self, status, content, coalesced=False):
+        """Record an HTTP response to the call, measuring its content.
+
+        :type status: int
+        :param status: The HTTP status code.
+
+        :type content: bytes
+        :param content: The content of the response. Contents without a
+                        size (e.g. the deferred responses of batches) count
+                        as empty, as do contents shared by coalesced calls.
+
+        :type coalesced: bool
+        :param coalesced: (Optional) True if the response was shared from
+                          an identical request in flight.
+        """
+        if coalesced or not isinstance(content, (bytes, six.text_type)):
+            bytes_received = 0
+        elif isinstance(content, bytes):
+            bytes_received = len(content)
+        else:
+            bytes_received = len(content.encode('utf-8'))
+        self.set_response(status, bytes_received, coalesced=coalesced)
+
+    def retried(self, exc, delay):  # pylint: disable=unused-argument
+        """Count a retry of the call, and the delay before it.
+
+        Signature matches the ``on_retry`` argument of
+        :meth:`google.cloud.retry.Retry.call`.
+
+        :type exc: :class:`Exception`
+        :param exc: The error which caused the retry.
+
+        :type delay: float
+        :param delay: The delay before the retry, in seconds.
+        """
+        self.retry_count += 1
+        self.retry_delay += delay
+
+    def throttled(self, delay):
+        """Count the time an attempt of the call waited for a rate limiter.
+
+        :type delay: float
+        :param delay: The time waited, in seconds.
+        """
+        self.throttle_delay += delay
+
+    def finish(self):
+        """Report the call to listeners (only the first time)."""
+        if self._finished:
+            return
+        self._finished = True
+        notify(CallRecord(
+            self.transport, self.service, self.method, self.path_template,
+            self.status, self.bytes_sent, self.bytes_received,
+            default_timer() - self._started, self.retry_count,
+            self.coalesced, self.throttle_delay, self.retry_delay))
+
+
+class _NullCall(object):
+    """Stand-in for :class:`_Call`, used while instrumentation is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def set_response(self, status, bytes_received, coalesced=False):
+        """Ignore the response."""
+
+    def set_http_response(self, status, content, coalesced=False):
+        """Ignore the response, without measuring it."""
+
+    def retried(self, exc, delay):
+        """Ignore the retry."""
+
+    def throttled(self, delay):
+        """Ignore the time waited."""
+
+    def finish(self):
+        """Report nothing."""
+
+
+_NULL_CALL = _NullCall()
+
+
+def http_call(connection, method, path, data):
+    """Start measuring an HTTP API call.
+
+    :type connection: :class:`~google.cloud._http.JSONConnection`
+    :param connection: The connection sending the request.
+
+    :type method: str
+    :param method: The HTTP method.
+
+    :type path: str
+    :param path: The request path, relative to the API version.
+
+    :type data: bytes or str
+    :param data: The request body.
+
+    :rtype: :class:`_Call`
+    :returns: A context manager measuring the call, whose
+              ``set_http_response()`` should be called with the response.
+              If no listener is registered, a shared object which does
+              nothing.
+    """
+    if not _listeners:
+        return _NULL_CALL
+    if not data:
+        bytes_sent = 0
+    elif isinstance(data, bytes):
+        bytes_sent = len(data)
+    else:
+        bytes_sent = len(data.encode('utf-8'))
+    return _Call('http', _service_name(connection), method,
+                 _path_template(path), bytes_sent)
+
+
+def _message_size(message):
+    """Get the serialized size of a protobuf message.
+
+    :type message: :class:`google.protobuf.message.Message`
+    :param message: A request or response message.
+
+    :rtype: int
+    :returns: The size of the message, or 0 if it is not a message.
+    """
+    try:
+        return message.ByteSize()
+    except AttributeError:
+        return 0
+
+
+def _grpc_status(exc):
+    """Get the name of the status code of a failed gRPC call.
+
+    :type exc: :class:`Exception`
+    :param exc: The exception raised by the call.
+
+    :rtype: str
+    :returns: The name of the status code, or :data:`None` if ``exc`` does
+              not carry one.
+    """
+    code = getattr(exc, 'code', None)
+    if not callable(code):
+        return None
+    try:
+        return code().name
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+class _CountedRequests(object):
+    """Iterator over streamed request messages, counting their size.
+
+    :type requests: iterable
+    :param requests: The request messages.
+
+    :type call: :class:`_Call`
+    :param call: The call whose ``bytes_sent`` is incremented.
+    """
+
+    def __init__(self, requests, call):
+        self._requests = iter(requests)
+        self._call = call
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        request = next(self._requests)
+        self._call.bytes_sent += _message_size(request)
+        return request
+
+    next = __next__
+
+
+class _StreamingResponse(object):
+    """Iterator over streamed response messages, reporting when exhausted.
+
+    Other attributes (e.g. ``cancel()``, ``code()``) are those of the
+    wrapped response.
+
+    :type responses: :class:`grpc.Call`
+    :param responses: The streaming response of the call.
+
+    :type call: :class:`_Call`
+    :param call: The call, finished once the stream ends.
+    """
+
+    def __init__(self, responses, call):
+        self._responses = responses
+        self._call = call
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            response = next(self._responses)
+        except StopIteration:
+            self._call.set_response('OK', 0)
+            self._call.finish()
+            raise
+        except Exception as exc:
+            self._call.status = _grpc_status(exc)
+            self._call.finish()
+            raise
+        self._call.bytes_received += _message_size(response)
+        return response
+
+    next = __next__
+
+    def __getattr__(self, name):
+        return getattr(self._responses, name)
+
+
+class _InstrumentedMultiCallable(object):
+    """Wraps a gRPC stub method, reporting each call to listeners.
+
+    Only direct calls are instrumented; other attributes (e.g. ``future()``
+    or ``with_call()``) are those of the wrapped method.
+
+    :type wrapped: :class:`grpc.UnaryUnaryMultiCallable` (or one of the
+                   other three multi-callable types)
+    :param wrapped: The stub method.
+
+    :type service: str
+    :param service: The name of the gRPC service.
+
+    :type method: str
+    :param method: The name of the method.
+
+    :type streaming_request: bool
+    :param streaming_request: Flag indicating if the method takes a stream
+                              of requests.
+
+    :type streaming_response: bool
+    :param streaming_response: Flag indicating if the method returns a
+                               stream of responses.
+
+    :type retry: :class:`~google.cloud.retry.Retry`
+    :param retry: (Optional) Policy for retrying failed calls. Ignored for
+                  streaming methods, which can't be replayed.
+
+    :type rate_limiter: :class:`~google.cloud.rate_limit.RateLimiter`
+    :param rate_limiter: (Optional) Limiter of the calls (its limiter for
+                         ``/<service>/<method>``, if it has one per
+                         method). Ignored for streaming methods.
+    """
+
+    def __init__(self, wrapped, service, method,
+                 streaming_request, streaming_response, retry=None,
+                 rate_limiter=None):
+        self._wrapped = wrapped
+        self._service = service
+        self._method = method
+        self._path_template = '/%s/%s' % (service, method)
+        self._streaming_request = streaming_request
+        self._streaming_response = streaming_response
+        if streaming_request or streaming_response:
+            retry = rate_limiter = None
+        if rate_limiter is not None:
+            rate_limiter = rate_limiter.select(self._path_template)
+        self._retry = retry
+        self._rate_limiter = rate_limiter
+
+    def _attempt(self, call, request, args, kwargs):
+        """Make one attempt of a unary call, through the rate limiter.
+
+        :type call: :class:`_Call`
+        :param call: The call, credited with the time waited.
+
+        :type request: :class:`google.protobuf.message.Message`
+        :param request: The request message.
+
+        :type args: tuple
+        :param args: Other positional arguments of the stub method.
+
+        :type kwargs: dict
+        :param kwargs: Keyword arguments of the stub method.
+
+        :rtype: :class:`google.protobuf.message.Message`
+        :returns: The response message.
+        """
+        if self._rate_limiter is None:
+            return self._wrapped(request, *args, **kwargs)
+        response, delay = self._rate_limiter.call(
+            functools.partial(self._wrapped, request, *args, **kwargs))
+        call.throttled(delay)
+        return response
+
+    def __call__(self, request, *args, **kwargs):
+        if not _listeners:
+            if self._retry is None and self._rate_limiter is None:
+                return self._wrapped(request, *args, **kwargs)
+            attempt = functools.partial(
+                self._attempt, _NULL_CALL, request, args, kwargs)
+            if self._retry is None:
+                return attempt()
+            return self._retry.call(attempt)
+
+        call = _Call('grpc', self._service, self._method,
+                     self._path_template, 0)
+        if self._streaming_request:
+            request = _CountedRequests(request, call)
+        else:
+            call.bytes_sent = _message_size(request)
+
+        if self._streaming_response:
+            try:
+                responses = self._wrapped(request, *args, **kwargs)
+            except Exception as exc:
+                call.status = _grpc_status(exc)
+                call.finish()
+                raise
+            # The call is finished once the response stream is exhausted.
+            return _StreamingResponse(responses, call)
+
+        with call:
+            attempt = functools.partial(
+                self._attempt, call, request, args, kwargs)
+            if self._retry is None:
+                response = attempt()
+            else:
+                response = self._retry.call(attempt, on_retry=call.retried)
+            call.set_response('OK', _message_size(response))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+
+def _multi_callable_kinds():
+    """Map gRPC multi-callable types to their streaming flags.
+
+    :rtype: tuple
+    :returns: Pairs of a multi-callable type and a tuple of flags indicating
+              if requests and responses (respectively) are streamed.
+    """
+    try:
+        import grpc
+    except ImportError:  # pragma: NO COVER
+        return ()
+    return (
+        (grpc.UnaryUnaryMultiCallable, (False, False)),
+        (grpc.UnaryStreamMultiCallable, (False, True)),
+        (grpc.StreamUnaryMultiCallable, (True, False)),
+        (grpc.StreamStreamMultiCallable, (True, True)),
+    )
+
+
+def instrument_stub(stub, retry=None, rate_limiter=None):
+    """Wrap the methods of a gRPC stub, reporting each call to listeners.
+
+    The stub is modified in place (and returned for convenience).
+
+    :type stub: object
+    :param stub: An instance of a generated gRPC stub class.
+
+    :type retry: :class:`~google.cloud.retry.Retry`
+    :param retry: (Optional) Policy for retrying failed calls of the
+                  stub's unary (non-streaming) methods.
+
+    :type rate_limiter: :class:`~google.cloud.rate_limit.RateLimiter`
+    :param rate_limiter: (Optional) Limiter of the calls of the stub's
+                         unary (non-streaming) methods.
+
+    :rtype: object
+    :returns: ``stub``.
+    """
+    service = type(stub).__name__
+    if service.endswith('Stub'):
+        service = service[:-len('Stub')]
+    kinds = _multi_callable_kinds()
+    for name, value in list(getattr(stub, '__dict__', {}).items()):
+        for kind, flags in kinds:
+            if isinstance(value, kind):
+                streaming_request, streaming_response = flags
+                setattr(stub, name, _InstrumentedMultiCallable(
+                    value, service, name, streaming_request,
+                    streaming_response, retry=retry,
+                    rate_limiter=rate_limiter))
+                break
+    return stub
+
+
+class LatencyHistogram(object):
+    """Latency and size statistics of a group of calls.
+
+    :type bounds: tuple
+    :param bounds: Increasing upper bounds (in seconds) of the histogram
+                   buckets; a final bucket holds larger latencies.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retry_count = 0
+        self.coalesced_count = 0
+        self.throttle_delay = 0.0
+        self.retry_delay = 0.0
+
+    def add(self, record):
+        """Add a call to the histogram.
+
+        :type record: :class:`CallRecord`
+        :param record: The call to add.
+        """
+        self.bucket_counts[bisect.bisect_left(
+            self.bounds, record.latency)] += 1
+        self.count += 1
+        self.total_latency += record.latency
+        self.max_latency = max(self.max_latency, record.latency)
+        self.bytes_sent += record.bytes_sent
+        self.bytes_received += record.bytes_received
+        self.retry_count += record.retry_count
+        self.coalesced_count += int(record.coalesced)
+        self.throttle_delay += record.throttle_delay
+        self.retry_delay += record.retry_delay
+
+    def copy(self):
+        """Copy the histogram.
+
+        :rtype: :class:`LatencyHistogram`
+        :returns: A histogram with the same statistics.
+        """
+        result = LatencyHistogram(self.bounds)
+        result.__dict__.update(self.__dict__)
+        result.bucket_counts = list(self.bucket_counts)
+        return result
+
+    @property
+    def mean(self):
+        """Mean latency of the calls.
+
+        :rtype: float
+        :returns: The mean latency, in seconds (0 if there are no calls).
+        """
+        if not self.count:
+            return 0.0
+        return self.total_latency / self.count
+
+    def percentile(self, percent):
+        """Estimate a latency percentile.
+
+        :type percent: float
+        :param percent: The percentile, between 0 and 100.
+
+        :rtype: float
+        :returns: The upper bound of the bucket holding the percentile (or
+                  the maximum latency, if that is lower), in seconds.
+        """
+        if not self.count:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max_latency)
+                break
+        return self.max_latency
+
+
+class HistogramAggregator(object):
+    """Listener collecting a latency histogram per kind of call.
+
+    Calls are grouped by ``(service, method, path_template, status)``.
+
+    :type bounds: tuple
+    :param bounds: (Optional) Increasing upper bounds (in seconds) of the
+                   histogram buckets. Defaults to :attr:`DEFAULT_BOUNDS`.
+    """
+
+    DEFAULT_BOUNDS = tuple(0.001 * 2 ** power for power in range(18))
+    """Bucket bounds doubling from 1 millisecond to about 2 minutes."""
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        """Add a call to its histogram.
+
+        :type record: :class:`CallRecord`
+        :param record: The call to add.
+        """
+        key = (record.service, record.method, record.path_template,
+               record.status)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(
+                    self.bounds)
+            histogram.add(record)
+
+    def snapshot(self):
+        """Copy the current histograms.
+
+        :rtype: dict
+        :returns: Copies of the :class:`LatencyHistogram` instances, keyed
+                  by ``(service, method, path_template, status)``.
+        """
+        with self._lock:
+            return {key: histogram.copy()
+                    for key, histogram in self._histograms.items()}
+
+    def reset(self):
+        """Discard all collected statistics."""
+        with self._lock:
+            self._histograms.clear()
+
+    def dump(self, stream=None):
+        """Write a summary of the histograms, one line per kind of call.
+
+        :type stream: file
+        :param stream: (Optional) The stream to write to. Defaults to
+                       :data:`sys.stdout`.
+        """
+        if stream is None:
+            stream = sys.stdout
+        histograms = self.snapshot()
+        for key in sorted(histograms, key=str):
+            histogram = histograms[key]
+            stream.write(
+                '%s %s %s %s: count=%d mean=%.3f p50=%.3f p90=%.3f '
+                'p99=%.3f max=%.3f sent=%d received=%d retries=%d '
+                'coalesced=%d throttled=%.3f backoff=%.3f\n' % (
+                    key + (
+                        histogram.count, histogram.mean,
+                        histogram.percentile(50), histogram.percentile(90),
+                        histogram.percentile(99), histogram.max_latency,
+                        histogram.bytes_sent, histogram.bytes_received,
+                        histogram.retry_count, histogram.coalesced_count,
+                        histogram.throttle_delay, histogram.retry_delay)))
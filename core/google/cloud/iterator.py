@@ -83,10 +83,50 @@ To consume an entire page::
         <MyItemClass at 0x7fd64a098ed0>,
         <MyItemClass at 0x7fd64a098e90>,
     ]
+
+To overlap the network round trip for the next page(s) with processing of
+the current one, pass ``prefetch`` when creating an :class:`HTTPIterator`
+or :class:`GAXIterator`. A background thread then requests up to that many
+pages ahead of the caller (items are still converted by ``item_to_value``
+in the calling thread)::
+
+    >>> iterator = HTTPIterator(..., prefetch=2)
+    >>> for my_item in iterator:
+    ...     process(my_item)  # Page N + 1 and N + 2 are fetched meanwhile.
+
+The same can be done for iterators returned by ``list_*`` methods, by
+setting ``prefetch`` before iteration starts::
+
+    >>> iterator = bucket.list_blobs()
+    >>> iterator.prefetch = 2
+
+If iteration stops early, the background thread is stopped as soon as the
+iterator (or its ``pages`` generator) is closed or garbage collected.
+
+For very large pages, an :class:`HTTPIterator` can also decode each
+response incrementally, by setting ``stream_items``. Each item is then
+decoded from the response text only when it is passed to
+``item_to_value``, so the whole page is never held as decoded objects::
+
+    >>> iterator = table.fetch_data()
+    >>> iterator.stream_items = True
+
+To keep only the raw items not yet converted alive, rather than the whole
+page, set ``release_items``: each raw item (e.g. a decoded JSON dictionary)
+is then replaced by :data:`None` in the page response as soon as it has been
+passed to ``item_to_value``. Only do so if nothing else (such as a
+``page_start`` callback) keeps the response and reads its items later::
+
+    >>> iterator = HTTPIterator(..., release_items=True)
 """
 
+import sys
+import threading
 
 import six
+from six.moves import queue
+
+from google.cloud._lazy_json import LazyJSONArray
 
 
 DEFAULT_ITEMS_KEY = 'items'
@@ -111,6 +151,111 @@ def _do_nothing_page_start(iterator, page, response):
 # pylint: enable=unused-argument
 
 
+_PREFETCH_DONE = object()
+"""Sentinel queued by :class:`_PagePrefetcher` after the last page."""
+
+_PREFETCH_POLL_INTERVAL = 0.1
+"""Seconds a blocked prefetch thread waits before checking for cancel."""
+
+
+class _PagePrefetcher(object):
+    """Fetch raw pages in a background thread, into a bounded queue.
+
+    :type fetch_pages: callable
+    :param fetch_pages: Callable (taking no arguments) returning an iterator
+                        of raw pages. Each raw page is requested when the
+                        iterator is advanced.
+
+    :type depth: int
+    :param depth: The maximum number of fetched pages waiting to be
+                  consumed.
+    """
+
+    def __init__(self, fetch_pages, depth):
+        self._queue = queue.Queue(maxsize=depth)
+        self._cancelled = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, args=(fetch_pages,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, value):
+        """Queue a value, unless cancelled while waiting for room.
+
+        :type value: object
+        :param value: A raw page, a failure or :data:`_PREFETCH_DONE`.
+
+        :rtype: bool
+        :returns: Flag indicating if the value was queued.
+        """
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(value, timeout=_PREFETCH_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, fetch_pages):
+        """Body of the background thread.
+
+        :type fetch_pages: callable
+        :param fetch_pages: As passed to the constructor.
+        """
+        try:
+            raw_pages = fetch_pages()
+            while not self._cancelled.is_set():
+                try:
+                    raw_page = six.next(raw_pages)
+                except StopIteration:
+                    break
+                if not self._put(raw_page):
+                    return
+        except Exception:  # pylint: disable=broad-except
+            self._put(_PrefetchFailure(sys.exc_info()))
+            return
+        self._put(_PREFETCH_DONE)
+
+    def get(self):
+        """Get the next raw page, blocking until it is available.
+
+        :rtype: object
+        :returns: The next raw page, or :data:`None` if there are no pages
+                  left.
+        :raises: Any exception raised while fetching the page.
+        """
+        if self._finished:
+            return None
+        value = self._queue.get()
+        if value is _PREFETCH_DONE:
+            self._finished = True
+            return None
+        if isinstance(value, _PrefetchFailure):
+            self._finished = True
+            six.reraise(*value.exc_info)
+        return value
+
+    def cancel(self):
+        """Stop fetching pages.
+
+        A request already in flight is allowed to complete, but its page is
+        discarded.
+        """
+        self._cancelled.set()
+
+
+class _PrefetchFailure(object):
+    """Wraps an exception raised in a :class:`_PagePrefetcher` thread.
+
+    :type exc_info: tuple
+    :param exc_info: The value of :func:`sys.exc_info` when the exception
+                     was caught.
+    """
+
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+
+
 class Page(object):
     """Single page of results in an iterator.
 
@@ -126,14 +271,46 @@ class Page(object):
                           raw API response into the native object.
                           Assumed signature takes an :class:`Iterator` and a
                           raw API response with a single item.
+
+    :type release_items: bool
+    :param release_items: (Optional) If True, and ``items`` is a
+                          :class:`list`, replace each item in it by
+                          :data:`None` once converted, so that its memory
+                          can be reclaimed before the page is exhausted.
+                          Defaults to False.
     """
 
-    def __init__(self, parent, items, item_to_value):
+    # Pages are created by the million when listing large collections:
+    # keep them free of a per-instance dictionary, unless a ``page_start``
+    # callback adds attributes.
+    __slots__ = ('_parent', '_lazy_items', '_num_items', '_remaining',
+                 '_num_consumed', '_item_iter', '_item_to_value',
+                 '_raw_items', '__dict__', '__weakref__')
+
+    def __init__(self, parent, items, item_to_value, release_items=False):
         self._parent = parent
-        self._num_items = len(items)
+        if isinstance(items, LazyJSONArray):
+            # Counting the items of a lazily-decoded array costs a full
+            # decoding pass, so it is deferred until asked for.
+            self._lazy_items = items
+            self._num_items = None
+        else:
+            self._lazy_items = None
+            self._num_items = len(items)
         self._remaining = self._num_items
+        self._num_consumed = 0
         self._item_iter = iter(items)
         self._item_to_value = item_to_value
+        if release_items and isinstance(items, list):
+            self._raw_items = items
+        else:
+            self._raw_items = None
+
+    def _count_lazy_items(self):
+        """Count the items of a lazily-decoded page, if not yet known."""
+        if self._num_items is None:
+            self._num_items = len(self._lazy_items)
+            self._remaining = self._num_items - self._num_consumed
 
     @property
     def num_items(self):
@@ -142,6 +319,7 @@ class Page(object):
         :rtype: int
         :returns: The number of items in this page.
         """
+        self._count_lazy_items()
         return self._num_items
 
     @property
@@ -151,6 +329,7 @@ class Page(object):
         :rtype: int
         :returns: The number of items remaining in this page.
         """
+        self._count_lazy_items()
         return self._remaining
 
     def __iter__(self):
@@ -159,11 +338,19 @@ class Page(object):
 
     def next(self):
         """Get the next value in the page."""
-        item = six.next(self._item_iter)
+        try:
+            item = six.next(self._item_iter)
+        except StopIteration:
+            self._raw_items = None
+            raise
         result = self._item_to_value(self._parent, item)
+        if self._raw_items is not None:
+            self._raw_items[self._num_consumed] = None
         # Since we've successfully got the next value from the
         # iterator, we update the number of remaining.
-        self._remaining -= 1
+        self._num_consumed += 1
+        if self._remaining is not None:
+            self._remaining -= 1
         return result
 
     # Alias needed for Python 2/3 support.
@@ -187,14 +374,38 @@ class Iterator(object):
 
     :type max_results: int
     :param max_results: (Optional) The maximum number of results to fetch.
+
+    :type prefetch: int
+    :param prefetch: (Optional) The number of pages to request ahead of the
+                     caller, in a background thread. Defaults to ``0``
+                     (pages are requested only when needed).
+
+    :type release_items: bool
+    :param release_items: (Optional) If True, pages drop their reference to
+                          each raw item once it has been converted by
+                          ``item_to_value``. Defaults to False.
     """
 
+    # Callers may still add attributes (e.g. the zone of a DNS changes
+    # iterator): those go to a dictionary, created on first use.  Subclasses
+    # with attributes of their own declare them as slots.
+    __slots__ = ('_started', 'client', '_item_to_value', 'max_results',
+                 'prefetch', 'release_items', '_prefetcher', 'page_number',
+                 'next_page_token', 'num_results', '__dict__', '__weakref__')
+
+    _PAGE_CLASS = Page
+    """The :class:`Page` subclass of the pages of the iterator."""
+
     def __init__(self, client, item_to_value,
-                 page_token=None, max_results=None):
+                 page_token=None, max_results=None, prefetch=0,
+                 release_items=False):
         self._started = False
         self.client = client
         self._item_to_value = item_to_value
         self.max_results = max_results
+        self.prefetch = prefetch
+        self.release_items = release_items
+        self._prefetcher = None
         # The attributes below will change over the life of the iterator.
         self.page_number = 0
         self.next_page_token = page_token
@@ -244,13 +455,17 @@ class Iterator(object):
 
         Yields :class:`Page` instances.
         """
-        page = self._next_page()
-        while page is not None:
-            self.page_number += 1
-            if increment:
-                self.num_results += page.num_items
-            yield page
+        try:
             page = self._next_page()
+            while page is not None:
+                self.page_number += 1
+                if increment:
+                    self.num_results += page.num_items
+                yield page
+                page = self._next_page()
+        finally:
+            if self._prefetcher is not None:
+                self._prefetcher.cancel()
 
     @staticmethod
     def _next_page():
@@ -263,6 +478,32 @@ class Iterator(object):
         """
         raise NotImplementedError
 
+    def _next_prefetched(self):
+        """Get the next raw page fetched by the background thread.
+
+        Starts the thread on first use.
+
+        :rtype: object
+        :returns: The next raw page (as produced by :meth:`_fetch_pages`),
+                  or :data:`None` if there are no pages left.
+        """
+        if self._prefetcher is None:
+            self._prefetcher = _PagePrefetcher(
+                self._fetch_pages, self.prefetch)
+        return self._prefetcher.get()
+
+    @staticmethod
+    def _fetch_pages():
+        """Generator of raw pages, run in the background thread.
+
+        This does nothing and is intended to be over-ridden by subclasses
+        which support ``prefetch``. It must not modify the state of the
+        iterator seen by the caller.
+
+        :raises NotImplementedError: Always.
+        """
+        raise NotImplementedError
+
 
 class HTTPIterator(Iterator):
     """A generic class for iterating through Cloud JSON APIs list responses.
@@ -300,9 +541,29 @@ class HTTPIterator(Iterator):
                        the :class:`Page` that was started and the dictionary
                        containing the page response.
 
+    :type prefetch: int
+    :param prefetch: (Optional) The number of pages to request ahead of the
+                     caller, in a background thread. Defaults to ``0``.
+
+    :type stream_items: bool
+    :param stream_items: (Optional) If True, decode the items of each page
+                         one at a time, as they are consumed, rather than
+                         decoding the whole response up front. This bounds
+                         peak memory by one item (plus the response text),
+                         but :attr:`Page.num_items` costs an extra decoding
+                         pass. Defaults to False.
+
+    :type release_items: bool
+    :param release_items: (Optional) If True, pages drop their reference to
+                          each raw item once it has been converted by
+                          ``item_to_value``. Defaults to False.
+
     .. autoattribute:: pages
     """
 
+    __slots__ = ('path', '_items_key', 'extra_params', '_page_start',
+                 'stream_items')
+
     _PAGE_TOKEN = 'pageToken'
     _MAX_RESULTS = 'maxResults'
     _NEXT_TOKEN = 'nextPageToken'
@@ -312,14 +573,17 @@ class HTTPIterator(Iterator):
     def __init__(self, client, path, item_to_value,
                  items_key=DEFAULT_ITEMS_KEY,
                  page_token=None, max_results=None, extra_params=None,
-                 page_start=_do_nothing_page_start):
+                 page_start=_do_nothing_page_start, prefetch=0,
+                 stream_items=False, release_items=False):
         super(HTTPIterator, self).__init__(
             client, item_to_value, page_token=page_token,
-            max_results=max_results)
+            max_results=max_results, prefetch=prefetch,
+            release_items=release_items)
         self.path = path
         self._items_key = items_key
         self.extra_params = extra_params
         self._page_start = page_start
+        self.stream_items = stream_items
         # Verify inputs / provide defaults.
         if self.extra_params is None:
             self.extra_params = {}
@@ -343,16 +607,56 @@ class HTTPIterator(Iterator):
         :returns: The next page in the iterator (or :data:`None` if
                   there are no pages left).
         """
+        if self.prefetch:
+            response = self._next_prefetched()
+            if response is None:
+                return None
+            return self._page_from_response(response)
+
         if self._has_next_page():
             response = self._get_next_page_response()
-            items = response.get(self._items_key, ())
-            page = Page(self, items, self._item_to_value)
-            self._page_start(self, page, response)
-            self.next_page_token = response.get(self._NEXT_TOKEN)
-            return page
+            return self._page_from_response(response)
         else:
             return None
 
+    def _fetch_pages(self):
+        """Generator of page responses, run in the background thread.
+
+        Tracks the page token and result count of the pages fetched so far,
+        independently of those of the pages consumed by the caller.
+
+        Yields the parsed JSON response of each page.
+        """
+        page_token = self.next_page_token
+        num_results = self.num_results
+        while True:
+            params = self._build_query_params(page_token, num_results)
+            response = self._request_page(params)
+            yield response
+            num_results += len(response.get(self._items_key, ()))
+            page_token = response.get(self._NEXT_TOKEN)
+            if page_token is None:
+                return
+            if (self.max_results is not None and
+                    num_results >= self.max_results):
+                return
+
+    def _page_from_response(self, response):
+        """Wrap a page response and capture the next page token.
+
+        :type response: dict
+        :param response: The JSON API response for a page.
+
+        :rtype: :class:`Page`
+        :returns: The page holding the items in ``response``.
+        """
+        items = response.get(self._items_key, ())
+        page = self._PAGE_CLASS(self, items, self._item_to_value,
+                                release_items=self.release_items)
+        self._page_start(self, page, response)
+        self.next_page_token = response.get(self._NEXT_TOKEN)
+        return page
+
     def _has_next_page(self):
         """Determines whether or not there are more pages with results.
 
@@ -371,14 +675,29 @@ class HTTPIterator(Iterator):
     def _get_query_params(self):
         """Getter for query parameters for the next request.
 
+        :rtype: dict
+        :returns: A dictionary of query parameters.
+        """
+        return self._build_query_params(
+            self.next_page_token, self.num_results)
+
+    def _build_query_params(self, page_token, num_results):
+        """Build query parameters for a page request.
+
+        :type page_token: str
+        :param page_token: The token of the page to request, if any.
+
+        :type num_results: int
+        :param num_results: The number of results already fetched.
+
         :rtype: dict
         :returns: A dictionary of query parameters.
         """
         result = {}
-        if self.next_page_token is not None:
-            result[self._PAGE_TOKEN] = self.next_page_token
+        if page_token is not None:
+            result[self._PAGE_TOKEN] = page_token
         if self.max_results is not None:
-            result[self._MAX_RESULTS] = self.max_results - self.num_results
+            result[self._MAX_RESULTS] = self.max_results - num_results
         result.update(self.extra_params)
         return result
 
@@ -388,17 +707,32 @@ class HTTPIterator(Iterator):
         :rtype: dict
         :returns: The parsed JSON response of the next page's contents.
         """
-        params = self._get_query_params()
+        return self._request_page(self._get_query_params())
+
+    def _request_page(self, params):
+        """Requests a page from the path provided.
+
+        :type params: dict
+        :param params: The query parameters for the request.
+
+        :rtype: dict
+        :returns: The parsed JSON response of the page's contents.
+        """
+        kwargs = {}
+        if self.stream_items:
+            kwargs['lazy_items_key'] = self._items_key
         if self._HTTP_METHOD == 'GET':
             return self.client._connection.api_request(
                 method=self._HTTP_METHOD,
                 path=self.path,
-                query_params=params)
+                query_params=params,
+                **kwargs)
         elif self._HTTP_METHOD == 'POST':
             return self.client._connection.api_request(
                 method=self._HTTP_METHOD,
                 path=self.path,
-                data=params)
+                data=params,
+                **kwargs)
         else:
             raise ValueError('Unexpected HTTP method', self._HTTP_METHOD)
 
@@ -422,13 +756,26 @@ class GAXIterator(Iterator):
     :type max_results: int
     :param max_results: (Optional) The maximum number of results to fetch.
 
+    :type prefetch: int
+    :param prefetch: (Optional) The number of pages to request ahead of the
+                     caller, in a background thread. Defaults to ``0``.
+
+    :type release_items: bool
+    :param release_items: (Optional) If True, pages drop their reference to
+                          each raw item once it has been converted by
+                          ``item_to_value``. Defaults to False.
+
     .. autoattribute:: pages
     """
 
-    def __init__(self, client, page_iter, item_to_value, max_results=None):
+    __slots__ = ('_gax_page_iter',)
+
+    def __init__(self, client, page_iter, item_to_value, max_results=None,
+                 prefetch=0, release_items=False):
         super(GAXIterator, self).__init__(
             client, item_to_value, page_token=page_iter.page_token,
-            max_results=max_results)
+            max_results=max_results, prefetch=prefetch,
+            release_items=release_items)
         self._gax_page_iter = page_iter
 
     def _next_page(self):
@@ -441,10 +788,32 @@ class GAXIterator(Iterator):
         :returns: The next page in the iterator (or :data:`None` if
                   there are no pages left).
         """
-        try:
-            items = six.next(self._gax_page_iter)
-            page = Page(self, items, self._item_to_value)
-            self.next_page_token = self._gax_page_iter.page_token or None
-            return page
-        except StopIteration:
-            return None
+        if self.prefetch:
+            fetched = self._next_prefetched()
+            if fetched is None:
+                return None
+            items, page_token = fetched
+        else:
+            try:
+                items = six.next(self._gax_page_iter)
+            except StopIteration:
+                return None
+            page_token = self._gax_page_iter.page_token
+
+        page = self._PAGE_CLASS(self, items, self._item_to_value,
+                                release_items=self.release_items)
+        self.next_page_token = page_token or None
+        return page
+
+    def _fetch_pages(self):
+        """Generator of GAX pages, run in the background thread.
+
+        Yields tuples of the items in each page and the token of the page
+        after it.
+        """
+        while True:
+            try:
+                items = six.next(self._gax_page_iter)
+            except StopIteration:
+                return
+            yield items, self._gax_page_iter.page_token
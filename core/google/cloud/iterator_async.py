@@ -0,0 +1,230 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asynchronous iterators for paging through API responses.
+
+.. note::
+
+   This module requires Python 3.5 or later.
+
+:class:`AsyncHTTPIterator` has the same surface as
+:class:`~google.cloud.iterator.HTTPIterator`, but pages are requested
+through an :class:`~google.cloud._http_async.AsyncJSONConnection` and
+consumed with ``async for``::
+
+    >>> iterator = AsyncHTTPIterator(
+    ...     client, connection, '/b', item_to_value)
+    >>> async for bucket in iterator:
+    ...     print(bucket.name)
+
+Pages can be iterated in the same way::
+
+    >>> async for page in iterator.pages:
+    ...     print(page.num_items)
+
+Iterators are also asynchronous context managers, which close their
+connection on exit::
+
+    >>> async with AsyncHTTPIterator(
+    ...         client, connection, '/b', item_to_value) as iterator:
+    ...     async for bucket in iterator:
+    ...         print(bucket.name)
+"""
+
+import six
+
+from google.cloud.iterator import _do_nothing_page_start
+from google.cloud.iterator import DEFAULT_ITEMS_KEY
+from google.cloud.iterator import HTTPIterator
+
+
+class _AsyncPageIterator(object):
+    """Asynchronous iterator over the pages of an :class:`AsyncHTTPIterator`.
+
+    :type iterator: :class:`AsyncHTTPIterator`
+    :param iterator: The iterator whose pages are fetched.
+
+    :type increment: bool
+    :param increment: Flag indicating if the total number of results
+                      should be incremented on each page.
+    """
+
+    def __init__(self, iterator, increment):
+        self._iterator = iterator
+        self._increment = increment
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        iterator = self._iterator
+        page = await iterator._next_page()
+        if page is None:
+            raise StopAsyncIteration
+        iterator.page_number += 1
+        if self._increment:
+            iterator.num_results += page.num_items
+        return page
+
+
+class _AsyncItemIterator(object):
+    """Asynchronous iterator over the items of an :class:`AsyncHTTPIterator`.
+
+    :type iterator: :class:`AsyncHTTPIterator`
+    :param iterator: The iterator whose items are fetched.
+    """
+
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self._pages = _AsyncPageIterator(iterator, increment=False)
+        self._page = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            if self._page is not None:
+                try:
+                    item = six.next(self._page)
+                except StopIteration:
+                    self._page = None
+                else:
+                    self._iterator.num_results += 1
+                    return item
+            self._page = await self._pages.__anext__()
+
+
+class AsyncHTTPIterator(HTTPIterator):
+    """Asynchronous iterator through Cloud JSON APIs list responses.
+
+    :type client: :class:`~google.cloud.client.Client`
+    :param client: The client used to identify the application.
+
+    :type connection: :class:`~google.cloud._http_async.AsyncJSONConnection`
+    :param connection: The connection used to request pages.
+
+    :type path: str
+    :param path: The path to query for the list of items.
+
+    :type item_to_value: callable
+    :param item_to_value: Callable to convert an item from JSON
+                          into the native object. Assumed signature
+                          takes an :class:`Iterator` and a dictionary
+                          holding a single item.
+
+    :type items_key: str
+    :param items_key: (Optional) The key used to grab retrieved items from an
+                      API response. Defaults to :data:`DEFAULT_ITEMS_KEY`.
+
+    :type page_token: str
+    :param page_token: (Optional) A token identifying a page in a result set.
+
+    :type max_results: int
+    :param max_results: (Optional) The maximum number of results to fetch.
+
+    :type extra_params: dict
+    :param extra_params: (Optional) Extra query string parameters for the
+                         API call.
+
+    :type page_start: callable
+    :param page_start: (Optional) Callable to provide any special behavior
+                       after a new page has been created. Assumed signature
+                       takes the :class:`Iterator` that started the page,
+                       the :class:`Page` that was started and the dictionary
+                       containing the page response.
+    """
+
+    def __init__(self, client, connection, path, item_to_value,
+                 items_key=DEFAULT_ITEMS_KEY,
+                 page_token=None, max_results=None, extra_params=None,
+                 page_start=_do_nothing_page_start):
+        super(AsyncHTTPIterator, self).__init__(
+            client, path, item_to_value, items_key=items_key,
+            page_token=page_token, max_results=max_results,
+            extra_params=extra_params, page_start=page_start)
+        self.connection = connection
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.connection.close()
+
+    @property
+    def pages(self):
+        """Asynchronous iterator of pages in the response.
+
+        :rtype: :class:`_AsyncPageIterator`
+        :returns: An object to be consumed with ``async for``, producing
+                  :class:`~google.cloud.iterator.Page` instances.
+        :raises ValueError: If the iterator has already been started.
+        """
+        if self._started:
+            raise ValueError('Iterator has already started', self)
+        self._started = True
+        return _AsyncPageIterator(self, increment=True)
+
+    def __aiter__(self):
+        """Asynchronous iterator for each item returned.
+
+        :rtype: :class:`_AsyncItemIterator`
+        :returns: An object to be consumed with ``async for``, producing
+                  items from the API.
+        :raises ValueError: If the iterator has already been started.
+        """
+        if self._started:
+            raise ValueError('Iterator has already started', self)
+        self._started = True
+        return _AsyncItemIterator(self)
+
+    def __iter__(self):
+        """Synchronous iteration is not supported.
+
+        :raises TypeError: Always; use ``async for`` instead.
+        """
+        raise TypeError('Use "async for" to iterate', self)
+
+    async def _next_page(self):
+        """Get the next page in the iterator.
+
+        :rtype: :class:`~google.cloud.iterator.Page`
+        :returns: The next page in the iterator (or :data:`None` if
+                  there are no pages left).
+        """
+        if self._has_next_page():
+            response = await self._get_next_page_response()
+            return self._page_from_response(response)
+        else:
+            return None
+
+    async def _get_next_page_response(self):
+        """Requests the next page from the path provided.
+
+        :rtype: dict
+        :returns: The parsed JSON response of the next page's contents.
+        """
+        params = self._get_query_params()
+        if self._HTTP_METHOD == 'GET':
+            return await self.connection.api_request(
+                method=self._HTTP_METHOD,
+                path=self.path,
+                query_params=params)
+        elif self._HTTP_METHOD == 'POST':
+            return await self.connection.api_request(
+                method=self._HTTP_METHOD,
+                path=self.path,
+                data=params)
+        else:
+            raise ValueError('Unexpected HTTP method', self._HTTP_METHOD)
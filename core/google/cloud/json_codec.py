@@ -0,0 +1,247 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pluggable JSON encoding and decoding of API payloads.
+
+:meth:`~google.cloud._http.JSONConnection.api_request` encodes request
+bodies and decodes responses with the ``json_codec`` of the client, which
+defaults to :data:`STDLIB_CODEC`.  :func:`fast_codec` returns a codec
+based on `orjson`_, if installed, which works on bytes directly (skipping
+the intermediate text of the standard library): it encodes a few times
+faster, and decodes faster::
+
+    >>> from google.cloud import json_codec
+    >>> client.json_codec = json_codec.fast_codec()
+
+Both codecs decode to the same values, accept the same values to encode,
+and encode them to JSON which decodes to the same values: the fast codec
+falls back to the standard library for the values it does not handle
+identically (integers beyond 64 bits, strings with lone surrogates,
+numbers out of range of a float, and values of other types than those of
+JSON, such as ``datetime``, ``UUID`` or ``Enum`` values, which `orjson`_
+encodes but the standard library rejects with :exc:`TypeError`).  The
+only exceptions are non-finite floats, which the standard library encodes
+as (invalid) ``NaN`` and ``Infinity`` tokens, and `orjson`_ as ``null``.
+
+`orjson`_ is installed with the ``orjson`` extra::
+
+    $ pip install google-cloud-core[orjson]
+
+.. _orjson: https://pypi.org/project/orjson/
+"""
+
+import json
+
+import six
+
+
+class JSONCodec(object):
+    """Encode and decode JSON with the standard library."""
+
+    name = 'json'
+
+    @staticmethod
+    def dumps(value):
+        """Encode a value as JSON.
+
+        :type value: object
+        :param value: A value made of dictionaries, lists, strings,
+                      numbers, booleans and :data:`None`.
+
+        :rtype: str or bytes
+        :returns: The JSON document.
+        """
+        return json.dumps(value)
+
+    @staticmethod
+    def loads(content):
+        """Decode a JSON document.
+
+        :type content: bytes or str
+        :param content: The document, UTF-8 encoded if bytes.
+
+        :rtype: object
+        :returns: The decoded value.
+        """
+        if isinstance(content, six.binary_type):
+            content = content.decode('utf-8')
+        return json.loads(content)
+
+
+STDLIB_CODEC = JSONCodec()
+"""The default codec, based on the :mod:`json` module."""
+
+
+_DIGITS = bytes(bytearray(
+    ord('0') if ord('0') <= byte <= ord('9') else ord(' ')
+    for byte in range(256)))
+"""Translation table mapping digits to ``0``, and other bytes to spaces."""
+
+_BIG_INTEGER_DIGITS = b'0' * 19
+"""Integers with as many digits might not fit in 64 bits."""
+
+
+_JSON_KEY_TYPES = frozenset(
+    [six.text_type, bool, float, type(None)] + list(six.integer_types))
+"""Types of dictionary keys which ``orjson`` encodes as the stdlib does."""
+
+_JSON_TYPES = _JSON_KEY_TYPES | frozenset([dict, list, tuple])
+"""Types which ``orjson`` encodes as the standard library does."""
+
+
+def _has_json_types_only(value):
+    """Check if a value is made of the types of JSON values only.
+
+    ``orjson`` natively encodes values of other types (e.g. ``UUID`` or
+    ``Enum`` values, or dictionary keys of any type), which the standard
+    library rejects.
+
+    :type value: object
+    :param value: The value to encode.
+
+    :rtype: bool
+    :returns: True if the value, and the values it holds, are all of
+              :data:`_JSON_TYPES`, and its keys of :data:`_JSON_KEY_TYPES`.
+    """
+    json_types = _JSON_TYPES
+    key_types = _JSON_KEY_TYPES
+    values = [value]
+    while values:
+        value = values.pop()
+        kind = type(value)
+        if kind is dict:
+            if not key_types.issuperset(map(type, value)):
+                return False
+            values.extend(six.itervalues(value))
+        elif kind is list or kind is tuple:
+            values.extend(value)
+        elif kind not in json_types:
+            return False
+    return True
+
+
+def _reject(value):
+    """Reject a value ``orjson`` would encode differently from the stdlib.
+
+    :type value: object
+    :param value: The value ``orjson`` cannot encode natively.
+
+    :raises: :exc:`TypeError` always.
+    """
+    raise TypeError('Not a JSON value', value)
+
+
+def _has_big_integers(content):
+    """Check if a JSON document might contain integers beyond 64 bits.
+
+    ``orjson`` decodes those as floats.  Runs of digits inside strings
+    are skipped when they start the string (e.g. ``INT64`` values, which
+    the APIs encode as strings), and otherwise flagged conservatively.
+
+    :type content: bytes
+    :param content: The JSON document.
+
+    :rtype: bool
+    :returns: False if the document has no integer of 19 digits or more.
+    """
+    # Translating, then searching, is much faster than a regular
+    # expression, and leaves little to do in Python.
+    digits = content.translate(_DIGITS)
+    start = digits.find(_BIG_INTEGER_DIGITS)
+    while start != -1:
+        before = content[start - 1:start]
+        if before == b'-':
+            before = content[start - 2:start - 1]
+        if before != b'"':
+            return True
+        end = digits.find(b' ', start)
+        if end == -1:
+            return True
+        start = digits.find(_BIG_INTEGER_DIGITS, end)
+    return False
+
+
+class OrjsonCodec(JSONCodec):
+    """Encode and decode JSON with ``orjson``.
+
+    Encodes to, and decodes from, UTF-8 bytes.
+
+    :raises: :class:`ImportError` if ``orjson`` is not installed.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._options = (
+            orjson.OPT_NON_STR_KEYS |
+            orjson.OPT_PASSTHROUGH_DATETIME |
+            orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumps(self, value):
+        """Encode a value as JSON.
+
+        :type value: object
+        :param value: A value made of dictionaries, lists, strings,
+                      numbers, booleans and :data:`None`.
+
+        :rtype: bytes or str
+        :returns: The JSON document.
+        :raises: :exc:`TypeError` if the value holds other types than those
+                 of JSON values, as the standard library does.
+        """
+        if _has_json_types_only(value):
+            try:
+                return self._dumps(
+                    value, default=_reject, option=self._options)
+            except TypeError:
+                # E.g. integers beyond 64 bits, or lone surrogates.
+                pass
+        return JSONCodec.dumps(value)
+
+    def loads(self, content):
+        """Decode a JSON document.
+
+        :type content: bytes or str
+        :param content: The document, UTF-8 encoded if bytes.
+
+        :rtype: object
+        :returns: The decoded value.
+        """
+        if isinstance(content, six.text_type):
+            content = content.encode('utf-8')
+        if not _has_big_integers(content):
+            try:
+                return self._loads(content)
+            except ValueError:
+                # E.g. numbers out of range of a float: let the standard
+                # library decode them, or report the error.
+                pass
+        return JSONCodec.loads(content)
+
+
+def fast_codec():
+    """Get the fastest codec installed.
+
+    :rtype: :class:`JSONCodec`
+    :returns: An :class:`OrjsonCodec` if ``orjson`` is installed,
+              otherwise :data:`STDLIB_CODEC`.
+    """
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return STDLIB_CODEC
@@ -0,0 +1,200 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache resource metadata, revalidated with conditional requests.
+
+A :class:`MetadataCache` attached to a client keeps the ETag and the
+properties last fetched by each resource ``reload``.  The next reload of
+the same resource sends the ETag in an ``If-None-Match`` header: if the
+resource is unchanged, the API answers ``304 Not Modified`` with an empty
+body, and the cached properties are reused instead of being downloaded
+and decoded again::
+
+    >>> from google.cloud.metadata_cache import MetadataCache
+    >>> client.metadata_cache = MetadataCache(max_size=10000, ttl=300.0)
+    >>> blob = client.bucket('my-bucket').get_blob('config.json')
+    >>> blob.reload()  # Unchanged: 304, no payload.
+
+The API always decides whether cached properties are current, so the cache
+never serves stale metadata: its size and TTL only bound its memory use.
+Entries for a resource are dropped by any other request (``PATCH``,
+``PUT``, ``DELETE``, ...) on its path, made through the same client.
+The cache counts the reloads answered from its entries (``hits``) and
+those which stored a new entry (``misses``).
+"""
+
+import collections
+import threading
+from timeit import default_timer
+
+import six
+
+
+_Entry = collections.namedtuple(
+    '_Entry', ['url', 'etag', 'properties', 'expires'])
+
+
+def _copy_json(value):
+    """Copy a decoded JSON value.
+
+    Faster than :func:`copy.deepcopy` for the dictionaries, lists and
+    scalars of a decoded resource.
+
+    :type value: object
+    :param value: A value decoded from JSON.
+
+    :rtype: object
+    :returns: A copy sharing no mutable containers with ``value``.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in six.iteritems(value)}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+class MetadataCache(object):
+    """Bounded cache of resource properties, keyed by resource path.
+
+    Safe to share between threads.
+
+    :type max_size: int
+    :param max_size: (Optional) The maximum number of resources cached; the
+                     least recently used are evicted first.
+
+    :type ttl: float
+    :param ttl: (Optional) Seconds after which an entry, not revalidated
+                since it was stored, is dropped.  Defaults to
+                :data:`None`: entries only expire when evicted.
+
+    :raises: :class:`ValueError` if ``max_size`` or ``ttl`` is not positive.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        if max_size < 1:
+            raise ValueError('max_size must be positive', max_size)
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be positive', ttl)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        with self._lock:
+            state = self.__dict__.copy()
+            state['_entries'] = self._entries.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _expires(self):
+        """Expiry time of an entry stored now.
+
+        :rtype: float
+        :returns: The time, or :data:`None` if entries do not expire.
+        """
+        if self.ttl is None:
+            return None
+        return default_timer() + self.ttl
+
+    def get(self, path, url):
+        """Find the cached entry for a resource.
+
+        :type path: str
+        :param path: The path of the resource.
+
+        :type url: str
+        :param url: The full URL of the request, including its query
+                    parameters: an entry stored for another URL (e.g. a
+                    different ``projection``) does not match.
+
+        :rtype: tuple
+        :returns: The entry, with ``etag`` and ``properties`` fields, or
+                  :data:`None` if there is no current entry.
+        """
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return None
+            if entry.expires is not None and entry.expires < default_timer():
+                return None
+            # Re-insert, as the most recently used.
+            self._entries[path] = entry
+        if entry.url != url:
+            return None
+        return entry
+
+    def put(self, path, url, etag, properties):
+        """Cache the properties fetched for a resource.
+
+        :type path: str
+        :param path: The path of the resource.
+
+        :type url: str
+        :param url: The full URL of the request.
+
+        :type etag: str
+        :param etag: The ETag of the resource.
+
+        :type properties: dict
+        :param properties: The decoded resource: a copy is cached.
+        """
+        entry = _Entry(url, etag, _copy_json(properties), self._expires())
+        with self._lock:
+            self.misses += 1
+            self._entries.pop(path, None)
+            self._entries[path] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def revalidated(self, path, entry):
+        """Reuse an entry, which the API reported as not modified.
+
+        :type path: str
+        :param path: The path of the resource.
+
+        :type entry: tuple
+        :param entry: The entry returned by :meth:`get`.
+
+        :rtype: dict
+        :returns: A copy of the cached properties.
+        """
+        with self._lock:
+            self.hits += 1
+            if self._entries.get(path) is entry:
+                self._entries[path] = entry._replace(expires=self._expires())
+        return _copy_json(entry.properties)
+
+    def invalidate(self, path):
+        """Drop the entry for a resource, if any.
+
+        :type path: str
+        :param path: The path of the resource.
+        """
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
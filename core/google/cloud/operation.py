@@ -14,9 +14,21 @@
 
 """Wrap long-running operations returned from Google Cloud APIs."""
 
+import heapq
+import itertools
+import logging
+import random
+import threading
+from timeit import default_timer
+
 from google.longrunning import operations_pb2
 from google.protobuf import json_format
 
+from google.cloud.retry import if_transient_error
+
+
+_LOGGER = logging.getLogger(__name__)
+
 
 _GOOGLE_APIS_PREFIX = 'type.googleapis.com'
 
@@ -268,3 +280,341 @@ class Operation(object):
         self._update_state(operation_pb)
 
         return self.complete
+
+
+class _TrackedOperation(object):
+    """An operation tracked by an :class:`OperationPoller`.
+
+    :type operation: :class:`Operation`
+    :param operation: The operation to poll until it completes.
+
+    :type delay: float
+    :param delay: Seconds between the next two polls of the operation.
+
+    :type callback: callable
+    :param callback: (Optional) Called with the operation once it has
+                     finished.
+    """
+
+    __slots__ = ('operation', 'delay', 'callback')
+
+    def __init__(self, operation, delay, callback=None):
+        self.operation = operation
+        self.delay = delay
+        self.callback = callback
+
+
+class OperationPoller(object):
+    """Poll many long-running operations concurrently.
+
+    Rather than one ``while not operation.poll(): time.sleep(...)`` loop
+    per operation, a poller tracks any number of operations and polls them
+    from a small pool of worker threads.  Each operation is polled on its
+    own schedule: the delay between its polls grows exponentially (with
+    some jitter), from ``initial_delay`` up to ``maximum_delay``, so that
+    quick operations are noticed quickly while slow ones cost few requests.
+
+    Operations created from either the gRPC or the JSON / HTTP API can be
+    tracked (see :meth:`Operation.poll`), as long as their clients can be
+    used from several threads.
+
+    .. code-block:: python
+
+       with OperationPoller() as poller:
+           for operation in operations:
+               poller.add(operation)
+           for operation in poller.as_completed(timeout=600):
+               print(operation.name, operation.error or operation.response)
+
+    Errors raised while polling an operation are retried (with backoff) if
+    transient; otherwise the operation stops being polled and is reported
+    as finished, and the error is recorded in the poller's ``errors`` dict
+    (keyed by operation).
+
+    Callbacks always run on a worker thread, even for operations which are
+    already complete when added.
+
+    :type operations: iterable
+    :param operations: (Optional) :class:`Operation` instances to track.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of polling requests
+                        made at the same time.
+
+    :type initial_delay: float
+    :param initial_delay: (Optional) Seconds between the first two polls of
+                          an operation.
+
+    :type maximum_delay: float
+    :param maximum_delay: (Optional) Maximum seconds between two polls of
+                          an operation.
+
+    :type multiplier: float
+    :param multiplier: (Optional) Growth factor of the delay after each
+                       poll.
+    """
+
+    def __init__(self, operations=(), max_workers=10, initial_delay=1.0,
+                 maximum_delay=30.0, multiplier=1.5):
+        if max_workers < 1:
+            raise ValueError('max_workers must be positive', max_workers)
+        self._max_workers = max_workers
+        self.initial_delay = initial_delay
+        self.maximum_delay = maximum_delay
+        self.multiplier = multiplier
+        self.errors = {}
+        self._condition = threading.Condition()
+        # Heap of (due time, sequence, _TrackedOperation).
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._done_callbacks = []
+        self._pending = 0
+        self._finished = []
+        self._workers = []
+        self._closed = False
+        for operation in operations:
+            self.add(operation)
+
+    @property
+    def pending(self):
+        """Number of tracked operations which have not finished.
+
+        :rtype: int
+        :returns: The count of operations still being polled.
+        """
+        with self._condition:
+            return self._pending
+
+    @property
+    def finished(self):
+        """Tracked operations which have finished, in completion order.
+
+        :rtype: list
+        :returns: The finished :class:`Operation` instances.
+        """
+        with self._condition:
+            return list(self._finished)
+
+    def add(self, operation, callback=None):
+        """Start tracking an operation.
+
+        :type operation: :class:`Operation`
+        :param operation: The operation to poll until it completes.
+
+        :type callback: callable
+        :param callback: (Optional) Called with the operation, from a
+                         worker thread, once it has finished.  An operation
+                         added several times is tracked (and reported as
+                         finished) as many times, each with its callback.
+
+        :rtype: :class:`Operation`
+        :returns: ``operation``, for convenience.
+        :raises: :class:`ValueError` if the poller has been closed.
+        """
+        tracked = _TrackedOperation(operation, self.initial_delay, callback)
+        with self._condition:
+            if self._closed:
+                raise ValueError('The poller has been closed.')
+            self._pending += 1
+            self._push(tracked, default_timer())
+            self._start_worker()
+        return operation
+
+    def add_done_callback(self, callback):
+        """Register a callback for every tracked operation.
+
+        :type callback: callable
+        :param callback: Called with each operation, from a worker thread,
+                         once it has finished. Operations which finished
+                         before the callback was added are not reported.
+        """
+        with self._condition:
+            self._done_callbacks.append(callback)
+
+    def wait(self, timeout=None):
+        """Wait for all tracked operations to finish.
+
+        :type timeout: float
+        :param timeout: (Optional) The maximum number of seconds to wait.
+                        If :data:`None`, wait indefinitely.
+
+        :rtype: bool
+        :returns: Flag indicating if all operations have finished (it is
+                  only false if ``timeout`` elapsed).
+        """
+        deadline = None if timeout is None else default_timer() + timeout
+        with self._condition:
+            while self._pending:
+                if not self._wait(deadline):
+                    break
+            return not self._pending
+
+    def as_completed(self, timeout=None):
+        """Iterate over tracked operations as they finish.
+
+        Yields the operations which have already finished first, then the
+        others as they do.
+
+        :type timeout: float
+        :param timeout: (Optional) The maximum number of seconds to wait
+                        for operations to finish. If :data:`None`, wait
+                        indefinitely. Once elapsed, the iteration stops:
+                        operations still pending are not yielded.
+
+        :rtype: :class:`~types.GeneratorType`
+        :returns: A generator of finished :class:`Operation` instances.
+        """
+        deadline = None if timeout is None else default_timer() + timeout
+        index = 0
+        while True:
+            with self._condition:
+                while index == len(self._finished) and self._pending:
+                    if not self._wait(deadline):
+                        return
+                if index == len(self._finished):
+                    return
+                operation = self._finished[index]
+            index += 1
+            yield operation
+
+    def close(self):
+        """Stop polling, and wait for the worker threads to exit.
+
+        Operations still pending are left as they are.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            if worker is not threading.current_thread():
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _wait(self, deadline):
+        """Wait for a notification; caller must hold the lock.
+
+        :type deadline: float
+        :param deadline: Time (as per :func:`timeit.default_timer`) after
+                         which to stop waiting, or :data:`None`.
+
+        :rtype: bool
+        :returns: False if ``deadline`` has passed, else True.
+        """
+        if deadline is None:
+            self._condition.wait()
+            return True
+        remaining = deadline - default_timer()
+        if remaining <= 0:
+            return False
+        self._condition.wait(remaining)
+        return True
+
+    def _push(self, tracked, due):
+        """Schedule the next poll of an operation; caller must hold the lock.
+
+        :type tracked: :class:`_TrackedOperation`
+        :param tracked: The operation to poll.
+
+        :type due: float
+        :param due: Time (as per :func:`timeit.default_timer`) of the poll.
+        """
+        heapq.heappush(
+            self._schedule, (due, next(self._sequence), tracked))
+        self._condition.notify_all()
+
+    def _start_worker(self):
+        """Start a worker thread, if needed; caller must hold the lock."""
+        if len(self._workers) >= min(self._max_workers, self._pending):
+            return
+        worker = threading.Thread(
+            target=self._run, name='OperationPoller-%d' % (
+                len(self._workers),))
+        worker.daemon = True
+        self._workers.append(worker)
+        worker.start()
+
+    def _next_due(self):
+        """Wait for the next operation due to be polled.
+
+        :rtype: :class:`_TrackedOperation`
+        :returns: The operation to poll, or :data:`None` once the poller is
+                  closed.
+        """
+        with self._condition:
+            while not self._closed:
+                if not self._schedule:
+                    self._condition.wait()
+                    continue
+                due = self._schedule[0][0]
+                now = default_timer()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                return heapq.heappop(self._schedule)[2]
+        return None
+
+    def _run(self):
+        """Worker thread: poll operations as they become due."""
+        while True:
+            tracked = self._next_due()
+            if tracked is None:
+                return
+            # Operations already complete when added are not polled.
+            complete = tracked.operation.complete
+            if not complete:
+                try:
+                    complete = tracked.operation.poll()
+                except Exception as exc:  # pylint: disable=broad-except
+                    if not if_transient_error(exc):
+                        self._finish(tracked, error=exc)
+                        continue
+                    complete = False
+            if complete:
+                self._finish(tracked)
+            else:
+                self._reschedule(tracked)
+
+    def _reschedule(self, tracked):
+        """Schedule the next poll of an operation, backing off.
+
+        :type tracked: :class:`_TrackedOperation`
+        :param tracked: The operation which is still running.
+        """
+        with self._condition:
+            delay = tracked.delay
+            tracked.delay = min(delay * self.multiplier, self.maximum_delay)
+            self._push(
+                tracked, default_timer() + random.uniform(0.5, 1.0) * delay)
+
+    def _finish(self, tracked, error=None):
+        """Run the callbacks of a finished operation, then record it.
+
+        :type tracked: :class:`_TrackedOperation`
+        :param tracked: The operation which has finished.
+
+        :type error: :class:`Exception`
+        :param error: (Optional) The error which stopped the polling.
+        """
+        operation = tracked.operation
+        with self._condition:
+            callbacks = list(self._done_callbacks)
+            if tracked.callback is not None:
+                callbacks.append(tracked.callback)
+            if error is not None:
+                self.errors[operation] = error
+        for callback in callbacks:
+            try:
+                callback(operation)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    'Callback for operation %s raised', operation.name)
+        with self._condition:
+            self._finished.append(operation)
+            self._pending -= 1
+            self._condition.notify_all()
@@ -0,0 +1,441 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Limit the rate and concurrency of API calls, adapting to overload.
+
+A :class:`RateLimiter` combines a token bucket, bounding the rate at which
+calls are sent, with a concurrency limit, bounding how many are in flight.
+Both back off (multiplicatively) as soon as a call is rejected because the
+API is overloaded (HTTP ``429`` or ``503``, gRPC ``RESOURCE_EXHAUSTED``),
+and ramp back up (additively) as calls succeed::
+
+    >>> from google.cloud.rate_limit import RateLimiter
+    >>> client.rate_limiter = RateLimiter(rate=100.0, max_concurrency=16)
+    >>> for blob in blobs:
+    ...     bucket.delete_blob(blob.name)
+
+Each attempt of a retried call goes through the limiter, so that retries
+slow down with the rest of the traffic instead of adding to the overload.
+
+A :class:`MethodRateLimiter` sets different limits per API method, keyed
+by HTTP method and path template (as reported to
+:mod:`~google.cloud.instrumentation` listeners)::
+
+    >>> from google.cloud.rate_limit import MethodRateLimiter
+    >>> client.rate_limiter = MethodRateLimiter({
+    ...     'DELETE /b/{}/o/{}': RateLimiter(rate=50.0),
+    ...     'POST /projects/{}/topics/{}:publish': RateLimiter(
+    ...         max_concurrency=8),
+    ... }, default=RateLimiter(rate=500.0))
+
+Either can also be passed to a single
+:meth:`~google.cloud._http.JSONConnection.api_request` call, or to
+:func:`~google.cloud._helpers.make_secure_stub` (for unary gRPC calls,
+keyed by ``'/Service/Method'``).
+
+The current rate and concurrency limit of every limiter are reported by
+:func:`~google.cloud.instrumentation.rate_limiter_stats`, and the time
+each call waited for the limiter by the ``throttle_delay`` of its
+:class:`~google.cloud.instrumentation.CallRecord`.
+"""
+
+import collections
+import threading
+import time
+from timeit import default_timer
+
+from six.moves import http_client
+
+from google.cloud import instrumentation
+from google.cloud.retry import error_code
+
+
+OVERLOAD_CODES = frozenset([
+    429,  # Too Many Requests
+    http_client.SERVICE_UNAVAILABLE,
+    'RESOURCE_EXHAUSTED',
+])
+"""HTTP and gRPC status codes which make a :class:`RateLimiter` back off."""
+
+
+RateLimiterStats = collections.namedtuple('RateLimiterStats', [
+    'name', 'rate', 'max_rate', 'concurrency_limit', 'max_concurrency',
+    'in_flight', 'calls', 'backoffs', 'throttled', 'throttle_delay'])
+"""A snapshot of the state of a :class:`RateLimiter`.
+
+``rate`` and ``concurrency_limit`` are the current limits (:data:`None`
+if not limited), ``max_rate`` and ``max_concurrency`` the limits they ramp
+back up to.  ``calls`` counts the calls sent, ``backoffs`` the times the
+limits were lowered, ``throttled`` the calls which had to wait, and
+``throttle_delay`` the total seconds they waited.
+"""
+
+
+class _Permit(object):
+    """Permission to send one call, returned by :meth:`RateLimiter.acquire`.
+
+    :type started: float
+    :param started: When the permit was requested.
+
+    :type delay: float
+    :param delay: Seconds waited for the permit.
+    """
+
+    __slots__ = ('started', 'delay')
+
+    def __init__(self, started, delay):
+        self.started = started
+        self.delay = delay
+
+
+class RateLimiter(object):
+    """Token bucket and AIMD concurrency limit, for the calls of a client.
+
+    Safe to share between threads: :meth:`acquire` blocks the calling
+    thread until the call may be sent.
+
+    When a call is rejected because of overload, the rate and concurrency
+    limit are multiplied by ``decrease`` (at most once for all the calls in
+    flight at the time, which likely failed for the same reason).  Every
+    successful call then raises the concurrency limit by ``1 / limit``
+    (i.e. by one per "window" of calls), and the rate by
+    ``max_rate / ramp_up`` per second of successful calls, until they reach
+    their maximum again.
+
+    :type rate: float
+    :param rate: (Optional) The maximum number of calls sent per second.
+                 If :data:`None` (the default), the rate is not limited.
+
+    :type burst: float
+    :param burst: (Optional) The number of calls which can be sent at once,
+                  after a pause. Defaults to one second of calls at
+                  ``rate`` (and at least one).
+
+    :type max_concurrency: int
+    :param max_concurrency: (Optional) The maximum number of calls in
+                            flight. If :data:`None` (the default), the
+                            concurrency is not limited.
+
+    :type initial_concurrency: int
+    :param initial_concurrency: (Optional) The concurrency limit to start
+                                with. Defaults to ``max_concurrency``.
+
+    :type min_concurrency: int
+    :param min_concurrency: (Optional) The lowest concurrency limit to back
+                            off to.
+
+    :type min_rate: float
+    :param min_rate: (Optional) The lowest rate to back off to. Defaults
+                     to ``rate / 100``.
+
+    :type decrease: float
+    :param decrease: (Optional) Factor applied to the limits on overload,
+                     between 0 and 1.
+
+    :type ramp_up: float
+    :param ramp_up: (Optional) Seconds of successful calls for the rate to
+                    grow back by ``rate``: from its lowest to its maximum.
+
+    :type name: str
+    :param name: (Optional) Name of the limiter, in its
+                 :class:`RateLimiterStats`.
+
+    :raises: :class:`ValueError` if a limit is not positive, or
+             ``decrease`` is not between 0 and 1.
+    """
+
+    def __init__(self, rate=None, burst=None, max_concurrency=None,
+                 initial_concurrency=None, min_concurrency=1,
+                 min_rate=None, decrease=0.5, ramp_up=10.0, name=None):
+        if rate is not None and rate <= 0:
+            raise ValueError('rate must be positive', rate)
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError('max_concurrency must be positive',
+                             max_concurrency)
+        if not 0 < decrease < 1:
+            raise ValueError('decrease must be between 0 and 1', decrease)
+        if min_concurrency < 1:
+            raise ValueError('min_concurrency must be positive',
+                             min_concurrency)
+        self.name = name
+        self.max_rate = rate
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.decrease = decrease
+        self.ramp_up = ramp_up
+
+        if rate is None:
+            self.burst = self.min_rate = None
+        else:
+            self.burst = max(1.0, rate if burst is None else burst)
+            self.min_rate = rate / 100.0 if min_rate is None else min_rate
+        self._rate = rate
+        self._tokens = self.burst
+        self._refilled = default_timer()
+
+        if max_concurrency is None:
+            self._concurrency_limit = None
+        else:
+            self._concurrency_limit = float(
+                initial_concurrency or max_concurrency)
+
+        self._init_state()
+
+    def _init_state(self):
+        """Reset the state which is not pickled."""
+        self._condition = threading.Condition(threading.Lock())
+        self._in_flight = 0
+        self._last_backoff = default_timer()
+        self.calls = 0
+        self.backoffs = 0
+        self.throttled = 0
+        self.throttle_delay = 0.0
+        instrumentation.track_rate_limiter(self)
+
+    def __getstate__(self):
+        """Get the state of the limiter to pickle.
+
+        :rtype: dict
+        :returns: The current limits, without the calls in flight.
+        """
+        with self._condition:
+            state = self.__dict__.copy()
+        for name in ('_condition', '_in_flight', '_last_backoff', 'calls',
+                     'backoffs', 'throttled', 'throttle_delay'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of an unpickled limiter.
+
+        :type state: dict
+        :param state: The state returned by :meth:`__getstate__`.
+        """
+        self.__dict__.update(state)
+        self._refilled = default_timer()
+        self._init_state()
+
+    def select(self, key):  # pylint: disable=unused-argument
+        """Get the limiter for an API method.
+
+        :type key: str
+        :param key: The HTTP method and path template of the call (e.g.
+                    ``'DELETE /b/{}/o/{}'``), or the full name of the gRPC
+                    method (e.g. ``'/Bigtable/MutateRow'``).
+
+        :rtype: :class:`RateLimiter`
+        :returns: This limiter, used for every method.
+        """
+        return self
+
+    @property
+    def rate(self):
+        """The current rate limit.
+
+        :rtype: float
+        :returns: Calls per second, or :data:`None` if not limited.
+        """
+        return self._rate
+
+    @property
+    def concurrency_limit(self):
+        """The current concurrency limit.
+
+        :rtype: int
+        :returns: The number of calls allowed in flight, or :data:`None`
+                  if not limited.
+        """
+        if self._concurrency_limit is None:
+            return None
+        return int(self._concurrency_limit)
+
+    def _reserve_token(self, now):
+        """Take a token from the bucket, possibly ahead of time.
+
+        Must be called with the lock held.
+
+        :type now: float
+        :param now: The current time.
+
+        :rtype: float
+        :returns: Seconds to wait until the token is actually available.
+        """
+        if self._rate is None:
+            return 0.0
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+    def acquire(self):
+        """Wait until a call may be sent.
+
+        :meth:`release` must be called with the returned permit once the
+        call completes.
+
+        :rtype: :class:`_Permit`
+        :returns: The permit to send the call, with the ``delay`` waited.
+        """
+        started = default_timer()
+        with self._condition:
+            delay = self._reserve_token(started)
+        waited = bool(delay)
+        if waited:
+            time.sleep(delay)
+        with self._condition:
+            while (self._concurrency_limit is not None and
+                   self._in_flight >= int(self._concurrency_limit)):
+                waited = True
+                self._condition.wait()
+            self._in_flight += 1
+            self.calls += 1
+            delay = 0.0
+            if waited:
+                delay = default_timer() - started
+                self.throttled += 1
+                self.throttle_delay += delay
+        return _Permit(started, delay)
+
+    def _back_off(self, now):
+        """Lower the limits after a call was rejected.
+
+        Must be called with the lock held.
+
+        :type now: float
+        :param now: The current time.
+        """
+        self._last_backoff = now
+        self.backoffs += 1
+        if self._concurrency_limit is not None:
+            self._concurrency_limit = max(
+                self.min_concurrency,
+                self._concurrency_limit * self.decrease)
+        if self._rate is not None:
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            # Stop any burst in progress.
+            self._tokens = min(self._tokens, 0.0)
+
+    def _ramp_up(self):
+        """Raise the limits after a call succeeded.
+
+        Must be called with the lock held.
+
+        :rtype: bool
+        :returns: Flag indicating if one more call may now be in flight.
+        """
+        if self._rate is not None and self._rate < self.max_rate:
+            self._rate = min(
+                self.max_rate,
+                self._rate + self.max_rate / (self.ramp_up * self._rate))
+        limit = self._concurrency_limit
+        if limit is None or limit >= self.max_concurrency:
+            return False
+        self._concurrency_limit = min(
+            self.max_concurrency, limit + 1.0 / limit)
+        return int(self._concurrency_limit) > int(limit)
+
+    def release(self, permit, status):
+        """Report that a call completed, adapting the limits.
+
+        :type permit: :class:`_Permit`
+        :param permit: The permit returned by :meth:`acquire`.
+
+        :type status: int or str
+        :param status: The HTTP status code, or the name of the gRPC status
+                       code, of the call; :data:`None` if no response was
+                       received (which adapts neither limit).
+        """
+        with self._condition:
+            self._in_flight -= 1
+            wake = 1
+            if status in OVERLOAD_CODES:
+                # Calls sent before the last back-off were likely rejected
+                # by the same overload: back off once for all of them.
+                if permit.started >= self._last_backoff:
+                    self._back_off(default_timer())
+            elif status is not None and self._ramp_up():
+                wake = 2
+            self._condition.notify(wake)
+
+    def call(self, function):
+        """Call a function once it may be sent, adapting the limits.
+
+        :type function: callable
+        :param function: The function to call, without arguments; it
+                         raises an error (carrying a status code, see
+                         :func:`~google.cloud.retry.error_code`) if the
+                         call fails.
+
+        :rtype: tuple
+        :returns: The result of the function, and the seconds waited before
+                  calling it.
+        """
+        permit = self.acquire()
+        try:
+            result = function()
+        except Exception as exc:
+            self.release(permit, error_code(exc))
+            raise
+        self.release(permit, 'OK')
+        return result, permit.delay
+
+    def stats(self):
+        """Get a snapshot of the state of the limiter.
+
+        :rtype: :class:`RateLimiterStats`
+        :returns: The current limits and counters.
+        """
+        with self._condition:
+            return RateLimiterStats(
+                self.name, self._rate, self.max_rate,
+                self.concurrency_limit, self.max_concurrency,
+                self._in_flight, self.calls, self.backoffs, self.throttled,
+                self.throttle_delay)
+
+
+class MethodRateLimiter(object):
+    """Different :class:`RateLimiter` instances per API method.
+
+    :type limiters: dict
+    :param limiters: Limiters, keyed by HTTP method and path template
+                     (e.g. ``'DELETE /b/{}/o/{}'``) or by full gRPC method
+                     name (e.g. ``'/Bigtable/MutateRow'``).  Unnamed
+                     limiters are named after their key.
+
+    :type default: :class:`RateLimiter`
+    :param default: (Optional) The limiter for other methods. If
+                    :data:`None` (the default), they are not limited.
+    """
+
+    def __init__(self, limiters, default=None):
+        self.limiters = dict(limiters)
+        self.default = default
+        for key, limiter in self.limiters.items():
+            if limiter.name is None:
+                limiter.name = key
+
+    def select(self, key):
+        """Get the limiter for an API method.
+
+        :type key: str
+        :param key: The HTTP method and path template of the call, or the
+                    full name of the gRPC method.
+
+        :rtype: :class:`RateLimiter`
+        :returns: The limiter for ``key``, or the default limiter.
+        """
+        return self.limiters.get(key, self.default)
@@ -0,0 +1,284 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retry API calls which fail with transient errors.
+
+A :class:`Retry` policy retries a call with exponentially growing,
+randomized ("full jitter") delays, for as long as its predicate accepts
+the error raised and its overall deadline allows::
+
+    >>> from google.cloud.retry import Retry
+    >>> retry = Retry(deadline=30.0)
+    >>> bucket = retry.call(lambda: client.get_bucket('my-bucket'))
+
+A policy can be attached to a client, to be used for every idempotent
+(``GET``, ``HEAD``, ``PUT`` or ``DELETE``)
+:meth:`~google.cloud._http.JSONConnection.api_request` it makes, or passed
+to a single ``api_request`` call, of any method::
+
+    >>> client.retry = Retry()
+    >>> client._connection.api_request('GET', '/b/my-bucket', retry=Retry())
+
+It can also be passed to :func:`~google.cloud._helpers.make_secure_stub`
+(for unary gRPC calls) and to the transfers in
+:mod:`google.cloud.streaming.transfer`.
+
+Retries made by ``api_request`` and by gRPC stubs are reported in the
+``retry_count`` of :class:`~google.cloud.instrumentation.CallRecord`.
+"""
+
+# Avoid the grpc and google.cloud.grpc collision.
+from __future__ import absolute_import
+
+import functools
+import random
+import socket
+import time
+from timeit import default_timer
+
+import six
+from six.moves import http_client
+
+
+TRANSIENT_HTTP_CODES = frozenset([
+    429,  # Too Many Requests
+    http_client.INTERNAL_SERVER_ERROR,
+    http_client.BAD_GATEWAY,
+    http_client.SERVICE_UNAVAILABLE,
+    http_client.GATEWAY_TIMEOUT,
+])
+"""HTTP status codes retried by :func:`if_transient_error`."""
+
+TRANSIENT_GRPC_CODES = frozenset([
+    'INTERNAL',
+    'RESOURCE_EXHAUSTED',
+    'UNAVAILABLE',
+])
+"""Names of gRPC status codes retried by :func:`if_transient_error`."""
+
+_CONNECTION_ERRORS = (socket.error, http_client.HTTPException)
+
+
+def error_code(exc):
+    """Get the status code carried by an error.
+
+    Understands :class:`~google.cloud.exceptions.GoogleCloudError`,
+    :class:`~google.cloud.streaming.exceptions.HttpError`,
+    :class:`grpc.RpcError` and ``google.gax.errors.GaxError``.
+
+    :type exc: :class:`Exception`
+    :param exc: The error raised by an API call.
+
+    :rtype: int or str
+    :returns: The HTTP status code, or the name of the gRPC status code
+              (e.g. ``'UNAVAILABLE'``), or :data:`None` if ``exc`` carries
+              neither.
+    """
+    cause = getattr(exc, 'cause', None)
+    if cause is not None:
+        exc = cause
+
+    code = getattr(exc, 'code', None)
+    if callable(code):
+        try:
+            return code().name
+        except Exception:  # pylint: disable=broad-except
+            return None
+    if isinstance(code, six.integer_types):
+        return code
+    return getattr(exc, 'status_code', None)
+
+
+def if_status_code(*codes):
+    """Build a predicate retrying errors with the given status codes.
+
+    :type codes: tuple
+    :param codes: HTTP status codes (:class:`int`), and / or gRPC status
+                  codes (members of :class:`grpc.StatusCode` or their
+                  names).
+
+    :rtype: callable
+    :returns: A predicate to pass to :class:`Retry`.
+    """
+    names = frozenset(getattr(code, 'name', code) for code in codes)
+
+    def predicate(exc):
+        """Check the status code of an error.
+
+        :type exc: :class:`Exception`
+        :param exc: The error raised by an API call.
+
+        :rtype: bool
+        :returns: Flag indicating if the call should be retried.
+        """
+        return error_code(exc) in names
+
+    return predicate
+
+
+def if_transient_error(exc):
+    """Default predicate: retry connection errors and transient statuses.
+
+    Retries errors with one of :data:`TRANSIENT_HTTP_CODES` or
+    :data:`TRANSIENT_GRPC_CODES`, responses asking to be retried later
+    (with a ``retry-after`` header), and socket / HTTP connection errors.
+
+    :type exc: :class:`Exception`
+    :param exc: The error raised by an API call.
+
+    :rtype: bool
+    :returns: Flag indicating if the call should be retried.
+    """
+    if isinstance(exc, _CONNECTION_ERRORS):
+        return True
+    if getattr(exc, 'retry_after', None) is not None:
+        return True
+    code = error_code(exc)
+    return code in TRANSIENT_HTTP_CODES or code in TRANSIENT_GRPC_CODES
+
+
+class Retry(object):
+    """Policy for retrying failed API calls.
+
+    The delay before the ``n``-th retry is chosen uniformly at random
+    between zero and ``min(initial * multiplier ** (n - 1), maximum)``
+    seconds ("full jitter"), so that many clients failing at once don't
+    retry in lock-step.  If the error asks for a longer delay (with a
+    ``retry-after`` header), that delay is used instead.
+
+    :type predicate: callable
+    :param predicate: (Optional) Called with the error raised by a failed
+                      call; returns a flag indicating if the call should be
+                      retried. Defaults to :func:`if_transient_error`.
+
+    :type initial: float
+    :param initial: (Optional) Upper bound of the first delay, in seconds.
+
+    :type maximum: float
+    :param maximum: (Optional) Upper bound of any delay, in seconds.
+
+    :type multiplier: float
+    :param multiplier: (Optional) Growth factor of the delay bound.
+
+    :type deadline: float
+    :param deadline: (Optional) Seconds, from the first attempt, after which
+                     no retry is made: the last error is raised instead.
+                     If :data:`None`, retry for as long as the predicate
+                     allows.
+    """
+
+    def __init__(self, predicate=if_transient_error, initial=1.0,
+                 maximum=32.0, multiplier=2.0, deadline=120.0):
+        self.predicate = predicate
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.deadline = deadline
+
+    def __repr__(self):
+        return (
+            'Retry(predicate=%r, initial=%r, maximum=%r, multiplier=%r, '
+            'deadline=%r)' % (
+                self.predicate, self.initial, self.maximum,
+                self.multiplier, self.deadline))
+
+    def delays(self):
+        """Generate the delays to sleep for between attempts.
+
+        :rtype: :class:`~types.GeneratorType`
+        :returns: An infinite generator of delays, in seconds.
+        """
+        bound = self.initial
+        while True:
+            yield random.uniform(0.0, bound)
+            bound = min(bound * self.multiplier, self.maximum)
+
+    def _start(self):
+        """Start retrying a call.
+
+        :rtype: float
+        :returns: The time (as per :func:`timeit.default_timer`) after
+                  which no more retries are made, or :data:`None`.
+        """
+        if self.deadline is None:
+            return None
+        return default_timer() + self.deadline
+
+    def _retry_delay(self, exc, delay, deadline):
+        """Decide whether to retry after an error.
+
+        :type exc: :class:`Exception`
+        :param exc: The error raised by the latest attempt.
+
+        :type delay: float
+        :param delay: The delay generated by :meth:`delays`.
+
+        :type deadline: float
+        :param deadline: The value returned by :meth:`_start`.
+
+        :rtype: float
+        :returns: The delay to sleep for before retrying, or :data:`None`
+                  if the error should be raised.
+        """
+        if not self.predicate(exc):
+            return None
+        retry_after = getattr(exc, 'retry_after', None)
+        if isinstance(retry_after, (int, float)):
+            delay = max(delay, retry_after)
+        if deadline is not None and default_timer() + delay > deadline:
+            return None
+        return delay
+
+    def call(self, function, on_retry=None):
+        """Call a function, retrying as long as the policy allows.
+
+        :type function: callable
+        :param function: The function to call, without arguments.
+
+        :type on_retry: callable
+        :param on_retry: (Optional) Called with the error and the delay
+                         before each retry.
+
+        :rtype: object
+        :returns: The result of the first successful call.
+        :raises: The error raised by the last attempt, if it is not
+                 retried.
+        """
+        deadline = self._start()
+        for delay in self.delays():
+            try:
+                return function()
+            except Exception as exc:  # pylint: disable=broad-except
+                delay = self._retry_delay(exc, delay, deadline)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(exc, delay)
+            time.sleep(delay)
+
+    def __call__(self, function):
+        """Decorate a function, to retry it as long as the policy allows.
+
+        :type function: callable
+        :param function: The function to wrap.
+
+        :rtype: callable
+        :returns: A function with the same arguments as ``function``.
+        """
+        @functools.wraps(function)
+        def retried(*args, **kwargs):
+            """Call the wrapped function with retries."""
+            return self.call(functools.partial(function, *args, **kwargs))
+
+        return retried
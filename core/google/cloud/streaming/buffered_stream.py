@@ -17,6 +17,8 @@
 This class reads ahead to detect if we are at the end of the stream.
 """
 
+from google.cloud.streaming.util import read_into
+
 
 class BufferedStream(object):
     """Buffers a stream, reading ahead to determine if we're at the end.
@@ -29,16 +31,25 @@ class BufferedStream(object):
 
     :type size: int
     :param size:  the size of the buffer
+
+    :type buffer: :class:`bytearray`
+    :param buffer: (Optional) preallocated storage of at least ``size``
+                   bytes, to be reused instead of allocating a new buffer.
+                   If passed, :meth:`read` returns :class:`memoryview`
+                   slices of it rather than copies.
     """
-    def __init__(self, stream, start, size):
+    def __init__(self, stream, start, size, buffer=None):
         self._stream = stream
         self._start_pos = start
         self._buffer_pos = 0
 
-        if not hasattr(self._stream, 'closed') or not self._stream.closed:
-            self._buffered_data = self._stream.read(size)
-        else:
+        if hasattr(self._stream, 'closed') and self._stream.closed:
             self._buffered_data = b''
+        elif buffer is not None:
+            view = memoryview(buffer)[:size]
+            self._buffered_data = view[:read_into(self._stream, view)]
+        else:
+            self._buffered_data = self._stream.read(size)
 
         self._stream_at_end = len(self._buffered_data) < size
         self._end_pos = self._start_pos + len(self._buffered_data)
@@ -355,7 +355,7 @@ def _make_api_request_no_retry(http, http_request, redirections=_REDIRECTIONS):
 
 
 def make_api_request(http, http_request, retries=7,
-                     redirections=_REDIRECTIONS):
+                     redirections=_REDIRECTIONS, retry=None):
     """Send an HTTP request via the given http, performing error/retry handling.
 
     :type http: :class:`httplib2.Http`
@@ -371,24 +371,42 @@ def make_api_request(http, http_request, retries=7,
     :type redirections: int
     :param redirections: Number of redirects to follow.
 
+    :type retry: :class:`~google.cloud.retry.Retry`
+    :param retry: (Optional) Policy for retrying failed requests. If passed,
+                  ``retries`` is ignored.
+
     :rtype: :class:`Response`
     :returns: an object representing the server's response.
 
     :raises: :exc:`google.cloud.streaming.exceptions.RequestError` if no
              response could be parsed.
     """
-    retry = 0
+    if retry is not None:
+        def send():
+            """Send the request once."""
+            return _make_api_request_no_retry(http, http_request,
+                                              redirections=redirections)
+
+        def on_retry(exc, delay):  # pylint: disable=unused-argument
+            """Reset connections before retrying."""
+            _reset_http_connections(http)
+            logging.debug('Retrying request to url %s after exception %s',
+                          http_request.url, type(exc).__name__)
+
+        return retry.call(send, on_retry=on_retry)
+
+    attempt = 0
     while True:
         try:
             return _make_api_request_no_retry(http, http_request,
                                               redirections=redirections)
         except _RETRYABLE_EXCEPTIONS as exc:
-            retry += 1
-            if retry >= retries:
+            attempt += 1
+            if attempt >= retries:
                 raise
             retry_after = getattr(exc, 'retry_after', None)
             if retry_after is None:
-                retry_after = calculate_wait_for_retry(retry)
+                retry_after = calculate_wait_for_retry(attempt)
 
             _reset_http_connections(http)
             logging.debug('Retrying request to url %s after exception %s',
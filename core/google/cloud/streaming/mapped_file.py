@@ -0,0 +1,176 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Read-only stream over a memory-mapped file.
+
+Reads return views of the mapping rather than copies, so uploading a chunk
+of the file does not copy it into a new bytes object first.
+"""
+
+import mmap
+import os
+
+
+class MappedFile(object):
+    """Read-only, seekable stream over a memory-mapped file.
+
+    :meth:`read` returns :class:`memoryview` slices of the mapping: they
+    remain valid after the stream is closed (the mapping is then released
+    once the last of them is garbage collected).
+
+    :type file_obj: file
+    :param file_obj: a regular, non-empty file opened for reading.  It is
+                     closed along with this stream.
+
+    :raises: :exc:`ValueError` if the file is empty,
+             :exc:`EnvironmentError` if it cannot be mapped (e.g. a pipe),
+             or :exc:`TypeError` if the mapping does not support
+             :class:`memoryview` (Python 2).
+    """
+
+    def __init__(self, file_obj):
+        self._file = file_obj
+        self._mmap = mmap.mmap(
+            file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._view = memoryview(self._mmap)
+        except TypeError:
+            self._mmap.close()
+            raise
+        self._position = 0
+
+    def __repr__(self):
+        return 'MappedFile(%r)' % (self.name,)
+
+    def __len__(self):
+        return len(self._view)
+
+    @property
+    def name(self):
+        """Name of the mapped file.
+
+        :rtype: str
+        :returns: The ``name`` of the underlying file, if any.
+        """
+        return getattr(self._file, 'name', None)
+
+    @property
+    def closed(self):
+        """Has the stream been closed.
+
+        :rtype: bool
+        :returns: True once :meth:`close` has been called.
+        """
+        return self._view is None
+
+    def _check_open(self):
+        """Raise if the stream has been closed.
+
+        :raises: :exc:`ValueError` if closed.
+        """
+        if self._view is None:
+            raise ValueError('I/O operation on closed file.')
+
+    @staticmethod
+    def seekable():
+        """Does the stream support :meth:`seek`.
+
+        :rtype: bool
+        :returns: True
+        """
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Change the stream position.
+
+        :type offset: int
+        :param offset: the new position, relative to ``whence``.
+
+        :type whence: int
+        :param whence: one of :data:`os.SEEK_SET`, :data:`os.SEEK_CUR` or
+                       :data:`os.SEEK_END`.
+
+        :rtype: int
+        :returns: The new position.
+        """
+        self._check_open()
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += len(self._view)
+        elif whence != os.SEEK_SET:
+            raise ValueError('Invalid whence', whence)
+        if offset < 0:
+            raise ValueError('Negative seek position', offset)
+        self._position = offset
+        return offset
+
+    def tell(self):
+        """Current stream position.
+
+        :rtype: int
+        :returns: The position.
+        """
+        self._check_open()
+        return self._position
+
+    def read(self, size=-1):
+        """Read bytes, without copying them.
+
+        :type size: int
+        :param size: (Optional) the maximum number of bytes to read;
+                     defaults to all remaining bytes.
+
+        :rtype: :class:`memoryview`
+        :returns: a view of the bytes read, empty at the end of the file.
+        """
+        self._check_open()
+        start = min(self._position, len(self._view))
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = min(start + size, len(self._view))
+        self._position = end
+        return self._view[start:end]
+
+    def readinto(self, buffer):
+        """Read bytes into a preallocated buffer.
+
+        :type buffer: :class:`bytearray` or :class:`memoryview`
+        :param buffer: writable storage for the bytes read.
+
+        :rtype: int
+        :returns: the number of bytes read, zero at the end of the file.
+        """
+        data = self.read(len(buffer))
+        count = len(data)
+        memoryview(buffer)[:count] = data
+        return count
+
+    def close(self):
+        """Close the stream, the mapping and the underlying file."""
+        if self._view is None:
+            return
+        release = getattr(self._view, 'release', None)
+        if release is not None:  # Not available in Python 2.
+            release()
+        self._view = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views returned by ``read`` are still in use: the mapping
+            # is released along with the last of them.
+            pass
+        self._mmap = None
+        self._file.close()
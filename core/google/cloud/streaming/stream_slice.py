@@ -16,6 +16,8 @@
 
 from six.moves import http_client
 
+from google.cloud.streaming.util import read_into
+
 
 class StreamSlice(object):
     """Provides a slice-like object for streams.
@@ -85,3 +87,29 @@ class StreamSlice(object):
                 self._max_bytes - self._remaining_bytes, self._max_bytes)
         self._remaining_bytes -= len(data)
         return data
+
+    def readinto(self, buffer):
+        """Read bytes from the slice into a preallocated buffer.
+
+        Fills ``buffer`` (up to the bytes remaining in the slice) without
+        an intermediate copy if the underlying stream supports
+        ``readinto``.  As for :meth:`read`, raises :exc:`IncompleteRead`
+        if the underlying stream is exhausted before the slice.
+
+        :type buffer: :class:`bytearray` or :class:`memoryview`
+        :param buffer: writable storage for the bytes read.
+
+        :rtype: int
+        :returns: the number of bytes read.
+
+        :raises: :exc:`IncompleteRead`
+        """
+        view = memoryview(buffer)
+        read_size = min(len(view), self._remaining_bytes)
+        count = read_into(self._stream, view[:read_size])
+        if count < read_size:
+            raise http_client.IncompleteRead(
+                self._max_bytes - self._remaining_bytes + count,
+                self._max_bytes)
+        self._remaining_bytes -= count
+        return count
@@ -20,10 +20,13 @@ import email.mime.multipart as mime_multipart
 import email.mime.nonmultipart as mime_nonmultipart
 import mimetypes
 import os
+import sys
+import threading
 
 import httplib2
 import six
 from six.moves import http_client
+from six.moves import queue
 
 from google.cloud._helpers import _to_bytes
 from google.cloud.streaming.buffered_stream import BufferedStream
@@ -34,6 +37,7 @@ from google.cloud.streaming.exceptions import TransferRetryError
 from google.cloud.streaming.http_wrapper import make_api_request
 from google.cloud.streaming.http_wrapper import Request
 from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+from google.cloud.streaming.mapped_file import MappedFile
 from google.cloud.streaming.stream_slice import StreamSlice
 from google.cloud.streaming.util import acceptable_mime_type
 
@@ -67,13 +71,17 @@ class _Transfer(object):
 
     :type num_retries: int
     :param num_retries: how many retries should the transfer attempt
+
+    :type retry: :class:`~google.cloud.retry.Retry`
+    :param retry: (Optional) policy for retrying failed requests; if
+                  passed, it is used instead of ``num_retries``.
     """
 
     _num_retries = None
 
     def __init__(self, stream, close_stream=False,
                  chunksize=_DEFAULT_CHUNKSIZE, auto_transfer=True,
-                 http=None, num_retries=5):
+                 http=None, num_retries=5, retry=None):
         self._bytes_http = None
         self._close_stream = close_stream
         self._http = http
@@ -82,6 +90,7 @@ class _Transfer(object):
 
         # Let the @property do validation.
         self.num_retries = num_retries
+        self.retry = retry
 
         self.auto_transfer = auto_transfer
         self.chunksize = chunksize
@@ -377,7 +386,7 @@ class Download(_Transfer):
             end_byte = self._compute_end_byte(0)
             self._set_range_header(http_request, 0, end_byte)
             response = make_api_request(
-                self.bytes_http or http, http_request)
+                self.bytes_http or http, http_request, retry=self.retry)
             if response.status_code not in self._ACCEPTABLE_STATUSES:
                 raise HttpError.from_response(response)
             self._initial_response = response
@@ -506,7 +515,8 @@ class Download(_Transfer):
         request = Request(url=self.url, headers=headers)
         self._set_range_header(request, start, end=end)
         return make_api_request(
-            self.bytes_http, request, retries=self.num_retries)
+            self.bytes_http, request, retries=self.num_retries,
+            retry=self.retry)
 
     def _process_response(self, response):
         """Update attribtes and writing stream, based on response.
@@ -645,6 +655,14 @@ class Upload(_Transfer):
     :param auto_transfer: should this instance automatically begin transfering
                           data when initialized
 
+    :type read_ahead: int
+    :param read_ahead: (Optional) how many chunks to read ahead of the one
+                       being sent, when streaming in chunks.  If positive,
+                       the stream is read on a background thread while the
+                       current chunk is sent, buffering at most this many
+                       chunks.  Defaults to 0, which reads each chunk only
+                       once the previous one is sent.
+
     :type kwds: dict
     :param kwds:  keyword arguments:  all except ``total_size`` are passed
                   through to :meth:`_Transfer.__init__()`.
@@ -652,12 +670,15 @@ class Upload(_Transfer):
     _REQUIRED_SERIALIZATION_KEYS = set((
         'auto_transfer', 'mime_type', 'total_size', 'url'))
 
+    _read_ahead = 0
+
     def __init__(self, stream, mime_type, total_size=None, http=None,
-                 close_stream=False, auto_transfer=True,
+                 close_stream=False, auto_transfer=True, read_ahead=0,
                  **kwds):
         super(Upload, self).__init__(
             stream, close_stream=close_stream, auto_transfer=auto_transfer,
             http=http, **kwds)
+        self.read_ahead = read_ahead
         self._final_response = None
         self._server_chunk_granularity = None
         self._complete = False
@@ -667,7 +688,8 @@ class Upload(_Transfer):
         self._total_size = total_size
 
     @classmethod
-    def from_file(cls, filename, mime_type=None, auto_transfer=True, **kwds):
+    def from_file(cls, filename, mime_type=None, auto_transfer=True,
+                  use_mmap=True, **kwds):
         """Create a new Upload object from a filename.
 
         :type filename: str
@@ -680,6 +702,12 @@ class Upload(_Transfer):
         :param auto_transfer:
             (Optional) should the transfer be started immediately
 
+        :type use_mmap: bool
+        :param use_mmap:
+            (Optional) memory-map the file, so that chunks are sent from
+            views of the mapping rather than copies.  Files which cannot
+            be mapped are read as usual.
+
         :type kwds: dict
         :param kwds:  keyword arguments:  passed
                       through to :meth:`_Transfer.__init__()`.
@@ -694,7 +722,13 @@ class Upload(_Transfer):
                 raise ValueError(
                     'Could not guess mime type for %s' % path)
         size = os.stat(path).st_size
-        return cls(open(path, 'rb'), mime_type, total_size=size,
+        stream = open(path, 'rb')
+        if use_mmap and size:
+            try:
+                stream = MappedFile(stream)
+            except (EnvironmentError, TypeError, ValueError):
+                pass  # Not a regular file, or no mmap support.
+        return cls(stream, mime_type, total_size=size,
                    close_stream=True, auto_transfer=auto_transfer, **kwds)
 
     @classmethod
@@ -746,6 +780,29 @@ class Upload(_Transfer):
         """
         return self._mime_type
 
+    @property
+    def read_ahead(self):
+        """How many chunks to read ahead of the one being sent.
+
+        :rtype: int
+        :returns: The maximum number of chunks buffered.
+        """
+        return self._read_ahead
+
+    @read_ahead.setter
+    def read_ahead(self, value):
+        """Update how many chunks to read ahead of the one being sent.
+
+        :type value: int
+        """
+        if not isinstance(value, six.integer_types):
+            raise ValueError("read_ahead: pass an integer")
+
+        if value < 0:
+            raise ValueError(
+                'Cannot have negative value for read_ahead')
+        self._read_ahead = value
+
     @property
     def progress(self):
         """Bytes uploaded so far
@@ -954,7 +1011,7 @@ class Upload(_Transfer):
             headers={'Content-Range': 'bytes */*'})
         refresh_response = make_api_request(
             self.http, refresh_request, redirections=0,
-            retries=self.num_retries)
+            retries=self.num_retries, retry=self.retry)
         range_header = self._get_range_header(refresh_response)
         if refresh_response.status_code in (http_client.OK,
                                             http_client.CREATED):
@@ -1021,7 +1078,8 @@ class Upload(_Transfer):
             return
         self._ensure_uninitialized()
         http_response = make_api_request(http, http_request,
-                                         retries=self.num_retries)
+                                         retries=self.num_retries,
+                                         retry=self.retry)
         if http_response.status_code != http_client.OK:
             raise HttpError.from_response(http_response)
 
@@ -1076,7 +1134,9 @@ class Upload(_Transfer):
 
         :type use_chunks: bool
         :param use_chunks: If False, send the stream in a single request.
-                           Otherwise, send it in chunks.
+                           Otherwise, send it in chunks, reading up to
+                           :attr:`read_ahead` chunks ahead of the one
+                           being sent.
 
         :rtype: :class:`google.cloud.streaming.http_wrapper.Response`
         :returns: The response for the final request made.
@@ -1090,6 +1150,8 @@ class Upload(_Transfer):
         if use_chunks:
             self._validate_chunksize(self.chunksize)
         self._ensure_initialized()
+        if use_chunks and self.read_ahead and not self.complete:
+            response = self._stream_chunks_read_ahead()
         while not self.complete:
             response = send_func(self.stream.tell())
             if response.status_code in (http_client.OK, http_client.CREATED):
@@ -1130,7 +1192,8 @@ class Upload(_Transfer):
                  code from the response indicates an error.
         """
         response = make_api_request(
-            self.bytes_http, request, retries=self.num_retries)
+            self.bytes_http, request, retries=self.num_retries,
+            retry=self.retry)
         if response.status_code not in (http_client.OK, http_client.CREATED,
                                         RESUME_INCOMPLETE):
             # We want to reset our state to wherever the server left us
@@ -1203,7 +1266,34 @@ class Upload(_Transfer):
         else:
             end = min(start + self.chunksize, self.total_size)
             body_stream = StreamSlice(self.stream, end - start)
-        request = Request(url=self.url, http_method='PUT', body=body_stream)
+            if isinstance(self.stream, MappedFile):
+                # Send a view of the mapping, rather than a stream.
+                body_stream = body_stream.read()
+        request = self._chunk_request(start, end, body_stream, no_log_body)
+        return self._send_media_request(request, end)
+
+    def _chunk_request(self, start, end, body, no_log_body):
+        """Build the request uploading one chunk.
+
+        Helper for :meth:`_send_chunk` and
+        :meth:`_stream_chunks_read_ahead`.
+
+        :type start: int
+        :param start: start byte of the range.
+
+        :type end: int
+        :param end: end byte (exclusive) of the range.
+
+        :type body: bytes or file-like object
+        :param body: the bytes of the chunk.
+
+        :type no_log_body: bool
+        :param no_log_body: if True, don't log the body of the request.
+
+        :rtype: :class:`google.cloud.streaming.http_wrapper.Request`
+        :returns: The request for the chunk.
+        """
+        request = Request(url=self.url, http_method='PUT', body=body)
         request.headers['Content-Type'] = self.mime_type
         if no_log_body:
             # Disable logging of streaming body.
@@ -1219,5 +1309,208 @@ class Upload(_Transfer):
             range_string = 'bytes %s-%s/%s' % (start, end - 1, self.total_size)
 
         request.headers['Content-Range'] = range_string
+        return request
 
-        return self._send_media_request(request, end)
+    def _read_chunk(self, start, total_size, buffer=None):
+        """Read the next chunk of the stream into memory.
+
+        Helper for :meth:`_stream_chunks_read_ahead`; called on the
+        read-ahead thread, so it must not update the state of the upload.
+
+        :type start: int
+        :param start: start byte of the chunk (the current position of the
+                      stream).
+
+        :type total_size: int
+        :param total_size: total size of the upload, or None if unknown.
+
+        :type buffer: :class:`bytearray`
+        :param buffer: (Optional) storage of :attr:`chunksize` bytes to read
+                       the chunk into.
+
+        :rtype: tuple
+        :returns: The bytes of the chunk (a view of ``buffer``, if passed),
+                  and a flag indicating if it is the last one.
+        """
+        if total_size is None:
+            buffered = BufferedStream(
+                self.stream, start, self.chunksize, buffer=buffer)
+            return (buffered.read(len(buffered)),
+                    buffered.stream_exhausted)
+        end = min(start + self.chunksize, total_size)
+        body_stream = StreamSlice(self.stream, end - start)
+        if buffer is None:
+            return body_stream.read(), end == total_size
+        view = memoryview(buffer)[:end - start]
+        body_stream.readinto(view)
+        return view, end == total_size
+
+    def _stream_chunks_read_ahead(self):
+        """Send the stream in chunks, reading ahead on a background thread.
+
+        Helper for :meth:`stream_file`: the next chunks are read from the
+        stream while the current one is sent.  A resumable upload only
+        accepts chunks in order, so they are still sent one at a time.
+
+        :rtype: :class:`google.cloud.streaming.http_wrapper.Response`
+        :returns: The response for the final request made.
+        :raises: :exc:`~.streaming.exceptions.HttpError` if the status
+                 code from a response indicates an error, or
+                 :exc:`~.streaming.exceptions.CommunicationError` if the
+                 server did not receive a whole chunk.
+        """
+        no_log_body = self.total_size is None
+        start = end = self.stream.tell()
+        last = False
+        if isinstance(self.stream, MappedFile):
+            buffer_size = None
+        else:
+            buffer_size = self.chunksize
+        reader = _ReadAhead(self._read_chunk, start, self.total_size,
+                            self.read_ahead, buffer_size)
+        try:
+            while True:
+                if last:
+                    # The server did not finalize on the last chunk.
+                    start, data = end, b''
+                else:
+                    start, data, last = reader.get()
+                end = start + len(data)
+                if last and self.total_size is None:
+                    self._total_size = end
+                request = self._chunk_request(start, end, data, no_log_body)
+                response = make_api_request(
+                    self.bytes_http, request, retries=self.num_retries,
+                    retry=self.retry)
+                if response.status_code in (http_client.OK,
+                                            http_client.CREATED):
+                    self._complete = True
+                    break
+                if response.status_code != RESUME_INCOMPLETE:
+                    # Stop reading before moving the stream back to
+                    # wherever the server left us, then raise.
+                    reader.close()
+                    self.refresh_upload_state()
+                    raise HttpError.from_response(response)
+                self._progress = self._last_byte(
+                    self._get_range_header(response))
+                if self.progress + 1 != end:
+                    reader.close()
+                    self.stream.seek(self.progress + 1)
+                    raise CommunicationError(
+                        'Failed to transfer all bytes in chunk, upload '
+                        'paused at byte %d' % self.progress)
+        finally:
+            reader.close()
+        if reader.position != end:
+            # Leave the stream after the last byte sent.
+            self.stream.seek(end)
+        return response
+
+
+class _ReadAhead(object):
+    """Read chunks of a stream on a background thread.
+
+    Helper for :meth:`Upload._stream_chunks_read_ahead`.  At most ``depth``
+    chunks wait in the queue, which bounds the memory used to the size of
+    ``depth + 2`` chunks (those queued, plus the one being read and the one
+    being sent).  Chunks are read into a pool of that many buffers, reused
+    in turn: by the time a buffer is reused, the chunk it held was sent.
+
+    :type read_chunk: callable
+    :param read_chunk: called with the position of the stream, the total
+                       size of the upload and a buffer (or None), returns
+                       the bytes of the next chunk and a flag indicating if
+                       it is the last one.
+
+    :type start: int
+    :param start: the current position of the stream.
+
+    :type total_size: int
+    :param total_size: total size of the upload, or None if unknown.
+
+    :type depth: int
+    :param depth: how many chunks to read ahead.
+
+    :type buffer_size: int
+    :param buffer_size: (Optional) the size of each buffer of the pool.  If
+                        not passed, ``read_chunk`` is called without
+                        buffers.
+    """
+
+    def __init__(self, read_chunk, start, total_size, depth,
+                 buffer_size=None):
+        self._read_chunk = read_chunk
+        self._total_size = total_size
+        self._buffer_size = buffer_size
+        self._buffers = []
+        self._buffer_count = depth + 2
+        self._chunks = queue.Queue(maxsize=depth)
+        self._stopped = threading.Event()
+        self._exc_info = None
+        self.position = start
+        self._thread = threading.Thread(
+            target=self._run, name='google.cloud.streaming.ReadAhead')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _next_buffer(self, index):
+        """Get the buffer to read the ``index``-th chunk into.
+
+        :type index: int
+        :param index: the index of the chunk.
+
+        :rtype: :class:`bytearray`
+        :returns: a buffer of the pool (allocated on first use), or None.
+        """
+        if self._buffer_size is None:
+            return None
+        slot = index % self._buffer_count
+        if slot == len(self._buffers):
+            self._buffers.append(bytearray(self._buffer_size))
+        return self._buffers[slot]
+
+    def _run(self):
+        """Read chunks until the last one, or until closed."""
+        last = False
+        index = 0
+        while not last and not self._stopped.is_set():
+            start = self.position
+            try:
+                data, last = self._read_chunk(
+                    start, self._total_size, self._next_buffer(index))
+            except Exception:  # pylint: disable=broad-except
+                self._exc_info = sys.exc_info()
+                self._chunks.put(None)
+                return
+            self.position = start + len(data)
+            self._chunks.put((start, data, last))
+            index += 1
+
+    def get(self):
+        """Wait for the next chunk.
+
+        :rtype: tuple
+        :returns: The start byte of the chunk, its bytes, and a flag
+                  indicating if it is the last one.
+        :raises: the exception raised reading the stream, if any.
+        """
+        chunk = self._chunks.get()
+        if chunk is None:
+            six.reraise(*self._exc_info)
+        return chunk
+
+    def close(self):
+        """Stop reading, and wait for the thread to finish.
+
+        Afterwards, :attr:`position` is the position of the stream.
+        """
+        self._stopped.set()
+        # Make room for a ``put``, which may be blocked on a full queue:
+        # once done, the thread sees it was stopped.
+        while True:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
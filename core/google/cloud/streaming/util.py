@@ -72,3 +72,36 @@ def acceptable_mime_type(accept_patterns, mime_type):
                    in zip(pattern.split('/'), mime_type.split('/')))
 
     return any(_match(pattern, mime_type) for pattern in accept_patterns)
+
+
+def read_into(stream, buffer):
+    """Fill ``buffer`` from ``stream``, without an intermediate copy.
+
+    Uses the stream's ``readinto`` method if it has one, else copies the
+    bytes returned by ``read``.  Reads until ``buffer`` is full or the
+    stream is exhausted.
+
+    :type stream: readable file-like object
+    :param stream: the stream to read from.
+
+    :type buffer: :class:`memoryview`
+    :param buffer: a writable view of the bytes to fill.
+
+    :rtype: int
+    :returns: the number of bytes read, less than ``len(buffer)`` only if
+              the stream was exhausted.
+    """
+    readinto = getattr(stream, 'readinto', None)
+    size = len(buffer)
+    filled = 0
+    while filled < size:
+        if readinto is not None:
+            count = readinto(buffer[filled:])
+        else:
+            data = stream.read(size - filled)
+            count = len(data)
+            buffer[filled:filled + count] = data
+        if not count:
+            break
+        filled += count
+    return filled
@@ -59,6 +59,11 @@ REQUIREMENTS = [
     'six',
 ]
 
+EXTRAS_REQUIRE = {
+    'async:python_version>="3.5"': ['aiohttp >= 2.0.0'],
+    'orjson:python_version>="3.6"': ['orjson >= 3.4.0'],
+}
+
 setup(
     name='google-cloud-core',
     version='0.25.0',
@@ -70,5 +75,6 @@ setup(
     ],
     packages=find_packages(exclude=('tests*',)),
     install_requires=REQUIREMENTS,
+    extras_require=EXTRAS_REQUIRE,
     **SETUP_BASE
 )
@@ -139,3 +139,40 @@ class Test_BufferedStream(unittest.TestCase):
         self.assertEqual(bufstream.stream_end_position, len(CONTENT))
         self.assertEqual(bufstream._bytes_remaining, 0)
         self.assertEqual(bufstream.read(10), b'')
+
+    def test_ctor_w_buffer(self):
+        from io import BytesIO
+
+        CONTENT = b'CONTENT GOES HERE'
+        START = 0
+        BUFSIZE = 4
+        buffer = bytearray(8)
+        stream = BytesIO(CONTENT)
+        bufstream = self._make_one(stream, START, BUFSIZE, buffer=buffer)
+        self.assertEqual(len(bufstream), BUFSIZE)
+        self.assertFalse(bufstream.stream_exhausted)
+        self.assertEqual(bufstream.stream_end_position, BUFSIZE)
+        self.assertEqual(bytes(buffer[:BUFSIZE]), CONTENT[:BUFSIZE])
+        self.assertEqual(stream.tell(), BUFSIZE)
+
+        data = bufstream.read(3)
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(bytes(data), CONTENT[:3])
+        # A view of the buffer, not a copy.
+        buffer[0:1] = b'X'
+        self.assertEqual(bytes(data), b'XON')
+
+    def test_ctor_w_buffer_shorter_stream(self):
+        from io import BytesIO
+
+        CONTENT = b'CONTENT'
+        START = 4
+        BUFSIZE = 10
+        stream = BytesIO(CONTENT)
+        stream.read(START)  # already consumed
+        bufstream = self._make_one(
+            stream, START, BUFSIZE, buffer=bytearray(BUFSIZE))
+        self.assertEqual(len(bufstream), len(CONTENT) - START)
+        self.assertTrue(bufstream.stream_exhausted)
+        self.assertEqual(bufstream.stream_end_position, len(CONTENT))
+        self.assertEqual(bytes(bufstream.read(10)), CONTENT[START:])
@@ -462,6 +462,41 @@ class _Dummy(object):
     def __init__(self, **kw):
         self.__dict__.update(kw)
 
+    def test_w_retry_policy(self):
+        import mock
+        from google.cloud.streaming.exceptions import BadStatusCodeError
+        from google.cloud.streaming import http_wrapper as MUT
+        from google.cloud._testing import _Monkey
+        from google.cloud.retry import Retry
+
+        HTTP = mock.Mock(connections={'https:abc': object()},
+                         spec=['connections'])
+        RESPONSE = object()
+        REQUEST = _Request()
+        _created = []
+        _counter = [None] * 2
+
+        def _wo_exception(*args, **kw):
+            _created.append((args, kw))
+            if _counter:
+                _counter.pop()
+                raise BadStatusCodeError(
+                    {'status': '503'}, b'', REQUEST.url)
+            return RESPONSE
+
+        with _Monkey(MUT, _make_api_request_no_retry=_wo_exception):
+            with mock.patch('time.sleep') as sleep:
+                response = self._call_fut(
+                    HTTP, REQUEST, retries=1, redirections=3,
+                    retry=Retry())
+
+        self.assertIs(response, RESPONSE)
+        self.assertEqual(len(_created), 3)
+        for attempt in _created:
+            self.assertEqual(attempt, ((HTTP, REQUEST), {'redirections': 3}))
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(HTTP.connections, {})
+
 
 class _Request(object):
     __slots__ = ('url', 'http_method', 'body', 'headers', 'loggable_body',)
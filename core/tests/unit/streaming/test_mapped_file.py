@@ -0,0 +1,119 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class Test_MappedFile(unittest.TestCase):
+
+    CONTENT = b'CONTENT GOES HERE'
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        return MappedFile
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def setUp(self):
+        import tempfile
+
+        self._file = tempfile.TemporaryFile()
+        self._file.write(self.CONTENT)
+        self._file.flush()
+        self._file.seek(0)
+
+    def tearDown(self):
+        self._file.close()
+
+    def test_ctor(self):
+        mapped = self._make_one(self._file)
+        self.assertEqual(len(mapped), len(self.CONTENT))
+        self.assertEqual(mapped.tell(), 0)
+        self.assertFalse(mapped.closed)
+        self.assertTrue(mapped.seekable())
+        self.assertEqual(mapped.name, self._file.name)
+        self.assertEqual(repr(mapped), 'MappedFile(%r)' % (self._file.name,))
+        mapped.close()
+
+    def test_ctor_empty_file(self):
+        import tempfile
+
+        with tempfile.TemporaryFile() as empty:
+            with self.assertRaises(ValueError):
+                self._make_one(empty)
+
+    def test_read(self):
+        mapped = self._make_one(self._file)
+
+        data = mapped.read(7)
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(bytes(data), b'CONTENT')
+        self.assertEqual(mapped.tell(), 7)
+        self.assertEqual(bytes(mapped.read()), self.CONTENT[7:])
+        self.assertEqual(bytes(mapped.read(4)), b'')
+        mapped.close()
+
+    def test_seek(self):
+        import os
+
+        mapped = self._make_one(self._file)
+
+        self.assertEqual(mapped.seek(8), 8)
+        self.assertEqual(bytes(mapped.read(4)), b'GOES')
+        self.assertEqual(mapped.seek(-4, os.SEEK_CUR), 8)
+        self.assertEqual(mapped.seek(-4, os.SEEK_END), len(self.CONTENT) - 4)
+        self.assertEqual(bytes(mapped.read()), b'HERE')
+        mapped.seek(100)
+        self.assertEqual(bytes(mapped.read()), b'')
+        with self.assertRaises(ValueError):
+            mapped.seek(-1)
+        with self.assertRaises(ValueError):
+            mapped.seek(0, 42)
+        mapped.close()
+
+    def test_readinto(self):
+        mapped = self._make_one(self._file)
+        mapped.seek(8)
+        buffer = bytearray(b'..........')
+
+        self.assertEqual(mapped.readinto(buffer), len(self.CONTENT) - 8)
+        self.assertEqual(bytes(buffer), b'GOES HERE.')
+        self.assertEqual(mapped.readinto(buffer), 0)
+        mapped.close()
+
+    def test_close(self):
+        mapped = self._make_one(self._file)
+
+        mapped.close()
+        mapped.close()
+
+        self.assertTrue(mapped.closed)
+        self.assertTrue(self._file.closed)
+        with self.assertRaises(ValueError):
+            mapped.read()
+        with self.assertRaises(ValueError):
+            mapped.tell()
+
+    def test_close_w_views_in_use(self):
+        mapped = self._make_one(self._file)
+        data = mapped.read(7)
+
+        mapped.close()
+
+        # Views remain valid until released.
+        self.assertTrue(mapped.closed)
+        self.assertEqual(bytes(data), b'CONTENT')
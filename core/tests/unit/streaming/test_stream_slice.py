@@ -88,3 +88,40 @@ class Test_StreamSlice(unittest.TestCase):
         stream_slice = self._make_one(stream, MAXSIZE)
         self.assertEqual(stream_slice.read(SIZE), CONTENT[:SIZE])
         self.assertEqual(stream_slice._remaining_bytes, MAXSIZE - SIZE)
+
+    def test_readinto(self):
+        from io import BytesIO
+
+        CONTENT = b'CONTENT GOES HERE'
+        MAXSIZE = 4
+        stream = BytesIO(CONTENT)
+        stream_slice = self._make_one(stream, MAXSIZE)
+        buffer = bytearray(b'......')
+        self.assertEqual(stream_slice.readinto(buffer), MAXSIZE)
+        self.assertEqual(bytes(buffer), b'CONT..')
+        self.assertEqual(stream_slice._remaining_bytes, 0)
+        self.assertEqual(stream.tell(), MAXSIZE)
+        self.assertEqual(stream_slice.readinto(buffer), 0)
+
+    def test_readinto_partial(self):
+        from io import BytesIO
+
+        CONTENT = b'CONTENT GOES HERE'
+        MAXSIZE = 4
+        stream = BytesIO(CONTENT)
+        stream_slice = self._make_one(stream, MAXSIZE)
+        buffer = bytearray(3)
+        self.assertEqual(stream_slice.readinto(memoryview(buffer)), 3)
+        self.assertEqual(bytes(buffer), b'CON')
+        self.assertEqual(stream_slice._remaining_bytes, 1)
+
+    def test_readinto_exhausted(self):
+        from io import BytesIO
+        from six.moves import http_client
+
+        CONTENT = b'AB'
+        MAXSIZE = 4
+        stream = BytesIO(CONTENT)
+        stream_slice = self._make_one(stream, MAXSIZE)
+        with self.assertRaises(http_client.IncompleteRead):
+            stream_slice.readinto(bytearray(MAXSIZE))
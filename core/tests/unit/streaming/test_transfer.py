@@ -39,6 +39,7 @@ class Test__Transfer(unittest.TestCase):
         self.assertIsNone(xfer.bytes_http)
         self.assertIsNone(xfer.http)
         self.assertEqual(xfer.num_retries, 5)
+        self.assertIsNone(xfer.retry)
         self.assertIsNone(xfer.url)
         self.assertFalse(xfer.initialized)
 
@@ -47,12 +48,14 @@ class Test__Transfer(unittest.TestCase):
         HTTP = object()
         CHUNK_SIZE = 1 << 18
         NUM_RETRIES = 8
+        RETRY = object()
         xfer = self._make_one(stream,
                               close_stream=True,
                               chunksize=CHUNK_SIZE,
                               auto_transfer=False,
                               http=HTTP,
-                              num_retries=NUM_RETRIES)
+                              num_retries=NUM_RETRIES,
+                              retry=RETRY)
         self.assertIs(xfer.stream, stream)
         self.assertTrue(xfer.close_stream)
         self.assertEqual(xfer.chunksize, CHUNK_SIZE)
@@ -60,6 +63,7 @@ class Test__Transfer(unittest.TestCase):
         self.assertIs(xfer.bytes_http, HTTP)
         self.assertIs(xfer.http, HTTP)
         self.assertEqual(xfer.num_retries, NUM_RETRIES)
+        self.assertIs(xfer.retry, RETRY)
 
     def test_bytes_http_fallback_to_http(self):
         stream = _Stream()
@@ -461,8 +465,9 @@ class Test_Download(unittest.TestCase):
 
         self.assertIs(found, response)
         self.assertTrue(len(requester._requested), 1)
-        request = requester._requested[0][0]
+        request, _, kw = requester._requested[0]
         self.assertEqual(request.headers['range'], 'bytes=0-10')
+        self.assertEqual(kw, {'retries': download.num_retries, 'retry': None})
 
     def test__process_response_w_FORBIDDEN(self):
         from google.cloud.streaming.exceptions import HttpError
@@ -868,6 +873,24 @@ class Test_Upload(unittest.TestCase):
         self.assertEqual(upload.mime_type, self.MIME_TYPE)
         self.assertEqual(upload.chunksize, CHUNK_SIZE)
 
+    def test_ctor_w_read_ahead(self):
+        stream = _Stream()
+        upload = self._make_one(stream, read_ahead=3)
+        self.assertEqual(upload.read_ahead, 3)
+
+    def test_read_ahead_setter_invalid(self):
+        stream = _Stream()
+        upload = self._make_one(stream)
+        self.assertEqual(upload.read_ahead, 0)
+        with self.assertRaises(ValueError):
+            upload.read_ahead = object()
+
+    def test_read_ahead_setter_negative(self):
+        stream = _Stream()
+        upload = self._make_one(stream)
+        with self.assertRaises(ValueError):
+            upload.read_ahead = -1
+
     def test_from_file_w_nonesuch_file(self):
         klass = self._get_target_class()
         filename = '~nosuchuser/file.txt'
@@ -925,6 +948,53 @@ class Test_Upload(unittest.TestCase):
             self.assertEqual(upload.chunksize, CHUNK_SIZE)
             upload._stream.close()
 
+    def test_from_file_w_mmap(self):
+        import os
+        from google.cloud._testing import _tempdir
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        klass = self._get_target_class()
+        CONTENT = b'EXISTING FILE'
+        with _tempdir() as tempdir:
+            filename = os.path.join(tempdir, 'file.txt')
+            with open(filename, 'wb') as fileobj:
+                fileobj.write(CONTENT)
+            upload = klass.from_file(filename)
+            self.assertIsInstance(upload.stream, MappedFile)
+            self.assertEqual(bytes(upload.stream.read()), CONTENT)
+            upload._stream.close()
+
+    def test_from_file_wo_mmap(self):
+        import os
+        from google.cloud._testing import _tempdir
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        klass = self._get_target_class()
+        CONTENT = b'EXISTING FILE'
+        with _tempdir() as tempdir:
+            filename = os.path.join(tempdir, 'file.txt')
+            with open(filename, 'wb') as fileobj:
+                fileobj.write(CONTENT)
+            upload = klass.from_file(filename, use_mmap=False)
+            self.assertNotIsInstance(upload.stream, MappedFile)
+            self.assertEqual(upload.stream.read(), CONTENT)
+            upload._stream.close()
+
+    def test_from_file_w_mmap_empty_file(self):
+        import os
+        from google.cloud._testing import _tempdir
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        klass = self._get_target_class()
+        with _tempdir() as tempdir:
+            filename = os.path.join(tempdir, 'file.txt')
+            with open(filename, 'wb'):
+                pass
+            upload = klass.from_file(filename)
+            self.assertNotIsInstance(upload.stream, MappedFile)
+            self.assertEqual(upload.total_size, 0)
+            upload._stream.close()
+
     def test_from_stream_wo_mimetype(self):
         klass = self._get_target_class()
         stream = _Stream()
@@ -1657,6 +1727,200 @@ class Test_Upload(unittest.TestCase):
                           'Content-Type': self.MIME_TYPE})
         self.assertEqual(request.body, CONTENT[:6])
 
+    def _read_ahead_helper(self, content, responses, total_size=None,
+                           stream=None):
+        from google.cloud._testing import _Monkey
+        from google.cloud.streaming import transfer as MUT
+        from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
+
+        if stream is None:
+            stream = _Stream(content)
+        upload = self._make_one(
+            stream, chunksize=4, total_size=total_size, read_ahead=2)
+        upload.strategy = RESUMABLE_UPLOAD
+        upload._initialize(object(), self.UPLOAD_URL)
+        requester = _MakeRequest(*responses)
+
+        with _Monkey(MUT,
+                     Request=_Request,
+                     make_api_request=requester):
+            response = upload.stream_file()
+
+        self.assertEqual(len(requester._responses), 0)
+        requests = [
+            (request.headers['Content-Range'], request.body)
+            for request, _, _ in requester._requested]
+        return upload, response, requests
+
+    def test_stream_file_w_read_ahead_wo_total_size(self):
+        from six.moves import http_client
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+
+        CONTENT = b'ABCDEFGHIJ'
+        final = _makeResponse(http_client.OK)
+        responses = [
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-3'}),
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-7'}),
+            final,
+        ]
+
+        upload, response, requests = self._read_ahead_helper(
+            CONTENT, responses)
+
+        self.assertIs(response, final)
+        self.assertTrue(upload.complete)
+        self.assertEqual(upload.total_size, 10)
+        self.assertEqual(upload.stream.tell(), 10)
+        self.assertEqual(requests, [
+            ('bytes 0-3/*', CONTENT[:4]),
+            ('bytes 4-7/*', CONTENT[4:8]),
+            ('bytes 8-9/10', CONTENT[8:]),
+        ])
+
+    def test_stream_file_w_read_ahead_wo_total_size_exact_multiple(self):
+        from six.moves import http_client
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+
+        CONTENT = b'ABCDEFGH'
+        responses = [
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-3'}),
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-7'}),
+            _makeResponse(http_client.OK),
+        ]
+
+        _, _, requests = self._read_ahead_helper(CONTENT, responses)
+
+        self.assertEqual(requests, [
+            ('bytes 0-3/*', CONTENT[:4]),
+            ('bytes 4-7/*', CONTENT[4:]),
+            ('bytes */8', b''),
+        ])
+
+    def test_stream_file_w_read_ahead_w_total_size(self):
+        from six.moves import http_client
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+
+        CONTENT = b'ABCDEFGHIJ'
+        responses = [
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-3'}),
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-7'}),
+            _makeResponse(http_client.CREATED),
+        ]
+
+        upload, _, requests = self._read_ahead_helper(
+            CONTENT, responses, total_size=10)
+
+        self.assertTrue(upload.complete)
+        self.assertEqual(requests, [
+            ('bytes 0-3/10', CONTENT[:4]),
+            ('bytes 4-7/10', CONTENT[4:8]),
+            ('bytes 8-9/10', CONTENT[8:]),
+        ])
+
+    def test_stream_file_w_read_ahead_not_finalized_by_last_chunk(self):
+        from six.moves import http_client
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+
+        CONTENT = b'ABCDEF'
+        responses = [
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-3'}),
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-5'}),
+            _makeResponse(http_client.OK),
+        ]
+
+        _, _, requests = self._read_ahead_helper(
+            CONTENT, responses, total_size=6)
+
+        self.assertEqual(requests, [
+            ('bytes 0-3/6', CONTENT[:4]),
+            ('bytes 4-5/6', CONTENT[4:]),
+            ('bytes */6', b''),
+        ])
+
+    def test_stream_file_w_read_ahead_completed_early(self):
+        from six.moves import http_client
+        from google.cloud.streaming.exceptions import TransferInvalidError
+
+        CONTENT = b'ABCDEFGHIJ'
+        stream = _Stream(CONTENT)
+        responses = [_makeResponse(http_client.OK)]
+
+        # Bytes read ahead but not sent are left in the stream.
+        with self.assertRaises(TransferInvalidError):
+            self._read_ahead_helper(
+                CONTENT, responses, total_size=10, stream=stream)
+
+        self.assertEqual(stream.tell(), 4)
+
+    def test_stream_file_w_read_ahead_w_transfer_error(self):
+        from google.cloud.streaming.exceptions import CommunicationError
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+
+        CONTENT = b'ABCDEFGHIJ'
+        stream = _Stream(CONTENT)
+        responses = [
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-2'}),
+        ]
+
+        with self.assertRaises(CommunicationError):
+            self._read_ahead_helper(CONTENT, responses, stream=stream)
+
+        # Positioned to resume after the last byte received.
+        self.assertEqual(stream.tell(), 3)
+
+    def test_stream_file_w_read_ahead_w_http_error(self):
+        from six.moves import http_client
+        from google.cloud._testing import _Monkey
+        from google.cloud.streaming import transfer as MUT
+        from google.cloud.streaming.exceptions import HttpError
+        from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
+
+        CONTENT = b'ABCDEFGHIJ'
+        stream = _Stream(CONTENT)
+        upload = self._make_one(stream, chunksize=4, read_ahead=1)
+        upload.strategy = RESUMABLE_UPLOAD
+        upload._initialize(object(), self.UPLOAD_URL)
+        refreshed = []
+
+        def _refresh():
+            refreshed.append(True)
+            stream.seek(0)
+
+        upload.refresh_upload_state = _refresh
+        requester = _MakeRequest(
+            _makeResponse(http_client.SERVICE_UNAVAILABLE))
+
+        with _Monkey(MUT,
+                     Request=_Request,
+                     make_api_request=requester):
+            with self.assertRaises(HttpError):
+                upload.stream_file()
+
+        self.assertEqual(refreshed, [True])
+        self.assertEqual(stream.tell(), 0)
+
+    def test_stream_file_w_read_ahead_w_read_error(self):
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+
+        CONTENT = b'ABCDEFGHIJ'
+
+        class _FailingStream(_Stream):
+            _reads = 0
+
+            def read(self, size=None):
+                self._reads += 1
+                if self._reads > 1:
+                    raise IOError('disk')
+                return super(_FailingStream, self).read(size)
+
+        responses = [
+            _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-3'}),
+        ]
+
+        with self.assertRaises(IOError):
+            self._read_ahead_helper(
+                CONTENT, responses, stream=_FailingStream(CONTENT))
+
     def test__send_media_request_wo_error(self):
         from google.cloud._testing import _Monkey
         from google.cloud.streaming import transfer as MUT
@@ -1891,6 +2155,33 @@ class Test_Upload(unittest.TestCase):
         self.assertEqual(request.headers, expected_headers)
         self.assertEqual(end, CHUNK_SIZE)
 
+    def test__send_chunk_w_total_size_w_mapped_file(self):
+        import tempfile
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        CONTENT = b'ABCDEFGHIJ'
+        SIZE = len(CONTENT)
+        CHUNK_SIZE = SIZE - 5
+        with tempfile.TemporaryFile() as file_obj:
+            file_obj.write(CONTENT)
+            file_obj.flush()
+            stream = MappedFile(file_obj)
+            upload = self._make_one(
+                stream, total_size=SIZE, chunksize=CHUNK_SIZE)
+            upload._initialize(object(), self.UPLOAD_URL)
+            streamer = _MediaStreamer(object())
+            upload._send_media_request = streamer
+
+            upload._send_chunk(0)
+
+            request, end = streamer._called_with
+            self.assertIsInstance(request.body, memoryview)
+            self.assertEqual(bytes(request.body), CONTENT[:CHUNK_SIZE])
+            self.assertEqual(request.headers['content-length'],
+                             '%d' % CHUNK_SIZE)
+            self.assertEqual(end, CHUNK_SIZE)
+            stream.close()
+
     def test__send_chunk_w_total_size_stream_exhausted(self):
         from google.cloud.streaming.stream_slice import StreamSlice
 
@@ -1922,6 +2213,84 @@ class Test_Upload(unittest.TestCase):
         self.assertEqual(end, SIZE)
 
 
+class Test__ReadAhead(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.streaming.transfer import _ReadAhead
+
+        return _ReadAhead
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_get(self):
+        import io
+
+        stream = io.BytesIO(b'ABCDEFGHIJ')
+
+        def read_chunk(start, total_size, buffer):
+            self.assertIsNone(buffer)
+            data = stream.read(4)
+            return data, start + len(data) == total_size
+
+        reader = self._make_one(read_chunk, 0, 10, 1)
+
+        self.assertEqual(reader.get(), (0, b'ABCD', False))
+        self.assertEqual(reader.get(), (4, b'EFGH', False))
+        self.assertEqual(reader.get(), (8, b'IJ', True))
+        reader.close()
+        self.assertEqual(reader.position, 10)
+
+    def test_close_bounded(self):
+        starts = []
+
+        def read_chunk(start, total_size, buffer):
+            starts.append(start)
+            return b'X', False
+
+        reader = self._make_one(read_chunk, 5, None, 2)
+        self.assertEqual(reader.get(), (5, b'X', False))
+        reader.close()
+        reader.close()
+
+        # At most ``depth`` chunks wait in the queue, plus one blocked in
+        # ``put`` and the one already returned.
+        self.assertLessEqual(len(starts), 4)
+        self.assertEqual(reader.position, 5 + len(starts))
+
+    def test_buffer_pool(self):
+        buffers = []
+
+        def read_chunk(start, total_size, buffer):
+            buffers.append(buffer)
+            view = memoryview(buffer)[:2]
+            view[:] = b'XY'
+            return view, start + 2 == total_size
+
+        reader = self._make_one(read_chunk, 0, 12, 1, buffer_size=2)
+        chunks = [reader.get() for _ in range(6)]
+        reader.close()
+
+        self.assertEqual([chunk[0] for chunk in chunks], [0, 2, 4, 6, 8, 10])
+        self.assertTrue(chunks[-1][2])
+        # ``depth + 2`` buffers, reused in turn.
+        self.assertEqual(len(buffers), 6)
+        self.assertEqual(len(set(id(buffer) for buffer in buffers)), 3)
+        self.assertIs(buffers[3], buffers[0])
+        self.assertIs(buffers[4], buffers[1])
+
+    def test_get_reraises(self):
+        def read_chunk(start, total_size, buffer):
+            raise IOError('disk')
+
+        reader = self._make_one(read_chunk, 0, None, 1)
+
+        with self.assertRaises(IOError):
+            reader.get()
+        reader.close()
+
+
 def _email_chunk_parser():
     import six
 
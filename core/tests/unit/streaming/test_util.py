@@ -64,3 +64,44 @@ class Test_acceptable_mime_type(unittest.TestCase):
 
     def test_hit(self):
         self.assertTrue(self._call_fut(['text/*'], 'text/plain'))
+
+
+class Test_read_into(unittest.TestCase):
+
+    def _call_fut(self, *args, **kw):
+        from google.cloud.streaming.util import read_into
+
+        return read_into(*args, **kw)
+
+    def test_w_readinto(self):
+        from io import BytesIO
+
+        buffer = bytearray(4)
+        count = self._call_fut(BytesIO(b'ABCDEF'), memoryview(buffer))
+        self.assertEqual(count, 4)
+        self.assertEqual(bytes(buffer), b'ABCD')
+
+    def test_wo_readinto(self):
+        class _Stream(object):
+
+            def __init__(self, chunks):
+                self._chunks = list(chunks)
+
+            def read(self, size):
+                if not self._chunks:
+                    return b''
+                return self._chunks.pop(0)[:size]
+
+        buffer = bytearray(6)
+        stream = _Stream([b'AB', b'CD'])
+        count = self._call_fut(stream, memoryview(buffer))
+        self.assertEqual(count, 4)
+        self.assertEqual(bytes(buffer[:count]), b'ABCD')
+
+    def test_short_stream(self):
+        from io import BytesIO
+
+        buffer = bytearray(b'......')
+        count = self._call_fut(BytesIO(b'ABC'), memoryview(buffer))
+        self.assertEqual(count, 3)
+        self.assertEqual(bytes(buffer), b'ABC...')
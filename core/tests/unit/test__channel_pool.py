@@ -0,0 +1,262 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestSharedChannel(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._channel_pool import SharedChannel
+
+        return SharedChannel
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_constructor(self):
+        import grpc
+
+        channels = [_Channel(), _Channel()]
+        shared = self._make_one(channels)
+
+        self.assertIsInstance(shared, grpc.Channel)
+        self.assertEqual(shared.channels, tuple(channels))
+
+    def _multi_callable_helper(self, factory_name, abc_name):
+        import grpc
+
+        channels = [_Channel('a'), _Channel('b')]
+        shared = self._make_one(channels)
+        factory = getattr(shared, factory_name)
+
+        multi_callable = factory(
+            '/svc/Method', request_serializer='ser',
+            response_deserializer='deser', _registered_method=True)
+
+        self.assertIsInstance(multi_callable, getattr(grpc, abc_name))
+        for channel in channels:
+            self.assertEqual(channel.created, [(
+                factory_name, '/svc/Method',
+                {'request_serializer': 'ser',
+                 'response_deserializer': 'deser',
+                 '_registered_method': True})])
+
+        # Calls are spread round-robin over the channels.
+        self.assertEqual(multi_callable('req'), ('a', 'call', 'req'))
+        self.assertEqual(multi_callable('req'), ('b', 'call', 'req'))
+        self.assertEqual(multi_callable.future('req'),
+                         ('a', 'future', 'req'))
+        self.assertEqual(multi_callable.with_call('req', timeout=1),
+                         ('b', 'with_call', 'req'))
+
+    def test_unary_unary(self):
+        self._multi_callable_helper('unary_unary', 'UnaryUnaryMultiCallable')
+
+    def test_unary_stream(self):
+        self._multi_callable_helper(
+            'unary_stream', 'UnaryStreamMultiCallable')
+
+    def test_stream_unary(self):
+        self._multi_callable_helper(
+            'stream_unary', 'StreamUnaryMultiCallable')
+
+    def test_stream_stream(self):
+        self._multi_callable_helper(
+            'stream_stream', 'StreamStreamMultiCallable')
+
+    def test_subscribe_unsubscribe(self):
+        first = mock.Mock(spec=['subscribe', 'unsubscribe'])
+        second = mock.Mock(spec=['subscribe', 'unsubscribe'])
+        shared = self._make_one([first, second])
+        callback = object()
+
+        shared.subscribe(callback, try_to_connect=True)
+        shared.unsubscribe(callback)
+
+        first.subscribe.assert_called_once_with(
+            callback, try_to_connect=True)
+        first.unsubscribe.assert_called_once_with(callback)
+        second.subscribe.assert_not_called()
+
+    def test_close(self):
+        channels = [_Channel(), object()]
+        shared = self._make_one(channels)
+
+        shared.close()
+        shared.close()
+
+        self.assertEqual(channels[0].closed, 1)
+
+    def test_closed_when_unreferenced(self):
+        import gc
+
+        channel = _Channel()
+        shared = self._make_one([channel])
+        multi_callable = shared.unary_unary('/svc/Method')
+
+        del shared
+        gc.collect()
+        # Still referenced by the multi-callable.
+        self.assertEqual(channel.closed, 0)
+
+        del multi_callable
+        gc.collect()
+        self.assertEqual(channel.closed, 1)
+
+
+class Test_get_channel(unittest.TestCase):
+
+    def setUp(self):
+        from google.cloud import _channel_pool
+
+        _channel_pool.clear()
+
+    def tearDown(self):
+        from google.cloud import _channel_pool
+
+        _channel_pool.clear()
+
+    def _call_fut(self, *args, **kwargs):
+        from google.cloud._channel_pool import get_channel
+
+        return get_channel(*args, **kwargs)
+
+    def test_miss_then_hit(self):
+        created = []
+
+        def create_channel(index):
+            created.append(index)
+            return _Channel()
+
+        first = self._call_fut(('key',), create_channel)
+        second = self._call_fut(('key',), create_channel)
+
+        self.assertIs(first, second)
+        self.assertEqual(created, [0])
+
+    def test_pool_size(self):
+        created = []
+
+        def create_channel(index):
+            created.append(index)
+            return _Channel()
+
+        pooled = self._call_fut(('key',), create_channel, pool_size=3)
+        single = self._call_fut(('key',), create_channel)
+
+        self.assertEqual(len(pooled.channels), 3)
+        self.assertIsNot(pooled, single)
+        self.assertEqual(created, [0, 1, 2, 0])
+
+    def test_bad_pool_size(self):
+        with self.assertRaises(ValueError):
+            self._call_fut(('key',), _Channel, pool_size=0)
+
+    def test_dropped_when_unreferenced(self):
+        import gc
+
+        channels = []
+
+        def create_channel(index):
+            channel = _Channel()
+            channels.append(channel)
+            return channel
+
+        first = self._call_fut(('key',), create_channel)
+        del first
+        gc.collect()
+        self.assertEqual(channels[0].closed, 1)
+
+        second = self._call_fut(('key',), create_channel)
+        self.assertEqual(len(channels), 2)
+        self.assertIs(second.channels[0], channels[1])
+
+    def test_clear(self):
+        first = self._call_fut(('key',), lambda index: _Channel())
+        self._get_module().clear()
+        second = self._call_fut(('key',), lambda index: _Channel())
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.channels[0].closed, 0)
+
+    def test_after_fork(self):
+        import os
+
+        module = self._get_module()
+        first = self._call_fut(('key',), lambda index: _Channel())
+        lock = module._CHANNELS_LOCK
+
+        with mock.patch.object(os, 'getpid',
+                               return_value=module._CHANNELS_PID + 1):
+            second = self._call_fut(('key',), lambda index: _Channel())
+            third = self._call_fut(('key',), lambda index: _Channel())
+        # Back in the "parent", the child's cache is discarded in turn.
+        fourth = self._call_fut(('key',), lambda index: _Channel())
+
+        self.assertIsNot(first, second)
+        self.assertIs(second, third)
+        self.assertIsNot(fourth, second)
+        self.assertIsNot(module._CHANNELS_LOCK, lock)
+
+    @staticmethod
+    def _get_module():
+        from google.cloud import _channel_pool
+
+        return _channel_pool
+
+
+class _MultiCallable(object):
+
+    def __init__(self, name):
+        self._name = name
+
+    def __call__(self, request, **kwargs):
+        return self._name, 'call', request
+
+    def future(self, request, **kwargs):
+        return self._name, 'future', request
+
+    def with_call(self, request, **kwargs):
+        return self._name, 'with_call', request
+
+
+class _Channel(object):
+
+    def __init__(self, name=None):
+        self._name = name
+        self.created = []
+        self.closed = 0
+
+    def _factory(self, factory_name, method, **kwargs):
+        self.created.append((factory_name, method, kwargs))
+        return _MultiCallable(self._name)
+
+    def unary_unary(self, method, **kwargs):
+        return self._factory('unary_unary', method, **kwargs)
+
+    def unary_stream(self, method, **kwargs):
+        return self._factory('unary_stream', method, **kwargs)
+
+    def stream_unary(self, method, **kwargs):
+        return self._factory('stream_unary', method, **kwargs)
+
+    def stream_stream(self, method, **kwargs):
+        return self._factory('stream_stream', method, **kwargs)
+
+    def close(self):
+        self.closed += 1
@@ -17,6 +17,14 @@ import unittest
 import mock
 
 
+def _helpers_numpy():
+    try:
+        import numpy
+    except ImportError:  # pragma: NO COVER
+        return None
+    return numpy
+
+
 class Test__LocalStack(unittest.TestCase):
 
     @staticmethod
@@ -130,6 +138,24 @@ class Test__ensure_tuple_or_list(unittest.TestCase):
             self._call_fut('ARGNAME', invalid_tuple_or_list)
 
 
+class Test__module_available(unittest.TestCase):
+
+    def _call_fut(self, name):
+        from google.cloud._helpers import _module_available
+
+        return _module_available(name)
+
+    def test_available(self):
+        self.assertTrue(self._call_fut('json'))
+        self.assertTrue(self._call_fut('google.cloud._helpers'))
+
+    def test_missing(self):
+        self.assertFalse(self._call_fut('google.cloud._no_such_module'))
+
+    def test_missing_parent(self):
+        self.assertFalse(self._call_fut('_no_such_package.module'))
+
+
 class Test__determine_default_project(unittest.TestCase):
 
     def _call_fut(self, project=None):
@@ -433,6 +459,160 @@ class Test__rfc3339_nanos_to_datetime(unittest.TestCase):
         self.assertEqual(result, expected_result)
 
 
+class Test__rfc3339_differential(unittest.TestCase):
+    """Compare the fast-path parsers against the original implementations.
+    """
+
+    @staticmethod
+    def _reference_micros(dt_str):
+        import datetime
+        from google.cloud._helpers import UTC
+
+        return datetime.datetime.strptime(
+            dt_str, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=UTC)
+
+    @staticmethod
+    def _reference_nanos(dt_str):
+        import datetime
+        from google.cloud._helpers import _RFC3339_NANOS
+        from google.cloud._helpers import UTC
+
+        with_nanos = _RFC3339_NANOS.match(dt_str)
+        if with_nanos is None:
+            raise ValueError(dt_str)
+        bare_seconds = datetime.datetime.strptime(
+            with_nanos.group('no_fraction'), '%Y-%m-%dT%H:%M:%S')
+        fraction = with_nanos.group('nanos')
+        if fraction is None:
+            micros = 0
+        else:
+            scale = 9 - len(fraction)
+            micros = int(fraction) * (10 ** scale) // 1000
+        return bare_seconds.replace(microsecond=micros, tzinfo=UTC)
+
+    @staticmethod
+    def _samples():
+        import random
+
+        rng = random.Random(1234)
+        samples = [
+            '2009-12-17T12:44:32.123456Z',
+            '2009-12-17T12:44:32Z',
+            '2009-12-17T12:44:32.1Z',
+            '2009-12-17T12:44:32.123456789Z',
+            '2009-12-17T12:44:32.123456Ztrailing',
+            '2009-12-17T12:44:32.123456Z\n',
+            '2009-12-17T12:44:32.123456+00:00',
+            '2009-1-7T2:4:3.5Z',
+            '2009-12-17 12:44:32.123456Z',
+            '2009-13-17T12:44:32.123456Z',
+            '2009-02-29T12:44:32.123456Z',
+            '2008-02-29T12:44:32.123456Z',
+            '2009-12-17T24:44:32.123456Z',
+            '2009-12-17T12:44:60.123456Z',
+            '0000-12-17T12:44:32.123456Z',
+            '9999-12-31T23:59:59.999999Z',
+            '0001-01-01T00:00:00.000000Z',
+            u'2009-12-17T12:44:32.\u0661\u0662Z',
+            u'\u0662009-12-17T12:44:32.123456Z',
+            '',
+            'Z',
+        ]
+        for _ in range(2000):
+            fields = (
+                rng.randint(1, 9999), rng.randint(0, 13), rng.randint(0, 32),
+                rng.randint(0, 25), rng.randint(0, 61), rng.randint(0, 61))
+            stamp = '%04d-%02d-%02dT%02d:%02d:%02d' % fields
+            digits = rng.randint(0, 10)
+            if digits:
+                stamp += '.' + ''.join(
+                    rng.choice('0123456789') for _ in range(digits))
+            samples.append(stamp + 'Z')
+        return samples
+
+    def _compare(self, fast, reference):
+        for sample in self._samples():
+            try:
+                expected = reference(sample)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    fast(sample)
+            else:
+                result = fast(sample)
+                self.assertEqual(result, expected, sample)
+                self.assertIs(result.tzinfo, expected.tzinfo)
+
+    def test_rfc3339_to_datetime(self):
+        from google.cloud._helpers import _rfc3339_to_datetime
+
+        self._compare(_rfc3339_to_datetime, self._reference_micros)
+
+    def test_rfc3339_nanos_to_datetime(self):
+        from google.cloud._helpers import _rfc3339_nanos_to_datetime
+
+        self._compare(_rfc3339_nanos_to_datetime, self._reference_nanos)
+
+    def test_cached(self):
+        from google.cloud._helpers import _rfc3339_nanos_to_datetime
+
+        dt_str = '2017-06-01T12:00:00.5Z'
+        first = _rfc3339_nanos_to_datetime(dt_str)
+        second = _rfc3339_nanos_to_datetime(dt_str)
+        self.assertIs(first, second)
+
+
+class Test__rfc3339_bulk_to_datetime(unittest.TestCase):
+
+    def _call_fut(self, *args, **kwargs):
+        from google.cloud._helpers import _rfc3339_bulk_to_datetime
+
+        return _rfc3339_bulk_to_datetime(*args, **kwargs)
+
+    def test_micros(self):
+        import datetime
+        from google.cloud._helpers import UTC
+
+        result = self._call_fut(
+            ['2009-12-17T12:44:32.123456Z', None,
+             '1988-04-29T12:12:12.000001Z'])
+
+        self.assertEqual(result, [
+            datetime.datetime(2009, 12, 17, 12, 44, 32, 123456, UTC),
+            None,
+            datetime.datetime(1988, 4, 29, 12, 12, 12, 1, UTC),
+        ])
+
+    def test_micros_invalid(self):
+        with self.assertRaises(ValueError):
+            self._call_fut(['2009-12-17T12:44:32Z'])
+
+    def test_nanos(self):
+        import datetime
+        from google.cloud._helpers import UTC
+
+        result = self._call_fut(
+            iter(['2009-12-17T12:44:32.123456789Z', '2009-12-17T12:44:32Z']),
+            nanos=True)
+
+        self.assertEqual(result, [
+            datetime.datetime(2009, 12, 17, 12, 44, 32, 123456, UTC),
+            datetime.datetime(2009, 12, 17, 12, 44, 32, 0, UTC),
+        ])
+
+    @unittest.skipIf(_helpers_numpy() is None, 'numpy not installed')
+    def test_as_numpy(self):
+        import numpy
+
+        result = self._call_fut(
+            ['2009-12-17T12:44:32.123456789Z', None], nanos=True,
+            as_numpy=True)
+
+        self.assertEqual(result.dtype, numpy.dtype('datetime64[us]'))
+        self.assertEqual(
+            result[0], numpy.datetime64('2009-12-17T12:44:32.123456'))
+        self.assertTrue(numpy.isnat(result[1]))
+
+
 class Test__datetime_to_rfc3339(unittest.TestCase):
 
     def _call_fut(self, *args, **kwargs):
@@ -707,6 +887,11 @@ class Test__name_from_project_path(unittest.TestCase):
 
 class Test_make_secure_channel(unittest.TestCase):
 
+    def setUp(self):
+        from google.cloud import _channel_pool
+
+        _channel_pool.clear()
+
     def _call_fut(self, *args, **kwargs):
         from google.cloud._helpers import make_secure_channel
 
@@ -714,6 +899,7 @@ class Test_make_secure_channel(unittest.TestCase):
 
     def test_it(self):
         from six.moves import http_client
+        from google.cloud._channel_pool import SharedChannel
 
         credentials = object()
         host = 'HOST'
@@ -726,7 +912,9 @@ class Test_make_secure_channel(unittest.TestCase):
         with secure_authorized_channel_patch as secure_authorized_channel:
             result = self._call_fut(credentials, user_agent, host)
 
-        self.assertIs(result, secure_authorized_channel.return_value)
+        self.assertIsInstance(result, SharedChannel)
+        self.assertEqual(
+            result.channels, (secure_authorized_channel.return_value,))
 
         expected_target = '%s:%d' % (host, http_client.HTTPS_PORT)
         expected_options = (('grpc.primary_user_agent', user_agent),)
@@ -750,7 +938,8 @@ class Test_make_secure_channel(unittest.TestCase):
             result = self._call_fut(credentials, user_agent, host,
                                     extra_options)
 
-        self.assertIs(result, secure_authorized_channel.return_value)
+        self.assertEqual(
+            result.channels, (secure_authorized_channel.return_value,))
 
         expected_target = '%s:%d' % (host, http_client.HTTPS_PORT)
         expected_options = (
@@ -761,6 +950,71 @@ class Test_make_secure_channel(unittest.TestCase):
         secure_authorized_channel.assert_called_once_with(
             credentials, mock.ANY, expected_target, options=expected_options)
 
+    def test_cached(self):
+        credentials = object()
+
+        secure_authorized_channel_patch = mock.patch(
+            'google.auth.transport.grpc.secure_authorized_channel',
+            autospec=True)
+
+        with secure_authorized_channel_patch as secure_authorized_channel:
+            first = self._call_fut(credentials, 'agent', 'HOST')
+            second = self._call_fut(credentials, 'agent', 'HOST')
+            other_host = self._call_fut(credentials, 'agent', 'OTHER')
+            other_credentials = self._call_fut(object(), 'agent', 'HOST')
+            extra = self._call_fut(credentials, 'agent', 'HOST', [('a', 1)])
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_host)
+        self.assertIsNot(first, other_credentials)
+        self.assertIsNot(first, extra)
+        self.assertEqual(secure_authorized_channel.call_count, 4)
+
+    def test_shared_refresh_request(self):
+        import google_auth_httplib2
+        from google.cloud._http_pool import PooledHttp
+
+        secure_authorized_channel_patch = mock.patch(
+            'google.auth.transport.grpc.secure_authorized_channel',
+            autospec=True)
+
+        with secure_authorized_channel_patch as secure_authorized_channel:
+            self._call_fut(object(), 'agent', 'HOST')
+            self._call_fut(object(), 'agent', 'HOST')
+
+        (_, first, _), _ = secure_authorized_channel.call_args_list[0]
+        (_, second, _), _ = secure_authorized_channel.call_args_list[1]
+        self.assertIs(first, second)
+        self.assertIsInstance(first, google_auth_httplib2.Request)
+        self.assertIsInstance(first.http, PooledHttp)
+
+    def test_pool(self):
+        from google.cloud._channel_pool import POOL_INDEX_OPTION
+
+        credentials = object()
+        created = [object() for _ in range(4)]
+
+        secure_authorized_channel_patch = mock.patch(
+            'google.auth.transport.grpc.secure_authorized_channel',
+            autospec=True, side_effect=created)
+
+        with secure_authorized_channel_patch as secure_authorized_channel:
+            result = self._call_fut(credentials, 'agent', 'HOST',
+                                    pool_size=3)
+            single = self._call_fut(credentials, 'agent', 'HOST')
+
+        self.assertEqual(result.channels, tuple(created[:3]))
+        self.assertIsNot(single, result)
+        options = [
+            kwargs['options']
+            for _, kwargs in secure_authorized_channel.call_args_list]
+        self.assertEqual(options[:3], [
+            (('grpc.primary_user_agent', 'agent'), (POOL_INDEX_OPTION, 0)),
+            (('grpc.primary_user_agent', 'agent'), (POOL_INDEX_OPTION, 1)),
+            (('grpc.primary_user_agent', 'agent'), (POOL_INDEX_OPTION, 2)),
+        ])
+        self.assertEqual(options[3], (('grpc.primary_user_agent', 'agent'),))
+
 
 class Test_make_secure_stub(unittest.TestCase):
 
@@ -790,15 +1044,46 @@ class Test_make_secure_stub(unittest.TestCase):
         credentials = object()
         user_agent = 'you-sir-age-int'
         host = 'localhost'
-        extra_options = {'extra_options': ()}
         with _Monkey(MUT, make_secure_channel=mock_channel):
             stub = self._call_fut(credentials, user_agent,
                                   stub_class, host)
 
         self.assertIs(stub, result)
         self.assertEqual(channels, [channel_obj])
-        self.assertEqual(channel_args,
-                         [(credentials, user_agent, host), extra_options])
+        self.assertEqual(
+            channel_args,
+            [(credentials, user_agent, host),
+             {'extra_options': (), 'pool_size': 1}])
+
+    def test_instruments_stub(self):
+        import grpc
+        from google.cloud._testing import _Monkey
+        from google.cloud import _helpers as MUT
+        from google.cloud.instrumentation import _InstrumentedMultiCallable
+        from google.cloud.rate_limit import RateLimiter
+
+        class _Method(grpc.UnaryUnaryMultiCallable):
+
+            def __call__(self, request):  # pragma: NO COVER
+                raise NotImplementedError
+
+            future = with_call = __call__
+
+        class FooStub(object):
+
+            def __init__(self, channel):
+                self.channel = channel
+                self.Method = _Method()
+
+        channel_obj = object()
+        limiter = RateLimiter()
+        with _Monkey(MUT, make_secure_channel=lambda *a, **kw: channel_obj):
+            stub = self._call_fut(object(), 'agent', FooStub, 'localhost',
+                                  rate_limiter=limiter)
+
+        self.assertIs(stub.channel, channel_obj)
+        self.assertIsInstance(stub.Method, _InstrumentedMultiCallable)
+        self.assertIs(stub.Method._rate_limiter, limiter)
 
 
 class Test_make_insecure_stub(unittest.TestCase):
@@ -809,31 +1094,21 @@ class Test_make_insecure_stub(unittest.TestCase):
         return make_insecure_stub(*args, **kwargs)
 
     def _helper(self, target, host, port=None):
-        from google.cloud._testing import _Monkey
-        from google.cloud import _helpers as MUT
-
         mock_result = object()
         stub_inputs = []
         CHANNEL = object()
 
-        class _GRPCModule(object):
-
-            def insecure_channel(self, *args):
-                self.insecure_channel_args = args
-                return CHANNEL
-
-        grpc_mod = _GRPCModule()
-
         def mock_stub_class(channel):
             stub_inputs.append(channel)
             return mock_result
 
-        with _Monkey(MUT, grpc=grpc_mod):
+        with mock.patch('grpc.insecure_channel',
+                        return_value=CHANNEL) as insecure_channel:
             result = self._call_fut(mock_stub_class, host, port=port)
 
         self.assertIs(result, mock_result)
         self.assertEqual(stub_inputs, [CHANNEL])
-        self.assertEqual(grpc_mod.insecure_channel_args, (target,))
+        insecure_channel.assert_called_once_with(target)
 
     def test_with_port_argument(self):
         host = 'HOST'
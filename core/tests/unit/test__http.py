@@ -33,6 +33,19 @@ class TestConnection(unittest.TestCase):
         conn = self._make_one(client)
         self.assertIs(conn._client, client)
 
+    def test_pickle(self):
+        import pickle
+        from google.cloud._single_flight import SingleFlight
+
+        conn = self._make_one(['client'])
+        in_flight = conn._in_flight
+
+        copied = pickle.loads(pickle.dumps(conn))
+
+        self.assertEqual(copied._client, ['client'])
+        self.assertIsInstance(copied._in_flight, SingleFlight)
+        self.assertIsNot(copied._in_flight, in_flight)
+
     def test_credentials_property(self):
         client = mock.Mock(spec=['_credentials'])
         conn = self._make_one(client)
@@ -52,6 +65,34 @@ class TestConnection(unittest.TestCase):
         self.assertEqual(conn.USER_AGENT, expected_ua)
 
 
+class Test__gzip_body(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(data, threshold):
+        from google.cloud._http import _gzip_body
+
+        return _gzip_body(data, threshold)
+
+    def test_below_threshold(self):
+        self.assertIsNone(self._call_fut(b'x' * 99, 100))
+
+    def test_compressed(self):
+        import zlib
+
+        data = u'caf\u00e9 ' * 100
+
+        compressed = self._call_fut(data, 100)
+
+        self.assertLess(len(compressed), len(data))
+        self.assertEqual(zlib.decompress(compressed, 16 + zlib.MAX_WBITS),
+                         data.encode('utf-8'))
+
+    def test_incompressible(self):
+        import os
+
+        self.assertIsNone(self._call_fut(os.urandom(1000), 100))
+
+
 class TestJSONConnection(unittest.TestCase):
 
     @staticmethod
@@ -176,6 +217,28 @@ class TestJSONConnection(unittest.TestCase):
         }
         self.assertEqual(http._called_with['headers'], expected_headers)
 
+    def test__make_request_w_text_data(self):
+        http = _Http(
+            {'status': '200', 'content-type': 'text/plain'},
+            b'',
+        )
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_one(client)
+        data = u'{"name": "caf\u00e9"}'
+        conn._make_request('POST', 'http://example.com/test', data)
+        self.assertEqual(http._called_with['headers']['Content-Length'],
+                         str(len(data) + 1))
+
+    def test__make_request_w_bytes_data(self):
+        http = _Http(
+            {'status': '200', 'content-type': 'text/plain'},
+            b'',
+        )
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_one(client)
+        conn._make_request('POST', 'http://example.com/test', b'\x00\xff')
+        self.assertEqual(http._called_with['headers']['Content-Length'], '2')
+
     def test_api_request_defaults(self):
         http = _Http(
             {'status': '200', 'content-type': 'application/json'},
@@ -221,6 +284,478 @@ class TestJSONConnection(unittest.TestCase):
         self.assertEqual(conn.api_request('GET', '/', expect_json=False),
                          b'CONTENT')
 
+    def test_api_request_w_lazy_items_key(self):
+        from google.cloud._lazy_json import LazyJSONArray
+        from google.cloud._lazy_json import LazyJSONObject
+
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'},
+            b'{"items": [{"a": 1}, {"b": 2}], "nextPageToken": "tok"}',
+        )
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+
+        result = conn.api_request('GET', '/', lazy_items_key='items')
+
+        self.assertIsInstance(result, LazyJSONObject)
+        self.assertEqual(result['nextPageToken'], 'tok')
+        self.assertIsInstance(result['items'], LazyJSONArray)
+        self.assertEqual(list(result['items']), [{'a': 1}, {'b': 2}])
+
+    def test_api_request_instrumented(self):
+        from google.cloud import instrumentation
+
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'},
+            b'{"name": "bucket"}',
+        )
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            conn.api_request('POST', '/b/bucket', data={'a': 'b'})
+
+        record, = records
+        self.assertEqual(record.transport, 'http')
+        self.assertEqual(record.method, 'POST')
+        self.assertEqual(record.path_template, '/b/{}')
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.bytes_sent, len('{"a": "b"}'))
+        self.assertEqual(record.bytes_received, len('{"name": "bucket"}'))
+        self.assertEqual(record.retry_count, 0)
+
+    def test_api_request_instrumented_error(self):
+        from google.cloud import instrumentation
+        from google.cloud.exceptions import NotFound
+
+        http = _Http(
+            {'status': '404', 'content-type': 'text/plain'},
+            b'{}',
+        )
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            with self.assertRaises(NotFound):
+                conn.api_request('GET', '/b/missing')
+
+        record, = records
+        self.assertEqual(record.status, 404)
+
+    def test_api_request_w_retry(self):
+        from google.cloud import instrumentation
+        from google.cloud.retry import Retry
+
+        http = _Http(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        http.responses.append(
+            ({'status': '200', 'content-type': 'application/json'}, b'{}'))
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            with mock.patch('time.sleep') as sleep:
+                result = conn.api_request('GET', '/b/bucket', retry=Retry())
+
+        self.assertEqual(result, {})
+        self.assertEqual(len(http.requested), 2)
+        self.assertEqual(sleep.call_count, 1)
+        record, = records
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.retry_count, 1)
+        (delay,), _ = sleep.call_args
+        self.assertEqual(record.retry_delay, delay)
+
+    def test_api_request_w_rate_limiter(self):
+        from google.cloud import instrumentation
+        from google.cloud.rate_limit import MethodRateLimiter
+        from google.cloud.rate_limit import RateLimiter
+        from google.cloud.retry import Retry
+
+        http = _Http(
+            {'status': '429', 'content-type': 'text/plain'}, b'quota')
+        http.responses.append(
+            ({'status': '200', 'content-type': 'application/json'}, b'{}'))
+        limiter = RateLimiter(max_concurrency=8)
+        other = RateLimiter(max_concurrency=8)
+        client = mock.Mock(
+            _http=http, rate_limiter=MethodRateLimiter(
+                {'DELETE /b/{}/o/{}': limiter}, default=other),
+            spec=['_http', 'rate_limiter'])
+        conn = self._make_mock_one(client)
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            with mock.patch('time.sleep'):
+                conn.api_request(
+                    'DELETE', '/b/bucket/o/blob', retry=Retry(),
+                    expect_json=False)
+
+        self.assertEqual(len(http.requested), 2)
+        stats = limiter.stats()
+        self.assertEqual((stats.calls, stats.backoffs, stats.in_flight),
+                         (2, 1, 0))
+        self.assertEqual(other.stats().calls, 0)
+        record, = records
+        self.assertEqual(record.retry_count, 1)
+        self.assertEqual(record.throttle_delay, 0.0)
+
+    def test_api_request_w_rate_limiter_connection_error(self):
+        import socket
+        from google.cloud.rate_limit import RateLimiter
+
+        http = mock.Mock(spec=['request'])
+        http.request.side_effect = socket.error('reset')
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+        limiter = RateLimiter(max_concurrency=2)
+
+        with self.assertRaises(socket.error):
+            conn.api_request('GET', '/b/bucket', rate_limiter=limiter)
+
+        stats = limiter.stats()
+        self.assertEqual((stats.calls, stats.backoffs, stats.in_flight),
+                         (1, 0, 0))
+
+    def test_api_request_w_client_retry(self):
+        from google.cloud.exceptions import ServiceUnavailable
+        from google.cloud.retry import Retry
+
+        http = _Http(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        client = mock.Mock(_http=http, retry=Retry(deadline=0.0),
+                           spec=['_http', 'retry'])
+        conn = self._make_mock_one(client)
+
+        with mock.patch('time.sleep') as sleep:
+            with self.assertRaises(ServiceUnavailable):
+                conn.api_request('GET', '/b/bucket')
+
+        self.assertEqual(len(http.requested), 1)
+        sleep.assert_not_called()
+
+    def test_api_request_w_client_retry_idempotent(self):
+        from google.cloud.retry import Retry
+
+        http = _Http(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        http.responses.append(
+            ({'status': '200', 'content-type': 'application/json'}, b'{}'))
+        client = mock.Mock(_http=http, retry=Retry(),
+                           spec=['_http', 'retry'])
+        conn = self._make_mock_one(client)
+
+        with mock.patch('time.sleep'):
+            result = conn.api_request('PUT', '/b/bucket', data={})
+
+        self.assertEqual(result, {})
+        self.assertEqual(len(http.requested), 2)
+
+    def test_api_request_w_client_retry_post_not_retried(self):
+        from google.cloud.exceptions import ServiceUnavailable
+        from google.cloud.retry import Retry
+
+        http = _Http(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        client = mock.Mock(_http=http, retry=Retry(),
+                           spec=['_http', 'retry'])
+        conn = self._make_mock_one(client)
+
+        for method in ('POST', 'PATCH'):
+            with mock.patch('time.sleep') as sleep:
+                with self.assertRaises(ServiceUnavailable):
+                    conn.api_request(method, '/b', data={'name': 'bucket'})
+            sleep.assert_not_called()
+
+        self.assertEqual(len(http.requested), 2)
+
+    def test_api_request_w_explicit_retry_post(self):
+        from google.cloud.retry import Retry
+
+        http = _Http(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        http.responses.append(
+            ({'status': '200', 'content-type': 'application/json'}, b'{}'))
+        client = mock.Mock(_http=http, retry=None, spec=['_http', 'retry'])
+        conn = self._make_mock_one(client)
+
+        with mock.patch('time.sleep'):
+            result = conn.api_request(
+                'POST', '/b', data={'name': 'bucket'}, retry=Retry())
+
+        self.assertEqual(result, {})
+        self.assertEqual(len(http.requested), 2)
+
+    def test_api_request_wo_retry(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        http = _Http(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        http.responses.append(
+            ({'status': '200', 'content-type': 'application/json'}, b'{}'))
+        client = mock.Mock(_http=http, retry=None, spec=['_http', 'retry'])
+        conn = self._make_mock_one(client)
+
+        with self.assertRaises(ServiceUnavailable):
+            conn.api_request('GET', '/b/bucket')
+
+        self.assertEqual(len(http.requested), 1)
+
+    def test_api_request_coalesce_gets(self):
+        import threading
+        from google.cloud import instrumentation
+
+        conn = None
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'},
+            b'{"name": "bucket"}')
+        request = http.request
+
+        def blocking_request(**kw):
+            # Wait until the other requests wait for this one.
+            _wait_for(lambda: sum(
+                flight.waiters
+                for flight in conn._in_flight._flights.values()) == 2)
+            return request(**kw)
+
+        http.request = blocking_request
+        client = mock.Mock(_http=http, coalesce_gets=True,
+                           spec=['_http', 'coalesce_gets'])
+        conn = self._make_mock_one(client)
+        results = []
+        records = []
+
+        def get():
+            results.append(conn.api_request('GET', '/b/bucket'))
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            threads = [threading.Thread(target=get) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(http.requested), 1)
+        self.assertEqual(results, [{'name': 'bucket'}] * 3)
+        # Each caller decodes its own copy.
+        self.assertEqual(len(set(id(result) for result in results)), 3)
+        self.assertEqual(
+            sorted((record.coalesced, record.bytes_received)
+                   for record in records),
+            [(False, 18), (True, 0), (True, 0)])
+        self.assertEqual(conn._in_flight._flights, {})
+
+    def test_api_request_coalesce_gets_error(self):
+        from google.cloud.exceptions import NotFound
+
+        http = _Http(
+            {'status': '404', 'content-type': 'text/plain'}, b'missing')
+        client = mock.Mock(_http=http, coalesce_gets=True,
+                           spec=['_http', 'coalesce_gets'])
+        conn = self._make_mock_one(client)
+
+        with self.assertRaises(NotFound):
+            conn.api_request('GET', '/b/bucket')
+        self.assertEqual(len(http.requested), 1)
+
+    def test_api_request_coalesce_gets_only_gets(self):
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'}, b'{}')
+        client = mock.Mock(_http=http, coalesce_gets=True,
+                           spec=['_http', 'coalesce_gets'])
+        conn = self._make_mock_one(client)
+        conn._in_flight = mock.Mock(spec=['call'])
+
+        conn.api_request('POST', '/b', data={'name': 'bucket'})
+        conn.api_request('DELETE', '/b/bucket')
+
+        conn._in_flight.call.assert_not_called()
+        self.assertEqual(len(http.requested), 2)
+
+    def test_api_request_wo_coalesce_gets(self):
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'}, b'{}')
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+        conn._in_flight = mock.Mock(spec=['call'])
+
+        conn.api_request('GET', '/b/bucket')
+
+        conn._in_flight.call.assert_not_called()
+
+    def test_api_request_w_compression_threshold(self):
+        import json
+        import zlib
+        from google.cloud import instrumentation
+
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'}, b'{}')
+        client = mock.Mock(_http=http, compression_threshold=1024,
+                           spec=['_http', 'compression_threshold'])
+        conn = self._make_mock_one(client)
+        rows = {'rows': [{'json': {'name': u'caf\u00e9', 'value': index}}
+                         for index in range(100)]}
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            conn.api_request('POST', '/insertAll', data=rows)
+
+        body = http._called_with['body']
+        headers = http._called_with['headers']
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-Length'], str(len(body)))
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(records[0].bytes_sent, len(body))
+        decoded = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        self.assertEqual(json.loads(decoded.decode('utf-8')), rows)
+
+    def test_api_request_w_compression_threshold_small_body(self):
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'}, b'{}')
+        client = mock.Mock(_http=http, compression_threshold=1024,
+                           spec=['_http', 'compression_threshold'])
+        conn = self._make_mock_one(client)
+
+        conn.api_request('POST', '/b', data={'name': 'bucket'})
+
+        self.assertEqual(http._called_with['body'], '{"name": "bucket"}')
+        self.assertNotIn('Content-Encoding', http._called_with['headers'])
+
+    def test_api_request_w_compression_threshold_encoded_body(self):
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'}, b'{}')
+        client = mock.Mock(_http=http, compression_threshold=0,
+                           spec=['_http', 'compression_threshold'])
+        conn = self._make_mock_one(client)
+        data = b'x' * 100
+
+        conn.api_request('POST', '/b', data=data,
+                         headers={'Content-Encoding': 'identity'})
+
+        self.assertEqual(http._called_with['body'], data)
+        self.assertEqual(http._called_with['headers']['Content-Encoding'],
+                         'identity')
+
+    def test_api_request_w_json_codec(self):
+        from google.cloud.json_codec import JSONCodec
+
+        class _Codec(JSONCodec):
+            def dumps(self, value):
+                return JSONCodec.dumps(value).encode('utf-8')
+
+        codec = mock.Mock(wraps=_Codec(), spec=['dumps', 'loads'])
+        http = _Http(
+            {'status': '200', 'content-type': 'application/json'},
+            b'{"name": "caf\xc3\xa9"}')
+        client = mock.Mock(_http=http, json_codec=codec,
+                           spec=['_http', 'json_codec'])
+        conn = self._make_mock_one(client)
+
+        result = conn.api_request('POST', '/b', data={'name': 'bucket'})
+
+        self.assertEqual(result, {'name': u'caf\xe9'})
+        self.assertEqual(http._called_with['body'], b'{"name": "bucket"}')
+        self.assertEqual(http._called_with['headers']['Content-Length'],
+                         '18')
+        codec.dumps.assert_called_once_with({'name': 'bucket'})
+        codec.loads.assert_called_once_with(b'{"name": "caf\xc3\xa9"}')
+
+    def _metadata_cache_conn(self, *responses):
+        from google.cloud.metadata_cache import MetadataCache
+
+        http = _Http(*responses[0])
+        http.responses = list(responses)
+        client = mock.Mock(_http=http, metadata_cache=MetadataCache(),
+                           spec=['_http', 'metadata_cache'])
+        return self._make_mock_one(client), http
+
+    def test_api_request_metadata_cache_not_modified(self):
+        conn, http = self._metadata_cache_conn(
+            ({'status': '200', 'content-type': 'application/json',
+              'etag': '"abc"'}, b'{"name": "bucket", "labels": {}}'),
+            ({'status': '304'}, b''))
+        cache = conn._client.metadata_cache
+
+        first = conn.api_request('GET', '/b/bucket', _cacheable=True)
+        first['labels']['a'] = 'b'
+        second = conn.api_request('GET', '/b/bucket', _cacheable=True)
+
+        self.assertEqual(second, {'name': 'bucket', 'labels': {}})
+        self.assertNotIn('If-None-Match', http.requested[0]['headers'])
+        self.assertEqual(http.requested[1]['headers']['If-None-Match'],
+                         '"abc"')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_api_request_metadata_cache_modified(self):
+        conn, http = self._metadata_cache_conn(
+            ({'status': '200', 'content-type': 'application/json'},
+             b'{"etag": "abc", "name": "old"}'),
+            ({'status': '200', 'content-type': 'application/json'},
+             b'{"etag": "def", "name": "new"}'))
+        cache = conn._client.metadata_cache
+
+        conn.api_request('GET', '/b/bucket', _cacheable=True)
+        result = conn.api_request('GET', '/b/bucket', _cacheable=True)
+
+        self.assertEqual(result, {'etag': 'def', 'name': 'new'})
+        # Falls back to the ETag of the resource itself.
+        self.assertEqual(http.requested[1]['headers']['If-None-Match'],
+                         'abc')
+        self.assertEqual(cache.get('/b/bucket', http.requested[1]['uri']
+                                   ).etag, 'def')
+
+    def test_api_request_metadata_cache_not_cacheable(self):
+        conn, http = self._metadata_cache_conn(
+            ({'status': '200', 'content-type': 'application/json',
+              'etag': '"abc"'}, b'{}'))
+
+        conn.api_request('GET', '/b/bucket')
+        conn.api_request('GET', '/b/bucket')
+
+        self.assertNotIn('If-None-Match', http.requested[1]['headers'])
+        self.assertEqual(len(conn._client.metadata_cache), 0)
+
+    def test_api_request_metadata_cache_without_etag(self):
+        conn, _ = self._metadata_cache_conn(
+            ({'status': '200', 'content-type': 'application/json'},
+             b'{"name": "bucket"}'))
+
+        conn.api_request('GET', '/b/bucket', _cacheable=True)
+
+        self.assertEqual(len(conn._client.metadata_cache), 0)
+
+    def test_api_request_metadata_cache_invalidated(self):
+        conn, http = self._metadata_cache_conn(
+            ({'status': '200', 'content-type': 'application/json',
+              'etag': '"abc"'}, b'{}'))
+        cache = conn._client.metadata_cache
+
+        conn.api_request('GET', '/b/bucket', _cacheable=True)
+        conn.api_request('GET', '/b/other', _cacheable=True)
+        conn.api_request('PATCH', '/b/bucket', data={'labels': {}})
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get('/b/bucket', http.requested[0]['uri']))
+
+    def test_api_request_not_modified_wo_metadata_cache(self):
+        from google.cloud.exceptions import NotModified
+
+        http = _Http({'status': '304'}, b'')
+        client = mock.Mock(_http=http, spec=['_http'])
+        conn = self._make_mock_one(client)
+
+        with self.assertRaises(NotModified):
+            conn.api_request('GET', '/b/bucket', _cacheable=True)
+
     def test_api_request_w_query_params(self):
         from six.moves.urllib.parse import parse_qsl
         from six.moves.urllib.parse import urlsplit
@@ -405,16 +940,31 @@ class TestJSONConnection(unittest.TestCase):
         self.assertEqual(http._called_with['headers'], expected_headers)
 
 
+def _wait_for(predicate, timeout=5.0):
+    import time
+
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(0.001)
+
+
 class _Http(object):
 
     _called_with = None
 
     def __init__(self, headers, content):
-        from httplib2 import Response
-
-        self._response = Response(headers)
-        self._content = content
+        self.responses = [(headers, content)]
+        self.requested = []
 
     def request(self, **kw):
+        from httplib2 import Response
+
         self._called_with = kw
-        return self._response, self._content
+        self.requested.append(kw)
+        if len(self.responses) > 1:
+            headers, content = self.responses.pop(0)
+        else:
+            headers, content = self.responses[0]
+        return Response(headers), content
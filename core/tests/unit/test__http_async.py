@@ -0,0 +1,491 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+
+import mock
+
+
+_ASYNC_UNSUPPORTED = sys.version_info < (3, 5)
+
+
+def _run(coroutine):
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _done(result):
+    import asyncio
+
+    future = asyncio.Future(loop=asyncio.get_event_loop())
+    future.set_result(result)
+    return future
+
+
+@unittest.skipIf(_ASYNC_UNSUPPORTED, 'Requires Python 3.5+')
+class Test__running_loop(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut():
+        from google.cloud._http_async import _running_loop
+
+        return _running_loop()
+
+    def test_in_running_loop(self):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        found = []
+
+        def callback():
+            found.append(self._call_fut())
+            loop.stop()
+
+        loop.call_soon(callback)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+        self.assertEqual(found, [loop])
+
+
+@unittest.skipIf(_ASYNC_UNSUPPORTED, 'Requires Python 3.5+')
+class TestAuthorizedAsyncHttp(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._http_async import AuthorizedAsyncHttp
+
+        return AuthorizedAsyncHttp
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_session_explicit(self):
+        session = object()
+        http = self._make_one(_Credentials(), session=session)
+        self.assertIs(http.session, session)
+
+    def test_session_missing_aiohttp(self):
+        from google.cloud import _http_async
+
+        http = self._make_one(_Credentials())
+        with mock.patch.object(_http_async, 'aiohttp', new=None):
+            with self.assertRaises(RuntimeError):
+                getattr(http, 'session')
+
+    def test_session_created(self):
+        from google.cloud import _http_async
+
+        aiohttp = mock.Mock(spec=['ClientSession'])
+        http = self._make_one(_Credentials())
+        with mock.patch.object(_http_async, 'aiohttp', new=aiohttp):
+            self.assertIs(http.session, aiohttp.ClientSession.return_value)
+            self.assertIs(http.session, aiohttp.ClientSession.return_value)
+        aiohttp.ClientSession.assert_called_once_with()
+
+    def test_close_created_session(self):
+        from google.cloud import _http_async
+
+        session = _Session()
+        aiohttp = mock.Mock(spec=['ClientSession'])
+        aiohttp.ClientSession.return_value = session
+        http = self._make_one(_Credentials())
+        with mock.patch.object(_http_async, 'aiohttp', new=aiohttp):
+            self.assertIs(http.session, session)
+
+        _run(http.close())
+
+        self.assertEqual(session.closed, 1)
+        self.assertIsNone(http._session)
+        # Closing again is a no-op.
+        _run(http.close())
+        self.assertEqual(session.closed, 1)
+
+    def test_close_wo_session(self):
+        http = self._make_one(_Credentials())
+        _run(http.close())
+        self.assertIsNone(http._session)
+
+    def test_close_leaves_explicit_session_open(self):
+        session = _Session()
+        http = self._make_one(_Credentials(), session=session)
+
+        _run(http.close())
+
+        self.assertEqual(session.closed, 0)
+        self.assertIs(http.session, session)
+
+    def test_request(self):
+        credentials = _Credentials()
+        session = _Session(_Response(200, {'Content-Type': 'text/plain'}))
+        http = self._make_one(credentials, session=session)
+
+        response, content = _run(http.request(
+            'http://example.com/', method='POST', body=b'abc',
+            headers={'foo': 'bar'}))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response['content-type'], 'text/plain')
+        self.assertEqual(content, b'body')
+        self.assertEqual(credentials.refreshed, 0)
+        self.assertEqual(session._requested, [(
+            ('POST', 'http://example.com/'),
+            {
+                'data': b'abc',
+                'headers': {'foo': 'bar', 'authorization': 'Bearer token0'},
+            },
+        )])
+
+    def test_request_refreshes_invalid_credentials(self):
+        credentials = _Credentials(valid=False)
+        session = _Session(_Response(200))
+        http = self._make_one(credentials, session=session)
+
+        response, _ = _run(http.request('http://example.com/'))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(credentials.refreshed, 1)
+        headers = session._requested[0][1]['headers']
+        self.assertEqual(headers['authorization'], 'Bearer token1')
+
+    def test_request_refreshes_on_401(self):
+        credentials = _Credentials()
+        session = _Session(_Response(401), _Response(200))
+        http = self._make_one(credentials, session=session)
+
+        response, _ = _run(http.request('http://example.com/'))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(credentials.refreshed, 1)
+        self.assertEqual(len(session._requested), 2)
+
+    def test_request_gives_up_after_max_refreshes(self):
+        from google.cloud._http_async import _MAX_REFRESH_ATTEMPTS
+
+        credentials = _Credentials()
+        responses = [_Response(401)] * (_MAX_REFRESH_ATTEMPTS + 1)
+        session = _Session(*responses)
+        http = self._make_one(credentials, session=session)
+
+        response, _ = _run(http.request('http://example.com/'))
+
+        self.assertEqual(response.status, 401)
+        self.assertEqual(credentials.refreshed, _MAX_REFRESH_ATTEMPTS)
+
+    def test__refresh_skipped_if_already_refreshed(self):
+        credentials = _Credentials()
+        http = self._make_one(credentials, session=object())
+
+        _run(http._refresh('stale-token'))
+
+        self.assertEqual(credentials.refreshed, 0)
+
+
+@unittest.skipIf(_ASYNC_UNSUPPORTED, 'Requires Python 3.5+')
+class TestAsyncJSONConnection(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._http_async import AsyncJSONConnection
+
+        return AsyncJSONConnection
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_mock_one(self, *args, **kw):
+        class MockConnection(self._get_target_class()):
+            API_URL_TEMPLATE = '{api_base_url}/mock/{api_version}{path}'
+            API_BASE_URL = 'http://mock'
+            API_VERSION = 'vMOCK'
+        return MockConnection(*args, **kw)
+
+    def test_http_explicit(self):
+        http = object()
+        conn = self._make_one(object(), http=http)
+        self.assertIs(conn.http, http)
+
+    def test_http_default(self):
+        from google.cloud._http_async import AuthorizedAsyncHttp
+
+        credentials = _Credentials()
+        client = mock.Mock(_credentials=credentials, spec=['_credentials'])
+        conn = self._make_one(client)
+
+        http = conn.http
+
+        self.assertIsInstance(http, AuthorizedAsyncHttp)
+        self.assertIs(http.credentials, credentials)
+        self.assertIs(conn.http, http)
+
+    def test_close_default_http(self):
+        from google.cloud import _http_async
+
+        session = _Session()
+        aiohttp = mock.Mock(spec=['ClientSession'])
+        aiohttp.ClientSession.return_value = session
+        client = mock.Mock(_credentials=_Credentials(), spec=['_credentials'])
+        conn = self._make_one(client)
+        with mock.patch.object(_http_async, 'aiohttp', new=aiohttp):
+            getattr(conn.http, 'session')
+
+        _run(conn.close())
+
+        self.assertEqual(session.closed, 1)
+        self.assertIsNone(conn._http)
+
+    def test_close_leaves_explicit_http_open(self):
+        http = _AsyncHttp({'status': '200'}, b'')
+        conn = self._make_one(object(), http=http)
+
+        _run(conn.close())
+
+        self.assertEqual(http.closed, 0)
+        self.assertIs(conn.http, http)
+
+    def test_context_manager(self):
+        http = _AsyncHttp({'status': '200'}, b'')
+        conn = self._make_one(object())
+        conn._http = http
+        conn._http_owned = True
+
+        async_context = conn.__aenter__()
+        self.assertIs(_run(async_context), conn)
+        self.assertEqual(http.closed, 0)
+        _run(conn.__aexit__(None, None, None))
+        self.assertEqual(http.closed, 1)
+        self.assertIsNone(conn._http)
+
+    def test_from_connection(self):
+        from google.cloud._http import JSONConnection
+
+        class Connection(JSONConnection):
+            API_URL_TEMPLATE = '{api_base_url}/other/{api_version}{path}'
+            API_BASE_URL = 'http://other'
+            API_VERSION = 'vOTHER'
+            _EXTRA_HEADERS = {'X-Extra': 'yes'}
+
+        client = object()
+        http = object()
+        klass = self._get_target_class()
+
+        conn = klass.from_connection(Connection(client), http=http)
+
+        self.assertIsInstance(conn, klass)
+        self.assertEqual(type(conn).__module__, Connection.__module__)
+        self.assertIsInstance(conn, Connection)
+        self.assertIs(conn._client, client)
+        self.assertIs(conn.http, http)
+        self.assertEqual(conn.build_api_url('/foo'),
+                         'http://other/other/vOTHER/foo')
+
+    def test_from_connection_already_async(self):
+        conn = self._make_mock_one(object())
+        klass = self._get_target_class()
+
+        twin = klass.from_connection(conn)
+
+        self.assertIs(type(twin), type(conn))
+
+    def test_api_request_defaults(self):
+        http = _AsyncHttp(
+            {'status': '200', 'content-type': 'application/json'},
+            b'{"foo": "bar"}')
+        conn = self._make_mock_one(object(), http=http)
+
+        result = _run(conn.api_request('GET', '/path', {'a': 'b'}))
+
+        self.assertEqual(result, {'foo': 'bar'})
+        self.assertEqual(http._called_with['method'], 'GET')
+        self.assertEqual(http._called_with['uri'],
+                         'http://mock/mock/vMOCK/path?a=b')
+        self.assertIsNone(http._called_with['body'])
+        self.assertEqual(http._called_with['headers'], {
+            'Accept-Encoding': 'gzip',
+            'Content-Length': '0',
+            'User-Agent': conn.USER_AGENT,
+        })
+
+    def test_api_request_w_dict_data(self):
+        import json
+
+        http = _AsyncHttp({'status': '200'}, b'')
+        conn = self._make_mock_one(object(), http=http)
+        data = {'foo': 'bar'}
+
+        result = _run(conn.api_request('POST', '/path', data=data))
+
+        self.assertEqual(result, b'')
+        self.assertEqual(json.loads(http._called_with['body']), data)
+        headers = http._called_with['headers']
+        self.assertEqual(headers['Content-Type'], 'application/json')
+
+    def test_api_request_instrumented(self):
+        from google.cloud import instrumentation
+
+        http = _AsyncHttp(
+            {'status': '200', 'content-type': 'application/json'}, b'{}')
+        conn = self._make_mock_one(object(), http=http)
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            _run(conn.api_request('GET', '/b/bucket'))
+
+        record, = records
+        self.assertEqual(record.path_template, '/b/{}')
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.bytes_received, 2)
+
+    def test_api_request_w_retry(self):
+        from google.cloud import instrumentation
+        from google.cloud.retry import Retry
+
+        http = _AsyncHttp(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        http.responses.append(
+            ({'status': '200', 'content-type': 'application/json'}, b'{}'))
+        conn = self._make_mock_one(object(), http=http)
+        records = []
+
+        with mock.patch.object(
+                instrumentation, '_listeners', (records.append,)):
+            with mock.patch('asyncio.sleep', side_effect=_done) as sleep:
+                result = _run(conn.api_request('GET', '/b', retry=Retry()))
+
+        self.assertEqual(result, {})
+        self.assertEqual(sleep.call_count, 1)
+        record, = records
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.retry_count, 1)
+
+    def test_api_request_w_client_retry_exhausted(self):
+        from google.cloud.exceptions import ServiceUnavailable
+        from google.cloud.retry import Retry
+
+        http = _AsyncHttp(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        client = mock.Mock(retry=Retry(deadline=0.0), spec=['retry'])
+        conn = self._make_mock_one(client, http=http)
+
+        with self.assertRaises(ServiceUnavailable):
+            _run(conn.api_request('GET', '/b'))
+
+        self.assertEqual(len(http.requested), 1)
+
+    def test_api_request_w_client_retry_post_not_retried(self):
+        from google.cloud.exceptions import ServiceUnavailable
+        from google.cloud.retry import Retry
+
+        http = _AsyncHttp(
+            {'status': '503', 'content-type': 'text/plain'}, b'busy')
+        client = mock.Mock(retry=Retry(), spec=['retry'])
+        conn = self._make_mock_one(client, http=http)
+
+        with self.assertRaises(ServiceUnavailable):
+            _run(conn.api_request('POST', '/b', data={'name': 'bucket'}))
+
+        self.assertEqual(len(http.requested), 1)
+
+    def test_api_request_error(self):
+        from google.cloud.exceptions import NotFound
+
+        http = _AsyncHttp(
+            {'status': '404', 'content-type': 'text/plain'}, b'{}')
+        conn = self._make_mock_one(object(), http=http)
+
+        with self.assertRaises(NotFound):
+            _run(conn.api_request('GET', '/'))
+
+
+class _Credentials(object):
+
+    def __init__(self, valid=True):
+        self.valid = valid
+        self.token = 'token0'
+        self.refreshed = 0
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.token = 'token%d' % (self.refreshed,)
+        self.valid = True
+
+    def apply(self, headers):
+        headers['authorization'] = 'Bearer ' + self.token
+
+
+class _Response(object):
+
+    def __init__(self, status, headers=None, content=b'body'):
+        self.status = status
+        self.headers = headers or {}
+        self._content = content
+
+    def read(self):
+        return _done(self._content)
+
+    def __aenter__(self):
+        return _done(self)
+
+    def __aexit__(self, *args):
+        return _done(None)
+
+
+class _Session(object):
+
+    closed = 0
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self._requested = []
+
+    def request(self, *args, **kw):
+        self._requested.append((args, kw))
+        return self._responses.pop(0)
+
+    def close(self):
+        self.closed += 1
+        return _done(None)
+
+
+class _AsyncHttp(object):
+
+    _called_with = None
+    closed = 0
+
+    def __init__(self, headers, content):
+        self.responses = [(headers, content)]
+        self.requested = []
+
+    def request(self, **kw):
+        from httplib2 import Response
+
+        self._called_with = kw
+        self.requested.append(kw)
+        if len(self.responses) > 1:
+            headers, content = self.responses.pop(0)
+        else:
+            headers, content = self.responses[0]
+        return _done((Response(headers), content))
+
+    def close(self):
+        self.closed += 1
+        return _done(None)
@@ -0,0 +1,240 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class Test__HostPool(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._http_pool import _HostPool
+
+        return _HostPool
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_get_creates_then_reuses(self):
+        created = []
+
+        def factory():
+            http = _Http()
+            created.append(http)
+            return http
+
+        pool = self._make_one(factory, 2)
+        first = pool.get()
+        second = pool.get()
+        self.assertIsNot(first, second)
+        self.assertEqual(created, [first, second])
+
+        pool.put(first)
+        pool.put(second)
+        # LIFO: the most recently returned object is re-used first.
+        self.assertIs(pool.get(), second)
+        self.assertEqual(len(created), 2)
+
+    def test_get_blocks_when_exhausted(self):
+        import threading
+
+        pool = self._make_one(_Http, 1)
+        held = pool.get()
+        acquired = []
+
+        def worker():
+            acquired.append(pool.get())
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(0.05)
+        self.assertEqual(acquired, [])
+
+        pool.put(held)
+        thread.join()
+        self.assertEqual(acquired, [held])
+
+    def test_get_factory_failure_releases_slot(self):
+        def factory():
+            raise RuntimeError('boom')
+
+        pool = self._make_one(factory, 1)
+        with self.assertRaises(RuntimeError):
+            pool.get()
+        # The slot was released, so a second attempt does not deadlock.
+        with self.assertRaises(RuntimeError):
+            pool.get()
+
+    def test_clear(self):
+        pool = self._make_one(_Http, 2)
+        http = pool.get()
+        connection = _Connection()
+        http.connections = {'https': object, 'https:example.com': connection}
+        pool.put(http)
+
+        pool.clear()
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(list(http.connections), ['https'])
+        self.assertIsNot(pool.get(), http)
+
+
+class TestPooledHttp(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._http_pool import PooledHttp
+
+        return PooledHttp
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_ctor_defaults(self):
+        import httplib2
+        from google.cloud._http_pool import DEFAULT_POOL_SIZE
+
+        http = self._make_one()
+        self.assertEqual(http.maxsize, DEFAULT_POOL_SIZE)
+        self.assertIs(http._http_factory, httplib2.Http)
+        self.assertEqual(http._pools, {})
+
+    def test_ctor_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            self._make_one(maxsize=0)
+
+    def test_request(self):
+        http = self._make_one(maxsize=3, http_factory=_Http)
+
+        response, content = http.request(
+            'https://example.com/path', method='POST', body=b'data',
+            headers={'foo': 'bar'})
+
+        self.assertEqual(response, {'status': '200'})
+        self.assertEqual(content, b'')
+        pool = http._pools[('https', 'example.com')]
+        self.assertEqual(len(pool._idle), 1)
+        pooled = pool._idle[0]
+        self.assertEqual(pooled._called_with, (
+            ('https://example.com/path',),
+            {
+                'method': 'POST',
+                'body': b'data',
+                'headers': {'foo': 'bar'},
+                'redirections': 5,
+                'connection_type': None,
+            },
+        ))
+
+    def test_request_pools_per_host(self):
+        http = self._make_one(http_factory=_Http)
+
+        http.request('https://example.com/a')
+        http.request('https://example.com/b')
+        http.request('https://other.example.com/c')
+
+        self.assertEqual(sorted(http._pools), [
+            ('https', 'example.com'),
+            ('https', 'other.example.com'),
+        ])
+        self.assertEqual(len(http._pools[('https', 'example.com')]._idle), 1)
+
+    def test_request_failure_returns_http_to_pool(self):
+        http = self._make_one(maxsize=1, http_factory=_FailingHttp)
+
+        with self.assertRaises(ValueError):
+            http.request('https://example.com/')
+
+        pool = http._pools[('https', 'example.com')]
+        self.assertEqual(len(pool._idle), 1)
+
+    def test_concurrent_requests(self):
+        import threading
+
+        http = self._make_one(maxsize=2, http_factory=_Http)
+        threads = [
+            threading.Thread(target=http.request,
+                             args=('https://example.com/',))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        pool = http._pools[('https', 'example.com')]
+        self.assertLessEqual(len(pool._idle), 2)
+
+    def test_clear(self):
+        http = self._make_one(http_factory=_Http)
+        http.request('https://example.com/')
+        pool = http._pools[('https', 'example.com')]
+
+        http.clear()
+
+        self.assertEqual(pool._idle, [])
+
+    def test_pickle(self):
+        import pickle
+        import httplib2
+
+        http = self._make_one(maxsize=3)
+        http._pools[('https', 'example.com')] = object()
+
+        copied = pickle.loads(pickle.dumps(http))
+
+        self.assertEqual(copied.maxsize, 3)
+        self.assertIs(copied._http_factory, httplib2.Http)
+        self.assertEqual(copied._pools, {})
+
+    def test_request_after_fork(self):
+        import os
+
+        http = self._make_one(http_factory=_Http)
+        http.request('https://example.com/')
+        pool = http._pools[('https', 'example.com')]
+        lock = http._lock
+
+        with mock.patch.object(os, 'getpid', return_value=http._pid + 1):
+            http.request('https://example.com/')
+
+        # The child does not use (or close) the parent's connections.
+        self.assertIsNot(http._pools[('https', 'example.com')], pool)
+        self.assertEqual(len(pool._idle), 1)
+        self.assertIsNot(http._lock, lock)
+
+
+class _Connection(object):
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _Http(object):
+
+    _called_with = None
+
+    def request(self, *args, **kw):
+        self._called_with = (args, kw)
+        return {'status': '200'}, b''
+
+
+class _FailingHttp(object):
+
+    def request(self, *args, **kw):
+        raise ValueError('failed')
@@ -0,0 +1,158 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestLazyJSONArray(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._lazy_json import LazyJSONArray
+
+        return LazyJSONArray
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_constructor_not_array(self):
+        with self.assertRaises(ValueError):
+            self._make_one('{"a": 1}', 0)
+
+    def test_iterate(self):
+        text = 'xx[ {"a": 1} , [2, 3],"four" ]yy'
+        array = self._make_one(text, 2)
+
+        self.assertEqual(list(array), [{'a': 1}, [2, 3], 'four'])
+        self.assertEqual(len(array), 3)
+        self.assertEqual(array.end, len(text) - 2)
+
+    def test_iterate_lazily(self):
+        array = self._make_one('[1, 2, oops]', 0)
+        iterator = iter(array)
+
+        self.assertEqual(next(iterator), 1)
+        self.assertEqual(next(iterator), 2)
+        with self.assertRaises(ValueError):
+            next(iterator)
+
+    def test_empty(self):
+        text = '[ \n ]'
+        array = self._make_one(text, 0)
+
+        self.assertEqual(list(array), [])
+        self.assertEqual(len(array), 0)
+        self.assertEqual(array.end, len(text))
+
+    def test___len___scans(self):
+        array = self._make_one('[1, 2, 3]', 0)
+        self.assertEqual(len(array), 3)
+
+    def test_end_scans(self):
+        array = self._make_one('[1, 2, 3], 4', 0)
+        self.assertEqual(array.end, 9)
+
+    def test_missing_comma(self):
+        array = self._make_one('[1 2]', 0)
+        with self.assertRaises(ValueError):
+            list(array)
+
+
+class TestLazyJSONObject(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._lazy_json import LazyJSONObject
+
+        return LazyJSONObject
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_constructor_not_object(self):
+        with self.assertRaises(ValueError):
+            self._make_one('[1, 2]', 'items')
+
+    def test_get_decodes_only_as_needed(self):
+        obj = self._make_one('{"a": 1, "b": oops}', 'items')
+
+        self.assertEqual(obj.get('a'), 1)
+        with self.assertRaises(ValueError):
+            obj.get('b')
+
+    def test_lazy_array(self):
+        from google.cloud._lazy_json import LazyJSONArray
+
+        text = '{"items": [{"x": 1}, {"x": 2}], "nextPageToken": "tok"}'
+        obj = self._make_one(text, 'items')
+
+        items = obj['items']
+        self.assertIsInstance(items, LazyJSONArray)
+        self.assertEqual(list(items), [{'x': 1}, {'x': 2}])
+        self.assertEqual(obj.get('nextPageToken'), 'tok')
+
+    def test_key_after_lazy_array(self):
+        text = ' { "items" : [1, 2] , "nextPageToken" : "tok" } '
+        obj = self._make_one(text, 'items')
+
+        self.assertEqual(obj.get('nextPageToken'), 'tok')
+        self.assertEqual(list(obj['items']), [1, 2])
+
+    def test_lazy_key_not_array(self):
+        obj = self._make_one('{"items": {"x": 1}}', 'items')
+        self.assertEqual(obj['items'], {'x': 1})
+
+    def test_other_keys_not_lazy(self):
+        obj = self._make_one('{"other": [1, 2]}', 'items')
+        self.assertEqual(obj['other'], [1, 2])
+
+    def test_get_missing(self):
+        obj = self._make_one('{"a": 1}', 'items')
+
+        self.assertIsNone(obj.get('b'))
+        self.assertEqual(obj.get('b', 'default'), 'default')
+        # Once the object is exhausted, lookups don't decode any further.
+        self.assertIsNone(obj.get('c'))
+
+    def test___getitem___missing(self):
+        obj = self._make_one('{}', 'items')
+        with self.assertRaises(KeyError):
+            obj['a']
+
+    def test___contains__(self):
+        obj = self._make_one('{"a": null}', 'items')
+
+        self.assertIn('a', obj)
+        self.assertNotIn('b', obj)
+
+    def test_keys_items_and_len(self):
+        text = '{"a": 1, "items": [1, 2], "b": 2}'
+        obj = self._make_one(text, 'items')
+
+        self.assertEqual(sorted(obj.keys()), ['a', 'b', 'items'])
+        self.assertEqual(len(obj), 3)
+        items = dict(obj.items())
+        self.assertEqual(items['a'], 1)
+        self.assertEqual(items['b'], 2)
+        self.assertEqual(list(items['items']), [1, 2])
+
+    def test_missing_comma(self):
+        obj = self._make_one('{"a": 1 "b": 2}', 'items')
+        with self.assertRaises(ValueError):
+            obj.get('b')
+
+    def test_missing_colon(self):
+        obj = self._make_one('{"a" 1}', 'items')
+        with self.assertRaises(ValueError):
+            obj.get('a')
@@ -0,0 +1,113 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+def _wait_for(predicate, timeout=5.0):
+    import time
+
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(0.001)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud._single_flight import SingleFlight
+
+        return SingleFlight
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _concurrent(self, flights, key, function, followers):
+        """Call ``function`` on a leader, shared with ``followers``."""
+        import threading
+
+        outcomes = []
+
+        def follow():
+            try:
+                outcomes.append(flights.call(key, function))
+            except Exception as exc:  # pylint: disable=broad-except
+                outcomes.append(exc)
+
+        threads = [threading.Thread(target=follow) for _ in range(followers)]
+
+        def lead():
+            for thread in threads:
+                thread.start()
+            _wait_for(lambda: flights.waiters(key) == followers)
+            return function()
+
+        try:
+            outcomes.append(flights.call(key, lead))
+        except Exception as exc:  # pylint: disable=broad-except
+            outcomes.append(exc)
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_sequential_calls_not_shared(self):
+        flights = self._make_one()
+        results = iter([1, 2])
+
+        self.assertEqual(flights.call(('key',), lambda: next(results)),
+                         (1, False))
+        self.assertEqual(flights.call(('key',), lambda: next(results)),
+                         (2, False))
+        self.assertEqual(flights.waiters(('key',)), 0)
+
+    def test_concurrent_calls_shared(self):
+        flights = self._make_one()
+        calls = []
+
+        def function():
+            calls.append(None)
+            return 'result'
+
+        outcomes = self._concurrent(flights, ('key',), function, 3)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(outcomes), [
+            ('result', False), ('result', True), ('result', True),
+            ('result', True)])
+        self.assertEqual(flights._flights, {})
+
+    def test_concurrent_calls_w_other_key(self):
+        flights = self._make_one()
+
+        def function():
+            self.assertEqual(flights.call(('other',), lambda: 'other'),
+                             ('other', False))
+            return 'result'
+
+        self.assertEqual(flights.call(('key',), function), ('result', False))
+
+    def test_error_shared(self):
+        flights = self._make_one()
+        error = ValueError('boom')
+
+        def function():
+            raise error
+
+        outcomes = self._concurrent(flights, ('key',), function, 2)
+
+        self.assertEqual(outcomes, [error, error, error])
+        self.assertEqual(flights._flights, {})
@@ -16,6 +16,8 @@ import io
 import json
 import unittest
 
+import google.auth.credentials
+import google.cloud.client
 import mock
 
 
@@ -25,6 +27,29 @@ def _make_credentials():
     return mock.Mock(spec=google.auth.credentials.Credentials)
 
 
+class _PicklableCredentials(google.auth.credentials.Credentials):
+    """Credentials which, unlike mocks, can be pickled."""
+
+    def refresh(self, request):
+        raise NotImplementedError
+
+
+class _ScopedCredentials(_PicklableCredentials,
+                         google.auth.credentials.Scoped):
+    """Credentials which require scopes before use."""
+
+    def __init__(self, scopes=None):
+        super(_ScopedCredentials, self).__init__()
+        self._scopes = scopes
+
+    @property
+    def requires_scopes(self):
+        return not self._scopes
+
+    def with_scopes(self, scopes, **kwargs):
+        return _ScopedCredentials(scopes=scopes)
+
+
 class Test_ClientFactoryMixin(unittest.TestCase):
 
     @staticmethod
@@ -49,15 +74,99 @@ class TestClient(unittest.TestCase):
     def _make_one(self, *args, **kw):
         return self._get_target_class()(*args, **kw)
 
-    def test_unpickleable(self):
+    def test_pickle_w_explicit_credentials_and_http(self):
         import pickle
+        from google.cloud._http_pool import PooledHttp
 
-        CREDENTIALS = _make_credentials()
-        HTTP = object()
+        credentials = _PicklableCredentials()
+        http = PooledHttp(maxsize=3)
+        client_obj = self._make_one(credentials=credentials, _http=http)
+        client_obj.retry = None
 
-        client_obj = self._make_one(credentials=CREDENTIALS, _http=HTTP)
-        with self.assertRaises(pickle.PicklingError):
-            pickle.dumps(client_obj)
+        copied = pickle.loads(pickle.dumps(client_obj))
+
+        self.assertIsInstance(copied._credentials, _PicklableCredentials)
+        self.assertIsInstance(copied._http_internal, PooledHttp)
+        self.assertIsNot(copied._http_internal, http)
+        self.assertEqual(copied._http_internal.maxsize, 3)
+
+    def test_pickle_rebuilds_owned_http(self):
+        import pickle
+        import google_auth_httplib2
+
+        client_obj = self._make_one(credentials=_PicklableCredentials())
+        http = client_obj._http
+
+        copied = pickle.loads(pickle.dumps(client_obj))
+
+        self.assertIsNone(copied._http_internal)
+        self.assertIsInstance(copied._http,
+                              google_auth_httplib2.AuthorizedHttp)
+        self.assertIsNot(copied._http, http)
+        self.assertIs(copied._http.credentials, copied._credentials)
+
+    def test_pickle_w_inferred_credentials(self):
+        import pickle
+        from google.cloud._testing import _Monkey
+        from google.cloud import client
+
+        credentials = [_make_credentials(), _make_credentials()]
+
+        with _Monkey(client, get_credentials=lambda: credentials.pop(0)):
+            client_obj = self._make_one()
+            copied = pickle.loads(pickle.dumps(client_obj))
+
+        self.assertEqual(credentials, [])
+        self.assertIsNot(copied._credentials, client_obj._credentials)
+        self.assertTrue(copied._credentials_inferred)
+
+    def test_pickle_w_service_account_info(self):
+        import pickle
+
+        info = {'client_email': 'sa@example.com'}
+        client_obj = self._make_one(credentials=_make_credentials())
+        client_obj._credentials_info = info
+        constructor_patch = mock.patch(
+            'google.oauth2.service_account.Credentials.'
+            'from_service_account_info',
+            return_value=_make_credentials())
+
+        with constructor_patch as constructor:
+            copied = pickle.loads(pickle.dumps(client_obj))
+
+        self.assertIs(copied._credentials, constructor.return_value)
+        constructor.assert_called_once_with(info)
+
+    def test_pickle_w_inferred_credentials_keeps_scopes(self):
+        import pickle
+        from google.cloud._testing import _Monkey
+        from google.cloud import client
+
+        credentials = [_ScopedCredentials(), _ScopedCredentials()]
+
+        with _Monkey(client, get_credentials=lambda: credentials.pop(0)):
+            client_obj = _ScopedClient()
+            # Scopes held by the instance must not leak into the copy.
+            client_obj._credentials._scopes = ('other-scope',)
+            copied = pickle.loads(pickle.dumps(client_obj))
+
+        self.assertEqual(credentials, [])
+        self.assertIsInstance(copied._credentials, _ScopedCredentials)
+        self.assertEqual(copied._credentials.scopes, _ScopedClient.SCOPE)
+
+    def test_pickle_transient_attributes(self):
+        import pickle
+
+        client_obj = self._make_one(
+            credentials=_PicklableCredentials(), _http=object())
+        client_obj._TRANSIENT_ATTRIBUTES = ('_api',)
+        client_obj._api = mock.Mock()  # Not picklable.
+        client_obj.name = 'name'
+
+        copied = pickle.loads(pickle.dumps(client_obj))
+
+        self.assertIsNone(copied._api)
+        self.assertEqual(copied.name, 'name')
 
     def test_ctor_defaults(self):
         from google.cloud._testing import _Monkey
@@ -75,6 +184,7 @@ class TestClient(unittest.TestCase):
 
         self.assertIs(client_obj._credentials, CREDENTIALS)
         self.assertIsNone(client_obj._http_internal)
+        self.assertIsNone(client_obj.retry)
         self.assertEqual(FUNC_CALLS, ['get_credentials'])
 
     def test_ctor_explicit(self):
@@ -118,6 +228,7 @@ class TestClient(unittest.TestCase):
         file_open.assert_called_once_with(
             mock.sentinel.filename, 'r', encoding='utf-8')
         constructor.assert_called_once_with(info)
+        self.assertEqual(client_obj._credentials_info, info)
 
     def test_from_service_account_json_bad_args(self):
         KLASS = self._get_target_class()
@@ -134,6 +245,8 @@ class TestClient(unittest.TestCase):
         self.assertIs(client._http, http)
 
     def test__http_property_new(self):
+        from google.cloud._http_pool import PooledHttp
+
         credentials = _make_credentials()
         client = self._make_one(credentials=credentials)
         self.assertIsNone(client._http_internal)
@@ -143,7 +256,10 @@ class TestClient(unittest.TestCase):
         with patch as mocked:
             self.assertIs(client._http, mock.sentinel.http)
             # Check the mock.
-            mocked.assert_called_once_with(credentials)
+            mocked.assert_called_once_with(credentials, http=mock.ANY)
+            pooled = mocked.call_args[1]['http']
+            self.assertIsInstance(pooled, PooledHttp)
+            self.assertEqual(pooled.maxsize, client._HTTP_POOL_SIZE)
             self.assertEqual(mocked.call_count, 1)
             # Make sure the cached value is used on subsequent access.
             self.assertIs(client._http_internal, mock.sentinel.http)
@@ -278,3 +394,9 @@ class TestClientWithProject(unittest.TestCase):
 
     def test_from_service_account_json_project_set(self):
         self._from_service_account_json_helper(project='prah-jekt')
+
+
+class _ScopedClient(google.cloud.client.Client):
+    """Module-level client subclass, so that it can be pickled."""
+
+    SCOPE = ('https://www.googleapis.com/auth/cloud-platform',)
@@ -148,3 +148,18 @@ class Test_make_exception(unittest.TestCase):
 class _Response(object):
     def __init__(self, status):
         self.status = status
+
+
+class Test_GrpcRendezvous(unittest.TestCase):
+
+    def test_lazy(self):
+        from grpc._channel import _Rendezvous
+        from google.cloud.exceptions import GrpcRendezvous
+
+        self.assertIs(GrpcRendezvous, _Rendezvous)
+
+    def test_other_attribute(self):
+        from google.cloud import exceptions
+
+        with self.assertRaises(AttributeError):
+            getattr(exceptions, 'NoSuchThing')
@@ -0,0 +1,824 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+def _record(**kw):
+    from google.cloud.instrumentation import CallRecord
+
+    values = {
+        'transport': 'http',
+        'service': 'storage',
+        'method': 'GET',
+        'path_template': '/b/{}',
+        'status': 200,
+        'bytes_sent': 0,
+        'bytes_received': 0,
+        'latency': 0.0,
+        'retry_count': 0,
+        'coalesced': False,
+        'throttle_delay': 0.0,
+        'retry_delay': 0.0,
+    }
+    values.update(kw)
+    return CallRecord(**values)
+
+
+def _listening(*listeners):
+    from google.cloud import instrumentation
+
+    return mock.patch.object(instrumentation, '_listeners', listeners)
+
+
+class TestCallRecord(unittest.TestCase):
+
+    def test_coalesced_default(self):
+        from google.cloud.instrumentation import CallRecord
+
+        record = CallRecord(
+            'http', 'storage', 'GET', '/b/{}', 200, 0, 0, 0.0, 0)
+        self.assertFalse(record.coalesced)
+        self.assertEqual(record.throttle_delay, 0.0)
+        self.assertEqual(record.retry_delay, 0.0)
+
+
+class Test_listeners(unittest.TestCase):
+
+    def setUp(self):
+        patch = _listening()
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_add_and_remove(self):
+        from google.cloud import instrumentation
+
+        def listener(record):
+            pass
+
+        self.assertFalse(instrumentation.is_enabled())
+        instrumentation.add_listener(listener)
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertEqual(instrumentation._listeners, (listener,))
+        instrumentation.remove_listener(listener)
+        self.assertFalse(instrumentation.is_enabled())
+
+    def test_remove_missing(self):
+        from google.cloud import instrumentation
+
+        with self.assertRaises(ValueError):
+            instrumentation.remove_listener(object())
+
+    def test_notify(self):
+        from google.cloud import instrumentation
+
+        records = []
+        instrumentation.add_listener(records.append)
+        record = _record()
+
+        instrumentation.notify(record)
+
+        self.assertEqual(records, [record])
+
+    def test_notify_failing_listener(self):
+        from google.cloud import instrumentation
+
+        def failing(record):
+            raise RuntimeError(record)
+
+        records = []
+        instrumentation.add_listener(failing)
+        instrumentation.add_listener(records.append)
+        record = _record()
+
+        with mock.patch.object(instrumentation, '_LOGGER') as logger:
+            instrumentation.notify(record)
+
+        self.assertEqual(records, [record])
+        logger.exception.assert_called_once_with(
+            'Instrumentation listener %r failed', failing)
+
+
+class Test_rate_limiter_stats(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut():
+        from google.cloud.instrumentation import rate_limiter_stats
+
+        return rate_limiter_stats()
+
+    def test_tracked_while_in_use(self):
+        import gc
+        import weakref
+        from google.cloud import instrumentation
+
+        class _Limiter(object):
+            def stats(self):
+                return 'STATS'
+
+        limiter = _Limiter()
+        with mock.patch.object(
+                instrumentation, '_rate_limiters', weakref.WeakSet()):
+            instrumentation.track_rate_limiter(limiter)
+            self.assertEqual(self._call_fut(), ['STATS'])
+
+            del limiter
+            gc.collect()
+            self.assertEqual(self._call_fut(), [])
+
+
+class Test__path_template(unittest.TestCase):
+
+    def _call_fut(self, path):
+        from google.cloud.instrumentation import _path_template
+
+        return _path_template(path)
+
+    def test_resources(self):
+        self.assertEqual(self._call_fut('/b/bucket/o/name%2Fpart'),
+                         '/b/{}/o/{}')
+        self.assertEqual(
+            self._call_fut('/projects/p/datasets/d/tables/t/data'),
+            '/projects/{}/datasets/{}/tables/{}/data')
+
+    def test_collection(self):
+        self.assertEqual(self._call_fut('/b'), '/b')
+        self.assertEqual(self._call_fut('/projects/p/timeSeries/'),
+                         '/projects/{}/timeSeries/')
+
+    def test_custom_verb(self):
+        self.assertEqual(self._call_fut('/projects/p:lookup'),
+                         '/projects/{}:lookup')
+        self.assertEqual(self._call_fut('/entries:list'), '/entries:list')
+
+
+class Test__service_name(unittest.TestCase):
+
+    def _call_fut(self, obj):
+        from google.cloud.instrumentation import _service_name
+
+        return _service_name(obj)
+
+    def test_cloud_package(self):
+        klass = type('Connection', (object,),
+                     {'__module__': 'google.cloud.storage._http'})
+        self.assertEqual(self._call_fut(klass()), 'storage')
+
+    def test_other_module(self):
+        klass = type('Connection', (object,), {'__module__': 'mine.http'})
+        self.assertEqual(self._call_fut(klass()), 'mine')
+
+
+class Test_http_call(unittest.TestCase):
+
+    def _call_fut(self, *args):
+        from google.cloud.instrumentation import http_call
+
+        return http_call(*args)
+
+    def test_disabled(self):
+        from google.cloud.instrumentation import _NULL_CALL
+
+        with _listening():
+            call = self._call_fut(object(), 'GET', '/b/name', None)
+
+        self.assertIs(call, _NULL_CALL)
+        with call as entered:
+            entered.set_response(200, 10)
+            entered.set_http_response(200, object())
+            entered.retried(ValueError(), 1.0)
+        call.finish()
+        self.assertFalse(hasattr(call, 'retry_count'))
+
+    def test_enabled(self):
+        records = []
+        connection = type('Connection', (object,), {
+            '__module__': 'google.cloud.bigquery._http'})()
+
+        with _listening(records.append):
+            data = u'\u00e9'
+            with self._call_fut(
+                    connection, 'POST', '/projects/p/jobs', data) as call:
+                call.retried(ValueError(), 1.0)
+                call.retried(ValueError(), 2.0)
+                call.throttled(0.25)
+                call.throttled(0.5)
+                call.set_response(201, 17)
+
+        record, = records
+        self.assertEqual(record.transport, 'http')
+        self.assertEqual(record.service, 'bigquery')
+        self.assertEqual(record.method, 'POST')
+        self.assertEqual(record.path_template, '/projects/{}/jobs')
+        self.assertEqual(record.status, 201)
+        self.assertEqual(record.bytes_sent, 2)
+        self.assertEqual(record.bytes_received, 17)
+        self.assertGreaterEqual(record.latency, 0.0)
+        self.assertEqual(record.retry_count, 2)
+        self.assertFalse(record.coalesced)
+        self.assertEqual(record.throttle_delay, 0.75)
+        self.assertEqual(record.retry_delay, 3.0)
+
+    def test_coalesced(self):
+        records = []
+        with _listening(records.append):
+            with self._call_fut(object(), 'GET', '/b/name', None) as call:
+                call.set_response(200, 0, coalesced=True)
+
+        record, = records
+        self.assertEqual(record.status, 200)
+        self.assertTrue(record.coalesced)
+
+    def test_set_http_response(self):
+        records = []
+        with _listening(records.append):
+            for content, coalesced in ((b'abc', False), (u'\u00e9', False),
+                                       (b'abc', True), (object(), False)):
+                with self._call_fut(
+                        object(), 'GET', '/b/name', None) as call:
+                    call.set_http_response(200, content, coalesced=coalesced)
+
+        self.assertEqual(
+            [(record.status, record.bytes_received, record.coalesced)
+             for record in records],
+            [(200, 3, False), (200, 2, False), (200, 0, True),
+             (200, 0, False)])
+
+    def test_w_bytes_data(self):
+        records = []
+        with _listening(records.append):
+            with self._call_fut(object(), 'PUT', '/b', b'abc'):
+                pass
+
+        record, = records
+        self.assertEqual(record.bytes_sent, 3)
+        self.assertIsNone(record.status)
+
+    def test_error(self):
+        records = []
+        with _listening(records.append):
+            with self.assertRaises(ValueError):
+                with self._call_fut(object(), 'GET', '/b', None):
+                    raise ValueError()
+
+        record, = records
+        self.assertIsNone(record.status)
+        self.assertEqual(record.bytes_sent, 0)
+
+    def test_finish_reports_once(self):
+        records = []
+        with _listening(records.append):
+            call = self._call_fut(object(), 'GET', '/b', None)
+            call.finish()
+            call.finish()
+
+        self.assertEqual(len(records), 1)
+
+
+class Test__grpc_status(unittest.TestCase):
+
+    def _call_fut(self, exc):
+        from google.cloud.instrumentation import _grpc_status
+
+        return _grpc_status(exc)
+
+    def test_rpc_error(self):
+        import grpc
+
+        self.assertEqual(
+            self._call_fut(_RpcError(grpc.StatusCode.UNAVAILABLE)),
+            'UNAVAILABLE')
+
+    def test_without_code(self):
+        self.assertIsNone(self._call_fut(ValueError()))
+
+    def test_code_not_callable(self):
+        exc = ValueError()
+        exc.code = 404
+        self.assertIsNone(self._call_fut(exc))
+
+    def test_code_fails(self):
+        exc = ValueError()
+        exc.code = lambda: None
+        self.assertIsNone(self._call_fut(exc))
+
+
+class Test_instrument_stub(unittest.TestCase):
+
+    def _call_fut(self, stub, **kw):
+        from google.cloud.instrumentation import instrument_stub
+
+        return instrument_stub(stub, **kw)
+
+    def _make_stub(self):
+        import grpc
+
+        class BigtableStub(object):
+            def __init__(self):
+                self.MutateRow = _make_multi_callable(
+                    grpc.UnaryUnaryMultiCallable, _Message(5))
+                self.ReadRows = _make_multi_callable(
+                    grpc.UnaryStreamMultiCallable,
+                    _Responses([_Message(3), _Message(4)]))
+                self.Upload = _make_multi_callable(
+                    grpc.StreamUnaryMultiCallable, _Message(1))
+                self.Chat = _make_multi_callable(
+                    grpc.StreamStreamMultiCallable, _Responses([]))
+                self.not_a_method = 'value'
+
+        return BigtableStub()
+
+    def test_wraps_methods_in_place(self):
+        from google.cloud.instrumentation import _InstrumentedMultiCallable
+
+        stub = self._make_stub()
+        result = self._call_fut(stub)
+
+        self.assertIs(result, stub)
+        for name in ('MutateRow', 'ReadRows', 'Upload', 'Chat'):
+            self.assertIsInstance(
+                getattr(stub, name), _InstrumentedMultiCallable)
+        self.assertEqual(stub.not_a_method, 'value')
+
+    def test_without_instance_dict(self):
+        stub = object()
+        self.assertIs(self._call_fut(stub), stub)
+
+    def test_disabled(self):
+        stub = self._call_fut(self._make_stub())
+        request = _Message(7)
+
+        with _listening():
+            response = stub.MutateRow(request, timeout=3)
+
+        self.assertEqual(response.ByteSize(), 5)
+        self.assertEqual(stub.MutateRow._wrapped.calls,
+                         [((request,), {'timeout': 3})])
+
+    def test_other_attributes_delegated(self):
+        stub = self._call_fut(self._make_stub())
+        self.assertEqual(
+            stub.MutateRow.future, stub.MutateRow._wrapped.future)
+
+    def test_unary_unary(self):
+        records = []
+        stub = self._call_fut(self._make_stub())
+
+        with _listening(records.append):
+            stub.MutateRow(_Message(7))
+
+        record, = records
+        self.assertEqual(record.transport, 'grpc')
+        self.assertEqual(record.service, 'Bigtable')
+        self.assertEqual(record.method, 'MutateRow')
+        self.assertEqual(record.path_template, '/Bigtable/MutateRow')
+        self.assertEqual(record.status, 'OK')
+        self.assertEqual(record.bytes_sent, 7)
+        self.assertEqual(record.bytes_received, 5)
+        self.assertEqual(record.retry_count, 0)
+
+    def test_unary_unary_error(self):
+        import grpc
+
+        records = []
+        stub = self._call_fut(self._make_stub())
+        stub.MutateRow._wrapped.result = _RpcError(
+            grpc.StatusCode.NOT_FOUND)
+
+        with _listening(records.append):
+            with self.assertRaises(grpc.RpcError):
+                stub.MutateRow(_Message(7))
+
+        record, = records
+        self.assertEqual(record.status, 'NOT_FOUND')
+        self.assertEqual(record.bytes_received, 0)
+
+    def test_stream_unary(self):
+        records = []
+        stub = self._call_fut(self._make_stub())
+
+        with _listening(records.append):
+            stub.Upload(iter([_Message(2), _Message(3)]))
+
+        record, = records
+        self.assertEqual(record.bytes_sent, 5)
+        self.assertEqual(record.bytes_received, 1)
+
+    def test_unary_stream(self):
+        records = []
+        stub = self._call_fut(self._make_stub())
+
+        with _listening(records.append):
+            responses = stub.ReadRows(_Message(2))
+            self.assertEqual(records, [])
+            self.assertEqual(responses.code(), 'code')
+            sizes = [response.ByteSize() for response in responses]
+
+        self.assertEqual(sizes, [3, 4])
+        record, = records
+        self.assertEqual(record.status, 'OK')
+        self.assertEqual(record.bytes_sent, 2)
+        self.assertEqual(record.bytes_received, 7)
+
+    def test_unary_stream_error_mid_stream(self):
+        import grpc
+
+        records = []
+        stub = self._call_fut(self._make_stub())
+        stub.ReadRows._wrapped.result = _Responses(
+            [_Message(3), _RpcError(grpc.StatusCode.ABORTED)])
+
+        with _listening(records.append):
+            responses = stub.ReadRows(_Message(2))
+            with self.assertRaises(grpc.RpcError):
+                list(responses)
+
+        record, = records
+        self.assertEqual(record.status, 'ABORTED')
+        self.assertEqual(record.bytes_received, 3)
+
+    def test_unary_stream_error_on_call(self):
+        import grpc
+
+        records = []
+        stub = self._call_fut(self._make_stub())
+        stub.ReadRows._wrapped.result = _RpcError(
+            grpc.StatusCode.UNAUTHENTICATED)
+
+        with _listening(records.append):
+            with self.assertRaises(grpc.RpcError):
+                stub.ReadRows(_Message(2))
+
+        record, = records
+        self.assertEqual(record.status, 'UNAUTHENTICATED')
+
+    def test_stream_stream(self):
+        records = []
+        stub = self._call_fut(self._make_stub())
+
+        with _listening(records.append):
+            responses = stub.Chat(iter([_Message(4)]))
+            self.assertEqual(list(responses), [])
+
+        record, = records
+        self.assertEqual(record.path_template, '/Bigtable/Chat')
+        self.assertEqual(record.status, 'OK')
+        self.assertEqual(record.bytes_received, 0)
+
+    def test_retry_disabled(self):
+        import grpc
+        from google.cloud.retry import Retry
+
+        stub = self._call_fut(self._make_stub(), retry=Retry())
+        method = stub.MutateRow._wrapped
+        method.result = _RpcError(grpc.StatusCode.UNAVAILABLE)
+        expected = _Message(1)
+
+        def side_effect(delay):
+            method.result = expected
+
+        with _listening():
+            with mock.patch('time.sleep', side_effect=side_effect):
+                response = stub.MutateRow(_Message(7), timeout=3)
+
+        self.assertIs(response, expected)
+        self.assertEqual(len(method.calls), 2)
+
+    def test_retry_enabled(self):
+        import grpc
+        from google.cloud.retry import Retry
+
+        records = []
+        stub = self._call_fut(self._make_stub(), retry=Retry())
+        method = stub.MutateRow._wrapped
+        method.result = _RpcError(grpc.StatusCode.UNAVAILABLE)
+
+        def side_effect(delay):
+            method.result = _Message(1)
+
+        with _listening(records.append):
+            with mock.patch('time.sleep', side_effect=side_effect):
+                stub.MutateRow(_Message(7))
+
+        record, = records
+        self.assertEqual(record.status, 'OK')
+        self.assertEqual(record.retry_count, 1)
+        self.assertEqual(record.bytes_received, 1)
+
+    def test_rate_limiter(self):
+        import grpc
+        from google.cloud.rate_limit import MethodRateLimiter
+
+        records = []
+        limiter = mock.Mock(spec=['call', 'name'])
+        limiter.name = 'mutations'
+        limiter.call.side_effect = lambda function: (function(), 0.25)
+        stub = self._call_fut(
+            self._make_stub(),
+            rate_limiter=MethodRateLimiter({'/Bigtable/MutateRow': limiter}))
+        method = stub.MutateRow._wrapped
+        method.result = _RpcError(grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+        with _listening(records.append):
+            with self.assertRaises(grpc.RpcError):
+                stub.MutateRow(_Message(7))
+            method.result = _Message(1)
+            stub.MutateRow(_Message(7))
+        with _listening():
+            stub.MutateRow(_Message(7))
+
+        self.assertEqual(limiter.call.call_count, 3)
+        self.assertEqual(len(method.calls), 3)
+        self.assertIsNone(stub.Upload._rate_limiter)
+        self.assertEqual([record.status for record in records],
+                         ['RESOURCE_EXHAUSTED', 'OK'])
+        self.assertEqual(records[1].throttle_delay, 0.25)
+
+    def test_rate_limiter_w_retry(self):
+        import grpc
+        from google.cloud.retry import Retry
+
+        records = []
+        limiter = mock.Mock(spec=['call', 'select'])
+        limiter.select.return_value = limiter
+        limiter.call.side_effect = lambda function: (function(), 0.5)
+        stub = self._call_fut(
+            self._make_stub(), retry=Retry(), rate_limiter=limiter)
+        method = stub.MutateRow._wrapped
+        method.result = _RpcError(grpc.StatusCode.UNAVAILABLE)
+
+        def side_effect(delay):
+            method.result = _Message(1)
+
+        with _listening(records.append):
+            with mock.patch('time.sleep', side_effect=side_effect):
+                stub.MutateRow(_Message(7))
+
+        limiter.select.assert_any_call('/Bigtable/MutateRow')
+        self.assertEqual(limiter.call.call_count, 2)
+        record, = records
+        self.assertEqual(record.retry_count, 1)
+        self.assertEqual(record.throttle_delay, 0.5)
+
+    def test_rate_limiter_ignored_for_streaming(self):
+        limiter = mock.Mock(spec=['call', 'select'])
+        limiter.select.return_value = limiter
+
+        stub = self._call_fut(self._make_stub(), rate_limiter=limiter)
+        with _listening():
+            list(stub.ReadRows(_Message(2)))
+
+        limiter.call.assert_not_called()
+        self.assertIsNone(stub.ReadRows._rate_limiter)
+
+    def test_retry_ignored_for_streaming(self):
+        from google.cloud.retry import Retry
+
+        stub = self._call_fut(self._make_stub(), retry=Retry())
+
+        self.assertIsNotNone(stub.MutateRow._retry)
+        self.assertIsNone(stub.ReadRows._retry)
+        self.assertIsNone(stub.Upload._retry)
+        self.assertIsNone(stub.Chat._retry)
+
+    def test_non_message_sizes(self):
+        records = []
+        stub = self._call_fut(self._make_stub())
+        stub.MutateRow._wrapped.result = object()
+
+        with _listening(records.append):
+            stub.MutateRow(object())
+
+        record, = records
+        self.assertEqual(record.bytes_sent, 0)
+        self.assertEqual(record.bytes_received, 0)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.instrumentation import LatencyHistogram
+
+        return LatencyHistogram
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_empty(self):
+        histogram = self._make_one((0.1, 1.0))
+
+        self.assertEqual(histogram.bucket_counts, [0, 0, 0])
+        self.assertEqual(histogram.count, 0)
+        self.assertEqual(histogram.mean, 0.0)
+        self.assertEqual(histogram.percentile(50), 0.0)
+
+    def test_add(self):
+        histogram = self._make_one((0.1, 1.0))
+
+        histogram.add(_record(
+            latency=0.05, bytes_sent=1, bytes_received=2, retry_count=1))
+        histogram.add(_record(latency=0.1, bytes_sent=3))
+        histogram.add(_record(latency=0.5, bytes_received=4))
+        histogram.add(_record(latency=2.5, coalesced=True,
+                              throttle_delay=0.5, retry_delay=1.5))
+
+        self.assertEqual(histogram.bucket_counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.total_latency, 3.15)
+        self.assertAlmostEqual(histogram.mean, 3.15 / 4)
+        self.assertEqual(histogram.max_latency, 2.5)
+        self.assertEqual(histogram.bytes_sent, 4)
+        self.assertEqual(histogram.bytes_received, 6)
+        self.assertEqual(histogram.retry_count, 1)
+        self.assertEqual(histogram.coalesced_count, 1)
+        self.assertEqual(histogram.throttle_delay, 0.5)
+        self.assertEqual(histogram.retry_delay, 1.5)
+
+    def test_percentile(self):
+        histogram = self._make_one((0.1, 1.0))
+        for latency in (0.01, 0.02, 0.5, 0.6, 3.0):
+            histogram.add(_record(latency=latency))
+
+        self.assertEqual(histogram.percentile(0), 0.1)
+        self.assertEqual(histogram.percentile(40), 0.1)
+        self.assertEqual(histogram.percentile(50), 1.0)
+        self.assertEqual(histogram.percentile(80), 1.0)
+        self.assertEqual(histogram.percentile(99), 3.0)
+        self.assertEqual(histogram.percentile(100), 3.0)
+
+    def test_percentile_capped_at_max(self):
+        histogram = self._make_one((0.1, 1.0))
+        histogram.add(_record(latency=0.25))
+
+        self.assertEqual(histogram.percentile(50), 0.25)
+
+    def test_copy(self):
+        histogram = self._make_one((0.1,))
+        histogram.add(_record(latency=0.05))
+
+        copied = histogram.copy()
+        histogram.add(_record(latency=0.05))
+
+        self.assertEqual(copied.count, 1)
+        self.assertEqual(copied.bucket_counts, [1, 0])
+        self.assertEqual(copied.bounds, (0.1,))
+
+
+class TestHistogramAggregator(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.instrumentation import HistogramAggregator
+
+        return HistogramAggregator
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_default_bounds(self):
+        aggregator = self._make_one()
+
+        self.assertEqual(len(aggregator.bounds), 18)
+        self.assertEqual(aggregator.bounds[0], 0.001)
+        self.assertEqual(aggregator.bounds, tuple(sorted(aggregator.bounds)))
+
+    def test_groups_calls(self):
+        aggregator = self._make_one(bounds=[1.0])
+
+        aggregator(_record(latency=0.5))
+        aggregator(_record(latency=1.5))
+        aggregator(_record(status=404))
+
+        snapshot = aggregator.snapshot()
+        self.assertEqual(sorted(snapshot, key=str), [
+            ('storage', 'GET', '/b/{}', 200),
+            ('storage', 'GET', '/b/{}', 404),
+        ])
+        histogram = snapshot[('storage', 'GET', '/b/{}', 200)]
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.bucket_counts, [1, 1])
+
+    def test_snapshot_is_copy(self):
+        aggregator = self._make_one()
+        aggregator(_record())
+
+        snapshot = aggregator.snapshot()
+        aggregator(_record())
+
+        histogram, = snapshot.values()
+        self.assertEqual(histogram.count, 1)
+
+    def test_reset(self):
+        aggregator = self._make_one()
+        aggregator(_record())
+
+        aggregator.reset()
+
+        self.assertEqual(aggregator.snapshot(), {})
+
+    def test_dump(self):
+        from six import StringIO
+
+        aggregator = self._make_one(bounds=(0.25,))
+        aggregator(_record(latency=0.125, bytes_sent=1, bytes_received=2,
+                           retry_count=3))
+        aggregator(_record(latency=0.125, coalesced=True,
+                           throttle_delay=0.5, retry_delay=0.25))
+        stream = StringIO()
+
+        aggregator.dump(stream)
+
+        self.assertEqual(
+            stream.getvalue(),
+            'storage GET /b/{} 200: count=2 mean=0.125 p50=0.125 '
+            'p90=0.125 p99=0.125 max=0.125 sent=1 received=2 retries=3 '
+            'coalesced=1 throttled=0.500 backoff=0.250\n')
+
+    def test_dump_default_stream(self):
+        aggregator = self._make_one()
+        aggregator(_record(service='dns'))
+
+        with mock.patch('sys.stdout') as stdout:
+            aggregator.dump()
+
+        (line,), _ = stdout.write.call_args
+        self.assertTrue(line.startswith('dns GET /b/{} 200: count=1'))
+
+
+class _Message(object):
+
+    def __init__(self, size):
+        self._size = size
+
+    def ByteSize(self):
+        return self._size
+
+
+def _RpcError(code):
+    import grpc
+
+    class _Error(grpc.RpcError):
+
+        def code(self):
+            return code
+
+    return _Error()
+
+
+class _Responses(object):
+
+    def __init__(self, responses):
+        self._responses = iter(responses)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        response = next(self._responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    next = __next__
+
+    def code(self):
+        return 'code'
+
+
+def _make_multi_callable(kind, result):
+
+    class _MultiCallable(kind):
+
+        def __init__(self, result):
+            self.result = result
+            self.calls = []
+
+        def __call__(self, request, *args, **kwargs):
+            self.calls.append(((request,) + args, kwargs))
+            if kind.__name__.startswith('Stream'):
+                list(request)
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result
+
+        def future(self, *args, **kwargs):  # pragma: NO COVER
+            raise NotImplementedError
+
+        def with_call(self, *args, **kwargs):  # pragma: NO COVER
+            raise NotImplementedError
+
+    return _MultiCallable(result)
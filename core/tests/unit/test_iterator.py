@@ -27,6 +27,82 @@ class Test__do_nothing_page_start(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class Test_PagePrefetcher(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.iterator import _PagePrefetcher
+
+        return _PagePrefetcher
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_get(self):
+        prefetcher = self._make_one(lambda: iter(['a', 'b']), 1)
+
+        self.assertEqual(prefetcher.get(), 'a')
+        self.assertEqual(prefetcher.get(), 'b')
+        self.assertIsNone(prefetcher.get())
+        # Once finished, stays finished.
+        self.assertIsNone(prefetcher.get())
+        prefetcher._thread.join()
+
+    def test_get_failure(self):
+        def fetch_pages():
+            yield 'a'
+            raise ValueError('boom')
+
+        prefetcher = self._make_one(fetch_pages, 2)
+
+        self.assertEqual(prefetcher.get(), 'a')
+        with self.assertRaises(ValueError):
+            prefetcher.get()
+        self.assertIsNone(prefetcher.get())
+
+    def test_bounded_depth(self):
+        import threading
+
+        fetched = []
+        blocked = threading.Event()
+
+        def fetch_pages():
+            for value in range(5):
+                fetched.append(value)
+                if value == 2:
+                    blocked.set()
+                yield value
+
+        prefetcher = self._make_one(fetch_pages, 2)
+        blocked.wait()
+        prefetcher._thread.join(0.05)
+        # Two pages queued, plus one fetched and waiting for room.
+        self.assertEqual(fetched, [0, 1, 2])
+        self.assertEqual(
+            [prefetcher.get() for _ in range(5)], [0, 1, 2, 3, 4])
+        self.assertIsNone(prefetcher.get())
+
+    def test_cancel(self):
+        from google.cloud._testing import _Monkey
+        from google.cloud import iterator as MUT
+
+        fetched = []
+
+        def fetch_pages():
+            for value in range(5):
+                fetched.append(value)
+                yield value
+
+        with _Monkey(MUT, _PREFETCH_POLL_INTERVAL=0.01):
+            prefetcher = self._make_one(fetch_pages, 1)
+            self.assertEqual(prefetcher.get(), 0)
+            prefetcher.cancel()
+            prefetcher._thread.join()
+
+        self.assertFalse(prefetcher._thread.is_alive())
+        self.assertLess(len(fetched), 5)
+
+
 class TestPage(unittest.TestCase):
 
     @staticmethod
@@ -91,6 +167,59 @@ class TestPage(unittest.TestCase):
         self.assertEqual(parent.calls, 3)
         self.assertEqual(page.remaining, 97)
 
+    def test_lazy_items_counted_on_demand(self):
+        import six
+        from google.cloud._lazy_json import LazyJSONArray
+
+        items = LazyJSONArray('[1, 2, 3]', 0)
+        page = self._make_one(None, items, lambda parent, item: item)
+
+        self.assertIsNone(page._num_items)
+        self.assertIsNone(page._remaining)
+        self.assertEqual(six.next(page), 1)
+        self.assertEqual(page.num_items, 3)
+        self.assertEqual(page.remaining, 2)
+        self.assertEqual(list(page), [2, 3])
+        self.assertEqual(page.remaining, 0)
+
+    def test_release_items(self):
+        import six
+
+        items = [{'name': 'a'}, {'name': 'b'}]
+        page = self._make_one(
+            None, items, lambda parent, item: item['name'],
+            release_items=True)
+
+        self.assertEqual(six.next(page), 'a')
+        self.assertEqual(items, [None, {'name': 'b'}])
+        self.assertEqual(list(page), ['b'])
+        self.assertEqual(items, [None, None])
+        self.assertIsNone(page._raw_items)
+
+    def test_release_items_not_a_list(self):
+        items = ({'name': 'a'},)
+        page = self._make_one(
+            None, items, lambda parent, item: item['name'],
+            release_items=True)
+
+        self.assertEqual(list(page), ['a'])
+        self.assertEqual(items, ({'name': 'a'},))
+
+    def test_wo_release_items(self):
+        items = [{'name': 'a'}]
+        page = self._make_one(None, items, lambda parent, item: item['name'])
+
+        self.assertEqual(list(page), ['a'])
+        self.assertEqual(items, [{'name': 'a'}])
+
+    def test_slots(self):
+        page = self._make_one(None, (), None)
+        self.assertEqual(vars(page), {})
+
+        # Callbacks may still add their own attributes.
+        page.prefixes = ('a/',)
+        self.assertEqual(vars(page), {'prefixes': ('a/',)})
+
 
 class TestIterator(unittest.TestCase):
 
@@ -116,10 +245,14 @@ class TestIterator(unittest.TestCase):
         self.assertIs(iterator.client, client)
         self.assertIs(iterator._item_to_value, item_to_value)
         self.assertEqual(iterator.max_results, max_results)
+        self.assertEqual(iterator.prefetch, 0)
+        self.assertFalse(iterator.release_items)
+        self.assertIsNone(iterator._prefetcher)
         # Changing attributes.
         self.assertEqual(iterator.page_number, 0)
         self.assertEqual(iterator.next_page_token, token)
         self.assertEqual(iterator.num_results, 0)
+        self.assertEqual(vars(iterator), {})
 
     def test_pages_property(self):
         iterator = self._make_one(None, None)
@@ -235,6 +368,11 @@ class TestIterator(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             iterator._next_page()
 
+    def test__fetch_pages_virtual(self):
+        iterator = self._make_one(None, None)
+        with self.assertRaises(NotImplementedError):
+            iterator._fetch_pages()
+
 
 class TestHTTPIterator(unittest.TestCase):
 
@@ -262,6 +400,7 @@ class TestHTTPIterator(unittest.TestCase):
         self.assertIsNone(iterator.max_results)
         self.assertEqual(iterator.extra_params, {})
         self.assertIs(iterator._page_start, _do_nothing_page_start)
+        self.assertFalse(iterator.stream_items)
         # Changing attributes.
         self.assertEqual(iterator.page_number, 0)
         self.assertIsNone(iterator.next_page_token)
@@ -277,26 +416,25 @@ class TestHTTPIterator(unittest.TestCase):
 
     def test_pages_iter_empty_then_another(self):
         import six
-        from google.cloud._testing import _Monkey
-        from google.cloud import iterator as MUT
+        from google.cloud.iterator import Page
 
         items_key = 'its-key'
         iterator = self._make_one(None, None, None, items_key=items_key)
         # Fake the next page class.
-        fake_page = MUT.Page(None, (), None)
+        fake_page = Page(None, (), None)
         page_args = []
 
         def dummy_response():
             return {}
 
-        def dummy_page_class(*args):
+        def dummy_page_class(*args, **kwargs):
             page_args.append(args)
             return fake_page
 
         iterator._get_next_page_response = dummy_response
+        iterator._PAGE_CLASS = dummy_page_class
         pages_iter = iterator.pages
-        with _Monkey(MUT, Page=dummy_page_class):
-            page = six.next(pages_iter)
+        page = six.next(pages_iter)
         self.assertIs(page, fake_page)
         self.assertEqual(
             page_args, [(iterator, (), iterator._item_to_value)])
@@ -337,6 +475,26 @@ class TestHTTPIterator(unittest.TestCase):
         self.assertEqual(kw['path'], path)
         self.assertEqual(kw['query_params'], {})
 
+    def test_iterate_w_page_class(self):
+        import six
+        from google.cloud.iterator import Page
+
+        class _Page(Page):
+            __slots__ = ('extra',)
+
+        class _Iterator(self._get_target_class()):
+            __slots__ = ()
+            _PAGE_CLASS = _Page
+
+        connection = _Connection({'items': [{'name': 'key'}]})
+        client = _Client(connection)
+        iterator = _Iterator(client, path='/foo',
+                             item_to_value=lambda iterator, item: item)
+
+        page = six.next(iterator.pages)
+        self.assertIsInstance(page, _Page)
+        self.assertEqual(list(page), [{'name': 'key'}])
+
     def test__has_next_page_new(self):
         connection = _Connection()
         client = _Client(connection)
@@ -461,6 +619,67 @@ class TestHTTPIterator(unittest.TestCase):
             'data': {},
         })
 
+    def test__get_next_page_response_w_stream_items(self):
+        path = '/foo'
+        connection = _Connection({'items': []}, {'items': []})
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, path, None, items_key='things', stream_items=True)
+
+        iterator._get_next_page_response()
+        iterator._HTTP_METHOD = 'POST'
+        iterator._get_next_page_response()
+
+        self.assertEqual(connection._requested, [
+            {'method': 'GET', 'path': path, 'query_params': {},
+             'lazy_items_key': 'things'},
+            {'method': 'POST', 'path': path, 'data': {},
+             'lazy_items_key': 'things'},
+        ])
+
+    def test_iterate_w_release_items(self):
+        response = {'items': [{'name': 'a'}, {'name': 'b'}]}
+        connection = _Connection(response)
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', lambda iterator, item: item['name'],
+            release_items=True)
+        seen = []
+
+        for value in iterator:
+            seen.append((value, list(response['items'])))
+
+        self.assertEqual(seen, [
+            ('a', [None, {'name': 'b'}]),
+            ('b', [None, None]),
+        ])
+
+    def test_iterate_wo_release_items(self):
+        response = {'items': [{'name': 'a'}, {'name': 'b'}]}
+        connection = _Connection(response)
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', lambda iterator, item: item['name'])
+
+        self.assertEqual(list(iterator), ['a', 'b'])
+        self.assertEqual(response['items'], [{'name': 'a'}, {'name': 'b'}])
+
+    def test_iterate_w_stream_items(self):
+        from google.cloud._lazy_json import LazyJSONObject
+
+        connection = _Connection(
+            LazyJSONObject(
+                '{"items": [1, 2], "nextPageToken": "token1"}', 'items'),
+            LazyJSONObject('{"items": [3]}', 'items'),
+        )
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', _item_to_value, stream_items=True)
+
+        self.assertEqual(list(iterator), [2, 3, 4])
+        self.assertEqual(iterator.num_results, 3)
+        self.assertIsNone(iterator.next_page_token)
+
     def test__get_next_page_bad_http_method(self):
         path = '/foo'
         client = _Client(None)
@@ -469,6 +688,88 @@ class TestHTTPIterator(unittest.TestCase):
         with self.assertRaises(ValueError):
             iterator._get_next_page_response()
 
+    def test_iterate_w_prefetch(self):
+        connection = _Connection(
+            {'items': [1, 2], 'nextPageToken': 'token1'},
+            {'items': [3], 'nextPageToken': 'token2'},
+            {'items': [4]},
+        )
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', _item_to_value, prefetch=2)
+
+        self.assertEqual(list(iterator), [2, 3, 4, 5])
+        self.assertEqual(iterator.num_results, 4)
+        self.assertEqual(iterator.page_number, 3)
+        self.assertIsNone(iterator.next_page_token)
+        self.assertEqual(connection._requested, [
+            {'method': 'GET', 'path': '/foo', 'query_params': {}},
+            {'method': 'GET', 'path': '/foo',
+             'query_params': {'pageToken': 'token1'}},
+            {'method': 'GET', 'path': '/foo',
+             'query_params': {'pageToken': 'token2'}},
+        ])
+
+    def test_pages_w_prefetch_and_max_results(self):
+        connection = _Connection(
+            {'items': [1, 2], 'nextPageToken': 'token1'},
+            {'items': [3], 'nextPageToken': 'token2'},
+        )
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', _item_to_value, max_results=3,
+            page_token='token0', prefetch=1)
+
+        pages = iterator.pages
+        page = next(pages)
+        self.assertEqual(list(page), [2, 3])
+        self.assertEqual(iterator.next_page_token, 'token1')
+        self.assertEqual(iterator.num_results, 2)
+        page = next(pages)
+        self.assertEqual(list(page), [4])
+        self.assertEqual(iterator.next_page_token, 'token2')
+        self.assertEqual(iterator.num_results, 3)
+        with self.assertRaises(StopIteration):
+            next(pages)
+
+        self.assertEqual(connection._requested, [
+            {'method': 'GET', 'path': '/foo',
+             'query_params': {'pageToken': 'token0', 'maxResults': 3}},
+            {'method': 'GET', 'path': '/foo',
+             'query_params': {'pageToken': 'token1', 'maxResults': 1}},
+        ])
+
+    def test_iterate_w_prefetch_failure(self):
+        from google.cloud.exceptions import NotFound
+
+        connection = _FailingConnection(NotFound('missing'))
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', _item_to_value, prefetch=1)
+
+        with self.assertRaises(NotFound):
+            list(iterator)
+
+    def test_iterate_w_prefetch_stopped_early(self):
+        connection = _Connection(
+            {'items': [1], 'nextPageToken': 'token1'},
+            {'items': [2], 'nextPageToken': 'token2'},
+            {'items': [3], 'nextPageToken': 'token3'},
+            {'items': [4]},
+        )
+        client = _Client(connection)
+        iterator = self._make_one(
+            client, '/foo', _item_to_value, prefetch=1)
+
+        pages = iterator.pages
+        self.assertEqual(list(next(pages)), [2])
+        prefetcher = iterator._prefetcher
+        pages.close()
+
+        prefetcher._thread.join()
+        self.assertTrue(prefetcher._cancelled.is_set())
+        self.assertLess(len(connection._requested), 4)
+
 
 class TestGAXIterator(unittest.TestCase):
 
@@ -524,6 +825,23 @@ class TestGAXIterator(unittest.TestCase):
         expected = zip((iterator, iterator), page_items)
         self.assertEqual(list(page), list(expected))
 
+    def test__next_page_w_page_class(self):
+        from google.cloud._testing import _GAXPageIterator
+        from google.cloud.iterator import Page
+
+        class _Page(Page):
+            __slots__ = ()
+
+        class _Iterator(self._get_target_class()):
+            __slots__ = ()
+            _PAGE_CLASS = _Page
+
+        page_iter = _GAXPageIterator((29, 31))
+        iterator = _Iterator(None, page_iter, self._do_nothing)
+
+        page = iterator._next_page()
+        self.assertIsInstance(page, _Page)
+
     def test__next_page_empty(self):
         from google.cloud._testing import _GAXPageIterator
 
@@ -580,6 +898,28 @@ class TestGAXIterator(unittest.TestCase):
         with self.assertRaises(StopIteration):
             six.next(items_iter)
 
+    def test_iterate_w_prefetch(self):
+        page_iter = _TokenGAXPageIterator(
+            ((1, 2), 'token1'), ((3,), 'token2'), ((4,), None))
+        iterator = self._make_one(
+            None, page_iter, _item_to_value, prefetch=2)
+
+        pages = iterator.pages
+        self.assertEqual(list(next(pages)), [2, 3])
+        self.assertEqual(iterator.next_page_token, 'token1')
+        self.assertEqual(list(next(pages)), [4])
+        self.assertEqual(iterator.next_page_token, 'token2')
+        self.assertEqual(list(next(pages)), [5])
+        self.assertIsNone(iterator.next_page_token)
+        with self.assertRaises(StopIteration):
+            next(pages)
+        self.assertEqual(iterator.num_results, 4)
+        self.assertEqual(iterator.page_number, 3)
+
+
+def _item_to_value(iterator, item):  # pylint: disable=unused-argument
+    return item + 1
+
 
 class _Connection(object):
 
@@ -593,6 +933,15 @@ class _Connection(object):
         return response
 
 
+class _FailingConnection(object):
+
+    def __init__(self, exc):
+        self._exc = exc
+
+    def api_request(self, **kw):
+        raise self._exc
+
+
 class _Client(object):
 
     def __init__(self, connection):
@@ -603,3 +952,18 @@ class SimpleIter(object):
 
     def __init__(self, page_token=None):
         self.page_token = page_token
+
+
+class _TokenGAXPageIterator(object):
+
+    def __init__(self, *pages):
+        self._pages = iter(pages)
+        self.page_token = None
+
+    def next(self):
+        import six
+
+        items, self.page_token = six.next(self._pages)
+        return items
+
+    __next__ = next
@@ -0,0 +1,207 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+
+
+_ASYNC_UNSUPPORTED = sys.version_info < (3, 5)
+
+
+def _collect(async_iterator):
+    # Equivalent to ``[value async for value in async_iterator]``, spelled
+    # without the async syntax so this module still imports on Python 2.
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = []
+    try:
+        while True:
+            try:
+                value = loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:  # noqa: F821
+                return results
+            results.append(value)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@unittest.skipIf(_ASYNC_UNSUPPORTED, 'Requires Python 3.5+')
+class TestAsyncHTTPIterator(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.iterator_async import AsyncHTTPIterator
+
+        return AsyncHTTPIterator
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_constructor(self):
+        client = object()
+        connection = object()
+        path = '/foo'
+        iterator = self._make_one(
+            client, connection, path, _item_to_value, max_results=10)
+
+        self.assertIs(iterator.client, client)
+        self.assertIs(iterator.connection, connection)
+        self.assertEqual(iterator.path, path)
+        self.assertEqual(iterator.max_results, 10)
+        self.assertFalse(iterator._started)
+
+    def test_iterate_items(self):
+        connection = _Connection(
+            {'items': [1, 2], 'nextPageToken': 'next'},
+            {'items': [3]},
+        )
+        iterator = self._make_one(
+            object(), connection, '/foo', _item_to_value)
+
+        values = _collect(iterator.__aiter__())
+
+        self.assertEqual(values, [2, 3, 4])
+        self.assertEqual(iterator.num_results, 3)
+        self.assertEqual(iterator.page_number, 2)
+        self.assertIsNone(iterator.next_page_token)
+        self.assertEqual(connection._called_with, [
+            {'method': 'GET', 'path': '/foo', 'query_params': {}},
+            {'method': 'GET', 'path': '/foo',
+             'query_params': {'pageToken': 'next'}},
+        ])
+
+    def test_iterate_pages(self):
+        connection = _Connection(
+            {'items': [1, 2], 'nextPageToken': 'next'},
+            {'items': [3]},
+        )
+        iterator = self._make_one(
+            object(), connection, '/foo', _item_to_value)
+
+        pages = _collect(iterator.pages)
+
+        self.assertEqual([list(page) for page in pages], [[2, 3], [4]])
+        self.assertEqual(iterator.num_results, 3)
+        self.assertEqual(iterator.page_number, 2)
+
+    def test_iterate_w_max_results(self):
+        connection = _Connection(
+            {'items': [1, 2], 'nextPageToken': 'next'},
+        )
+        iterator = self._make_one(
+            object(), connection, '/foo', _item_to_value, max_results=2)
+
+        values = _collect(iterator.__aiter__())
+
+        self.assertEqual(values, [2, 3])
+        self.assertEqual(connection._called_with, [
+            {'method': 'GET', 'path': '/foo',
+             'query_params': {'maxResults': 2}},
+        ])
+
+    def test_post(self):
+        connection = _Connection({'items': [1]})
+        iterator = self._make_one(
+            object(), connection, '/foo', _item_to_value)
+        iterator._HTTP_METHOD = 'POST'
+
+        values = _collect(iterator.__aiter__())
+
+        self.assertEqual(values, [2])
+        self.assertEqual(connection._called_with, [
+            {'method': 'POST', 'path': '/foo', 'data': {}},
+        ])
+
+    def test_bad_http_method(self):
+        iterator = self._make_one(
+            object(), _Connection(), '/foo', _item_to_value)
+        iterator._HTTP_METHOD = 'NOT-A-VERB'
+
+        with self.assertRaises(ValueError):
+            _collect(iterator.__aiter__())
+
+    def test_already_started(self):
+        iterator = self._make_one(
+            object(), _Connection(), '/foo', _item_to_value)
+        iterator.__aiter__()
+
+        with self.assertRaises(ValueError):
+            iterator.__aiter__()
+        with self.assertRaises(ValueError):
+            getattr(iterator, 'pages')
+
+    def test_pages_already_started(self):
+        iterator = self._make_one(
+            object(), _Connection(), '/foo', _item_to_value)
+        getattr(iterator, 'pages')
+
+        with self.assertRaises(ValueError):
+            iterator.__aiter__()
+
+    def test_context_manager(self):
+        import asyncio
+
+        connection = _Connection()
+        iterator = self._make_one(
+            object(), connection, '/foo', _item_to_value)
+
+        loop = asyncio.new_event_loop()
+        try:
+            entered = loop.run_until_complete(iterator.__aenter__())
+            self.assertEqual(connection.closed, 0)
+            loop.run_until_complete(iterator.__aexit__(None, None, None))
+        finally:
+            loop.close()
+
+        self.assertIs(entered, iterator)
+        self.assertEqual(connection.closed, 1)
+
+    def test_sync_iteration_unsupported(self):
+        iterator = self._make_one(
+            object(), _Connection(), '/foo', _item_to_value)
+
+        with self.assertRaises(TypeError):
+            iter(iterator)
+
+
+def _item_to_value(iterator, item):
+    return item + 1
+
+
+class _Connection(object):
+
+    closed = 0
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self._called_with = []
+
+    def close(self):
+        import asyncio
+
+        self.closed += 1
+        future = asyncio.Future(loop=asyncio.get_event_loop())
+        future.set_result(None)
+        return future
+
+    def api_request(self, **kw):
+        import asyncio
+
+        self._called_with.append(kw)
+        future = asyncio.Future(loop=asyncio.get_event_loop())
+        future.set_result(self._responses.pop(0))
+        return future
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+def _orjson():
+    try:
+        import orjson
+    except ImportError:  # pragma: NO COVER
+        return None
+    return orjson
+
+
+def _canonical(value):
+    """Make a value comparable by type and exact representation.
+
+    ``1 == 1.0 == True`` and ``0.0 == -0.0`` in Python, but these must not
+    be confused by codecs.
+    """
+    if isinstance(value, dict):
+        return ('dict', sorted(
+            (key, _canonical(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ('list', [_canonical(item) for item in value])
+    return (type(value).__name__, repr(value))
+
+
+# Payloads of the kind sent to, and received from, the JSON APIs.
+PAYLOADS = [
+    # BigQuery ``insertAll`` rows.
+    {'kind': 'bigquery#tableDataInsertAllRequest',
+     'skipInvalidRows': False,
+     'rows': [{'insertId': '1', 'json': {
+         'name': u'Zoë', 'age': 32, 'score': 0.1, 'ratio': 1e-07,
+         'big': 1e+300, 'negative_zero': -0.0, 'active': True,
+         'nickname': None, 'tags': [u'日本語', u'emoji \U0001f600'],
+         'nested': {'when': '2017-06-01T12:00:00.000001Z'}}}]},
+    # BigQuery ``tabledata.list`` response: INT64 values as strings.
+    {'kind': 'bigquery#tableDataList', 'totalRows': '2',
+     'rows': [{'f': [{'v': '9223372036854775807'}, {'v': None}]},
+              {'f': [{'v': '-1'}, {'v': [{'v': '1.5'}]}]}]},
+    # Stackdriver Logging ``entries:write``.
+    {'entries': [{
+        'logName': 'projects/p/logs/syslog',
+        'resource': {'type': 'global', 'labels': {}},
+        'jsonPayload': {'message': u'quoted "text"\n\ttabbed \\ slash',
+                        'control': u'\x00\x1f\x7f', 'html': '</script>'},
+        'severity': 'ERROR'}]},
+    # Pub/Sub ``publish``.
+    {'messages': [{'data': 'aGVsbG8gd29ybGQ=',
+                   'attributes': {'key': u'välue'}}]},
+    # Stackdriver Monitoring ``timeSeries``.
+    {'timeSeries': [{
+        'metric': {'type': 'custom.googleapis.com/x'},
+        'points': [{
+            'value': {'doubleValue': 0.30000000000000004,
+                      'int64Value': '12345'},
+            'interval': {'endTime': '2017-06-01T00:00:00Z'}}]}]},
+    # Integer edge cases.
+    [0, -1, 2 ** 53 + 1, 2 ** 63 - 1, -2 ** 63, 2 ** 64 - 1, 2 ** 64,
+     -2 ** 63 - 1, 10 ** 30],
+    # Float edge cases.
+    [5e-324, 1.7976931348623157e+308, 2.2250738585072014e-308, 1e16,
+     123456789.123456789, 0.1 + 0.2],
+    # Empty containers and strings.
+    {'': [], 'a': {}, 'b': ''},
+]
+
+# Documents only decoded.
+DOCUMENTS = [
+    b'{"a": 1, "a": 2}',
+    b'  [1 , 2\n,3]  ',
+    b'"\\u00e9\\ud83d\\ude00\\/"',
+    b'"\\ud800"',
+    b'[1E400, -1e400]',
+    b'[12345678901234567890123, -9223372036854775809]',
+    b'{"id": 18446744073709551616}',
+    b'{"v": 1.0, "w": 1e2, "x": 1E-2, "y": -0}',
+    u'{"name": "Zoë"}'.encode('utf-8'),
+]
+
+
+class Test__has_big_integers(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(content):
+        from google.cloud.json_codec import _has_big_integers
+
+        return _has_big_integers(content)
+
+    def test_small_integers(self):
+        self.assertFalse(self._call_fut(b'[1, -922337203685477580, 1.5e300]'))
+
+    def test_big_integers(self):
+        self.assertTrue(self._call_fut(b'[1, 9223372036854775808]'))
+        self.assertTrue(self._call_fut(b'{"a":-9223372036854775809}'))
+        self.assertTrue(self._call_fut(b'12345678901234567890'))
+
+    def test_in_strings(self):
+        self.assertFalse(self._call_fut(
+            b'{"v": "9223372036854775808", "w": "-12345678901234567890"}'))
+        # Conservatively flagged.
+        self.assertTrue(self._call_fut(b'{"v": "id-9223372036854775808"}'))
+        self.assertTrue(self._call_fut(b'"1234567890123456789'))
+
+
+class Test__has_json_types_only(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(value):
+        from google.cloud.json_codec import _has_json_types_only
+
+        return _has_json_types_only(value)
+
+    def test_json_types(self):
+        self.assertTrue(self._call_fut(
+            {u'a': [1, 1.5, None, True, (u'b',)], 2: {None: u'c'}}))
+
+    def test_other_types(self):
+        import datetime
+
+        self.assertFalse(self._call_fut([{u'a': datetime.date.today()}]))
+        self.assertFalse(self._call_fut({(1, 2): u'a'}))
+        self.assertFalse(self._call_fut(set([1])))
+
+
+class TestJSONCodec(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.json_codec import JSONCodec
+
+        return JSONCodec
+
+    def _make_one(self):
+        return self._get_target_class()()
+
+    def test_dumps(self):
+        codec = self._make_one()
+        self.assertEqual(codec.dumps({'a': [1, None]}), '{"a": [1, null]}')
+
+    def test_loads(self):
+        codec = self._make_one()
+        self.assertEqual(codec.loads(b'{"a": "\xc3\xa9"}'), {'a': u'\xe9'})
+        self.assertEqual(codec.loads(u'{"a": "\xe9"}'), {'a': u'\xe9'})
+
+    def test_stdlib_codec(self):
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        self.assertIsInstance(STDLIB_CODEC, self._get_target_class())
+        self.assertEqual(STDLIB_CODEC.name, 'json')
+
+
+@unittest.skipIf(_orjson() is None, 'orjson not installed')
+class TestOrjsonCodec(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.json_codec import OrjsonCodec
+
+        return OrjsonCodec
+
+    def _make_one(self):
+        return self._get_target_class()()
+
+    def test_dumps_bytes(self):
+        codec = self._make_one()
+        self.assertEqual(codec.dumps({'a': [1, None]}), b'{"a":[1,null]}')
+
+    def test_dumps_conformance(self):
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        codec = self._make_one()
+        for payload in PAYLOADS:
+            expected = STDLIB_CODEC.loads(STDLIB_CODEC.dumps(payload))
+            decoded = STDLIB_CODEC.loads(codec.dumps(payload))
+            self.assertEqual(_canonical(decoded), _canonical(expected))
+
+    def test_dumps_non_string_keys(self):
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        codec = self._make_one()
+        # Boolean keys are separate, as ``True == 1``.
+        for payload in ({1: 'a', None: 'b', 1.5: 'd'},
+                        {True: 'c', False: 'e'}):
+            self.assertEqual(
+                STDLIB_CODEC.loads(codec.dumps(payload)),
+                STDLIB_CODEC.loads(STDLIB_CODEC.dumps(payload)))
+
+    def test_dumps_accepts_and_rejects_as_stdlib(self):
+        import dataclasses
+        import datetime
+        import enum
+        import uuid
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        class Color(enum.Enum):
+            RED = 1
+
+        class Size(enum.IntEnum):
+            SMALL = 1
+
+        class Name(str):
+            pass
+
+        @dataclasses.dataclass
+        class Point(object):
+            x: int
+
+        today = datetime.date(2017, 6, 1)
+        now = datetime.datetime(2017, 6, 1, 12, 0, 0)
+        identifier = uuid.UUID('12345678123456781234567812345678')
+        values = [
+            now, today, identifier, Color.RED, Size.SMALL, Name('a'),
+            Point(1), set([1]), 2 ** 70, -2 ** 70, [2 ** 64], 1.5,
+            {1: 'a', None: 'b', 1.5: 'c'}, {True: 'd'}, {2 ** 70: 'e'},
+            {today: 'f'}, {now: 'g'}, {identifier: 'h'}, {Color.RED: 'i'},
+            {Size.SMALL: 'j'}, {(1, 2): 'k'}, {'nested': [{'at': now}]},
+        ]
+        codec = self._make_one()
+        for value in values:
+            try:
+                expected = STDLIB_CODEC.loads(STDLIB_CODEC.dumps(value))
+            except TypeError:
+                with self.assertRaises(TypeError):
+                    codec.dumps(value)
+            else:
+                self.assertEqual(
+                    _canonical(STDLIB_CODEC.loads(codec.dumps(value))),
+                    _canonical(expected))
+
+    def test_dumps_lone_surrogate(self):
+        codec = self._make_one()
+        self.assertEqual(codec.dumps([u'\ud800']), '["\\ud800"]')
+
+    def test_loads_conformance(self):
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        codec = self._make_one()
+        documents = DOCUMENTS + [
+            STDLIB_CODEC.dumps(payload).encode('utf-8')
+            for payload in PAYLOADS]
+        for document in documents:
+            self.assertEqual(_canonical(codec.loads(document)),
+                             _canonical(STDLIB_CODEC.loads(document)))
+
+    def test_loads_text(self):
+        codec = self._make_one()
+        self.assertEqual(codec.loads(u'{"a": "\xe9"}'), {'a': u'\xe9'})
+
+    def test_loads_big_integer_in_string(self):
+        codec = self._make_one()
+        document = b'{"v": "12345678901234567890123"}'
+        with mock.patch.object(codec, '_loads') as loads:
+            codec.loads(document)
+        loads.assert_called_once_with(document)
+
+    def test_loads_invalid(self):
+        codec = self._make_one()
+        with self.assertRaises(ValueError):
+            codec.loads(b'{"a": ')
+
+
+class Test_fast_codec(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut():
+        from google.cloud.json_codec import fast_codec
+
+        return fast_codec()
+
+    @unittest.skipIf(_orjson() is None, 'orjson not installed')
+    def test_w_orjson(self):
+        from google.cloud.json_codec import OrjsonCodec
+
+        self.assertIsInstance(self._call_fut(), OrjsonCodec)
+
+    def test_wo_orjson(self):
+        import sys
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        with mock.patch.dict(sys.modules, {'orjson': None}):
+            self.assertIs(self._call_fut(), STDLIB_CODEC)
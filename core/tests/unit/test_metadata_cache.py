@@ -0,0 +1,180 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class Test__copy_json(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(value):
+        from google.cloud.metadata_cache import _copy_json
+
+        return _copy_json(value)
+
+    def test_nested(self):
+        value = {'a': [1, {'b': 'c'}], 'd': None, 'e': 1.5}
+
+        copied = self._call_fut(value)
+
+        self.assertEqual(copied, value)
+        self.assertIsNot(copied, value)
+        self.assertIsNot(copied['a'], value['a'])
+        self.assertIsNot(copied['a'][1], value['a'][1])
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    PATH = '/b/bucket'
+    URL = 'https://www.googleapis.com/storage/v1/b/bucket?projection=noAcl'
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.metadata_cache import MetadataCache
+
+        return MetadataCache
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_ctor_defaults(self):
+        cache = self._make_one()
+        self.assertEqual(cache.max_size, 1024)
+        self.assertIsNone(cache.ttl)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(len(cache), 0)
+
+    def test_ctor_invalid(self):
+        with self.assertRaises(ValueError):
+            self._make_one(max_size=0)
+        with self.assertRaises(ValueError):
+            self._make_one(ttl=0)
+
+    def test_get_miss(self):
+        cache = self._make_one()
+        self.assertIsNone(cache.get(self.PATH, self.URL))
+
+    def test_put_and_get(self):
+        cache = self._make_one()
+        properties = {'name': 'bucket', 'labels': {'a': 'b'}}
+
+        cache.put(self.PATH, self.URL, 'ETAG', properties)
+        properties['labels']['a'] = 'changed'
+
+        entry = cache.get(self.PATH, self.URL)
+        self.assertEqual(entry.etag, 'ETAG')
+        self.assertEqual(entry.properties,
+                         {'name': 'bucket', 'labels': {'a': 'b'}})
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_get_other_url(self):
+        cache = self._make_one()
+        cache.put(self.PATH, self.URL, 'ETAG', {})
+
+        self.assertIsNone(cache.get(self.PATH, self.URL + '&fields=name'))
+        self.assertEqual(len(cache), 1)
+
+    def test_get_expired(self):
+        from google.cloud import metadata_cache
+
+        cache = self._make_one(ttl=10.0)
+        with mock.patch.object(metadata_cache, 'default_timer',
+                               return_value=100.0):
+            cache.put(self.PATH, self.URL, 'ETAG', {})
+        with mock.patch.object(metadata_cache, 'default_timer',
+                               return_value=105.0):
+            self.assertIsNotNone(cache.get(self.PATH, self.URL))
+        with mock.patch.object(metadata_cache, 'default_timer',
+                               return_value=111.0):
+            self.assertIsNone(cache.get(self.PATH, self.URL))
+        self.assertEqual(len(cache), 0)
+
+    def test_revalidated(self):
+        from google.cloud import metadata_cache
+
+        cache = self._make_one(ttl=10.0)
+        with mock.patch.object(metadata_cache, 'default_timer',
+                               return_value=100.0):
+            cache.put(self.PATH, self.URL, 'ETAG', {'labels': {}})
+            entry = cache.get(self.PATH, self.URL)
+        with mock.patch.object(metadata_cache, 'default_timer',
+                               return_value=108.0):
+            properties = cache.revalidated(self.PATH, entry)
+        with mock.patch.object(metadata_cache, 'default_timer',
+                               return_value=115.0):
+            # Still current: the TTL restarted when revalidated.
+            self.assertIsNotNone(cache.get(self.PATH, self.URL))
+
+        self.assertEqual(properties, {'labels': {}})
+        properties['labels']['a'] = 'b'
+        self.assertEqual(entry.properties, {'labels': {}})
+        self.assertEqual(cache.hits, 1)
+
+    def test_revalidated_after_eviction(self):
+        cache = self._make_one()
+        cache.put(self.PATH, self.URL, 'ETAG', {'name': 'bucket'})
+        entry = cache.get(self.PATH, self.URL)
+        cache.invalidate(self.PATH)
+
+        self.assertEqual(cache.revalidated(self.PATH, entry),
+                         {'name': 'bucket'})
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = self._make_one(max_size=2)
+        cache.put('/b/a', 'a', 'A', {})
+        cache.put('/b/b', 'b', 'B', {})
+        cache.get('/b/a', 'a')  # Now the most recently used.
+
+        cache.put('/b/c', 'c', 'C', {})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get('/b/a', 'a'))
+        self.assertIsNone(cache.get('/b/b', 'b'))
+        self.assertIsNotNone(cache.get('/b/c', 'c'))
+
+    def test_invalidate(self):
+        cache = self._make_one()
+        cache.put(self.PATH, self.URL, 'ETAG', {})
+
+        cache.invalidate(self.PATH)
+        cache.invalidate('/b/other')
+
+        self.assertIsNone(cache.get(self.PATH, self.URL))
+
+    def test_pickle(self):
+        import pickle
+
+        cache = self._make_one(max_size=2, ttl=10.0)
+        cache.put(self.PATH, self.URL, 'ETAG', {'name': 'bucket'})
+
+        copied = pickle.loads(pickle.dumps(cache))
+
+        self.assertEqual((copied.max_size, copied.ttl), (2, 10.0))
+        self.assertEqual(copied.get(self.PATH, self.URL).properties,
+                         {'name': 'bucket'})
+        self.assertIsNot(copied._lock, cache._lock)
+
+    def test_clear(self):
+        cache = self._make_one()
+        cache.put('/b/a', 'a', 'A', {})
+        cache.put('/b/b', 'b', 'B', {})
+
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
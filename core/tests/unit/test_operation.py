@@ -14,6 +14,8 @@
 
 import unittest
 
+import mock
+
 
 class Test__compute_type_url(unittest.TestCase):
 
@@ -400,6 +402,243 @@ class TestOperation(unittest.TestCase):
         self.assertIsNone(operation.response)
 
 
+class TestOperationPoller(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.operation import OperationPoller
+
+        return OperationPoller
+
+    def _make_one(self, *args, **kw):
+        kw.setdefault('initial_delay', 0.001)
+        kw.setdefault('maximum_delay', 0.005)
+        poller = self._get_target_class()(*args, **kw)
+        self.addCleanup(poller.close)
+        return poller
+
+    @staticmethod
+    def _make_grpc_operation(name, polls_until_done, client=None):
+        from google.longrunning import operations_pb2
+        from google.cloud.operation import Operation
+
+        if client is None:
+            client = _Client()
+            client._operations_stub = _SequenceStub()
+        responses = [operations_pb2.Operation(name=name)] * (
+            polls_until_done - 1)
+        responses.append(operations_pb2.Operation(name=name, done=True))
+        client._operations_stub.responses[name] = responses
+        return Operation.from_pb(
+            operations_pb2.Operation(name=name), client)
+
+    def test_constructor_defaults(self):
+        poller = self._get_target_class()()
+
+        self.assertEqual(poller._max_workers, 10)
+        self.assertEqual(poller.initial_delay, 1.0)
+        self.assertEqual(poller.maximum_delay, 30.0)
+        self.assertEqual(poller.multiplier, 1.5)
+        self.assertEqual(poller.pending, 0)
+        self.assertEqual(poller.finished, [])
+        self.assertEqual(poller.errors, {})
+
+    def test_constructor_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            self._get_target_class()(max_workers=0)
+
+    def test_wait_grpc(self):
+        client = _Client()
+        client._operations_stub = _SequenceStub()
+        operations = [
+            self._make_grpc_operation('op-%d' % (index,), index + 1, client)
+            for index in range(5)
+        ]
+        poller = self._make_one(operations, max_workers=2)
+
+        self.assertTrue(poller.wait(timeout=10))
+
+        self.assertEqual(poller.pending, 0)
+        self.assertEqual(set(poller.finished), set(operations))
+        self.assertTrue(all(operation.complete for operation in operations))
+        self.assertLessEqual(len(poller._workers), 2)
+        self.assertEqual(client._operations_stub.calls['op-4'], 5)
+
+    def test_wait_http(self):
+        from google.cloud.operation import Operation
+
+        connection = _Connection(
+            {'name': 'op', 'done': False}, {'name': 'op', 'done': True})
+        operation = Operation.from_dict(
+            {'name': 'op'}, _Client(connection=connection))
+        poller = self._make_one()
+        poller.add(operation)
+
+        self.assertTrue(poller.wait(timeout=10))
+
+        self.assertTrue(operation.complete)
+        self.assertEqual(
+            [request['path'] for request in connection._requested],
+            ['operations/op', 'operations/op'])
+
+    def test_add_already_complete(self):
+        import threading
+
+        operation = _Operation(complete=True)
+        threads = []
+        poller = self._make_one()
+
+        def callback(operation):
+            threads.append(threading.current_thread())
+
+        self.assertIs(poller.add(operation, callback=callback), operation)
+        self.assertTrue(poller.wait(timeout=10))
+
+        self.assertEqual(poller.finished, [operation])
+        self.assertEqual(threads, poller._workers)
+        self.assertIsNot(threads[0], threading.current_thread())
+        self.assertEqual(operation.polls, 0)
+
+    def test_add_twice(self):
+        operation = _Operation(complete=False, results=[False, True])
+        first, second = mock.Mock(), mock.Mock()
+        poller = self._make_one()
+
+        poller.add(operation, callback=first)
+        poller.add(operation, callback=second)
+        self.assertTrue(poller.wait(timeout=10))
+
+        first.assert_called_once_with(operation)
+        second.assert_called_once_with(operation)
+        self.assertEqual(poller.finished, [operation, operation])
+
+    def test_as_completed(self):
+        slow = self._make_grpc_operation('slow', 4)
+        fast = self._make_grpc_operation('fast', 1)
+        done = _Operation(complete=True)
+        poller = self._make_one([done, slow, fast], max_workers=1)
+
+        completed = list(poller.as_completed(timeout=10))
+
+        self.assertEqual(completed, [done, fast, slow])
+
+    def test_timeout(self):
+        operation = _Operation(complete=False)
+        poller = self._make_one([operation])
+
+        self.assertFalse(poller.wait(timeout=0.02))
+        self.assertEqual(list(poller.as_completed(timeout=0.02)), [])
+        self.assertEqual(poller.pending, 1)
+        self.assertGreater(operation.polls, 1)
+
+    def test_callbacks(self):
+        operation = self._make_grpc_operation('op', 2)
+        calls = []
+
+        def failing(operation):
+            calls.append(('failing', operation))
+            raise RuntimeError('boom')
+
+        poller = self._make_one()
+        poller.add_done_callback(failing)
+        poller.add_done_callback(lambda op: calls.append(('all', op)))
+
+        with mock.patch('google.cloud.operation._LOGGER') as logger:
+            poller.add(operation, callback=lambda op: calls.append(
+                ('one', op)))
+            self.assertTrue(poller.wait(timeout=10))
+
+        self.assertEqual(calls, [
+            ('failing', operation), ('all', operation), ('one', operation)])
+        logger.exception.assert_called_once_with(
+            'Callback for operation %s raised', 'op')
+
+    def test_transient_error_retried(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        operation = _Operation(
+            complete=False, results=[ServiceUnavailable('x'), True])
+        poller = self._make_one([operation])
+
+        self.assertTrue(poller.wait(timeout=10))
+
+        self.assertEqual(operation.polls, 2)
+        self.assertEqual(poller.errors, {})
+
+    def test_permanent_error(self):
+        from google.cloud.exceptions import NotFound
+
+        error = NotFound('x')
+        operation = _Operation(complete=False, results=[error])
+        callback = mock.Mock()
+        poller = self._make_one()
+        poller.add(operation, callback=callback)
+
+        self.assertTrue(poller.wait(timeout=10))
+
+        self.assertEqual(poller.errors, {operation: error})
+        self.assertEqual(poller.finished, [operation])
+        callback.assert_called_once_with(operation)
+
+    def test_backoff(self):
+        from google.cloud.operation import _TrackedOperation
+
+        tracked = _TrackedOperation(_Operation(complete=False), 1.0)
+        poller = self._get_target_class()(
+            initial_delay=1.0, maximum_delay=3.0, multiplier=2.0)
+
+        dues = []
+        with mock.patch('google.cloud.operation.default_timer',
+                        return_value=100.0):
+            with mock.patch('random.uniform', return_value=1.0):
+                for _ in range(4):
+                    poller._reschedule(tracked)
+                    dues.append(poller._schedule.pop()[0])
+
+        self.assertEqual(dues, [101.0, 102.0, 103.0, 103.0])
+
+    def test_close(self):
+        operation = _Operation(complete=False)
+        with self._make_one() as poller:
+            poller.add(operation)
+            workers = list(poller._workers)
+
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+        with self.assertRaises(ValueError):
+            poller.add(_Operation(complete=False))
+
+
+class _Operation(object):
+
+    name = 'fake'
+
+    def __init__(self, complete, results=()):
+        self.complete = complete
+        self._results = list(results)
+        self.polls = 0
+
+    def poll(self):
+        self.polls += 1
+        if self._results:
+            result = self._results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            self.complete = result
+        return self.complete
+
+
+class _SequenceStub(object):
+
+    def __init__(self):
+        self.responses = {}
+        self.calls = {}
+
+    def GetOperation(self, request_pb):
+        name = request_pb.name
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return self.responses[name].pop(0)
+
+
 class _OperationsStub(object):
 
     def GetOperation(self, request_pb):
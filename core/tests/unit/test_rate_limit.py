@@ -0,0 +1,317 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class _Clock(object):
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.rate_limit import RateLimiter
+
+        return RateLimiter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _patch_clock(self, clock):
+        from google.cloud import rate_limit
+
+        patch = mock.patch.object(rate_limit, 'default_timer', new=clock)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_ctor_defaults(self):
+        limiter = self._make_one()
+        self.assertIsNone(limiter.rate)
+        self.assertIsNone(limiter.max_rate)
+        self.assertIsNone(limiter.burst)
+        self.assertIsNone(limiter.concurrency_limit)
+        self.assertIsNone(limiter.max_concurrency)
+        self.assertIsNone(limiter.name)
+
+    def test_ctor_explicit(self):
+        limiter = self._make_one(
+            rate=10.0, burst=5, max_concurrency=8, initial_concurrency=2,
+            min_rate=2.0, name='deletes')
+        self.assertEqual(limiter.rate, 10.0)
+        self.assertEqual(limiter.max_rate, 10.0)
+        self.assertEqual(limiter.burst, 5)
+        self.assertEqual(limiter.min_rate, 2.0)
+        self.assertEqual(limiter.concurrency_limit, 2)
+        self.assertEqual(limiter.max_concurrency, 8)
+        self.assertEqual(limiter.name, 'deletes')
+
+    def test_ctor_burst_default(self):
+        self.assertEqual(self._make_one(rate=20.0).burst, 20.0)
+        self.assertEqual(self._make_one(rate=0.5).burst, 1.0)
+        self.assertEqual(self._make_one(rate=20.0).min_rate, 0.2)
+
+    def test_ctor_invalid(self):
+        with self.assertRaises(ValueError):
+            self._make_one(rate=0)
+        with self.assertRaises(ValueError):
+            self._make_one(max_concurrency=0)
+        with self.assertRaises(ValueError):
+            self._make_one(min_concurrency=0)
+        with self.assertRaises(ValueError):
+            self._make_one(decrease=1.0)
+
+    def test_select(self):
+        limiter = self._make_one()
+        self.assertIs(limiter.select('GET /b/{}'), limiter)
+
+    def test_acquire_unlimited(self):
+        limiter = self._make_one()
+
+        with mock.patch('time.sleep') as sleep:
+            permits = [limiter.acquire() for _ in range(100)]
+
+        sleep.assert_not_called()
+        self.assertEqual(limiter.stats().in_flight, 100)
+        self.assertEqual(limiter.stats().throttled, 0)
+        for permit in permits:
+            limiter.release(permit, 200)
+        self.assertEqual(limiter.stats().in_flight, 0)
+
+    def test_acquire_token_bucket(self):
+        clock = _Clock()
+        self._patch_clock(clock)
+        limiter = self._make_one(rate=10.0, burst=2)
+
+        def sleep(delay):
+            clock.now += delay
+
+        with mock.patch('time.sleep', side_effect=sleep) as sleep_mock:
+            delays = [limiter.acquire().delay for _ in range(4)]
+
+        self.assertEqual(sleep_mock.call_count, 2)
+        for call in sleep_mock.call_args_list:
+            self.assertAlmostEqual(call[0][0], 0.1)
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.1)
+        self.assertAlmostEqual(delays[3], 0.1)
+        stats = limiter.stats()
+        self.assertEqual(stats.calls, 4)
+        self.assertEqual(stats.throttled, 2)
+        self.assertAlmostEqual(stats.throttle_delay, 0.2)
+
+    def test_acquire_refills(self):
+        clock = _Clock()
+        self._patch_clock(clock)
+        limiter = self._make_one(rate=10.0, burst=2)
+
+        with mock.patch('time.sleep') as sleep:
+            limiter.acquire()
+            limiter.acquire()
+            clock.now += 10.0  # Refills no more than the burst.
+            limiter.acquire()
+            limiter.acquire()
+
+        sleep.assert_not_called()
+
+    def test_acquire_concurrency_limit(self):
+        import threading
+
+        limiter = self._make_one(max_concurrency=1)
+        permit = limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+
+        limiter.release(permit, 200)
+        thread.join()
+
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(limiter.stats().in_flight, 1)
+        self.assertEqual(limiter.stats().throttled, 1)
+
+    def test_release_overloaded(self):
+        clock = _Clock()
+        self._patch_clock(clock)
+        limiter = self._make_one(rate=100.0, max_concurrency=8)
+        permits = [limiter.acquire() for _ in range(3)]
+
+        clock.now += 1.0
+        limiter.release(permits[0], 429)
+        self.assertEqual(limiter.rate, 50.0)
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+        # Sent before the back-off: rejected by the same overload.
+        limiter.release(permits[1], 503)
+        self.assertEqual(limiter.rate, 50.0)
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+        clock.now += 1.0
+        permit = limiter.acquire()
+        limiter.release(permit, 'RESOURCE_EXHAUSTED')
+        self.assertEqual(limiter.rate, 25.0)
+        self.assertEqual(limiter.concurrency_limit, 2)
+
+        stats = limiter.stats()
+        self.assertEqual(stats.backoffs, 2)
+        self.assertEqual(stats.in_flight, 1)
+
+    def test_release_overloaded_bounds(self):
+        limiter = self._make_one(rate=10.0, max_concurrency=2, min_rate=4.0)
+
+        with mock.patch('time.sleep'):
+            for _ in range(5):
+                limiter.release(limiter.acquire(), 429)
+
+        self.assertEqual(limiter.rate, 4.0)
+        self.assertEqual(limiter.concurrency_limit, 1)
+
+    def test_release_ramps_up(self):
+        limiter = self._make_one(
+            rate=10.0, ramp_up=10.0, max_concurrency=4, initial_concurrency=2)
+        patch = mock.patch('time.sleep')
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        limiter.release(limiter.acquire(), 429)
+        self.assertEqual(limiter.rate, 5.0)
+        self.assertEqual(limiter.concurrency_limit, 1)
+
+        limiter.release(limiter.acquire(), 200)
+        self.assertAlmostEqual(limiter.rate, 5.2)
+        self.assertEqual(limiter.concurrency_limit, 2)
+
+        for _ in range(200):
+            limiter.release(limiter.acquire(), 'OK')
+        self.assertEqual(limiter.rate, 10.0)
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+    def test_release_other_errors(self):
+        limiter = self._make_one(max_concurrency=4, initial_concurrency=2)
+
+        limiter.release(limiter.acquire(), None)
+        self.assertEqual(limiter.concurrency_limit, 2)
+        limiter.release(limiter.acquire(), 404)
+        limiter.release(limiter.acquire(), 404)
+        self.assertEqual(limiter.concurrency_limit, 2)
+        limiter.release(limiter.acquire(), 404)
+        self.assertEqual(limiter.concurrency_limit, 3)
+        self.assertEqual(limiter.stats().backoffs, 0)
+
+    def test_call(self):
+        limiter = self._make_one(max_concurrency=4)
+
+        result, delay = limiter.call(lambda: 'RESULT')
+
+        self.assertEqual(result, 'RESULT')
+        self.assertEqual(delay, 0.0)
+        self.assertEqual(limiter.stats().in_flight, 0)
+
+    def test_call_error(self):
+        from google.cloud.exceptions import TooManyRequests
+
+        limiter = self._make_one(max_concurrency=4)
+
+        def function():
+            raise TooManyRequests('quota')
+
+        with self.assertRaises(TooManyRequests):
+            limiter.call(function)
+
+        self.assertEqual(limiter.concurrency_limit, 2)
+        self.assertEqual(limiter.stats().in_flight, 0)
+
+    def test_stats(self):
+        from google.cloud.rate_limit import RateLimiterStats
+
+        limiter = self._make_one(rate=10.0, max_concurrency=4, name='name')
+        limiter.acquire()
+
+        self.assertEqual(
+            limiter.stats(),
+            RateLimiterStats('name', 10.0, 10.0, 4, 4, 1, 1, 0, 0, 0.0))
+
+    def test_tracked(self):
+        from google.cloud import instrumentation
+
+        limiter = self._make_one(name='tracked')
+
+        self.assertIn(limiter.stats(), instrumentation.rate_limiter_stats())
+
+    def test_pickle(self):
+        import pickle
+
+        limiter = self._make_one(rate=10.0, max_concurrency=8, name='name')
+        with mock.patch('time.sleep'):
+            limiter.release(limiter.acquire(), 429)
+            limiter.acquire()
+
+        copied = pickle.loads(pickle.dumps(limiter))
+
+        stats = copied.stats()
+        self.assertEqual(stats.name, 'name')
+        self.assertEqual((stats.rate, stats.max_rate), (5.0, 10.0))
+        self.assertEqual(
+            (stats.concurrency_limit, stats.max_concurrency), (4, 8))
+        self.assertEqual((stats.in_flight, stats.calls), (0, 0))
+        with mock.patch('time.sleep'):
+            copied.release(copied.acquire(), 200)
+
+
+class TestMethodRateLimiter(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.rate_limit import MethodRateLimiter
+
+        return MethodRateLimiter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_select(self):
+        from google.cloud.rate_limit import RateLimiter
+
+        deletes = RateLimiter(rate=10.0)
+        named = RateLimiter(rate=10.0, name='publish')
+        default = RateLimiter()
+        limiter = self._make_one({
+            'DELETE /b/{}/o/{}': deletes,
+            'POST /projects/{}/topics/{}:publish': named,
+        }, default=default)
+
+        self.assertIs(limiter.select('DELETE /b/{}/o/{}'), deletes)
+        self.assertIs(
+            limiter.select('POST /projects/{}/topics/{}:publish'), named)
+        self.assertIs(limiter.select('GET /b/{}/o/{}'), default)
+        self.assertEqual(deletes.name, 'DELETE /b/{}/o/{}')
+        self.assertEqual(named.name, 'publish')
+
+    def test_select_wo_default(self):
+        limiter = self._make_one({})
+        self.assertIsNone(limiter.select('GET /b/{}'))
@@ -0,0 +1,288 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+def _grpc_error(code):
+    import grpc
+
+    class _Error(grpc.RpcError):
+
+        def code(self):
+            return code
+
+    return _Error()
+
+
+class Test_error_code(unittest.TestCase):
+
+    def _call_fut(self, exc):
+        from google.cloud.retry import error_code
+
+        return error_code(exc)
+
+    def test_google_cloud_error(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        self.assertEqual(self._call_fut(ServiceUnavailable('x')), 503)
+
+    def test_streaming_http_error(self):
+        from google.cloud.streaming.exceptions import HttpError
+
+        exc = HttpError({'status': '429'}, b'', 'http://example.com')
+        self.assertEqual(self._call_fut(exc), 429)
+
+    def test_grpc_error(self):
+        import grpc
+
+        exc = _grpc_error(grpc.StatusCode.UNAVAILABLE)
+        self.assertEqual(self._call_fut(exc), 'UNAVAILABLE')
+
+    def test_gax_error(self):
+        import grpc
+
+        exc = ValueError()
+        exc.cause = _grpc_error(grpc.StatusCode.RESOURCE_EXHAUSTED)
+        self.assertEqual(self._call_fut(exc), 'RESOURCE_EXHAUSTED')
+
+    def test_code_fails(self):
+        exc = ValueError()
+        exc.code = lambda: None
+        self.assertIsNone(self._call_fut(exc))
+
+    def test_no_code(self):
+        self.assertIsNone(self._call_fut(ValueError()))
+
+
+class Test_if_status_code(unittest.TestCase):
+
+    def _call_fut(self, *codes):
+        from google.cloud.retry import if_status_code
+
+        return if_status_code(*codes)
+
+    def test_http_and_grpc_codes(self):
+        import grpc
+        from google.cloud.exceptions import NotFound
+        from google.cloud.exceptions import ServiceUnavailable
+
+        predicate = self._call_fut(404, grpc.StatusCode.ABORTED)
+
+        self.assertTrue(predicate(NotFound('x')))
+        self.assertTrue(predicate(_grpc_error(grpc.StatusCode.ABORTED)))
+        self.assertFalse(predicate(ServiceUnavailable('x')))
+        self.assertFalse(predicate(_grpc_error(grpc.StatusCode.UNAVAILABLE)))
+
+    def test_grpc_code_names(self):
+        import grpc
+
+        predicate = self._call_fut('ABORTED')
+        self.assertTrue(predicate(_grpc_error(grpc.StatusCode.ABORTED)))
+
+
+class Test_if_transient_error(unittest.TestCase):
+
+    def _call_fut(self, exc):
+        from google.cloud.retry import if_transient_error
+
+        return if_transient_error(exc)
+
+    def test_transient_http(self):
+        from google.cloud.exceptions import InternalServerError
+        from google.cloud.exceptions import ServiceUnavailable
+        from google.cloud.exceptions import TooManyRequests
+
+        self.assertTrue(self._call_fut(InternalServerError('x')))
+        self.assertTrue(self._call_fut(ServiceUnavailable('x')))
+        self.assertTrue(self._call_fut(TooManyRequests('x')))
+
+    def test_permanent_http(self):
+        from google.cloud.exceptions import BadRequest
+        from google.cloud.exceptions import NotFound
+
+        self.assertFalse(self._call_fut(BadRequest('x')))
+        self.assertFalse(self._call_fut(NotFound('x')))
+
+    def test_grpc(self):
+        import grpc
+
+        self.assertTrue(
+            self._call_fut(_grpc_error(grpc.StatusCode.UNAVAILABLE)))
+        self.assertFalse(
+            self._call_fut(_grpc_error(grpc.StatusCode.NOT_FOUND)))
+
+    def test_connection_errors(self):
+        import socket
+        from six.moves import http_client
+
+        self.assertTrue(self._call_fut(socket.error()))
+        self.assertTrue(self._call_fut(http_client.BadStatusLine('')))
+
+    def test_retry_after(self):
+        from google.cloud.streaming.exceptions import RetryAfterError
+
+        exc = RetryAfterError({'status': '200'}, b'', 'http://x', 10)
+        self.assertTrue(self._call_fut(exc))
+
+    def test_other(self):
+        self.assertFalse(self._call_fut(ValueError()))
+
+
+class TestRetry(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.retry import Retry
+
+        return Retry
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_constructor_defaults(self):
+        from google.cloud.retry import if_transient_error
+
+        retry = self._make_one()
+
+        self.assertIs(retry.predicate, if_transient_error)
+        self.assertEqual(retry.initial, 1.0)
+        self.assertEqual(retry.maximum, 32.0)
+        self.assertEqual(retry.multiplier, 2.0)
+        self.assertEqual(retry.deadline, 120.0)
+
+    def test___repr__(self):
+        retry = self._make_one(predicate=None, initial=1, maximum=2,
+                               multiplier=3, deadline=4)
+        self.assertEqual(
+            repr(retry),
+            'Retry(predicate=None, initial=1, maximum=2, multiplier=3, '
+            'deadline=4)')
+
+    def test_delays_full_jitter(self):
+        import itertools
+
+        retry = self._make_one(initial=1.0, maximum=5.0, multiplier=2.0)
+
+        with mock.patch('random.uniform', side_effect=lambda a, b: b) as u:
+            delays = list(itertools.islice(retry.delays(), 5))
+
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 5.0, 5.0])
+        for call in u.call_args_list:
+            self.assertEqual(call[0][0], 0.0)
+
+    def test_call_success(self):
+        retry = self._make_one()
+
+        with mock.patch('time.sleep') as sleep:
+            self.assertEqual(retry.call(lambda: 42), 42)
+
+        sleep.assert_not_called()
+
+    def test_call_retries_transient(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        function = mock.Mock(side_effect=[
+            ServiceUnavailable('x'), ServiceUnavailable('y'), 'done'])
+        on_retry = mock.Mock()
+        retry = self._make_one(initial=1.0)
+
+        with mock.patch('random.uniform', side_effect=lambda a, b: b):
+            with mock.patch('time.sleep') as sleep:
+                result = retry.call(function, on_retry=on_retry)
+
+        self.assertEqual(result, 'done')
+        self.assertEqual(function.call_count, 3)
+        self.assertEqual([call[0] for call in sleep.call_args_list],
+                         [(1.0,), (2.0,)])
+        self.assertEqual(on_retry.call_count, 2)
+        exc, delay = on_retry.call_args_list[1][0]
+        self.assertEqual(exc.message, 'y')
+        self.assertEqual(delay, 2.0)
+
+    def test_call_permanent_error(self):
+        from google.cloud.exceptions import NotFound
+
+        function = mock.Mock(side_effect=NotFound('x'))
+        retry = self._make_one()
+
+        with mock.patch('time.sleep') as sleep:
+            with self.assertRaises(NotFound):
+                retry.call(function)
+
+        function.assert_called_once_with()
+        sleep.assert_not_called()
+
+    def test_call_deadline_exceeded(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        function = mock.Mock(side_effect=ServiceUnavailable('x'))
+        retry = self._make_one(initial=4.0, multiplier=1.0, deadline=10.0)
+        clock = [100.0]
+
+        def sleep(delay):
+            clock[0] += delay
+
+        with mock.patch('random.uniform', side_effect=lambda a, b: b):
+            with mock.patch('google.cloud.retry.default_timer',
+                            new=lambda: clock[0]):
+                with mock.patch('time.sleep', new=sleep):
+                    with self.assertRaises(ServiceUnavailable):
+                        retry.call(function)
+
+        # Retries at 104 and 108; a third at 112 would pass the deadline.
+        self.assertEqual(function.call_count, 3)
+
+    def test_call_without_deadline(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        function = mock.Mock(side_effect=[ServiceUnavailable('x')] * 5 + [1])
+        retry = self._make_one(deadline=None)
+
+        with mock.patch('time.sleep'):
+            self.assertEqual(retry.call(function), 1)
+
+    def test_call_honors_retry_after(self):
+        from google.cloud.streaming.exceptions import RetryAfterError
+
+        exc = RetryAfterError({'status': '200'}, b'', 'http://x', 7)
+        function = mock.Mock(side_effect=[exc, 'done'])
+        retry = self._make_one(initial=1.0)
+
+        with mock.patch('time.sleep') as sleep:
+            self.assertEqual(retry.call(function), 'done')
+
+        sleep.assert_called_once_with(7)
+
+    def test_decorator(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        calls = []
+
+        @self._make_one()
+        def function(a, b=None):
+            """Docstring."""
+            calls.append((a, b))
+            if len(calls) == 1:
+                raise ServiceUnavailable('x')
+            return a + b
+
+        with mock.patch('time.sleep'):
+            self.assertEqual(function(1, b=2), 3)
+
+        self.assertEqual(calls, [(1, 2), (1, 2)])
+        self.assertEqual(function.__name__, 'function')
+        self.assertEqual(function.__doc__, 'Docstring.')
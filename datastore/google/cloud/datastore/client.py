@@ -198,6 +198,8 @@ class Client(ClientWithProject):
     SCOPE = ('https://www.googleapis.com/auth/datastore',)
     """The scopes required for authenticating as a Cloud Datastore consumer."""
 
+    _TRANSIENT_ATTRIBUTES = ('_batch_stack', '_datastore_api_internal')
+
     def __init__(self, project=None, namespace=None,
                  credentials=None, _http=None, _use_grpc=None):
         super(Client, self).__init__(
@@ -215,6 +217,10 @@ class Client(ClientWithProject):
         except KeyError:
             self._base_url = _DATASTORE_BASE_URL
 
+    def __setstate__(self, state):
+        super(Client, self).__setstate__(state)
+        self._batch_stack = _LocalStack()
+
     @staticmethod
     def _determine_default(project):
         """Helper:  override default project detection."""
@@ -362,6 +362,7 @@ class TestManagedZone(unittest.TestCase):
         req = conn._requested[0]
         self.assertEqual(req['method'], 'GET')
         self.assertEqual(req['path'], '/%s' % PATH)
+        self.assertTrue(req['_cacheable'])
         self._verifyResourceProperties(zone, RESOURCE)
 
     def test_reload_w_alternate_client(self):
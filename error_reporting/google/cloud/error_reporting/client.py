@@ -126,6 +126,8 @@ class Client(ClientWithProject):
     SCOPE = ('https://www.googleapis.com/auth/cloud-platform',)
     """The scopes required for authenticating as an API consumer."""
 
+    _TRANSIENT_ATTRIBUTES = ('_report_errors_api',)
+
     def __init__(self, project=None,
                  credentials=None,
                  _http=None,
@@ -17,18 +17,7 @@
 import logging
 import os
 
-try:
-    from google.cloud.logging._gax import make_gax_logging_api
-    from google.cloud.logging._gax import make_gax_metrics_api
-    from google.cloud.logging._gax import make_gax_sinks_api
-except ImportError:  # pragma: NO COVER
-    _HAVE_GRPC = False
-    make_gax_logging_api = None
-    make_gax_metrics_api = None
-    make_gax_sinks_api = None
-else:
-    _HAVE_GRPC = True
-
+from google.cloud._helpers import _module_available
 from google.cloud.client import ClientWithProject
 from google.cloud.environment_vars import DISABLE_GRPC
 from google.cloud.logging._http import Connection
@@ -46,6 +35,15 @@ from google.cloud.logging.metric import Metric
 from google.cloud.logging.sink import Sink
 
 
+# The GAX helpers (and with them gRPC and the generated modules, which are
+# slow to import) are only loaded once a gRPC-backed API is first used.
+_GAX_MODULES = (
+    'grpc',
+    'google.gax',
+    'google.cloud.gapic.logging.v2',
+    'google.cloud.proto.logging.v2',
+)
+_HAVE_GRPC = all(_module_available(name) for name in _GAX_MODULES)
 _DISABLE_GRPC = os.getenv(DISABLE_GRPC, False)
 _USE_GRPC = _HAVE_GRPC and not _DISABLE_GRPC
 
@@ -59,6 +57,48 @@ _CONTAINER_ENGINE_ENV = 'KUBERNETES_SERVICE'
 """Environment variable set in a Google Container Engine environment."""
 
 
+def make_gax_logging_api(client):
+    """Create an instance of the GAX Logging API.
+
+    :type client: :class:`~google.cloud.logging.client.Client`
+    :param client: The client that holds configuration details.
+
+    :rtype: :class:`~google.cloud.logging._gax._LoggingAPI`
+    :returns: A logging API instance with the proper credentials.
+    """
+    from google.cloud.logging import _gax
+
+    return _gax.make_gax_logging_api(client)
+
+
+def make_gax_metrics_api(client):
+    """Create an instance of the GAX Metrics API.
+
+    :type client: :class:`~google.cloud.logging.client.Client`
+    :param client: The client that holds configuration details.
+
+    :rtype: :class:`~google.cloud.logging._gax._MetricsAPI`
+    :returns: A metrics API instance with the proper credentials.
+    """
+    from google.cloud.logging import _gax
+
+    return _gax.make_gax_metrics_api(client)
+
+
+def make_gax_sinks_api(client):
+    """Create an instance of the GAX Sinks API.
+
+    :type client: :class:`~google.cloud.logging.client.Client`
+    :param client: The client that holds configuration details.
+
+    :rtype: :class:`~google.cloud.logging._gax._SinksAPI`
+    :returns: A sinks API instance with the proper credentials.
+    """
+    from google.cloud.logging import _gax
+
+    return _gax.make_gax_sinks_api(client)
+
+
 class Client(ClientWithProject):
     """Client to bundle configuration needed for API requests.
 
@@ -95,6 +135,8 @@ class Client(ClientWithProject):
     _sinks_api = None
     _metrics_api = None
 
+    _TRANSIENT_ATTRIBUTES = ('_logging_api', '_sinks_api', '_metrics_api')
+
     SCOPE = ('https://www.googleapis.com/auth/logging.read',
              'https://www.googleapis.com/auth/logging.write',
              'https://www.googleapis.com/auth/logging.admin',
@@ -16,9 +16,7 @@
 
 import json
 import re
-
-from google.protobuf import any_pb2
-from google.protobuf.json_format import Parse
+import sys
 
 from google.cloud.logging.resource import Resource
 from google.cloud._helpers import _name_from_project_path
@@ -194,7 +192,10 @@ class ProtobufEntry(_BaseEntry):
             payload, logger, insert_id=insert_id, timestamp=timestamp,
             labels=labels, severity=severity, http_request=http_request,
             resource=resource)
-        if isinstance(self.payload, any_pb2.Any):
+        # Avoid importing protobuf just for this check: if ``any_pb2`` has
+        # not been loaded, ``payload`` cannot be an ``Any``.
+        any_pb2 = sys.modules.get('google.protobuf.any_pb2')
+        if any_pb2 is not None and isinstance(self.payload, any_pb2.Any):
             self.payload_pb = self.payload
             self.payload = None
         else:
@@ -211,4 +212,6 @@ class ProtobufEntry(_BaseEntry):
         # NOTE: This assumes that ``payload`` is already a deserialized
         #       ``Any`` field and ``message`` has come from an imported
         #       ``pb2`` module with the relevant protobuf message type.
+        from google.protobuf.json_format import Parse
+
         Parse(json.dumps(self.payload), message)
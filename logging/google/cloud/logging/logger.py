@@ -14,7 +14,6 @@
 
 """Define API Loggers."""
 
-from google.protobuf.json_format import MessageToDict
 from google.cloud._helpers import _datetime_to_rfc3339
 from google.cloud.logging.resource import Resource
 
@@ -152,6 +151,8 @@ class Logger(object):
             #       the assumption is that any types needed for the
             #       protobuf->JSON conversion will be known from already
             #       imported ``pb2`` modules.
+            from google.protobuf.json_format import MessageToDict
+
             entry['protoPayload'] = MessageToDict(message)
 
         if labels is None:
@@ -529,6 +530,8 @@ class Batch(object):
                 #       ``Batch.log_proto``, the assumption is that any types
                 #       needed for the protobuf->JSON conversion will be known
                 #       from already imported ``pb2`` modules.
+                from google.protobuf.json_format import MessageToDict
+
                 info = {'protoPayload': MessageToDict(entry)}
             else:
                 raise ValueError('Unknown entry type: %s' % (entry_type,))
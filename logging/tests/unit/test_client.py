@@ -16,6 +16,14 @@ import unittest
 
 import mock
 
+from google.cloud._helpers import _module_available
+from google.cloud.logging.client import _GAX_MODULES
+
+
+# Check for the dependencies of ``google.cloud.logging._gax`` without
+# importing them: the module itself is always found.
+_HAVE_GRPC = all(_module_available(name) for name in _GAX_MODULES)
+
 
 def _make_credentials():
     import google.auth.credentials
@@ -633,6 +641,30 @@ class TestClient(unittest.TestCase):
         setup_logging.assert_called()
 
 
+@unittest.skipUnless(_HAVE_GRPC, 'No gax-python')
+class Test_make_gax_apis(unittest.TestCase):
+
+    def _helper(self, name):
+        from google.cloud.logging import client as MUT
+
+        client = object()
+        patch = mock.patch('google.cloud.logging._gax.' + name)
+        with patch as make_api:
+            result = getattr(MUT, name)(client)
+
+        self.assertIs(result, make_api.return_value)
+        make_api.assert_called_once_with(client)
+
+    def test_logging(self):
+        self._helper('make_gax_logging_api')
+
+    def test_metrics(self):
+        self._helper('make_gax_metrics_api')
+
+    def test_sinks(self):
+        self._helper('make_gax_sinks_api')
+
+
 class _Connection(object):
 
     _called_with = None
@@ -80,6 +80,9 @@ class Client(ClientWithProject):
     _subscriber_api = None
     _iam_policy_api = None
 
+    _TRANSIENT_ATTRIBUTES = (
+        '_publisher_api', '_subscriber_api', '_iam_policy_api')
+
     SCOPE = ('https://www.googleapis.com/auth/pubsub',
              'https://www.googleapis.com/auth/cloud-platform')
     """The scopes required for authenticating as a Cloud Pub/Sub consumer."""
@@ -229,5 +229,6 @@ class Variable(object):
 
         # We assume the variable exists. If it doesn't it will raise a NotFound
         # exception.
-        resp = client._connection.api_request(method='GET', path=self.path)
+        resp = client._connection.api_request(
+            method='GET', path=self.path, _cacheable=True)
         self._set_properties(resource=resp)
@@ -129,6 +129,7 @@ class TestVariable(unittest.TestCase):
         req = conn._requested[0]
         self.assertEqual(req['method'], 'GET')
         self.assertEqual(req['path'], '/%s' % (self.PATH,))
+        self.assertTrue(req['_cacheable'])
         self._verifyResourceProperties(variable, RESOURCE)
 
     def test_reload_w_empty_resource(self):
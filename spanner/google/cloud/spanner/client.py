@@ -102,6 +102,8 @@ class Client(_ClientFactoryMixin, _ClientProjectMixin):
     """
     _instance_admin_api = None
     _database_admin_api = None
+    _TRANSIENT_ATTRIBUTES = ('_instance_admin_api', '_database_admin_api')
+    """Attributes left out when the client is pickled."""
     _SET_PROJECT = True  # Used by from_service_account_json()
 
     def __init__(self, project=None, credentials=None,
@@ -121,6 +123,17 @@ class Client(_ClientFactoryMixin, _ClientProjectMixin):
         self._credentials = credentials
         self.user_agent = user_agent
 
+    def __getstate__(self):
+        # The admin API objects (and their gRPC channels) cannot be
+        # pickled: the unpickled client creates its own on first use.
+        state = self.__dict__.copy()
+        for name in self._TRANSIENT_ATTRIBUTES:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     @property
     def credentials(self):
         """Getter for client's credentials.
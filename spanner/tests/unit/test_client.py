@@ -199,6 +199,25 @@ class TestClient(unittest.TestCase):
         self.assertEqual(new_client.project, client.project)
         self.assertEqual(new_client.user_agent, client.user_agent)
 
+    def test_pickle(self):
+        import pickle
+
+        credentials = _Credentials('value')
+        client = self._make_one(
+            project=self.PROJECT,
+            credentials=credentials,
+            user_agent=self.USER_AGENT)
+        client._instance_admin_api = object()
+        client._database_admin_api = object()
+
+        new_client = pickle.loads(pickle.dumps(client))
+
+        self.assertEqual(new_client.project, self.PROJECT)
+        self.assertEqual(new_client.user_agent, self.USER_AGENT)
+        self.assertEqual(new_client._credentials, credentials)
+        self.assertIsNone(new_client._instance_admin_api)
+        self.assertIsNone(new_client._database_admin_api)
+
     def test_credentials_property(self):
         credentials = _Credentials()
         client = self._make_one(project=self.PROJECT, credentials=credentials)
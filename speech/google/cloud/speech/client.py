@@ -59,6 +59,8 @@ class Client(BaseClient):
 
     _speech_api = None
 
+    _TRANSIENT_ATTRIBUTES = ('_speech_api',)
+
     def __init__(self, credentials=None, _http=None, _use_grpc=None):
         super(Client, self).__init__(credentials=credentials, _http=_http)
         # Save on the actual client class whether we use GAX or not.
@@ -0,0 +1,127 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Checksums of blob data, as reported by the storage API.
+
+This module is not part of the public API surface.
+"""
+
+import base64
+import struct
+
+import six
+
+try:
+    import crcmod.predefined
+except ImportError:  # pragma: NO COVER
+    crcmod = None
+
+
+_BLOCK_SIZE = 1024 * 1024
+"""Size (1 MB) of the blocks read from files being checksummed."""
+_CRC32C_POLYNOMIAL = 0x82F63B78
+"""Reversed Castagnoli polynomial, of the CRC32C checksum."""
+
+
+def _make_crc32c_table():
+    """Compute the lookup table of the pure Python CRC32C.
+
+    :rtype: list
+    :returns: The CRC of each byte value.
+    """
+    table = []
+    for value in range(256):
+        for _ in range(8):
+            if value & 1:
+                value = (value >> 1) ^ _CRC32C_POLYNOMIAL
+            else:
+                value >>= 1
+        table.append(value)
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+class Crc32c(object):
+    """Pure Python CRC32C checksum, with the interface of :mod:`hashlib`.
+
+    This is slow (a few MB per second): :func:`crc32c` uses the C
+    extension of ``crcmod`` instead, when it is installed.
+    """
+
+    def __init__(self):
+        self._crc = 0xFFFFFFFF
+
+    def update(self, data):
+        """Add bytes to the checksum.
+
+        :type data: bytes
+        :param data: The bytes.
+        """
+        crc = self._crc
+        table = _CRC32C_TABLE
+        for byte in six.iterbytes(data):
+            crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        self._crc = crc
+
+    def digest(self):
+        """The checksum of the bytes added so far.
+
+        :rtype: bytes
+        :returns: The big-endian, four-byte checksum.
+        """
+        return struct.pack('>I', self._crc ^ 0xFFFFFFFF)
+
+
+def crc32c():
+    """Make a CRC32C checksum, using ``crcmod`` if it is installed.
+
+    :rtype: object
+    :returns: A checksum with the ``update`` and ``digest`` methods of
+              :mod:`hashlib` objects.
+    """
+    if crcmod is None:
+        return Crc32c()
+    return crcmod.predefined.Crc('crc-32c')
+
+
+def fast_crc32c():
+    """Tell if CRC32C checksums are computed by the C extension of ``crcmod``.
+
+    :rtype: bool
+    :returns: True if ``crcmod`` and its C extension are installed.
+    """
+    if crcmod is None:
+        return False
+    return bool(getattr(crcmod.crcmod, '_usingExtension', False))
+
+
+def file_checksum(filename, checksum):
+    """Compute the checksum of a file, as the storage API reports it.
+
+    :type filename: str
+    :param filename: The path to the file.
+
+    :type checksum: object
+    :param checksum: A new checksum, with the ``update`` and ``digest``
+                     methods of :mod:`hashlib` objects.
+
+    :rtype: str
+    :returns: The base64-encoded digest of the contents of the file.
+    """
+    with open(filename, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(_BLOCK_SIZE), b''):
+            checksum.update(block)
+    return base64.b64encode(checksum.digest()).decode('ascii')
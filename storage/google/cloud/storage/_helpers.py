@@ -96,7 +96,7 @@ class _PropertyMixin(object):
         query_params = {'projection': 'noAcl'}
         api_response = client._connection.api_request(
             method='GET', path=self.path, query_params=query_params,
-            _target_object=self)
+            _target_object=self, _cacheable=True)
         self._set_properties(api_response)
 
     def _patch_property(self, name, value):
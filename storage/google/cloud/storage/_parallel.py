@@ -0,0 +1,218 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for transferring slices of a blob concurrently.
+
+This module is not part of the public API surface.
+"""
+
+import os
+import sys
+import threading
+
+import six
+from six.moves import queue
+
+
+def map_in_threads(function, items, max_workers):
+    """Call a function on each item, from a pool of threads.
+
+    If a call fails, no new call is started: the calls in progress are
+    waited for, and the first exception is re-raised.
+
+    :type function: callable
+    :param function: Callable taking a single item.
+
+    :type items: list
+    :param items: The items to call ``function`` on.
+
+    :type max_workers: int
+    :param max_workers: The maximum number of concurrent calls.  With ``1``,
+                        or a single item, calls are made in the calling
+                        thread.
+
+    :rtype: list
+    :returns: The results of the calls, in the order of ``items``.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    pending = queue.Queue()
+    for index, item in enumerate(items):
+        pending.put((index, item))
+    results = [None] * len(items)
+    failures = []
+    failed = threading.Event()
+
+    def work():
+        while not failed.is_set():
+            try:
+                index, item = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[index] = function(item)
+            except Exception:  # pylint: disable=broad-except
+                failures.append(sys.exc_info())
+                failed.set()
+
+    workers = [threading.Thread(target=work)
+               for _ in range(min(max_workers, len(items)))]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if failures:
+        six.reraise(*failures[0])
+    return results
+
+
+class FileSlice(object):
+    """Read-only stream over a slice of a file.
+
+    Opens its own handle on the file, so that slices of the same file can be
+    read from several threads.  Positions are relative to the start of the
+    slice, which reads as a file of ``length`` bytes.
+
+    :type filename: str
+    :param filename: The path to the file.
+
+    :type offset: int
+    :param offset: The position of the slice in the file.
+
+    :type length: int
+    :param length: The size of the slice.
+    """
+
+    def __init__(self, filename, offset, length):
+        self._file_obj = open(filename, 'rb')
+        self._offset = offset
+        self._length = length
+        self._position = 0
+        self._file_obj.seek(offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read(self, size=-1):
+        """Read bytes from the slice.
+
+        :type size: int
+        :param size: (Optional) The maximum number of bytes to read.
+                     Defaults to the rest of the slice.
+
+        :rtype: bytes
+        :returns: The bytes read: empty at the end of the slice.
+        """
+        remaining = self._length - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        data = self._file_obj.read(size)
+        self._position += len(data)
+        return data
+
+    def tell(self):
+        """The current position in the slice.
+
+        :rtype: int
+        :returns: The position.
+        """
+        return self._position
+
+    def seek(self, position, whence=os.SEEK_SET):
+        """Move to a position in the slice.
+
+        :type position: int
+        :param position: The position, relative to ``whence``.
+
+        :type whence: int
+        :param whence: (Optional) :data:`os.SEEK_SET` (the default),
+                       :data:`os.SEEK_CUR` or :data:`os.SEEK_END`.
+
+        :rtype: int
+        :returns: The new position, capped to the bounds of the slice.
+        """
+        if whence == os.SEEK_CUR:
+            position += self._position
+        elif whence == os.SEEK_END:
+            position += self._length
+        self._position = max(0, min(position, self._length))
+        self._file_obj.seek(self._offset + self._position)
+        return self._position
+
+    def close(self):
+        """Close the file handle."""
+        self._file_obj.close()
+
+
+class SliceWriter(object):
+    """Write-only stream over a slice of a file.
+
+    Writes at positions relative to ``offset``, without moving the file
+    position: with :func:`os.pwrite` where it is available (Python 3.3+,
+    on Unix), otherwise by seeking and writing while holding ``lock``.
+    Writers of different slices of the same file may thus share a file
+    object, and write from several threads.
+
+    :type file_obj: file
+    :param file_obj: A file opened for writing in binary mode.
+
+    :type offset: int
+    :param offset: The position of the slice in the file.
+
+    :type lock: :class:`threading.Lock`
+    :param lock: Lock shared by the writers of ``file_obj``.
+    """
+
+    def __init__(self, file_obj, offset, lock):
+        self._file_obj = file_obj
+        self._offset = offset
+        self._lock = lock
+        self._position = 0
+
+    def write(self, data):
+        """Write bytes at the current position in the slice.
+
+        :type data: bytes
+        :param data: The bytes to write.
+
+        :rtype: int
+        :returns: The number of bytes written.
+        """
+        position = self._offset + self._position
+        pwrite = getattr(os, 'pwrite', None)
+        if pwrite is None:
+            with self._lock:
+                self._file_obj.seek(position)
+                self._file_obj.write(data)
+        else:
+            view = memoryview(data)
+            while view:
+                written = pwrite(self._file_obj.fileno(), view, position)
+                view = view[written:]
+                position += written
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        """The current position in the slice.
+
+        :rtype: int
+        :returns: The number of bytes written.
+        """
+        return self._position
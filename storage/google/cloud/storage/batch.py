@@ -27,6 +27,7 @@ import httplib2
 import six
 
 from google.cloud.exceptions import make_exception
+from google.cloud.json_codec import STDLIB_CODEC
 from google.cloud.storage._http import Connection
 
 
@@ -131,6 +132,12 @@ class Batch(Connection):
     """
     _MAX_BATCH_SIZE = 1000
 
+    _compression_threshold = None
+    """Parts of a batch request are never compressed."""
+
+    _json_codec = STDLIB_CODEC
+    """Parts of a batch request are text: always encode them to ``str``."""
+
     def __init__(self, client):
         super(Batch, self).__init__(client)
         self._requests = []
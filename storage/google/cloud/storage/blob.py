@@ -31,26 +31,32 @@ import hashlib
 from io import BytesIO
 import mimetypes
 import os
+import sys
+import threading
 import time
+import uuid
 import warnings
 
 import httplib2
+import six
 from six.moves.urllib.parse import quote
 
-import google.auth.transport.requests
 from google import resumable_media
-from google.resumable_media.requests import ChunkedDownload
-from google.resumable_media.requests import Download
-from google.resumable_media.requests import MultipartUpload
-from google.resumable_media.requests import ResumableUpload
 
 from google.cloud._helpers import _rfc3339_to_datetime
 from google.cloud._helpers import _to_bytes
 from google.cloud._helpers import _bytes_to_unicode
 from google.cloud.credentials import generate_signed_url
+from google.cloud.exceptions import GoogleCloudError
 from google.cloud.exceptions import NotFound
 from google.cloud.exceptions import make_exception
 from google.cloud.iam import Policy
+from google.cloud.storage._checksum import crc32c
+from google.cloud.storage._checksum import fast_crc32c
+from google.cloud.storage._checksum import file_checksum
+from google.cloud.storage._parallel import FileSlice
+from google.cloud.storage._parallel import map_in_threads
+from google.cloud.storage._parallel import SliceWriter
 from google.cloud.storage._helpers import _PropertyMixin
 from google.cloud.storage._helpers import _scalar_property
 from google.cloud.storage.acl import ObjectACL
@@ -87,9 +93,28 @@ _NUM_RETRIES_MESSAGE = (
     'retried. Subsequent retries will be sent after waiting 1, 2, 4, 8, etc. '
     'seconds (exponential backoff) until 10 minutes of wait time have '
     'elapsed. At that point, there will be no more attempts to retry.')
+_SLOW_CRC32C_MESSAGE = (
+    'The crc32c checksum of the downloaded file is not checked: it is too '
+    'slow without the C extension of crcmod.')
 _READ_LESS_THAN_SIZE = (
     'Size {:d} was specified but the file-like object only had '
     '{:d} bytes remaining.')
+_DEFAULT_PART_SIZE = 64 * 1024 * 1024
+"""Default size (64 MB) of the parts of a composite upload."""
+_PART_CHUNK_SIZE = 8 * 1024 * 1024
+"""Chunk size (8 MB) of part uploads and slice downloads, for blobs without
+a chunk size."""
+_DEFAULT_MAX_WORKERS = 8
+"""Default number of concurrent requests of composite uploads and sliced
+downloads."""
+_MIN_SLICE_SIZE = 16 * 1024 * 1024
+"""Minimum size (16 MB) of the automatically sized slices of a download."""
+_SLICE_ALIGNMENT = 256 * 1024
+"""Automatically sized slices are a multiple of this size (256 KB)."""
+_MAX_COMPOSE_SOURCES = 32
+"""Maximum number of source objects of a single compose request."""
+_MAX_COMPONENT_COUNT = 1024
+"""Maximum number of components of a composite object."""
 
 
 class Blob(_PropertyMixin):
@@ -363,7 +388,10 @@ class Blob(_PropertyMixin):
         return self.bucket.delete_blob(self.name, client=client)
 
     def _make_transport(self, client):
-        """Make an authenticated transport with a client's credentials.
+        """Get an authenticated transport with a client's credentials.
+
+        Uses the pooled media transport shared by all blobs of the client,
+        if it has one.
 
         :type client: :class:`~google.cloud.storage.client.Client`
         :param client: (Optional) The client to use.  If not passed, falls back
@@ -374,6 +402,14 @@ class Blob(_PropertyMixin):
                   make authenticated requests.
         """
         client = self._require_client(client)
+        transport = getattr(client, '_media_transport', None)
+        if transport is not None:
+            return transport
+
+        # ``requests`` is only needed for media operations: load it (and
+        # its dependencies) on first use.
+        import google.auth.transport.requests
+
         # Create a ``requests`` transport with the client's credentials.
         transport = google.auth.transport.requests.AuthorizedSession(
             client._credentials)
@@ -417,6 +453,9 @@ class Blob(_PropertyMixin):
         :type headers: dict
         :param headers: Optional headers to be sent with the request(s).
         """
+        from google.resumable_media.requests import ChunkedDownload
+        from google.resumable_media.requests import Download
+
         if self.chunk_size is None:
             download = Download(download_url, headers=headers)
             response = download.consume(transport)
@@ -491,6 +530,127 @@ class Blob(_PropertyMixin):
             mtime = time.mktime(updated.timetuple())
             os.utime(file_obj.name, (mtime, mtime))
 
+    def sliced_download_to_filename(
+            self, filename, client=None, slice_size=None,
+            max_workers=_DEFAULT_MAX_WORKERS):
+        """Download the contents of this blob into a named file, in slices.
+
+        Downloads slices of the blob concurrently, with ranged requests,
+        and writes each one at its offset in the file, preallocated to the
+        size of the blob.  The file is then checked against the blob's
+        ``md5_hash`` or, for composite objects, its ``crc32c``: if they do
+        not match, the file is removed.
+
+        .. note::
+
+           If the server-set property, :attr:`size`, is not yet
+           initialized, makes an additional API request to load it.
+
+        .. note::
+           The ``crc32c`` of composite objects is only checked if
+           `crcmod`_ and its C extension are installed.  Otherwise, a
+           :exc:`RuntimeWarning` is issued and the file is kept unchecked.
+           Install them with ``pip install google-cloud-storage[crcmod]``.
+
+        .. _crcmod: https://pypi.python.org/pypi/crcmod
+
+        :type filename: str
+        :param filename: A filename to be passed to ``open``.
+
+        :type client: :class:`~google.cloud.storage.client.Client` or
+                      ``NoneType``
+        :param client: Optional. The client to use.  If not passed, falls back
+                       to the ``client`` stored on the blob's bucket.
+
+        :type slice_size: int
+        :param slice_size: (Optional) The size of the slices, in bytes.
+                           Must be positive.  Defaults to the size of the
+                           blob split between ``max_workers``, but no less
+                           than 16 MB.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The maximum number of slices
+                            downloaded concurrently.  Defaults to 8.
+
+        :raises: :class:`google.cloud.exceptions.NotFound`, or
+                 :exc:`ValueError` if ``slice_size`` is not positive, or if
+                 the checksum of the file does not match the blob's.
+        """
+        if slice_size is not None and slice_size <= 0:
+            raise ValueError('slice_size must be positive', slice_size)
+        if self.size is None:
+            self.reload(client=client)
+        total_bytes = self.size
+        if slice_size is None:
+            slice_size = max(-(-total_bytes // max_workers), _MIN_SLICE_SIZE)
+            slice_size = -(-slice_size // _SLICE_ALIGNMENT) * _SLICE_ALIGNMENT
+        download_url = self._get_download_url()
+        headers = _get_encryption_headers(self._encryption_key)
+        transport = self._make_transport(client)
+        chunk_size = self.chunk_size or _PART_CHUNK_SIZE
+        lock = threading.Lock()
+        file_obj = open(filename, 'wb')
+
+        def download_slice(offset):
+            from google.resumable_media.requests import ChunkedDownload
+
+            end = min(offset + slice_size, total_bytes) - 1
+            download = ChunkedDownload(
+                download_url, chunk_size, SliceWriter(file_obj, offset, lock),
+                start=offset, end=end, headers=dict(headers))
+            try:
+                while not download.finished:
+                    download.consume_next_chunk(transport)
+            except resumable_media.InvalidResponse as exc:
+                _raise_from_invalid_response(exc, download_url)
+
+        try:
+            with file_obj:
+                file_obj.truncate(total_bytes)
+                map_in_threads(
+                    download_slice, list(range(0, total_bytes, slice_size)),
+                    max_workers)
+            self._verify_file(filename)
+        except Exception:
+            # Do not leave a partial (or corrupt) file behind.
+            exc_info = sys.exc_info()
+            os.remove(filename)
+            six.reraise(*exc_info)
+
+        updated = self.updated
+        if updated is not None:
+            mtime = time.mktime(updated.timetuple())
+            os.utime(filename, (mtime, mtime))
+
+    def _verify_file(self, filename):
+        """Check a downloaded file against the checksum of this blob.
+
+        Uses the ``md5_hash`` of the blob, or its ``crc32c`` if it has no
+        MD5 hash (as composite objects).  Files of blobs with neither are
+        not checked, nor are files of blobs with only a ``crc32c`` when the
+        C extension of ``crcmod`` is not installed (with a warning).
+
+        :type filename: str
+        :param filename: The path to the file.
+
+        :raises: :exc:`ValueError` if the checksum of the file does not
+                 match the blob's.
+        """
+        if self.md5_hash is not None:
+            name, expected, checksum = 'md5Hash', self.md5_hash, hashlib.md5()
+        elif self.crc32c is not None:
+            if not fast_crc32c():
+                warnings.warn(_SLOW_CRC32C_MESSAGE, RuntimeWarning)
+                return
+            name, expected, checksum = 'crc32c', self.crc32c, crc32c()
+        else:
+            return
+        actual = file_checksum(filename, checksum)
+        if actual != expected:
+            raise ValueError(
+                'Checksum of the downloaded file does not match', name,
+                expected, actual)
+
     def download_as_string(self, client=None):
         """Download the contents of this blob as a string.
 
@@ -507,6 +667,74 @@ class Blob(_PropertyMixin):
         self.download_to_file(string_buffer, client=client)
         return string_buffer.getvalue()
 
+    def open(self, mode='rb', client=None, chunk_size=None, read_ahead=None,
+             content_type=None):
+        """Open this blob as a file-like object.
+
+        Reading a CSV blob line by line, without downloading all of it:
+
+        .. code-block:: python
+
+           import csv
+           import io
+
+           with blob.open('rb') as reader:
+               for row in csv.reader(io.TextIOWrapper(
+                       io.BufferedReader(reader), encoding='utf-8')):
+                   ...
+
+        Writing a gzipped blob, without holding all of it in memory:
+
+        .. code-block:: python
+
+           import gzip
+
+           with blob.open('wb', content_type='application/gzip') as writer:
+               with gzip.GzipFile(fileobj=writer, mode='wb') as gzip_file:
+                   ...
+
+        :type mode: str
+        :param mode: (Optional) ``'rb'`` (the default) to read the blob, or
+                     ``'wb'`` to write it.
+
+        :type client: :class:`~google.cloud.storage.client.Client` or
+                      ``NoneType``
+        :param client: Optional. The client to use.  If not passed, falls back
+                       to the ``client`` stored on the blob's bucket.
+
+        :type chunk_size: int
+        :param chunk_size: (Optional) The size of the ranges requested, or
+                           of the chunks uploaded (a multiple of 256 KB).
+                           Defaults to the ``chunk_size`` of the blob, or to
+                           8 MB.
+
+        :type read_ahead: int
+        :param read_ahead: (Optional) When reading, the number of chunks
+                           downloaded in the background, ahead of the one
+                           being read.  Defaults to 2.
+
+        :type content_type: str
+        :param content_type: (Optional) When writing, the type of content
+                             being uploaded.
+
+        :rtype: :class:`~google.cloud.storage.fileio.BlobReader` or
+                :class:`~google.cloud.storage.fileio.BlobWriter`
+        :returns: A seekable reader, downloading ranges of the blob as they
+                  are read, or a writer uploading chunks of the blob as
+                  they are written, and creating it once closed.
+        :raises: :exc:`ValueError` if the mode is not supported.
+        """
+        from google.cloud.storage.fileio import BlobReader
+        from google.cloud.storage.fileio import BlobWriter
+
+        if mode == 'rb':
+            return BlobReader(self, client=client, chunk_size=chunk_size,
+                              read_ahead=read_ahead)
+        elif mode == 'wb':
+            return BlobWriter(self, client=client, chunk_size=chunk_size,
+                              content_type=content_type)
+        raise ValueError('Unsupported mode', mode)
+
     def _get_content_type(self, content_type, filename=None):
         """Determine the content type from the current object.
 
@@ -638,6 +866,8 @@ class Blob(_PropertyMixin):
                 msg = _READ_LESS_THAN_SIZE.format(size, len(data))
                 raise ValueError(msg)
 
+        from google.resumable_media.requests import MultipartUpload
+
         transport = self._make_transport(client)
         info = self._get_upload_arguments(content_type)
         headers, object_metadata, content_type = info
@@ -705,6 +935,8 @@ class Blob(_PropertyMixin):
               that was created
             * The ``transport`` used to initiate the upload.
         """
+        from google.resumable_media.requests import ResumableUpload
+
         if chunk_size is None:
             chunk_size = self.chunk_size
 
@@ -933,6 +1165,126 @@ class Blob(_PropertyMixin):
                 file_obj, content_type=content_type, client=client,
                 size=total_bytes)
 
+    def composite_upload_from_filename(
+            self, filename, content_type=None, client=None, part_size=None,
+            max_workers=_DEFAULT_MAX_WORKERS):
+        """Upload this blob's contents from a file, in parallel parts.
+
+        Uploads slices of the file concurrently, as temporary objects named
+        after this blob, then composes them into this blob (through
+        intermediate composite objects if there are more than 32 parts).
+        The temporary objects are deleted once the upload succeeds or
+        fails.  Files no larger than ``part_size`` are uploaded with
+        :meth:`upload_from_filename`.
+
+        The content type of the upload is determined as for
+        :meth:`upload_from_filename`.
+
+        .. note::
+           Composite objects have a ``crc32c`` checksum, but no
+           ``md5Hash``, and do not support customer-supplied encryption
+           keys.  Uploading them requires the ``storage.objects.delete``
+           permission, to delete the temporary objects.
+
+        :type filename: str
+        :param filename: The path to the file.
+
+        :type content_type: str
+        :param content_type: Optional type of content being uploaded.
+
+        :type client: :class:`~google.cloud.storage.client.Client`
+        :param client: (Optional) The client to use.  If not passed, falls back
+                       to the ``client`` stored on the blob's bucket.
+
+        :type part_size: int
+        :param part_size: (Optional) The size of the parts, in bytes.
+                          Defaults to 64 MB, and is raised if needed so that
+                          there are no more than 1024 parts.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The maximum number of parts uploaded
+                            (or composed) concurrently.  Defaults to 8.
+
+        :raises: :exc:`ValueError` if the blob has an encryption key.
+        """
+        if self._encryption_key is not None:
+            raise ValueError(
+                'Composite uploads do not support encryption keys.')
+        content_type = self._get_content_type(content_type, filename=filename)
+        client = self._require_client(client)
+        total_bytes = os.path.getsize(filename)
+        if part_size is None:
+            part_size = _DEFAULT_PART_SIZE
+        part_size = max(part_size, -(-total_bytes // _MAX_COMPONENT_COUNT))
+        if total_bytes <= part_size:
+            self.upload_from_filename(
+                filename, content_type=content_type, client=client)
+            return
+
+        prefix = u'{}.composite-{}.'.format(self.name, uuid.uuid4().hex)
+        temporary = []
+
+        def upload_part(offset):
+            index = offset // part_size
+            part = Blob(u'{}part-{:05d}'.format(prefix, index),
+                        bucket=self.bucket,
+                        chunk_size=self.chunk_size or _PART_CHUNK_SIZE)
+            size = min(part_size, total_bytes - offset)
+            with FileSlice(filename, offset, size) as stream:
+                part.upload_from_file(
+                    stream, size=size, content_type=content_type,
+                    client=client)
+            temporary.append(part)
+            return part
+
+        def compose_parts(args):
+            level, index, sources = args
+            if len(sources) == 1:
+                return sources[0]
+            composite = Blob(
+                u'{}compose-{}-{:05d}'.format(prefix, level, index),
+                bucket=self.bucket)
+            composite.content_type = content_type
+            composite.compose(sources, client=client)
+            temporary.append(composite)
+            return composite
+
+        try:
+            sources = map_in_threads(
+                upload_part, list(range(0, total_bytes, part_size)),
+                max_workers)
+            level = 0
+            while len(sources) > _MAX_COMPOSE_SOURCES:
+                level += 1
+                groups = [
+                    (level, index, sources[start:start + _MAX_COMPOSE_SOURCES])
+                    for index, start in enumerate(
+                        range(0, len(sources), _MAX_COMPOSE_SOURCES))]
+                sources = map_in_threads(compose_parts, groups, max_workers)
+            self.content_type = content_type
+            self.compose(sources, client=client)
+        except Exception:
+            exc_info = sys.exc_info()
+            try:
+                self._delete_temporary(temporary, client)
+            except GoogleCloudError:
+                pass  # Report the upload failure, rather than this one.
+            six.reraise(*exc_info)
+        self._delete_temporary(temporary, client)
+
+    def _delete_temporary(self, blobs, client):
+        """Delete the temporary objects of a composite upload.
+
+        :type blobs: list of :class:`Blob`
+        :param blobs: The objects to delete: those already deleted (e.g.
+                      by a concurrent retry) are skipped.
+
+        :type client: :class:`~google.cloud.storage.client.Client`
+        :param client: The client to use.
+        """
+        self.bucket.delete_blobs(
+            blobs, on_error=lambda blob: None, client=client)
+
     def upload_from_string(self, data, content_type='text/plain', client=None):
         """Upload contents of this blob from the provided string.
 
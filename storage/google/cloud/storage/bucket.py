@@ -28,6 +28,7 @@ from google.cloud._helpers import _rfc3339_to_datetime
 from google.cloud.exceptions import NotFound
 from google.cloud.iam import Policy
 from google.cloud.iterator import HTTPIterator
+from google.cloud.iterator import Page
 from google.cloud.storage._helpers import _PropertyMixin
 from google.cloud.storage._helpers import _scalar_property
 from google.cloud.storage._helpers import _validate_name
@@ -36,13 +37,34 @@ from google.cloud.storage.acl import DefaultObjectACL
 from google.cloud.storage.blob import Blob
 
 
+class _BlobPage(Page):
+    """Page of the blobs in a bucket.
+
+    Has the ``prefixes`` of its response, set by :func:`_blobs_page_start`.
+    """
+
+    __slots__ = ('prefixes',)
+
+
+class _BlobIterator(HTTPIterator):
+    """Iterator of the blobs in a bucket.
+
+    Has the ``bucket`` holding the blobs, and the cumulative ``prefixes``
+    of the pages it returned.
+    """
+
+    __slots__ = ('bucket', 'prefixes')
+
+    _PAGE_CLASS = _BlobPage
+
+
 def _blobs_page_start(iterator, page, response):
-    """Grab prefixes after a :class:`~google.cloud.iterator.Page` started.
+    """Grab prefixes after a :class:`_BlobPage` started.
 
-    :type iterator: :class:`~google.cloud.iterator.Iterator`
+    :type iterator: :class:`_BlobIterator`
     :param iterator: The iterator that is currently in use.
 
-    :type page: :class:`~google.cloud.iterator.Page`
+    :type page: :class:`_BlobPage`
     :param page: The page that was just created.
 
     :type response: dict
@@ -324,10 +346,11 @@ class Bucket(_PropertyMixin):
 
         client = self._require_client(client)
         path = self.path + '/o'
-        iterator = HTTPIterator(
+        iterator = _BlobIterator(
             client=client, path=path, item_to_value=_item_to_blob,
             page_token=page_token, max_results=max_results,
-            extra_params=extra_params, page_start=_blobs_page_start)
+            extra_params=extra_params, page_start=_blobs_page_start,
+            release_items=True)
         iterator.bucket = self
         iterator.prefixes = set()
         return iterator
@@ -14,8 +14,10 @@
 
 """Client for interacting with the Google Cloud Storage API."""
 
+import os
 
 from google.cloud._helpers import _LocalStack
+from google.cloud._http_pool import DEFAULT_POOL_SIZE
 from google.cloud.client import ClientWithProject
 from google.cloud.exceptions import NotFound
 from google.cloud.iterator import HTTPIterator
@@ -53,12 +55,75 @@ class Client(ClientWithProject):
              'https://www.googleapis.com/auth/devstorage.read_write')
     """The scopes required for authenticating as a Cloud Storage consumer."""
 
+    media_pool_size = DEFAULT_POOL_SIZE
+    """Maximum number of connections kept alive by the media transport.
+
+    The media transport, shared by the uploads and downloads of all blobs
+    of the client, keeps up to this many idle keep-alive connections in
+    the pool of each host (media requests go to one or two hosts).  Raise
+    it to match the number of threads transferring blobs concurrently.
+    Read when the transport is first used.
+    """
+
+    _TRANSIENT_ATTRIBUTES = ('_batch_stack', '_media_transport_internal')
+
     def __init__(self, project=None, credentials=None, _http=None):
         self._base_connection = None
         super(Client, self).__init__(project=project, credentials=credentials,
                                      _http=_http)
         self._connection = Connection(self)
         self._batch_stack = _LocalStack()
+        self._media_transport_internal = None
+
+    def __setstate__(self, state):
+        super(Client, self).__setstate__(state)
+        self._batch_stack = _LocalStack()
+
+    @property
+    def _media_transport(self):
+        """Transport used for blob uploads and downloads.
+
+        Created on first use, and shared by all media operations of the
+        client (including from several threads), so that they re-use the
+        same keep-alive connections and access token.  A forked child
+        process creates its own.
+
+        :rtype:
+            :class:`~google.auth.transport.requests.AuthorizedSession`
+        :returns: The transport, authorized with the client's credentials.
+        """
+        pid = os.getpid()
+        internal = self._media_transport_internal
+        if internal is None or internal[0] != pid:
+            # Threads racing here may each create a transport: only one
+            # is kept, the others are used once and discarded.
+            internal = pid, self._make_media_transport()
+            self._media_transport_internal = internal
+        return internal[1]
+
+    def _make_media_transport(self):
+        """Make a pooled transport with the client's credentials.
+
+        :rtype:
+            :class:`~google.auth.transport.requests.AuthorizedSession`
+        :returns: A new transport, keeping up to :attr:`media_pool_size`
+                  connections alive in the pool of each host.
+        """
+        # ``requests`` is only needed for media operations: load it (and
+        # its dependencies) on first use.
+        import google.auth.transport.requests
+        import requests.adapters
+
+        transport = google.auth.transport.requests.AuthorizedSession(
+            self._credentials)
+        # ``pool_connections`` is the number of host pools cached: the
+        # default (10) is plenty.  ``pool_maxsize`` is the number of
+        # connections in each.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=self.media_pool_size)
+        transport.mount('https://', adapter)
+        transport.mount('http://', adapter)
+        return transport
 
     @property
     def _connection(self):
@@ -0,0 +1,525 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""File-like objects reading and writing Google Cloud Storage blobs.
+
+Use :meth:`~google.cloud.storage.blob.Blob.open` to create them.
+"""
+
+import io
+import os
+import sys
+import threading
+
+import six
+
+from google import resumable_media
+
+from google.cloud.storage.blob import _get_encryption_headers
+from google.cloud.storage.blob import _raise_from_invalid_response
+
+
+_DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+"""Default size (8 MB) of the ranges read and the chunks written, for blobs
+without a chunk size."""
+_DEFAULT_READ_AHEAD = 2
+"""Default number of chunks downloaded ahead of the current one."""
+
+
+class _Fetch(object):
+    """Call of a function on a background thread.
+
+    :type function: callable
+    :param function: Callable taking a single argument.
+
+    :type argument: object
+    :param argument: The argument passed to ``function``.
+    """
+
+    def __init__(self, function, argument):
+        self._done = threading.Event()
+        self._result = None
+        self._exc_info = None
+        thread = threading.Thread(target=self._run, args=(function, argument))
+        thread.daemon = True
+        thread.start()
+
+    def _run(self, function, argument):
+        try:
+            self._result = function(argument)
+        except Exception:  # pylint: disable=broad-except
+            self._exc_info = sys.exc_info()
+        finally:
+            self._done.set()
+
+    def done(self):
+        """Tell if the call returned.
+
+        :rtype: bool
+        :returns: True if the call returned, or raised.
+        """
+        return self._done.is_set()
+
+    def result(self):
+        """Wait for the call to return.
+
+        :rtype: object
+        :returns: The value returned by the call.
+        :raises: The exception raised by the call, if any.
+        """
+        self._done.wait()
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+        return self._result
+
+
+class BlobReader(io.RawIOBase):
+    """Seekable, read-only file-like object over the contents of a blob.
+
+    Reads the blob in chunks, with ranged requests made on demand: seeking
+    only downloads the chunks which are then read.  While a chunk is read,
+    up to ``read_ahead`` of the following chunks are downloaded on
+    background threads, so that at most ``read_ahead + 1`` chunks are held
+    in memory.  Downloads cannot be cancelled: those of chunks skipped over
+    by a seek go on, and count against ``read_ahead`` until they finish.
+    Their chunks are then discarded.
+
+    Reads return at most the rest of the current chunk: wrap readers in
+    :class:`io.BufferedReader` (or :class:`io.TextIOWrapper`) to read
+    lines, or exact sizes.
+
+    .. note::
+
+       If the server-set property, :attr:`~.Blob.size`, is not yet
+       initialized, makes an additional API request to load it.
+
+    :type blob: :class:`~google.cloud.storage.blob.Blob`
+    :param blob: The blob to read.
+
+    :type client: :class:`~google.cloud.storage.client.Client`
+    :param client: (Optional) The client to use.  If not passed, falls back
+                   to the ``client`` stored on the blob's bucket.
+
+    :type chunk_size: int
+    :param chunk_size: (Optional) The size of the ranges requested.
+                       Defaults to the ``chunk_size`` of the blob, or to
+                       8 MB.
+
+    :type read_ahead: int
+    :param read_ahead: (Optional) The number of chunks downloaded ahead of
+                       the one being read.  Defaults to 2; with ``0``,
+                       chunks are only downloaded when they are read.
+    """
+
+    def __init__(self, blob, client=None, chunk_size=None, read_ahead=None):
+        super(BlobReader, self).__init__()
+        self._position = 0
+        self._chunk_index = None
+        self._chunk = None
+        self._fetches = {}
+        self._skipped_fetches = []
+        if blob.size is None:
+            blob.reload(client=client)
+        self._blob = blob
+        self._size = blob.size
+        self._chunk_size = (
+            chunk_size or blob.chunk_size or _DEFAULT_CHUNK_SIZE)
+        if read_ahead is None:
+            read_ahead = _DEFAULT_READ_AHEAD
+        self._read_ahead = read_ahead
+        self._download_url = blob._get_download_url()
+        self._headers = _get_encryption_headers(blob._encryption_key)
+        self._transport = blob._make_transport(client)
+
+    @property
+    def blob(self):
+        """The blob being read.
+
+        :rtype: :class:`~google.cloud.storage.blob.Blob`
+        :returns: The blob.
+        """
+        return self._blob
+
+    def readable(self):
+        """Readers are readable.
+
+        :rtype: bool
+        :returns: True
+        """
+        return True
+
+    def seekable(self):
+        """Readers are seekable.
+
+        :rtype: bool
+        :returns: True
+        """
+        return True
+
+    def tell(self):
+        """The current position in the blob.
+
+        :rtype: int
+        :returns: The position.
+        """
+        self._check_open()
+        return self._position
+
+    def seek(self, position, whence=os.SEEK_SET):
+        """Move to a position in the blob.
+
+        Does not make any request: the chunk at the new position is
+        downloaded when it is read.
+
+        :type position: int
+        :param position: The position, relative to ``whence``.
+
+        :type whence: int
+        :param whence: (Optional) :data:`os.SEEK_SET` (the default),
+                       :data:`os.SEEK_CUR` or :data:`os.SEEK_END`.
+
+        :rtype: int
+        :returns: The new position, which may be past the end of the blob.
+        :raises: :exc:`ValueError` if the position is negative.
+        """
+        self._check_open()
+        if whence == os.SEEK_CUR:
+            position += self._position
+        elif whence == os.SEEK_END:
+            position += self._size
+        elif whence != os.SEEK_SET:
+            raise ValueError('Invalid whence', whence)
+        if position < 0:
+            raise ValueError('Negative seek position', position)
+        self._position = position
+        return position
+
+    def readinto(self, buffer_):
+        """Read bytes from the current position into a buffer.
+
+        :type buffer_: bytearray
+        :param buffer_: A writable buffer.
+
+        :rtype: int
+        :returns: The number of bytes read: at most the rest of the current
+                  chunk, and ``0`` at the end of the blob.
+        :raises: :class:`~google.cloud.exceptions.GoogleCloudError` if a
+                 download fails.
+        """
+        self._check_open()
+        if self._position >= self._size:
+            return 0
+        index, start = divmod(self._position, self._chunk_size)
+        if index != self._chunk_index:
+            self._load_chunk(index)
+        data = self._chunk[start:start + len(buffer_)]
+        size = len(data)
+        buffer_[:size] = data
+        self._position += size
+        return size
+
+    def close(self):
+        """Close the reader, and release its chunks."""
+        self._chunk = None
+        self._chunk_index = None
+        # Pending downloads finish in the background, unread.
+        self._fetches.clear()
+        del self._skipped_fetches[:]
+        super(BlobReader, self).close()
+
+    def _check_open(self):
+        """Check that the reader is not closed.
+
+        :raises: :exc:`ValueError` if it is.
+        """
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+
+    def _load_chunk(self, index):
+        """Make a chunk the current one, and download the following ones.
+
+        :type index: int
+        :param index: The index of the chunk in the blob.
+        """
+        # Forget the current chunk first: if the download fails, the next
+        # read retries it.
+        self._chunk = None
+        self._chunk_index = None
+        fetch = self._fetches.pop(index, None)
+        if fetch is None:
+            chunk = self._download_chunk(index)
+        else:
+            chunk = fetch.result()
+        self._chunk = memoryview(chunk)
+        self._chunk_index = index
+
+        last_index = min(
+            index + self._read_ahead, (self._size - 1) // self._chunk_size)
+        for other in list(self._fetches):
+            if not index < other <= last_index:
+                self._skipped_fetches.append(self._fetches.pop(other))
+        self._skipped_fetches = [
+            fetch for fetch in self._skipped_fetches if not fetch.done()]
+        for other in range(index + 1, last_index + 1):
+            if other in self._fetches:
+                continue
+            if (len(self._fetches) + len(self._skipped_fetches) >=
+                    self._read_ahead):
+                break
+            self._fetches[other] = _Fetch(self._download_chunk, other)
+
+    def _download_chunk(self, index):
+        """Download a chunk of the blob.
+
+        :type index: int
+        :param index: The index of the chunk in the blob.
+
+        :rtype: bytes
+        :returns: The contents of the chunk.
+        """
+        from google.resumable_media.requests import Download
+
+        start = index * self._chunk_size
+        end = min(start + self._chunk_size, self._size) - 1
+        # Downloads update their headers: do not share them between threads.
+        download = Download(self._download_url, start=start, end=end,
+                            headers=dict(self._headers))
+        try:
+            response = download.consume(self._transport)
+        except resumable_media.InvalidResponse as exc:
+            _raise_from_invalid_response(exc, self._download_url)
+        return response.content
+
+
+class _ChunkBuffer(object):
+    """Stream of the data written, and not yet uploaded, to a blob.
+
+    Positions are those in the whole upload: the data before the start of
+    the buffer has already been uploaded, and discarded.
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._start = 0
+        self._position = 0
+
+    def __len__(self):
+        """The number of bytes not read yet.
+
+        :rtype: int
+        :returns: The size of the data after the current position.
+        """
+        return len(self._data) + self._start - self._position
+
+    def write(self, data):
+        """Add data at the end of the buffer.
+
+        :type data: bytes
+        :param data: The data.
+        """
+        self._data.extend(data)
+
+    def read(self, size):
+        """Read data from the current position.
+
+        :type size: int
+        :param size: The maximum number of bytes to read.
+
+        :rtype: bytes
+        :returns: The bytes read.
+        """
+        offset = self._position - self._start
+        data = bytes(self._data[offset:offset + size])
+        self._position += len(data)
+        return data
+
+    def tell(self):
+        """The current position in the upload.
+
+        :rtype: int
+        :returns: The position.
+        """
+        return self._position
+
+    def rewind(self, position):
+        """Move back to a position, and discard the data before it.
+
+        :type position: int
+        :param position: The number of bytes uploaded (and persisted): it
+                         is never before the start of the buffer.
+        """
+        del self._data[:position - self._start]
+        self._start = self._position = position
+
+
+class BlobWriter(io.RawIOBase):
+    """Write-only file-like object, uploading its contents to a blob.
+
+    Buffers one chunk of the data written at a time: when the buffer is
+    full, the chunk is uploaded to a resumable upload session (initiated
+    with the first chunk), so that memory stays bounded whatever the size
+    of the blob.  :meth:`close` uploads the rest of the data, and creates
+    the blob.
+
+    When used as a context manager, the upload is abandoned if the block
+    raises an exception: the blob is not created (or replaced) with
+    partial contents.  Writers garbage collected without being closed
+    are abandoned too.
+
+    :type blob: :class:`~google.cloud.storage.blob.Blob`
+    :param blob: The blob to write.  Its properties are updated from the
+                 response to the final chunk.
+
+    :type client: :class:`~google.cloud.storage.client.Client`
+    :param client: (Optional) The client to use.  If not passed, falls back
+                   to the ``client`` stored on the blob's bucket.
+
+    :type chunk_size: int
+    :param chunk_size: (Optional) The size of the chunks uploaded: a
+                       multiple of 256 KB.  Defaults to the ``chunk_size``
+                       of the blob, or to 8 MB.
+
+    :type content_type: str
+    :param content_type: (Optional) Type of content being uploaded.
+                         Defaults to the ``content_type`` of the blob, or
+                         to ``application/octet-stream``.
+
+    :raises: :exc:`ValueError` if ``chunk_size`` is not a multiple of
+             256 KB.
+    """
+
+    def __init__(self, blob, client=None, chunk_size=None,
+                 content_type=None):
+        super(BlobWriter, self).__init__()
+        chunk_size = chunk_size or blob.chunk_size or _DEFAULT_CHUNK_SIZE
+        if chunk_size % blob._CHUNK_SIZE_MULTIPLE != 0:
+            raise ValueError('Chunk size must be a multiple of %d.' % (
+                blob._CHUNK_SIZE_MULTIPLE,))
+        self._blob = blob
+        self._client = client
+        self._chunk_size = chunk_size
+        self._content_type = content_type
+        self._buffer = _ChunkBuffer()
+        self._upload = None
+        self._transport = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._abandon()
+
+    def __del__(self):
+        # Unlike files, do not finish (and so publish) unclosed uploads.
+        if not self.closed:
+            self._abandon()
+
+    @property
+    def blob(self):
+        """The blob being written.
+
+        :rtype: :class:`~google.cloud.storage.blob.Blob`
+        :returns: The blob.
+        """
+        return self._blob
+
+    def writable(self):
+        """Writers are writable.
+
+        :rtype: bool
+        :returns: True
+        """
+        return True
+
+    def tell(self):
+        """The number of bytes written so far.
+
+        :rtype: int
+        :returns: The position.
+        """
+        self._check_open()
+        return self._buffer.tell() + len(self._buffer)
+
+    def write(self, data):
+        """Write bytes, uploading each chunk once it is full.
+
+        :type data: bytes
+        :param data: The bytes to write.
+
+        :rtype: int
+        :returns: The number of bytes written: all of ``data``.
+        :raises: :class:`~google.cloud.exceptions.GoogleCloudError` if an
+                 upload request fails.
+        """
+        self._check_open()
+        view = memoryview(data)
+        while view:
+            space = max(self._chunk_size - len(self._buffer), 0)
+            self._buffer.write(view[:space])
+            view = view[space:]
+            if len(self._buffer) >= self._chunk_size:
+                self._transmit_next_chunk()
+        return len(data)
+
+    def close(self):
+        """Upload the rest of the data, and create the blob.
+
+        Does nothing if the writer is already closed.
+
+        :raises: :class:`~google.cloud.exceptions.GoogleCloudError` if an
+                 upload request fails.
+        """
+        if self.closed:
+            return
+        try:
+            while self._upload is None or not self._upload.finished:
+                response = self._transmit_next_chunk()
+            self._blob._set_properties(response.json())
+        finally:
+            self._abandon()
+
+    def _abandon(self):
+        """Close the writer, without finishing the upload."""
+        self._buffer = None
+        self._upload = None
+        super(BlobWriter, self).close()
+
+    def _check_open(self):
+        """Check that the writer is not closed.
+
+        :raises: :exc:`ValueError` if it is.
+        """
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+
+    def _transmit_next_chunk(self):
+        """Upload a chunk from the buffer, initiating the upload if needed.
+
+        Chunks shorter than the chunk size finish the upload.
+
+        :rtype: :class:`~requests.Response`
+        :returns: The response to the chunk.
+        """
+        try:
+            if self._upload is None:
+                self._upload, self._transport = (
+                    self._blob._initiate_resumable_upload(
+                        self._client, self._buffer, self._content_type,
+                        None, None, chunk_size=self._chunk_size))
+            response = self._upload.transmit_next_chunk(self._transport)
+        except resumable_media.InvalidResponse as exc:
+            _raise_from_invalid_response(exc)
+        # The server may have persisted only part of the chunk.
+        self._buffer.rewind(self._upload.bytes_uploaded)
+        return response
@@ -57,6 +57,10 @@ REQUIREMENTS = [
     'requests >= 2.0.0',
 ]
 
+EXTRAS_REQUIRE = {
+    'crcmod': ['crcmod >= 1.7'],
+}
+
 setup(
     name='google-cloud-storage',
     version='1.2.0',
@@ -68,5 +72,6 @@ setup(
     ],
     packages=find_packages(exclude=('tests*',)),
     install_requires=REQUIREMENTS,
+    extras_require=EXTRAS_REQUIRE,
     **SETUP_BASE
 )
@@ -0,0 +1,118 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestCrc32c(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage._checksum import Crc32c
+
+        return Crc32c
+
+    def _make_one(self):
+        return self._get_target_class()()
+
+    def test_empty(self):
+        self.assertEqual(self._make_one().digest(), b'\0\0\0\0')
+
+    def test_check_value(self):
+        checksum = self._make_one()
+        checksum.update(b'1234')
+        checksum.update(b'56789')
+        self.assertEqual(checksum.digest(), b'\xe3\x06\x92\x83')
+
+
+class Test_crc32c(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut():
+        from google.cloud.storage._checksum import crc32c
+
+        return crc32c()
+
+    def test_wo_crcmod(self):
+        from google.cloud.storage._checksum import Crc32c
+
+        with mock.patch('google.cloud.storage._checksum.crcmod', new=None):
+            checksum = self._call_fut()
+
+        self.assertIsInstance(checksum, Crc32c)
+
+    def test_w_crcmod(self):
+        crcmod = mock.Mock(spec=['predefined'])
+
+        with mock.patch('google.cloud.storage._checksum.crcmod', new=crcmod):
+            checksum = self._call_fut()
+
+        self.assertIs(checksum, crcmod.predefined.Crc.return_value)
+        crcmod.predefined.Crc.assert_called_once_with('crc-32c')
+
+
+class Test_fast_crc32c(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut():
+        from google.cloud.storage._checksum import fast_crc32c
+
+        return fast_crc32c()
+
+    def test_wo_crcmod(self):
+        with mock.patch('google.cloud.storage._checksum.crcmod', new=None):
+            self.assertFalse(self._call_fut())
+
+    def test_wo_extension(self):
+        crcmod = mock.Mock(spec=['crcmod'])
+        crcmod.crcmod._usingExtension = False
+
+        with mock.patch('google.cloud.storage._checksum.crcmod', new=crcmod):
+            self.assertFalse(self._call_fut())
+
+    def test_w_extension(self):
+        crcmod = mock.Mock(spec=['crcmod'])
+        crcmod.crcmod._usingExtension = True
+
+        with mock.patch('google.cloud.storage._checksum.crcmod', new=crcmod):
+            self.assertTrue(self._call_fut())
+
+
+class Test_file_checksum(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(filename, checksum):
+        from google.cloud.storage._checksum import file_checksum
+
+        return file_checksum(filename, checksum)
+
+    def test_it(self):
+        import hashlib
+        import os
+        import tempfile
+        from google.cloud.storage._checksum import Crc32c
+
+        handle, filename = tempfile.mkstemp()
+        self.addCleanup(os.remove, filename)
+        with os.fdopen(handle, 'wb') as file_obj:
+            file_obj.write(b'123456789')
+
+        with mock.patch('google.cloud.storage._checksum._BLOCK_SIZE', new=4):
+            self.assertEqual(
+                self._call_fut(filename, Crc32c()), u'4waSgw==')
+            self.assertEqual(
+                self._call_fut(filename, hashlib.md5()),
+                u'JfnnlDI7RTiF9RgfG2JNCw==')
@@ -59,6 +59,7 @@ class Test_PropertyMixin(unittest.TestCase):
         self.assertEqual(kw[0]['method'], 'GET')
         self.assertEqual(kw[0]['path'], '/path')
         self.assertEqual(kw[0]['query_params'], {'projection': 'noAcl'})
+        self.assertTrue(kw[0]['_cacheable'])
         # Make sure changes get reset by reload.
         self.assertEqual(derived._changes, set())
 
@@ -0,0 +1,187 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class Test_map_in_threads(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(function, items, max_workers):
+        from google.cloud.storage._parallel import map_in_threads
+
+        return map_in_threads(function, items, max_workers)
+
+    def test_sequential(self):
+        import threading
+
+        threads = set()
+
+        def function(item):
+            threads.add(threading.current_thread())
+            return item * 2
+
+        self.assertEqual(self._call_fut(function, [1, 2, 3], 1), [2, 4, 6])
+        self.assertEqual(threads, set([threading.current_thread()]))
+
+    def test_concurrent(self):
+        import threading
+        import time
+
+        lock = threading.Lock()
+        active = []
+        most_active = [0]
+
+        def function(item):
+            with lock:
+                active.append(item)
+                most_active[0] = max(most_active[0], len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(item)
+            return item * 2
+
+        items = list(range(20))
+        self.assertEqual(self._call_fut(function, items, 4),
+                         [item * 2 for item in items])
+        self.assertGreater(most_active[0], 1)
+        self.assertLessEqual(most_active[0], 4)
+
+    def test_empty(self):
+        self.assertEqual(self._call_fut(None, [], 4), [])
+
+    def test_failure(self):
+        import threading
+
+        calls = []
+        lock = threading.Lock()
+
+        def function(item):
+            with lock:
+                calls.append(item)
+            if item == 1:
+                raise KeyError(item)
+            return item
+
+        with self.assertRaises(KeyError):
+            self._call_fut(function, list(range(100)), 2)
+
+        # No new call is started after the failure.
+        self.assertLess(len(calls), 100)
+
+
+class TestFileSlice(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage._parallel import FileSlice
+
+        return FileSlice
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_file(self, data):
+        import os
+        import tempfile
+
+        handle, filename = tempfile.mkstemp()
+        self.addCleanup(os.remove, filename)
+        with os.fdopen(handle, 'wb') as file_obj:
+            file_obj.write(data)
+        return filename
+
+    def test_read(self):
+        filename = self._make_file(b'0123456789')
+
+        with self._make_one(filename, 3, 4) as stream:
+            self.assertEqual(stream.tell(), 0)
+            self.assertEqual(stream.read(3), b'345')
+            self.assertEqual(stream.tell(), 3)
+            self.assertEqual(stream.read(), b'6')
+            self.assertEqual(stream.read(), b'')
+
+        self.assertTrue(stream._file_obj.closed)
+
+    def test_seek(self):
+        import os
+
+        filename = self._make_file(b'0123456789')
+        stream = self._make_one(filename, 3, 4)
+
+        self.assertEqual(stream.seek(2), 2)
+        self.assertEqual(stream.read(), b'56')
+        self.assertEqual(stream.seek(-3, os.SEEK_CUR), 1)
+        self.assertEqual(stream.read(1), b'4')
+        self.assertEqual(stream.seek(-1, os.SEEK_END), 3)
+        self.assertEqual(stream.read(), b'6')
+        self.assertEqual(stream.seek(10), 4)
+        self.assertEqual(stream.seek(-10), 0)
+        self.assertEqual(stream.read(), b'3456')
+        stream.close()
+
+
+class TestSliceWriter(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage._parallel import SliceWriter
+
+        return SliceWriter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _write_slices(self):
+        import os
+        import tempfile
+        import threading
+
+        handle, filename = tempfile.mkstemp()
+        self.addCleanup(os.remove, filename)
+        lock = threading.Lock()
+        with os.fdopen(handle, 'wb') as file_obj:
+            file_obj.truncate(10)
+            second = self._make_one(file_obj, 6, lock)
+            first = self._make_one(file_obj, 2, lock)
+            self.assertEqual(second.write(b'ab'), 2)
+            self.assertEqual(first.write(b'cd'), 2)
+            self.assertEqual(second.write(b'e'), 1)
+            self.assertEqual(first.tell(), 2)
+            self.assertEqual(second.tell(), 3)
+        with open(filename, 'rb') as file_obj:
+            return file_obj.read()
+
+    def test_write(self):
+        self.assertEqual(self._write_slices(), b'\0\0cd\0\0abe\0')
+
+    def test_write_wo_pwrite(self):
+        import mock
+
+        with mock.patch('os.pwrite', new=None, create=True):
+            self.assertEqual(self._write_slices(), b'\0\0cd\0\0abe\0')
+
+    def test_write_w_partial_pwrite(self):
+        import os
+        import mock
+
+        pwrite = getattr(os, 'pwrite', None)
+        if pwrite is None:  # pragma: NO COVER
+            self.skipTest('os.pwrite is not available')
+
+        def partial_pwrite(fd, data, offset):
+            return pwrite(fd, data[:1], offset)
+
+        with mock.patch('os.pwrite', new=partial_pwrite):
+            self.assertEqual(self._write_slices(), b'\0\0cd\0\0abe\0')
@@ -96,6 +96,24 @@ class TestBatch(unittest.TestCase):
         self.assertEqual(len(batch._requests), 0)
         self.assertEqual(len(batch._target_objects), 0)
 
+    def test_ctor_w_compression_threshold(self):
+        http = _HTTP()
+        connection = _Connection(http=http)
+        client = _Client(connection)
+        client.compression_threshold = 0
+        batch = self._make_one(client)
+        self.assertIsNone(batch._compression_threshold)
+
+    def test_ctor_w_json_codec(self):
+        from google.cloud.json_codec import STDLIB_CODEC
+
+        http = _HTTP()
+        connection = _Connection(http=http)
+        client = _Client(connection)
+        client.json_codec = mock.Mock(spec=['dumps', 'loads'])
+        batch = self._make_one(client)
+        self.assertIs(batch._json_codec, STDLIB_CODEC)
+
     def test_current(self):
         from google.cloud.storage.client import Client
 
@@ -228,6 +246,56 @@ class TestBatch(unittest.TestCase):
                           batch._make_request, 'POST', URL, data={'foo': 1})
         self.assertIs(connection.http, http)
 
+    def _api_request_helper(self, *listeners, **client_attributes):
+        import json
+        from google.cloud import instrumentation
+        from google.cloud.storage.batch import _FutureDict
+        from google.cloud.storage.client import Client
+
+        client = Client(project='PROJECT', credentials=_make_credentials())
+        client._http_internal = _HTTP()  # no requests expected
+        for name, value in client_attributes.items():
+            setattr(client, name, value)
+        batch = self._make_one(client)
+        target = _MockObject()
+        for listener in listeners:
+            instrumentation.add_listener(listener)
+            self.addCleanup(instrumentation.remove_listener, listener)
+
+        result = batch.api_request(
+            'POST', '/b/name/o/source/copyTo/b/name/o/destination',
+            data={'foo': 1}, _target_object=target)
+
+        self.assertIsInstance(result, _FutureDict)
+        self.assertIs(target._properties, result)
+        method, url, _, body = batch._requests[0]
+        self.assertEqual(method, 'POST')
+        self.assertEqual(json.loads(body), {'foo': 1})
+        # The parts of the batch request can be built.
+        _, batch_body = batch._prepare_batch_request()
+        self.assertIn('{"foo": 1}', batch_body)
+
+    def test_api_request(self):
+        self._api_request_helper()
+
+    def test_api_request_w_bytes_codec(self):
+        from google.cloud.json_codec import JSONCodec
+
+        class _BytesCodec(JSONCodec):
+
+            def dumps(self, value):
+                return JSONCodec.dumps(value).encode('utf-8')
+
+        self._api_request_helper(json_codec=_BytesCodec())
+
+    def test_api_request_w_listener(self):
+        records = []
+        self._api_request_helper(records.append)
+
+        record, = records
+        self.assertEqual(record.status, 204)
+        self.assertEqual(record.bytes_received, 0)
+
     def test_finish_empty(self):
         http = _HTTP()  # no requests expected
         connection = _Connection(http=http)
@@ -336,6 +336,16 @@ class Test_Blob(unittest.TestCase):
         self.assertIs(transport, fake_session_factory.return_value)
         fake_session_factory.assert_called_once_with(client._credentials)
 
+    @mock.patch('google.auth.transport.requests.AuthorizedSession')
+    def test__make_transport_w_media_transport(self, fake_session_factory):
+        client = mock.Mock(spec=[u'_credentials', u'_media_transport'])
+        blob = self._make_one(u'blob-name', bucket=None)
+
+        transport = blob._make_transport(client)
+
+        self.assertIs(transport, client._media_transport)
+        fake_session_factory.assert_not_called()
+
     def test__get_download_url_with_media_link(self):
         blob_name = 'something.txt'
         bucket = mock.Mock(spec=[])
@@ -651,6 +661,281 @@ class Test_Blob(unittest.TestCase):
         self._check_session_mocks(
             client, fake_session_factory, media_link, headers=key_headers)
 
+    def _mock_ranged_transport(self, content):
+        import re
+        import threading
+
+        lock = threading.Lock()
+        ranges = []
+
+        def request(method, url, data=None, headers=None):
+            match = re.match(r'bytes=(\d+)-(\d+)$', headers['range'])
+            start, end = int(match.group(1)), int(match.group(2))
+            end = min(end, len(content) - 1)
+            with lock:
+                ranges.append((start, end))
+            return self._mock_requests_response(
+                http_client.PARTIAL_CONTENT,
+                {'content-length': str(end + 1 - start),
+                 'content-range': 'bytes {:d}-{:d}/{:d}'.format(
+                     start, end, len(content))},
+                content=content[start:end + 1])
+
+        transport = mock.Mock(spec=['request'])
+        transport.request.side_effect = request
+        return transport, ranges
+
+    @staticmethod
+    def _base64_md5(content):
+        import base64
+        import hashlib
+
+        return base64.b64encode(hashlib.md5(content).digest()).decode('ascii')
+
+    def test_sliced_download_to_filename(self):
+        import time
+        from google.cloud._testing import _NamedTemporaryFile
+
+        content = b'0123456789'
+        transport, ranges = self._mock_ranged_transport(content)
+        client = mock.Mock(
+            _media_transport=transport, spec=['_media_transport'])
+        properties = {
+            'mediaLink': 'http://example.com/media/',
+            'size': '10',
+            'md5Hash': self._base64_md5(content),
+            'updated': '2014-12-06T13:13:50.690Z',
+        }
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties=properties)
+        # Slices of 4 bytes, downloaded in chunks of 3.
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 3
+
+        with _NamedTemporaryFile() as temp:
+            blob.sliced_download_to_filename(
+                temp.name, slice_size=4, max_workers=2)
+            with open(temp.name, 'rb') as file_obj:
+                wrote = file_obj.read()
+            mtime = os.path.getmtime(temp.name)
+
+        self.assertEqual(wrote, content)
+        self.assertEqual(mtime, time.mktime(blob.updated.timetuple()))
+        self.assertEqual(
+            sorted(ranges), [(0, 2), (3, 3), (4, 6), (7, 7), (8, 9)])
+        for call in transport.request.mock_calls:
+            self.assertEqual(call[1], ('GET', 'http://example.com/media/'))
+
+    def test_sliced_download_to_filename_w_reload_and_crc32c(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        content = b'123456789'
+        transport, ranges = self._mock_ranged_transport(content)
+        resource = {
+            'mediaLink': 'http://example.com/media/',
+            'size': '9',
+            'crc32c': '4waSgw==',
+        }
+        connection = _Connection(({'status': http_client.OK}, resource))
+        client = _Client(connection)
+        client._media_transport = transport
+        blob = self._make_one('blob-name', bucket=_Bucket(client))
+
+        patch = mock.patch(
+            'google.cloud.storage.blob.fast_crc32c', return_value=True)
+        with _NamedTemporaryFile() as temp:
+            with patch:
+                blob.sliced_download_to_filename(temp.name)
+            with open(temp.name, 'rb') as file_obj:
+                wrote = file_obj.read()
+
+        self.assertEqual(wrote, content)
+        self.assertEqual(blob.size, 9)
+        self.assertEqual(connection._requested[0]['method'], 'GET')
+        # A single slice, in a single chunk.
+        self.assertEqual(ranges, [(0, 8)])
+
+    def test_sliced_download_to_filename_automatic_slice_size(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        size = 200 * 1024 * 1024 + 1
+        client = mock.Mock(
+            _media_transport=None, _credentials=_make_credentials(),
+            spec=['_media_transport', '_credentials'])
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties={'size': size})
+
+        patch = mock.patch(
+            'google.cloud.storage.blob.map_in_threads', autospec=True)
+        with _NamedTemporaryFile() as temp:
+            with patch as map_in_threads:
+                blob.sliced_download_to_filename(temp.name)
+            self.assertEqual(os.path.getsize(temp.name), size)
+
+        # Eight slices, rounded up to a multiple of 256 KB.
+        slice_size = 101 * 256 * 1024
+        function, offsets, max_workers = map_in_threads.call_args[0]
+        self.assertEqual(offsets, list(range(0, size, slice_size)))
+        self.assertEqual(len(offsets), 8)
+        self.assertEqual(max_workers, 8)
+
+    def test_sliced_download_to_filename_minimum_slice_size(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        client = mock.Mock(
+            _media_transport=None, _credentials=_make_credentials(),
+            spec=['_media_transport', '_credentials'])
+        size = 20 * 1024 * 1024
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties={'size': size})
+
+        patch = mock.patch(
+            'google.cloud.storage.blob.map_in_threads', autospec=True)
+        with _NamedTemporaryFile() as temp:
+            with patch as map_in_threads:
+                blob.sliced_download_to_filename(temp.name, max_workers=4)
+
+        offsets = map_in_threads.call_args[0][1]
+        self.assertEqual(offsets, [0, 16 * 1024 * 1024])
+
+    def test_sliced_download_to_filename_empty(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        transport = mock.Mock(spec=['request'])
+        client = mock.Mock(
+            _media_transport=transport, spec=['_media_transport'])
+        properties = {'size': '0', 'md5Hash': self._base64_md5(b'')}
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties=properties)
+
+        with _NamedTemporaryFile() as temp:
+            blob.sliced_download_to_filename(temp.name)
+            self.assertEqual(os.path.getsize(temp.name), 0)
+
+        transport.request.assert_not_called()
+
+    def _make_temporary_filename(self):
+        import shutil
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return os.path.join(directory, 'blob-name')
+
+    def test_sliced_download_to_filename_invalid_slice_size(self):
+        transport = mock.Mock(spec=['request'])
+        client = mock.Mock(
+            _media_transport=transport, spec=['_media_transport'])
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties={'size': '10'})
+        filename = self._make_temporary_filename()
+
+        for slice_size in (0, -1):
+            with self.assertRaises(ValueError):
+                blob.sliced_download_to_filename(
+                    filename, slice_size=slice_size)
+
+        self.assertFalse(os.path.exists(filename))
+        transport.request.assert_not_called()
+
+    def test_sliced_download_to_filename_checksum_mismatch(self):
+        content = b'0123456789'
+        transport, _ = self._mock_ranged_transport(content)
+        client = mock.Mock(
+            _media_transport=transport, spec=['_media_transport'])
+        properties = {
+            'size': '10',
+            'md5Hash': self._base64_md5(b'9876543210'),
+        }
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties=properties)
+
+        filename = self._make_temporary_filename()
+        with self.assertRaises(ValueError) as exc_info:
+            blob.sliced_download_to_filename(filename)
+
+        self.assertFalse(os.path.exists(filename))
+
+        self.assertEqual(exc_info.exception.args[1], 'md5Hash')
+        self.assertEqual(
+            exc_info.exception.args[3], self._base64_md5(content))
+
+    def test_sliced_download_to_filename_failure(self):
+        from google.cloud.exceptions import NotFound
+
+        transport = mock.Mock(spec=['request'])
+        transport.request.return_value = self._mock_requests_response(
+            http_client.NOT_FOUND, {}, content=b'Not found')
+        client = mock.Mock(
+            _media_transport=transport, spec=['_media_transport'])
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties={'size': '10'})
+
+        filename = self._make_temporary_filename()
+        with self.assertRaises(NotFound):
+            blob.sliced_download_to_filename(filename)
+
+        self.assertFalse(os.path.exists(filename))
+
+    def test__verify_file_wo_checksum(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        blob = self._make_one('blob-name', bucket=None)
+
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            blob._verify_file(temp.name)
+
+    def test__verify_file_w_crc32c_mismatch(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        blob = self._make_one(
+            'blob-name', bucket=None, properties={'crc32c': 'AAAAAA=='})
+
+        patch = mock.patch(
+            'google.cloud.storage.blob.fast_crc32c', return_value=True)
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            with patch:
+                with self.assertRaises(ValueError):
+                    blob._verify_file(temp.name)
+
+    def test__verify_file_w_crc32c_wo_extension(self):
+        import warnings
+        from google.cloud._testing import _NamedTemporaryFile
+
+        blob = self._make_one(
+            'blob-name', bucket=None, properties={'crc32c': 'AAAAAA=='})
+
+        patch = mock.patch(
+            'google.cloud.storage.blob.fast_crc32c', return_value=False)
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            with patch:
+                with warnings.catch_warnings(record=True) as warned:
+                    warnings.simplefilter('always')
+                    blob._verify_file(temp.name)
+
+        self.assertEqual(len(warned), 1)
+        self.assertIs(warned[0].category, RuntimeWarning)
+
+    def test__verify_file_prefers_md5_hash(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        properties = {
+            'md5Hash': self._base64_md5(b'abc'),
+            'crc32c': 'AAAAAA==',
+        }
+        blob = self._make_one('blob-name', bucket=None, properties=properties)
+
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            blob._verify_file(temp.name)
+
     @mock.patch('google.auth.transport.requests.AuthorizedSession')
     def test_download_as_string(self, fake_session_factory):
         blob_name = 'blob-name'
@@ -671,6 +956,41 @@ class Test_Blob(unittest.TestCase):
 
         self._check_session_mocks(client, fake_session_factory, media_link)
 
+    def test_open_read(self):
+        from google.cloud.storage.fileio import BlobReader
+
+        client = mock.Mock(
+            _media_transport=mock.Mock(spec=['request']),
+            spec=['_media_transport'])
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(client), properties={'size': '6'})
+
+        reader = blob.open(chunk_size=3, read_ahead=1)
+
+        self.assertIsInstance(reader, BlobReader)
+        self.assertIs(reader.blob, blob)
+        self.assertEqual(reader._chunk_size, 3)
+        self.assertEqual(reader._read_ahead, 1)
+
+    def test_open_write(self):
+        from google.cloud.storage.fileio import BlobWriter
+
+        blob = self._make_one('blob-name', bucket=_Bucket())
+
+        writer = blob.open(
+            'wb', chunk_size=256 * 1024, content_type='text/plain')
+
+        self.assertIsInstance(writer, BlobWriter)
+        self.assertIs(writer.blob, blob)
+        self.assertEqual(writer._chunk_size, 256 * 1024)
+        self.assertEqual(writer._content_type, 'text/plain')
+
+    def test_open_unsupported_mode(self):
+        blob = self._make_one('blob-name', bucket=None)
+
+        with self.assertRaises(ValueError):
+            blob.open('r')
+
     def test__get_content_type_explicit(self):
         blob = self._make_one(u'blob-name', bucket=None)
 
@@ -1218,6 +1538,166 @@ class Test_Blob(unittest.TestCase):
         self.assertEqual(stream.mode, 'rb')
         self.assertEqual(stream.name, temp.name)
 
+    def _composite_upload_helper(self, blob, data, upload_side_effect=None,
+                                 **kwargs):
+        import threading
+
+        from google.cloud._testing import _NamedTemporaryFile
+        from google.cloud.storage.blob import Blob
+
+        uploaded = {}
+        composed = []
+        lock = threading.Lock()
+
+        def upload_from_file(part, stream, size=None, content_type=None,
+                             client=None):
+            if upload_side_effect is not None:
+                upload_side_effect(part)
+            with lock:
+                uploaded[part.name] = (
+                    stream.read(), size, content_type, client,
+                    part.chunk_size)
+
+        def compose(destination, sources, client=None):
+            with lock:
+                composed.append((
+                    destination.name, destination.content_type,
+                    [source.name for source in sources], client))
+
+        client = mock.sentinel.client
+        patch_upload = mock.patch.object(
+            Blob, 'upload_from_file', autospec=True,
+            side_effect=upload_from_file)
+        patch_compose = mock.patch.object(
+            Blob, 'compose', autospec=True, side_effect=compose)
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(data)
+            with patch_upload, patch_compose:
+                blob.composite_upload_from_filename(
+                    temp.name, content_type='text/csv', client=client,
+                    **kwargs)
+
+        return uploaded, composed
+
+    def test_composite_upload_from_filename_w_encryption_key(self):
+        blob = self._make_one(
+            'blob-name', bucket=_Bucket(), encryption_key=b'01234567' * 4)
+
+        with self.assertRaises(ValueError):
+            blob.composite_upload_from_filename('filename')
+
+    def test_composite_upload_from_filename_single_part(self):
+        from google.cloud._testing import _NamedTemporaryFile
+
+        blob = self._make_one('blob-name', bucket=_Bucket())
+        blob.upload_from_filename = mock.Mock(spec=[])
+        client = mock.sentinel.client
+
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            blob.composite_upload_from_filename(
+                temp.name, client=client, part_size=3)
+
+        blob.upload_from_filename.assert_called_once_with(
+            temp.name, content_type='application/octet-stream',
+            client=client)
+
+    def test_composite_upload_from_filename(self):
+        blob = self._make_one('blob-name', bucket=_Bucket())
+        uploaded, composed = self._composite_upload_helper(
+            blob, b'abcdefghij', part_size=4)
+
+        names = sorted(uploaded)
+        self.assertEqual(len(names), 3)
+        for name in names:
+            self.assertTrue(name.startswith('blob-name.composite-'))
+        self.assertEqual(
+            [name.rsplit('.', 1)[1] for name in names],
+            ['part-00000', 'part-00001', 'part-00002'])
+        client = mock.sentinel.client
+        self.assertEqual([uploaded[name] for name in names], [
+            (b'abcd', 4, 'text/csv', client, 8 * 1024 * 1024),
+            (b'efgh', 4, 'text/csv', client, 8 * 1024 * 1024),
+            (b'ij', 2, 'text/csv', client, 8 * 1024 * 1024),
+        ])
+        self.assertEqual(
+            composed, [('blob-name', 'text/csv', names, client)])
+        self.assertEqual(blob.content_type, 'text/csv')
+        (deleted, on_error, deleted_client), = blob.bucket._deleted_blobs
+        self.assertEqual(sorted(deleted), names)
+        self.assertIsNone(on_error(deleted[0]))
+        self.assertIs(deleted_client, client)
+
+    def test_composite_upload_from_filename_w_compose_tree(self):
+        blob = self._make_one('blob-name', bucket=_Bucket())
+        uploaded, composed = self._composite_upload_helper(
+            blob, b'x' * 70, part_size=1, max_workers=4)
+
+        names = sorted(uploaded)
+        self.assertEqual(len(names), 70)
+        intermediate = [name for name, _, _, _ in composed[:-1]]
+        self.assertEqual(
+            [name.rsplit('.', 1)[1] for name in sorted(intermediate)],
+            ['compose-1-00000', 'compose-1-00001', 'compose-1-00002'])
+        groups = sorted(
+            sources for _, _, sources, _ in composed[:-1])
+        self.assertEqual(groups, [names[:32], names[32:64], names[64:]])
+        final_name, _, final_sources, _ = composed[-1]
+        self.assertEqual(final_name, 'blob-name')
+        self.assertEqual(final_sources, sorted(intermediate))
+        (deleted, _, _), = blob.bucket._deleted_blobs
+        self.assertEqual(sorted(deleted), sorted(names + intermediate))
+
+    def test_composite_upload_from_filename_w_part_size_raised(self):
+        from google.cloud.storage import blob as MUT
+
+        blob = self._make_one('blob-name', bucket=_Bucket())
+        with mock.patch.object(MUT, '_MAX_COMPONENT_COUNT', new=4):
+            uploaded, _ = self._composite_upload_helper(
+                blob, b'x' * 10, part_size=1)
+
+        self.assertEqual(sorted(len(data) for data, _, _, _, _ in
+                                uploaded.values()), [1, 3, 3, 3])
+
+    def test_composite_upload_from_filename_failure(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        def upload_side_effect(part):
+            if part.name.endswith('part-00001'):
+                raise ServiceUnavailable('down')
+
+        blob = self._make_one('blob-name', bucket=_Bucket())
+        with self.assertRaises(ServiceUnavailable):
+            self._composite_upload_helper(
+                blob, b'abcdefghij', upload_side_effect=upload_side_effect,
+                part_size=4, max_workers=1)
+
+        # Parts uploaded before the failure are deleted.
+        (deleted, _, _), = blob.bucket._deleted_blobs
+        self.assertEqual(
+            [name.rsplit('.', 1)[1] for name in deleted], ['part-00000'])
+        self.assertIsNone(blob.content_type)
+
+    def test_composite_upload_from_filename_failure_in_cleanup(self):
+        from google.cloud.exceptions import Forbidden
+        from google.cloud.exceptions import ServiceUnavailable
+
+        def upload_side_effect(part):
+            if part.name.endswith('part-00001'):
+                raise ServiceUnavailable('down')
+
+        blob = self._make_one('blob-name', bucket=_Bucket())
+        blob.bucket.delete_blobs = mock.Mock(
+            side_effect=Forbidden('no delete'), spec=[])
+        with self.assertRaises(ServiceUnavailable):
+            self._composite_upload_helper(
+                blob, b'abcdefghij', upload_side_effect=upload_side_effect,
+                part_size=4)
+
+        self.assertEqual(blob.bucket.delete_blobs.call_count, 1)
+
     def _upload_from_string_helper(self, data, **kwargs):
         from google.cloud._helpers import _to_bytes
 
@@ -2288,6 +2768,7 @@ class _Bucket(object):
         self._blobs = {}
         self._copied = []
         self._deleted = []
+        self._deleted_blobs = []
         self.name = name
         self.path = '/b/' + name
 
@@ -2295,6 +2776,10 @@ class _Bucket(object):
         del self._blobs[blob_name]
         self._deleted.append((blob_name, client))
 
+    def delete_blobs(self, blobs, on_error=None, client=None):
+        self._deleted_blobs.append(
+            ([blob.name for blob in blobs], on_error, client))
+
 
 class _Signer(object):
 
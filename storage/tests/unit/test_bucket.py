@@ -251,6 +251,9 @@ class Test_Bucket(unittest.TestCase):
         client = _Client(connection)
         bucket = self._make_one(client=client, name=NAME)
         iterator = bucket.list_blobs()
+        self.assertTrue(iterator.release_items)
+        self.assertIs(iterator.bucket, bucket)
+        self.assertEqual(iterator.__dict__, {})
         blobs = list(iterator)
         self.assertEqual(blobs, [])
         kw, = connection._requested
@@ -1199,6 +1202,7 @@ class Test_Bucket(unittest.TestCase):
 
         page = six.next(iterator.pages)
         self.assertEqual(page.prefixes, ('foo',))
+        self.assertEqual(page.__dict__, {})
         self.assertEqual(page.num_items, 1)
         blob = six.next(page)
         self.assertEqual(page.remaining, 0)
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import os
+import threading
 import unittest
 
+import google.auth.credentials
 import mock
+from six.moves import BaseHTTPServer
 
 
 def _make_credentials():
@@ -23,6 +28,54 @@ def _make_credentials():
     return mock.Mock(spec=google.auth.credentials.Credentials)
 
 
+class _Credentials(google.auth.credentials.Credentials):
+    """Picklable credentials, with a fixed token."""
+
+    def __init__(self):
+        super(_Credentials, self).__init__()
+        self.token = 'TOKEN'
+
+    def refresh(self, request):
+        raise NotImplementedError
+
+
+class _BucketHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Stub of the ``buckets.get`` API."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.headers.get('Authorization') != 'Bearer TOKEN':
+            self.send_response(401)
+            body = b'{}'
+        else:
+            self.send_response(200)
+            name = self.path.split('?')[0].rsplit('/', 1)[-1]
+            body = json.dumps({'name': name}).encode('utf-8')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _get_bucket(args):
+    client, name = args
+    return os.getpid(), client.get_bucket(name).name
+
+
+def _fork_pool(processes):
+    import multiprocessing
+
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:  # Python 2 always forks.
+        context = multiprocessing
+    return context.Pool(processes)
+
+
 class TestClient(unittest.TestCase):
 
     @staticmethod
@@ -47,6 +100,84 @@ class TestClient(unittest.TestCase):
         self.assertIsNone(client.current_batch)
         self.assertEqual(list(client._batch_stack), [])
 
+    def test_pickle(self):
+        import pickle
+
+        client = self._make_one(project='PROJECT', credentials=_Credentials())
+        client._push_batch(object())
+        transport = client._media_transport
+
+        new_client = pickle.loads(pickle.dumps(client))
+
+        self.assertEqual(new_client.project, 'PROJECT')
+        self.assertIsInstance(new_client._credentials, _Credentials)
+        self.assertIsNone(new_client.current_batch)
+        self.assertIsNot(new_client._batch_stack, client._batch_stack)
+        self.assertIs(new_client._connection._client, new_client)
+        self.assertIsNone(new_client._media_transport_internal)
+        self.assertIsNot(new_client._media_transport, transport)
+
+    def test__media_transport(self):
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import DEFAULT_POOLSIZE
+
+        credentials = _Credentials()
+        client = self._make_one(project='PROJECT', credentials=credentials)
+        client.media_pool_size = 32
+
+        transport = client._media_transport
+
+        self.assertIsInstance(transport, AuthorizedSession)
+        self.assertIs(transport.credentials, credentials)
+        for prefix in ('https://', 'http://'):
+            adapter = transport.get_adapter(prefix + 'www.googleapis.com')
+            self.assertEqual(adapter._pool_connections, DEFAULT_POOLSIZE)
+            self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertIs(client._media_transport, transport)
+
+    def test__media_transport_after_fork(self):
+        client = self._make_one(project='PROJECT', credentials=_Credentials())
+        transport = client._media_transport
+
+        with mock.patch('os.getpid', return_value=os.getpid() + 1):
+            child_transport = client._media_transport
+            self.assertIs(client._media_transport, child_transport)
+
+        self.assertIsNot(child_transport, transport)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork()')
+    def test_process_pool(self):
+        from six.moves import socketserver
+        from google.cloud.storage._http import Connection
+
+        class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+        server = _Server(('127.0.0.1', 0), _BucketHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base_url = 'http://127.0.0.1:%d' % (server.server_address[1],)
+
+        client = self._make_one(project='PROJECT', credentials=_Credentials())
+        names = ['bucket-%d' % (index,) for index in range(8)]
+        with mock.patch.object(Connection, 'API_BASE_URL', new=base_url):
+            # Open a pooled connection, which the workers must not share.
+            self.assertEqual(client.get_bucket('parent').name, 'parent')
+            pool = _fork_pool(2)
+            try:
+                results = pool.map(
+                    _get_bucket, [(client, name) for name in names])
+            finally:
+                pool.close()
+                pool.join()
+            self.assertEqual(client.get_bucket('parent').name, 'parent')
+
+        self.assertEqual([name for _, name in results], names)
+        self.assertNotIn(os.getpid(), [pid for pid, _ in results])
+
     def test__push_batch_and__pop_batch(self):
         from google.cloud.storage.batch import Batch
 
@@ -0,0 +1,573 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import unittest
+
+import mock
+from six.moves import http_client
+
+
+def _make_response(status_code, headers, content=b''):
+    return mock.Mock(
+        content=content, headers=headers, status_code=status_code,
+        spec=['content', 'headers', 'status_code'])
+
+
+def _make_ranged_transport(content):
+    import re
+    import threading
+
+    lock = threading.Lock()
+    ranges = []
+
+    def request(method, url, data=None, headers=None):
+        match = re.match(r'bytes=(\d+)-(\d+)$', headers['range'])
+        start, end = int(match.group(1)), int(match.group(2))
+        with lock:
+            ranges.append((start, end))
+        return _make_response(
+            http_client.PARTIAL_CONTENT,
+            {'content-length': str(end + 1 - start),
+             'content-range': 'bytes {:d}-{:d}/{:d}'.format(
+                 start, end, len(content))},
+            content=content[start:end + 1])
+
+    transport = mock.Mock(spec=['request'])
+    transport.request.side_effect = request
+    return transport, ranges
+
+
+def _make_blob(transport, size, **properties):
+    from google.cloud.storage.blob import Blob
+
+    client = mock.Mock(_media_transport=transport, spec=['_media_transport'])
+    bucket = mock.Mock(client=client, path='/b/name', spec=['client', 'path'])
+    blob = Blob('blob-name', bucket=bucket)
+    properties['mediaLink'] = 'http://example.com/media/'
+    if size is not None:
+        properties['size'] = str(size)
+    blob._properties = properties
+    return blob
+
+
+class Test_Fetch(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.fileio import _Fetch
+
+        return _Fetch
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_result(self):
+        fetch = self._make_one(lambda value: value * 2, 21)
+        self.assertEqual(fetch.result(), 42)
+
+    def test_failure(self):
+        def function(value):
+            raise KeyError(value)
+
+        fetch = self._make_one(function, 21)
+        with self.assertRaises(KeyError):
+            fetch.result()
+        self.assertTrue(fetch.done())
+
+    def test_done(self):
+        import threading
+
+        event = threading.Event()
+        fetch = self._make_one(lambda value: event.wait(), None)
+        self.assertFalse(fetch.done())
+
+        event.set()
+        fetch.result()
+        self.assertTrue(fetch.done())
+
+
+class TestBlobReader(unittest.TestCase):
+
+    CONTENT = b'0123456789'
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.fileio import BlobReader
+
+        return BlobReader
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_reader(self, read_ahead=0, **kw):
+        transport, ranges = _make_ranged_transport(self.CONTENT)
+        blob = _make_blob(transport, len(self.CONTENT))
+        reader = self._make_one(
+            blob, chunk_size=4, read_ahead=read_ahead, **kw)
+        return reader, ranges
+
+    def test_ctor_defaults(self):
+        transport = mock.Mock(spec=['request'])
+        blob = _make_blob(transport, 10)
+
+        reader = self._make_one(blob)
+
+        self.assertIs(reader.blob, blob)
+        self.assertTrue(reader.readable())
+        self.assertTrue(reader.seekable())
+        self.assertFalse(reader.writable())
+        self.assertEqual(reader.tell(), 0)
+        self.assertEqual(reader._chunk_size, 8 * 1024 * 1024)
+        self.assertEqual(reader._read_ahead, 2)
+        self.assertEqual(reader._headers, {})
+        # Nothing is downloaded until read.
+        transport.request.assert_not_called()
+
+    def test_ctor_w_blob_chunk_size(self):
+        blob = _make_blob(mock.Mock(spec=['request']), 10)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 3
+
+        reader = self._make_one(blob)
+
+        self.assertEqual(reader._chunk_size, 3)
+
+    def test_ctor_w_reload(self):
+        blob = _make_blob(mock.Mock(spec=['request']), None)
+
+        def reload(client=None):
+            blob._properties['size'] = '10'
+
+        with mock.patch.object(blob, 'reload', side_effect=reload) as patch:
+            reader = self._make_one(blob)
+
+        patch.assert_called_once_with(client=None)
+        self.assertEqual(reader._size, 10)
+
+    def test_ctor_w_encryption_key(self):
+        from google.cloud.storage.blob import _get_encryption_headers
+
+        key = b'aa426195405adee2c8081bb9e7e74b19'
+        blob = _make_blob(mock.Mock(spec=['request']), 10)
+        blob._encryption_key = key
+
+        reader = self._make_one(blob)
+
+        self.assertEqual(reader._headers, _get_encryption_headers(key))
+
+    def test_read(self):
+        reader, ranges = self._make_reader()
+
+        # Reads stop at the end of the current chunk.
+        self.assertEqual(reader.read(3), b'012')
+        self.assertEqual(reader.read(3), b'3')
+        self.assertEqual(reader.read(), b'456789')
+        self.assertEqual(reader.read(), b'')
+        self.assertEqual(reader.tell(), 10)
+        self.assertEqual(ranges, [(0, 3), (4, 7), (8, 9)])
+
+    def test_read_buffered(self):
+        reader, _ = self._make_reader()
+
+        stream = io.BufferedReader(reader, buffer_size=3)
+
+        self.assertEqual(stream.read(7), b'0123456')
+        self.assertEqual(stream.read(), b'789')
+
+    def test_seek(self):
+        reader, ranges = self._make_reader()
+
+        self.assertEqual(reader.seek(6), 6)
+        self.assertEqual(reader.read(1), b'6')
+        self.assertEqual(reader.seek(-3, os.SEEK_END), 7)
+        self.assertEqual(reader.read(1), b'7')
+        self.assertEqual(reader.seek(-6, os.SEEK_CUR), 2)
+        self.assertEqual(reader.read(1), b'2')
+        self.assertEqual(reader.seek(20), 20)
+        self.assertEqual(reader.read(), b'')
+        # Only the chunks read are downloaded, once while they are current.
+        self.assertEqual(ranges, [(4, 7), (0, 3)])
+
+    def test_seek_invalid(self):
+        reader, _ = self._make_reader()
+
+        with self.assertRaises(ValueError):
+            reader.seek(-1)
+        with self.assertRaises(ValueError):
+            reader.seek(0, 3)
+
+    def test_read_ahead(self):
+        reader, ranges = self._make_reader(read_ahead=1)
+
+        self.assertEqual(reader.read(4), b'0123')
+        self.assertEqual(sorted(reader._fetches), [1])
+        self.assertEqual(reader.read(4), b'4567')
+        self.assertEqual(sorted(reader._fetches), [2])
+        self.assertEqual(reader.read(4), b'89')
+        self.assertEqual(reader._fetches, {})
+        self.assertEqual(sorted(ranges), [(0, 3), (4, 7), (8, 9)])
+
+    def test_read_ahead_discarded_by_seek(self):
+        reader, _ = self._make_reader(read_ahead=2)
+
+        self.assertEqual(reader.read(1), b'0')
+        self.assertEqual(sorted(reader._fetches), [1, 2])
+        reader.seek(8)
+        self.assertEqual(reader.read(), b'89')
+        self.assertEqual(reader._fetches, {})
+
+    def test_read_ahead_skipped_fetches_are_capped(self):
+        import threading
+
+        content = b'0123456789abcdefghij'
+        transport, ranges = _make_ranged_transport(content)
+        request = transport.request.side_effect
+        event = threading.Event()
+
+        def blocking_request(method, url, data=None, headers=None):
+            if headers['range'] == 'bytes=4-7':
+                event.wait()
+            return request(method, url, data=data, headers=headers)
+
+        transport.request.side_effect = blocking_request
+        reader = self._make_one(
+            _make_blob(transport, len(content)), chunk_size=4, read_ahead=1)
+
+        self.assertEqual(reader.read(1), b'0')
+        skipped = reader._fetches[1]
+        reader.seek(12)
+        self.assertEqual(reader.read(1), b'c')
+        # The download of chunk 1 goes on: chunk 4 is not read ahead.
+        self.assertEqual(reader._fetches, {})
+        self.assertEqual(reader._skipped_fetches, [skipped])
+
+        event.set()
+        skipped.result()
+        reader.seek(16)
+        self.assertEqual(reader.read(), b'ghij')
+        self.assertEqual(reader._skipped_fetches, [])
+        self.assertEqual(
+            sorted(ranges), [(0, 3), (4, 7), (12, 15), (16, 19)])
+
+    def test_read_empty_blob(self):
+        transport = mock.Mock(spec=['request'])
+        reader = self._make_one(_make_blob(transport, 0))
+
+        self.assertEqual(reader.read(), b'')
+        transport.request.assert_not_called()
+
+    def test_read_failure(self):
+        from google.cloud.exceptions import NotFound
+
+        transport = mock.Mock(spec=['request'])
+        transport.request.return_value = _make_response(
+            http_client.NOT_FOUND, {}, content=b'Not found')
+        reader = self._make_one(_make_blob(transport, 10), read_ahead=0)
+
+        with self.assertRaises(NotFound):
+            reader.read()
+
+    def test_read_ahead_failure(self):
+        from google.cloud.exceptions import NotFound
+
+        responses = [
+            _make_response(
+                http_client.PARTIAL_CONTENT,
+                {'content-length': '4', 'content-range': 'bytes 0-3/10'},
+                content=b'0123'),
+            _make_response(http_client.NOT_FOUND, {}, content=b'Not found'),
+        ]
+        transport = mock.Mock(spec=['request'])
+        transport.request.side_effect = responses
+        reader = self._make_one(
+            _make_blob(transport, 10), chunk_size=4, read_ahead=1)
+
+        self.assertEqual(reader.read(4), b'0123')
+        with self.assertRaises(NotFound):
+            reader.read(4)
+
+    def test_read_after_failure(self):
+        from google.cloud.exceptions import NotFound
+
+        chunk = _make_response(
+            http_client.PARTIAL_CONTENT,
+            {'content-length': '4', 'content-range': 'bytes 0-3/10'},
+            content=b'0123')
+        transport = mock.Mock(spec=['request'])
+        transport.request.side_effect = [
+            chunk,
+            _make_response(http_client.NOT_FOUND, {}, content=b'Not found'),
+            chunk,
+        ]
+        reader = self._make_one(
+            _make_blob(transport, 10), chunk_size=4, read_ahead=0)
+
+        self.assertEqual(reader.read(4), b'0123')
+        with self.assertRaises(NotFound):
+            reader.read(4)
+        self.assertIsNone(reader._chunk_index)
+        reader.seek(0)
+        self.assertEqual(reader.read(5), b'0123')
+
+    def test_close(self):
+        reader, _ = self._make_reader(read_ahead=1)
+        self.assertEqual(reader.read(1), b'0')
+
+        reader.close()
+
+        self.assertTrue(reader.closed)
+        self.assertIsNone(reader._chunk)
+        self.assertEqual(reader._fetches, {})
+        self.assertEqual(reader._skipped_fetches, [])
+        with self.assertRaises(ValueError):
+            reader.read()
+        with self.assertRaises(ValueError):
+            reader.seek(0)
+        with self.assertRaises(ValueError):
+            reader.tell()
+
+    def test_context_manager(self):
+        reader, _ = self._make_reader()
+
+        with reader as stream:
+            self.assertEqual(stream.read(2), b'01')
+
+        self.assertTrue(reader.closed)
+
+
+def _make_resumable_transport(persist=None):
+    import re
+
+    uploaded = bytearray()
+    requests = []
+
+    def request(method, url, data=None, headers=None):
+        requests.append((method, url, headers))
+        if method == 'POST':
+            return _make_response(
+                http_client.OK, {'location': 'http://example.com/upload'})
+        match = re.match(
+            r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)$', headers['content-range'])
+        start = int(match.group(1) or len(uploaded))
+        if persist is not None and match.group(3) == '*':
+            # The server persists at most ``persist`` bytes of the
+            # chunks before the last one.
+            data = data[:persist]
+        del uploaded[start:]
+        uploaded.extend(data)
+        if match.group(3) == '*':
+            return _make_response(
+                http_client.PERMANENT_REDIRECT,
+                {'range': 'bytes=0-{:d}'.format(len(uploaded) - 1)})
+        response = _make_response(
+            http_client.OK, {}, content=b'{}')
+        response.json = mock.Mock(return_value={
+            'name': 'blob-name', 'size': str(len(uploaded))})
+        return response
+
+    transport = mock.Mock(spec=['request'])
+    transport.request.side_effect = request
+    return transport, uploaded, requests
+
+
+class Test_ChunkBuffer(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.fileio import _ChunkBuffer
+
+        return _ChunkBuffer
+
+    def _make_one(self):
+        return self._get_target_class()()
+
+    def test_it(self):
+        buffer_ = self._make_one()
+        buffer_.write(b'0123')
+        buffer_.write(memoryview(b'4567'))
+        self.assertEqual(len(buffer_), 8)
+        self.assertEqual(buffer_.read(5), b'01234')
+        self.assertEqual(buffer_.tell(), 5)
+        self.assertEqual(len(buffer_), 3)
+
+        # Only the first three bytes were persisted.
+        buffer_.rewind(3)
+        self.assertEqual(buffer_.tell(), 3)
+        self.assertEqual(len(buffer_), 5)
+        self.assertEqual(buffer_.read(10), b'34567')
+        self.assertEqual(buffer_.read(10), b'')
+
+        buffer_.rewind(8)
+        self.assertEqual(len(buffer_), 0)
+        self.assertEqual(buffer_._data, bytearray())
+
+
+class TestBlobWriter(unittest.TestCase):
+
+    CHUNK_SIZE = 256 * 1024
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.fileio import BlobWriter
+
+        return BlobWriter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_writer(self, persist=None, **kw):
+        transport, uploaded, requests = _make_resumable_transport(persist)
+        blob = _make_blob(transport, None)
+        writer = self._make_one(blob, chunk_size=self.CHUNK_SIZE, **kw)
+        return writer, uploaded, requests
+
+    def test_ctor_defaults(self):
+        blob = _make_blob(mock.Mock(spec=['request']), None)
+
+        writer = self._make_one(blob)
+
+        self.assertIs(writer.blob, blob)
+        self.assertTrue(writer.writable())
+        self.assertFalse(writer.readable())
+        self.assertEqual(writer.tell(), 0)
+        self.assertEqual(writer._chunk_size, 8 * 1024 * 1024)
+
+    def test_ctor_w_blob_chunk_size(self):
+        blob = _make_blob(mock.Mock(spec=['request']), None)
+        blob.chunk_size = self.CHUNK_SIZE
+
+        writer = self._make_one(blob)
+
+        self.assertEqual(writer._chunk_size, self.CHUNK_SIZE)
+
+    def test_ctor_w_invalid_chunk_size(self):
+        blob = _make_blob(mock.Mock(spec=['request']), None)
+
+        with self.assertRaises(ValueError):
+            self._make_one(blob, chunk_size=1000)
+
+    def test_write_and_close(self):
+        writer, uploaded, requests = self._make_writer(
+            content_type='text/csv')
+        data = b'x' * (self.CHUNK_SIZE - 1)
+
+        self.assertEqual(writer.write(data), len(data))
+        # Nothing is uploaded until a chunk is full.
+        self.assertEqual(requests, [])
+        writer.write(b'yz')
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0][2]['x-upload-content-type'], 'text/csv')
+        self.assertEqual(writer.tell(), self.CHUNK_SIZE + 1)
+        # Only the data of the next chunk stays buffered.
+        self.assertEqual(len(writer._buffer._data), 1)
+        writer.close()
+
+        self.assertTrue(writer.closed)
+        self.assertEqual(bytes(uploaded), data + b'yz')
+        self.assertEqual(
+            [headers['content-range'] for _, _, headers in requests[1:]],
+            ['bytes 0-262143/*', 'bytes 262144-262144/262145'])
+        self.assertEqual(writer.blob.size, self.CHUNK_SIZE + 1)
+
+    def test_write_large(self):
+        writer, uploaded, requests = self._make_writer()
+        data = b'0123456789abcdef' * (self.CHUNK_SIZE // 8)
+
+        writer.write(data)
+        self.assertEqual(len(requests), 3)
+        self.assertEqual(len(writer._buffer), 0)
+        writer.close()
+
+        self.assertEqual(bytes(uploaded), data)
+        # Closing after a full chunk sends an empty, final chunk.
+        self.assertEqual(requests[-1][2]['content-range'], 'bytes */524288')
+
+    def test_close_empty(self):
+        writer, uploaded, requests = self._make_writer()
+
+        writer.close()
+        writer.close()
+
+        self.assertEqual(uploaded, bytearray())
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1][2]['content-range'], 'bytes */0')
+
+    def test_partially_persisted_chunk(self):
+        writer, uploaded, requests = self._make_writer(
+            persist=self.CHUNK_SIZE // 2)
+        data = b'0123456789abcdef' * (self.CHUNK_SIZE // 16 + 1)
+
+        writer.write(data)
+        writer.close()
+
+        self.assertEqual(bytes(uploaded), data)
+        self.assertEqual(
+            [headers['content-range'] for _, _, headers in requests[1:]],
+            ['bytes 0-262143/*',
+             'bytes 131072-262159/262160'])
+
+    def test_failure(self):
+        from google.cloud.exceptions import NotFound
+
+        transport = mock.Mock(spec=['request'])
+        transport.request.return_value = _make_response(
+            http_client.NOT_FOUND, {}, content=b'Not found')
+        writer = self._make_one(
+            _make_blob(transport, None), chunk_size=self.CHUNK_SIZE)
+
+        with self.assertRaises(NotFound):
+            writer.close()
+
+        self.assertTrue(writer.closed)
+
+    def test_write_after_close(self):
+        writer, _, _ = self._make_writer()
+        writer.close()
+
+        with self.assertRaises(ValueError):
+            writer.write(b'abc')
+        with self.assertRaises(ValueError):
+            writer.tell()
+
+    def test_context_manager(self):
+        writer, uploaded, _ = self._make_writer()
+
+        with writer as stream:
+            stream.write(b'abc')
+
+        self.assertTrue(writer.closed)
+        self.assertEqual(uploaded, bytearray(b'abc'))
+
+    def test_context_manager_w_exception(self):
+        writer, uploaded, requests = self._make_writer()
+
+        with self.assertRaises(KeyError):
+            with writer as stream:
+                stream.write(b'abc')
+                raise KeyError('abc')
+
+        self.assertTrue(writer.closed)
+        # The upload is abandoned.
+        self.assertEqual(requests, [])
+
+    def test_del_abandons(self):
+        writer, _, requests = self._make_writer()
+        writer.write(b'abc')
+
+        writer.__del__()
+
+        self.assertTrue(writer.closed)
+        self.assertEqual(requests, [])
@@ -0,0 +1,700 @@
+# Copyright 2017 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local stand-ins for the JSON and gRPC APIs, for benchmarks.
+
+:class:`FakeJSONServer` answers the storage, bigquery and logging JSON
+endpoints used by the benchmarks, and :class:`FakeGrpcServer` serves
+bigtable, pubsub, datastore and spanner methods with the servicers of the
+generated stubs which are installed.  Responses are canned (and rendered
+once), so that the cost of the server stays low and constant.
+
+To keep the CPU time of the servers out of measurements of the client,
+run them in another process with :func:`spawn`::
+
+    >>> from test_utils import fake_servers
+    >>> with fake_servers.spawn('http') as endpoint:
+    ...     base_url = 'http://127.0.0.1:%d' % (endpoint.port,)
+
+or from the command line::
+
+    $ python -m test_utils.fake_servers grpc --port 8086
+"""
+
+from __future__ import print_function
+
+import argparse
+import base64
+import collections
+import contextlib
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import zlib
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib.parse import unquote
+
+
+JSON_SERVICES = ('storage', 'bigquery', 'logging')
+"""APIs emulated by :class:`FakeJSONServer`."""
+
+GRPC_SERVICES = ('bigtable', 'pubsub', 'datastore', 'spanner')
+"""APIs emulated by :class:`FakeGrpcServer`, if their stubs are installed."""
+
+_TIMESTAMP = '2017-06-01T00:00:00.000Z'
+
+_ROUTES = tuple((method, re.compile(pattern + '$'), name) for
+                method, pattern, name in (
+    ('GET', r'/storage/v1/b/([^/]+)', '_storage_bucket'),
+    ('GET', r'/storage/v1/b/([^/]+)/o', '_storage_objects'),
+    ('GET', r'/storage/v1/b/([^/]+)/o/(.+)', '_storage_object'),
+    ('POST', r'/upload/storage/v1/b/([^/]+)/o', '_storage_upload'),
+    ('GET', r'/bigquery/v2/projects/([^/]+)/datasets/([^/]+)/tables/([^/]+)',
+     '_bigquery_table'),
+    ('GET',
+     r'/bigquery/v2/projects/([^/]+)/datasets/([^/]+)/tables/([^/]+)/data',
+     '_bigquery_rows'),
+    ('POST',
+     r'/bigquery/v2/projects/([^/]+)/datasets/([^/]+)/tables/([^/]+)'
+     r'/insertAll',
+     '_bigquery_insert_all'),
+    ('POST', r'/v2/entries:write', '_logging_write'),
+    ('POST', r'/v2/entries:list', '_logging_list'),
+))
+
+
+_MEDIA_PATH = re.compile(r'/download/storage/v1/b/([^/]+)/o/(.+)$')
+_RANGE = re.compile(r'bytes=(\d+)-(\d*)$')
+_PATTERN = b'0123456789abcdef'
+"""Repeated to make up the content of storage objects."""
+_BLOCK_SIZE = 1 << 20
+"""Size (1 MB) of the blocks of media responses."""
+
+
+Endpoint = collections.namedtuple('Endpoint', ['port', 'services'])
+"""A running server: its port, and the names of the APIs it serves."""
+
+
+class _JSONHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Passes requests to :meth:`FakeJSONServer.respond`."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _handle(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        status, content_type, content = self.server.respond(
+            method, self.path, body)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_media(self):
+        status, start, stop = self.server.media_range(
+            self.headers.get('Range'))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(stop - start))
+        if status == 206:
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (
+                start, stop - 1, self.server.object_size))
+        self.end_headers()
+        for block in self.server.media_blocks(start, stop):
+            self.wfile.write(block)
+
+    def do_GET(self):
+        if _MEDIA_PATH.match(self.path.partition('?')[0]):
+            self._send_media()
+        else:
+            self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeJSONServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """HTTP server emulating the storage, bigquery and logging JSON APIs.
+
+    Serves the ``buckets.get``, ``objects.list``, ``objects.get``, media
+    download (of byte ranges too) and multipart upload methods of storage,
+    ``tables.get``, ``tabledata.list`` and ``tabledata.insertAll`` of
+    bigquery, and ``entries.write`` and ``entries.list`` of logging, for
+    any resource name.  Other requests are answered ``404 Not Found``.
+    Storage objects repeat a 16 byte pattern, and are streamed: they may be
+    larger than memory.
+
+    :type port: int
+    :param port: (Optional) The port to listen on, on ``127.0.0.1``.
+                 Defaults to any free port.
+
+    :type page_size: int
+    :param page_size: (Optional) The number of items in list responses.
+
+    :type object_size: int
+    :param object_size: (Optional) The size of storage objects, in bytes.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    # Many client threads may open connections at once.
+    request_queue_size = 128
+
+    def __init__(self, port=0, page_size=1000, object_size=1 << 20):
+        BaseHTTPServer.HTTPServer.__init__(
+            self, ('127.0.0.1', port), _JSONHandler)
+        self.page_size = page_size
+        self.object_size = object_size
+        # One extra pattern, to start blocks at any offset in the pattern.
+        self._block = _PATTERN * ((_BLOCK_SIZE + len(_PATTERN)) //
+                                  len(_PATTERN))
+        md5_hash = hashlib.md5()
+        for block in self.media_blocks(0, object_size):
+            md5_hash.update(block)
+        self._md5_hash = base64.b64encode(md5_hash.digest()).decode('ascii')
+        self._rendered = {}
+        self._rendered_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self):
+        """The port the server listens on.
+
+        :rtype: int
+        :returns: The port.
+        """
+        return self.server_address[1]
+
+    @property
+    def base_url(self):
+        """The base URL of the API endpoints.
+
+        :rtype: str
+        :returns: The URL, to use as the ``API_BASE_URL`` of connections.
+        """
+        return 'http://127.0.0.1:%d' % (self.port,)
+
+    def start(self):
+        """Serve requests on a background thread.
+
+        :rtype: :class:`FakeJSONServer`
+        :returns: The server.
+        """
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving requests, and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+        self.server_close()
+
+    def respond(self, method, path, body):
+        """Compute the response to a request.
+
+        ``GET`` responses are rendered once per path, and reused.
+
+        :type method: str
+        :param method: The HTTP method.
+
+        :type path: str
+        :param path: The request path, including the query string.
+
+        :type body: bytes
+        :param body: The (decompressed) request body.
+
+        :rtype: tuple
+        :returns: The status code, content type and content.
+        """
+        if method == 'GET':
+            with self._rendered_lock:
+                response = self._rendered.get(path)
+            if response is None:
+                response = self._route(method, path, body)
+                with self._rendered_lock:
+                    self._rendered[path] = response
+            return response
+        return self._route(method, path, body)
+
+    def media_range(self, range_header):
+        """Compute the byte range of a media download.
+
+        :type range_header: str
+        :param range_header: The ``Range`` header of the request, or
+                             :data:`None`.  Only single ``bytes=start-`` or
+                             ``bytes=start-end`` ranges are supported.
+
+        :rtype: tuple
+        :returns: The status code (``200`` for the whole object, ``206``
+                  for a range), and the start and stop of the range.
+        """
+        match = _RANGE.match(range_header or '')
+        if match is None:
+            return 200, 0, self.object_size
+        start = int(match.group(1))
+        stop = self.object_size
+        if match.group(2):
+            stop = min(int(match.group(2)) + 1, stop)
+        return 206, min(start, stop), stop
+
+    def media_blocks(self, start, stop):
+        """Generate the content of storage objects.
+
+        :type start: int
+        :param start: The offset of the first byte.
+
+        :type stop: int
+        :param stop: The offset following the last byte.
+
+        :rtype: iterator
+        :returns: Blocks of at most 1 MB, from ``start`` to ``stop``.
+        """
+        while start < stop:
+            shift = start % len(_PATTERN)
+            size = min(_BLOCK_SIZE, stop - start)
+            yield self._block[shift:shift + size]
+            start += size
+
+    def _route(self, method, path, body):
+        """Find the handler of a request, and call it.
+
+        :type method: str
+        :param method: The HTTP method.
+
+        :type path: str
+        :param path: The request path, including the query string.
+
+        :type body: bytes
+        :param body: The request body, passed as is to the handlers of
+                     ``POST`` requests.
+
+        :rtype: tuple
+        :returns: The status code, content type and content.
+        """
+        path = path.partition('?')[0]
+        for route_method, pattern, name in _ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match is not None:
+                args = [unquote(group) for group in match.groups()]
+                if method == 'POST':
+                    args.append(body)
+                result = getattr(self, name)(*args)
+                return 200, 'application/json', json.dumps(result).encode(
+                    'utf-8')
+        return 404, 'application/json', b'{"error": {"code": 404}}'
+
+    def _storage_bucket(self, bucket):
+        return {
+            'kind': 'storage#bucket',
+            'id': bucket,
+            'name': bucket,
+            'projectNumber': '123456789',
+            'metageneration': '1',
+            'location': 'US',
+            'storageClass': 'STANDARD',
+            'etag': 'CAE=',
+            'timeCreated': _TIMESTAMP,
+            'updated': _TIMESTAMP,
+        }
+
+    def _storage_object(self, bucket, name):
+        return {
+            'kind': 'storage#object',
+            'id': '%s/%s/1' % (bucket, name),
+            'name': name,
+            'bucket': bucket,
+            'generation': '1',
+            'metageneration': '1',
+            'contentType': 'application/octet-stream',
+            'size': str(self.object_size),
+            'md5Hash': self._md5_hash,
+            'etag': 'CAE=',
+            'storageClass': 'STANDARD',
+            'timeCreated': _TIMESTAMP,
+            'updated': _TIMESTAMP,
+            'mediaLink': '%s/download/storage/v1/b/%s/o/%s?alt=media' % (
+                self.base_url, bucket, name),
+        }
+
+    def _storage_objects(self, bucket):
+        return {
+            'kind': 'storage#objects',
+            'items': [self._storage_object(bucket, 'object-%06d' % (index,))
+                      for index in range(self.page_size)],
+        }
+
+    def _storage_upload(self, bucket, body):
+        # Multipart uploads start with the JSON metadata of the object.
+        match = re.search(br'"name": "([^"]+)"', body)
+        name = match.group(1).decode('utf-8') if match else 'object'
+        return self._storage_object(bucket, name)
+
+    def _bigquery_table(self, project, dataset, table):
+        return {
+            'kind': 'bigquery#table',
+            'id': '%s:%s.%s' % (project, dataset, table),
+            'tableReference': {
+                'projectId': project,
+                'datasetId': dataset,
+                'tableId': table,
+            },
+            'schema': {'fields': [
+                {'name': 'name', 'type': 'STRING', 'mode': 'NULLABLE'},
+                {'name': 'age', 'type': 'INTEGER', 'mode': 'NULLABLE'},
+                {'name': 'score', 'type': 'FLOAT', 'mode': 'NULLABLE'},
+                {'name': 'active', 'type': 'BOOLEAN', 'mode': 'NULLABLE'},
+                {'name': 'seen', 'type': 'TIMESTAMP', 'mode': 'NULLABLE'},
+            ]},
+            'numRows': str(self.page_size),
+            'etag': '"benchmark"',
+            'type': 'TABLE',
+        }
+
+    def _bigquery_rows(self, project, dataset, table):
+        # pylint: disable=unused-argument
+        return {
+            'kind': 'bigquery#tableDataList',
+            'etag': '"benchmark"',
+            'totalRows': str(self.page_size),
+            'rows': [{'f': [
+                {'v': 'name-%d' % (index,)},
+                {'v': str(index)},
+                {'v': str(index / 3.0)},
+                {'v': 'true' if index % 2 else 'false'},
+                {'v': '%d.123456E9' % (1 + index % 9,)},
+            ]} for index in range(self.page_size)],
+        }
+
+    def _bigquery_insert_all(self, project, dataset, table, body):
+        # pylint: disable=unused-argument
+        return {'kind': 'bigquery#tableDataInsertAllResponse'}
+
+    def _logging_write(self, body):  # pylint: disable=unused-argument
+        return {}
+
+    def _logging_list(self, body):
+        request = json.loads(body.decode('utf-8'))
+        project = request.get('projectIds', ['benchmark'])[0]
+        return {'entries': [{
+            'logName': 'projects/%s/logs/benchmark' % (project,),
+            'resource': {'type': 'global', 'labels': {}},
+            'timestamp': '2017-06-01T00:00:00.%06dZ' % (index,),
+            'insertId': 'entry-%d' % (index,),
+            'severity': 'INFO',
+            'jsonPayload': {'message': 'Entry %d' % (index,), 'index': index},
+        } for index in range(self.page_size)]}
+
+
+def _add_bigtable(server, rows):
+    """Register a bigtable ``Bigtable`` servicer."""
+    from google.cloud.bigtable._generated import bigtable_pb2
+    from google.protobuf import wrappers_pb2
+
+    chunks = [bigtable_pb2.ReadRowsResponse.CellChunk(
+        row_key=('row-%06d' % (index,)).encode('ascii'),
+        family_name=wrappers_pb2.StringValue(value='cf'),
+        qualifier=wrappers_pb2.BytesValue(value=b'column'),
+        timestamp_micros=1496275200000000,
+        value=b'v' * 100,
+        commit_row=True) for index in range(rows)]
+    # Real servers split rows across responses: send 100 per message.
+    read_rows_responses = [
+        bigtable_pb2.ReadRowsResponse(chunks=chunks[start:start + 100])
+        for start in range(0, rows, 100)]
+
+    class _Servicer(bigtable_pb2.BigtableServicer):
+
+        def ReadRows(self, request, context):
+            for response in read_rows_responses:
+                yield response
+
+        def MutateRow(self, request, context):
+            return bigtable_pb2.MutateRowResponse()
+
+        def MutateRows(self, request, context):
+            Entry = bigtable_pb2.MutateRowsResponse.Entry
+            yield bigtable_pb2.MutateRowsResponse(entries=[
+                Entry(index=index) for index in range(len(request.entries))])
+
+    bigtable_pb2.add_BigtableServicer_to_server(_Servicer(), server)
+
+
+def _add_pubsub(server, rows):
+    """Register pubsub ``Publisher`` and ``Subscriber`` servicers."""
+    from google.cloud.proto.pubsub.v1 import pubsub_pb2
+    from google.protobuf import empty_pb2
+
+    pull_response = pubsub_pb2.PullResponse(received_messages=[
+        pubsub_pb2.ReceivedMessage(
+            ack_id='ack-%d' % (index,),
+            message=pubsub_pb2.PubsubMessage(
+                data=b'm' * 1024, message_id=str(index),
+                attributes={'index': str(index)}))
+        for index in range(rows)])
+
+    class _Publisher(pubsub_pb2.PublisherServicer):
+
+        def Publish(self, request, context):
+            return pubsub_pb2.PublishResponse(message_ids=[
+                str(index) for index in range(len(request.messages))])
+
+    class _Subscriber(pubsub_pb2.SubscriberServicer):
+
+        def Pull(self, request, context):
+            return pull_response
+
+        def Acknowledge(self, request, context):
+            return empty_pb2.Empty()
+
+    pubsub_pb2.add_PublisherServicer_to_server(_Publisher(), server)
+    pubsub_pb2.add_SubscriberServicer_to_server(_Subscriber(), server)
+
+
+def _add_datastore(server, rows):
+    """Register a datastore ``Datastore`` servicer."""
+    from google.cloud.proto.datastore.v1 import datastore_pb2
+    from google.cloud.proto.datastore.v1 import entity_pb2
+    from google.cloud.proto.datastore.v1 import query_pb2
+
+    def entity_result(key, index):
+        entity = entity_pb2.Entity()
+        entity.key.CopyFrom(key)
+        entity.properties['name'].string_value = 'item-%d' % (index,)
+        entity.properties['count'].integer_value = index
+        entity.properties['score'].double_value = index / 3.0
+        entity.properties['active'].boolean_value = bool(index % 2)
+        return query_pb2.EntityResult(entity=entity, version=1)
+
+    def make_key(index):
+        key = entity_pb2.Key()
+        key.partition_id.project_id = 'benchmark'
+        element = key.path.add()
+        element.kind = 'Item'
+        element.id = index + 1
+        return key
+
+    run_query_response = datastore_pb2.RunQueryResponse(
+        batch=query_pb2.QueryResultBatch(
+            entity_result_type=query_pb2.EntityResult.FULL,
+            entity_results=[entity_result(make_key(index), index)
+                            for index in range(rows)],
+            more_results=query_pb2.QueryResultBatch.NO_MORE_RESULTS))
+
+    class _Servicer(datastore_pb2.DatastoreServicer):
+
+        def Lookup(self, request, context):
+            return datastore_pb2.LookupResponse(found=[
+                entity_result(key, index)
+                for index, key in enumerate(request.keys)])
+
+        def RunQuery(self, request, context):
+            return run_query_response
+
+        def BeginTransaction(self, request, context):
+            return datastore_pb2.BeginTransactionResponse(
+                transaction=b'transaction')
+
+        def Commit(self, request, context):
+            return datastore_pb2.CommitResponse(mutation_results=[
+                datastore_pb2.MutationResult(version=1)
+                for _ in request.mutations])
+
+    datastore_pb2.add_DatastoreServicer_to_server(_Servicer(), server)
+
+
+def _add_spanner(server, rows):
+    """Register a spanner ``Spanner`` servicer."""
+    from google.cloud.proto.spanner.v1 import result_set_pb2
+    from google.cloud.proto.spanner.v1 import spanner_pb2
+    from google.cloud.proto.spanner.v1 import type_pb2
+    from google.protobuf import struct_pb2
+
+    Field = type_pb2.StructType.Field
+    metadata = result_set_pb2.ResultSetMetadata(
+        row_type=type_pb2.StructType(fields=[
+            Field(name='id', type=type_pb2.Type(code=type_pb2.INT64)),
+            Field(name='name', type=type_pb2.Type(code=type_pb2.STRING)),
+            Field(name='score', type=type_pb2.Type(code=type_pb2.FLOAT64)),
+        ]))
+    values = []
+    for index in range(rows):
+        values.extend([
+            struct_pb2.Value(string_value=str(index)),
+            struct_pb2.Value(string_value='name-%d' % (index,)),
+            struct_pb2.Value(number_value=index / 3.0),
+        ])
+    result_set = result_set_pb2.PartialResultSet(
+        metadata=metadata, values=values)
+
+    class _Servicer(spanner_pb2.SpannerServicer):
+
+        def CreateSession(self, request, context):
+            return spanner_pb2.Session(
+                name=request.database + '/sessions/benchmark')
+
+        def ExecuteStreamingSql(self, request, context):
+            yield result_set
+
+        def Commit(self, request, context):
+            return spanner_pb2.CommitResponse()
+
+    spanner_pb2.add_SpannerServicer_to_server(_Servicer(), server)
+
+
+_GRPC_REGISTRARS = {
+    'bigtable': _add_bigtable,
+    'pubsub': _add_pubsub,
+    'datastore': _add_datastore,
+    'spanner': _add_spanner,
+}
+
+
+class FakeGrpcServer(object):
+    """gRPC server emulating the bigtable, pubsub, datastore and spanner APIs.
+
+    Services whose generated stubs are not installed are left out.
+
+    :type port: int
+    :param port: (Optional) The port to listen on, on ``127.0.0.1``.
+                 Defaults to any free port.
+
+    :type services: tuple
+    :param services: (Optional) The names of the services to serve.
+                     Defaults to :data:`GRPC_SERVICES`.
+
+    :type rows: int
+    :param rows: (Optional) The number of rows (or messages, or entities)
+                 in read responses.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The number of threads serving calls.
+    """
+
+    def __init__(self, port=0, services=GRPC_SERVICES, rows=1000,
+                 max_workers=16):
+        from concurrent import futures
+        import grpc
+
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers))
+        self.services = []
+        for name in services:
+            try:
+                _GRPC_REGISTRARS[name](self._server, rows)
+            except ImportError:
+                continue
+            self.services.append(name)
+        self.port = self._server.add_insecure_port('127.0.0.1:%d' % (port,))
+
+    def start(self):
+        """Serve calls on background threads.
+
+        :rtype: :class:`FakeGrpcServer`
+        :returns: The server.
+        """
+        self._server.start()
+        return self
+
+    def stop(self):
+        """Stop serving calls."""
+        self._server.stop(0)
+
+
+@contextlib.contextmanager
+def spawn(kind, page_size=1000, object_size=1 << 20):
+    """Run a fake server in a child process.
+
+    The server stops when the ``with`` block exits.
+
+    :type kind: str
+    :param kind: Either ``'http'`` or ``'grpc'``.
+
+    :type page_size: int
+    :param page_size: (Optional) The number of items (or rows) in list
+                      (or read) responses.
+
+    :type object_size: int
+    :param object_size: (Optional) The size of storage objects, in bytes.
+
+    :rtype: :class:`Endpoint`
+    :returns: The port of the server, and the services it serves.
+    :raises: :class:`RuntimeError` if the server fails to start.
+    """
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__)))
+    env['PYTHONPATH'] = os.pathsep.join(
+        path for path in (package_root, env.get('PYTHONPATH')) if path)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'test_utils.fake_servers', kind,
+         '--page-size', str(page_size), '--object-size', str(object_size)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+    try:
+        line = process.stdout.readline().decode('ascii').split()
+        if not line:
+            raise RuntimeError('The fake %s server failed to start' % (kind,))
+        services = tuple(line[1].split(',')) if len(line) > 1 else ()
+        yield Endpoint(int(line[0]), services)
+    finally:
+        # The server exits when its standard input is closed.
+        process.stdin.close()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('kind', choices=('http', 'grpc'))
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--page-size', type=int, default=1000,
+                        help='Items (or rows) in list (or read) responses.')
+    parser.add_argument('--object-size', type=int, default=1 << 20,
+                        help='Size of storage objects, in bytes.')
+    args = parser.parse_args()
+
+    if args.kind == 'http':
+        server = FakeJSONServer(args.port, page_size=args.page_size,
+                                object_size=args.object_size)
+        services = JSON_SERVICES
+    else:
+        server = FakeGrpcServer(args.port, rows=args.page_size)
+        services = server.services
+    server.start()
+    print(server.port, ','.join(services))
+    sys.stdout.flush()
+    try:
+        # Serve until the parent process closes our standard input.
+        sys.stdin.read()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -37,7 +37,8 @@ class EmulatorCreds(google.auth.credentials.Credentials):
     while an emulator is running.
     """
 
-    def __init__(self):  # pylint: disable=super-init-not-called
+    def __init__(self):
+        super(EmulatorCreds, self).__init__()
         self.token = b'seekrit'
         self.expiry = None
 
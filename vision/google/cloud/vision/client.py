@@ -66,6 +66,8 @@ class Client(ClientWithProject):
 
     _vision_api_internal = None
 
+    _TRANSIENT_ATTRIBUTES = ('_vision_api_internal',)
+
     def __init__(self, project=None, credentials=None, _http=None,
                  _use_grpc=None):
         warnings.warn(